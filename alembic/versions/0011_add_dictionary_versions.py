@@ -0,0 +1,30 @@
+"""Add dictionary_versions table for hot-reloadable dictionaries
+
+Revision ID: 0011_add_dictionary_versions
+Revises: 0010_add_game_name_and_ended_at
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0011_add_dictionary_versions'
+down_revision = '0010_add_game_name_and_ended_at'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # One row per language; workers poll the version to pick up wordlist edits
+    op.create_table('dictionary_versions',
+        sa.Column('language', sa.String(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('language')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('dictionary_versions')
@@ -0,0 +1,25 @@
+"""Add computer_difficulty to games
+
+Revision ID: 0012_add_game_computer_difficulty
+Revises: 0011_add_dictionary_versions
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0012_add_game_computer_difficulty'
+down_revision = '0011_add_dictionary_versions'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Difficulty of the game's computer player, which sets its search budget
+    op.add_column('games', sa.Column('computer_difficulty', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('games', 'computer_difficulty')
@@ -0,0 +1,25 @@
+"""Add state_version to games
+
+Revision ID: 0013_add_game_state_version
+Revises: 0012_add_game_computer_difficulty
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0013_add_game_state_version'
+down_revision = '0012_add_game_computer_difficulty'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Optimistic concurrency for game writes; also validates the per-worker GameState cache
+    op.add_column('games', sa.Column('state_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('games', 'state_version')
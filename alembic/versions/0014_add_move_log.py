@@ -0,0 +1,46 @@
+"""Add move log turn numbers and game snapshots
+
+Revision ID: 0014_add_move_log
+Revises: 0013_add_game_state_version
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0014_add_move_log'
+down_revision = '0013_add_game_state_version'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Move events are replayed by turn from the nearest snapshot
+    op.add_column('moves', sa.Column('turn_number', sa.Integer(), nullable=True))
+    op.create_index('ix_moves_game_id_turn_number', 'moves', ['game_id', 'turn_number'])
+
+    op.create_table(
+        'game_snapshots',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('game_id', sa.String(), nullable=False),
+        sa.Column('turn_number', sa.Integer(), nullable=False),
+        sa.Column('current_player_id', sa.Integer(), nullable=True),
+        sa.Column('state', sa.String(), nullable=False),
+        sa.Column('racks', sa.String(), nullable=False),
+        sa.Column('scores', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['game_id'], ['games.id']),
+        sa.ForeignKeyConstraint(['current_player_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('game_id', 'turn_number', name='uq_game_snapshots_game_id_turn_number')
+    )
+    op.create_index(op.f('ix_game_snapshots_id'), 'game_snapshots', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_game_snapshots_id'), table_name='game_snapshots')
+    op.drop_table('game_snapshots')
+    op.drop_index('ix_moves_game_id_turn_number', table_name='moves')
+    op.drop_column('moves', 'turn_number')
@@ -0,0 +1,42 @@
+"""Add game list summary columns to games
+
+Revision ID: 0015_add_game_summary_columns
+Revises: 0014_add_move_log
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0015_add_game_summary_columns'
+down_revision = '0014_add_move_log'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Maintained by the start and move write paths; NULL until a game's next write,
+    # game lists fall back to games.state and moves for those rows
+    op.add_column('games', sa.Column('turn_number', sa.Integer(), nullable=True))
+    op.add_column('games', sa.Column('consecutive_passes', sa.Integer(), nullable=True))
+    op.add_column('games', sa.Column('letter_bag_count', sa.Integer(), nullable=True))
+    op.add_column('games', sa.Column('last_move_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('games', sa.Column('last_move_player_id', sa.Integer(), nullable=True))
+    op.add_column('games', sa.Column('last_move_type', sa.String(), nullable=True))
+    op.add_column('games', sa.Column('last_move_points', sa.Integer(), nullable=True))
+    op.add_column('games', sa.Column('last_words', sa.String(), nullable=True))
+    op.create_foreign_key('fk_games_last_move_player_id_users', 'games', 'users', ['last_move_player_id'], ['id'])
+
+    # Kept in step by every players insert and delete from now on
+    op.add_column('games', sa.Column('player_count', sa.Integer(), nullable=False, server_default='0'))
+    op.execute("UPDATE games SET player_count = (SELECT COUNT(*) FROM players WHERE players.game_id = games.id)")
+
+
+def downgrade() -> None:
+    op.drop_column('games', 'player_count')
+    op.drop_constraint('fk_games_last_move_player_id_users', 'games', type_='foreignkey')
+    for column in ('last_words', 'last_move_points', 'last_move_type', 'last_move_player_id',
+                   'last_move_at', 'letter_bag_count', 'consecutive_passes', 'turn_number'):
+        op.drop_column('games', column)
@@ -0,0 +1,35 @@
+"""Add composite indexes for the hot moves, players and invitation queries
+
+Revision ID: 0016_add_hot_query_indexes
+Revises: 0015_add_game_summary_columns
+Create Date: 2026-10-16 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0016_add_hot_query_indexes'
+down_revision = '0015_add_game_summary_columns'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Latest moves of a game: WHERE game_id = ? ORDER BY timestamp DESC
+    op.create_index('ix_moves_game_id_timestamp', 'moves', ['game_id', sa.text('timestamp DESC')])
+    # Players of a game and membership checks, and a user's games
+    op.create_index('ix_players_game_id_user_id', 'players', ['game_id', 'user_id'])
+    op.create_index('ix_players_user_id', 'players', ['user_id'])
+    # A user's pending invitations and a game's invitations
+    op.create_index('ix_game_invitations_invitee_id_status', 'game_invitations', ['invitee_id', 'status'])
+    op.create_index('ix_game_invitations_game_id_status', 'game_invitations', ['game_id', 'status'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_game_invitations_game_id_status', table_name='game_invitations')
+    op.drop_index('ix_game_invitations_invitee_id_status', table_name='game_invitations')
+    op.drop_index('ix_players_user_id', table_name='players')
+    op.drop_index('ix_players_game_id_user_id', table_name='players')
+    op.drop_index('ix_moves_game_id_timestamp', table_name='moves')
@@ -11,10 +11,11 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from passlib.context import CryptContext
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models import User
-from app.db import get_db
+from app.db import get_db, get_async_db
 from app.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, PERSISTENT_TOKEN_EXPIRE_DAYS
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -40,6 +41,13 @@ def get_user_by_email(db: Session, email: str):
 
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
     """Get current user from token."""
+    return _user_for_token(db, token)
+
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)) -> User:
+    """Get current user from token, loaded in the request's AsyncSession (for async endpoints)."""
+    return await db.run_sync(_user_for_token, token)
+
+def _user_for_token(db: Session, token: str) -> User:
     # For testing, accept dummy token
     if TESTING and token == 'dummy_token_for_tests':
         return db.query(User).first()
@@ -0,0 +1,217 @@
+"""
+Process pool for computer move search.
+
+Move search is CPU-bound Python: run on the event loop it stalls every HTTP and
+WebSocket request on the worker while the computer thinks, and in a thread it
+still holds the GIL. Searches run in a small pool of worker processes instead.
+Each worker maps the dictionaries and builds their move generators when it
+starts, so a search only ships the board and rack across.
+
+At most one search runs per worker process; further searches wait in a bounded
+queue and are turned away once it is full. Queue depth and search/wait times are
+reported by stats() (admin /performance).
+"""
+
+import asyncio
+import gc
+import logging
+import multiprocessing
+import statistics
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.config import COMPUTER_MOVE_WORKERS, COMPUTER_MOVE_QUEUE_LIMIT, COMPUTER_MOVE_PRELOAD_LANGUAGES
+
+logger = logging.getLogger(__name__)
+
+# Recent samples kept for the search/wait time percentiles
+TIMING_SAMPLES = 500
+
+
+class ComputerMovePoolBusy(Exception):
+    """Raised when the computer move queue is full."""
+
+
+def _init_worker(languages: List[str]) -> None:
+    """Load the dictionaries and move generators once per worker process."""
+    from app.utils.wordlist_utils import load_wordlist
+    from app.game_logic.dictionary_index import warm_move_generators
+    from app.game_logic.move_generator import get_move_generator
+
+    # Reloaded dictionaries rebuild their move generators ahead of the next search
+    warm_move_generators()
+    for language in languages:
+        start = time.perf_counter()
+        try:
+            generator = get_move_generator(language, load_wordlist(language))
+            logger.info(f"🧠 Move search worker preloaded '{language}' ({generator.dawg.word_count} words, "
+                        f"{(time.perf_counter() - start) * 1000:.0f}ms)")
+        except Exception as e:
+            # The language is loaded on its first search instead
+            logger.warning(f"⚠️ Move search worker could not preload '{language}': {e}")
+    # The preloaded DAWGs live as long as the worker. Frozen, their nodes are skipped
+    # by full garbage collections, which otherwise land mid-search and take ~60ms
+    # for the English dictionary alone.
+    gc.collect()
+    gc.freeze()
+
+
+def _worker_ready() -> bool:
+    return True
+
+
+def _search(game_state_data: Dict[str, Any], rack: str, language: str,
+            difficulty: Optional[str], dictionary_version: int) -> Tuple[Dict[str, Any], float]:
+    """Run one computer move search; returns the move and the search time in ms."""
+    from app.utils.wordlist_utils import load_wordlist, get_dictionary_version, schedule_dictionary_reload
+    from app.optimized_computer_player import get_optimized_computer_player
+
+    start = time.perf_counter()
+    wordlist = load_wordlist(language)
+    if dictionary_version > get_dictionary_version(language):
+        # The web worker has seen a newer version; this one is served until it is loaded
+        schedule_dictionary_reload(language, dictionary_version)
+    move = get_optimized_computer_player().make_move(
+        game_state_data=game_state_data,
+        rack=rack,
+        wordlist=wordlist,
+        language=language,
+        difficulty=difficulty
+    )
+    return move, (time.perf_counter() - start) * 1000
+
+
+def _summary(samples: Iterable[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+    return {
+        "p50": round(statistics.median(ordered), 1),
+        "p95": round(ordered[int(0.95 * (len(ordered) - 1))], 1),
+        "max": round(ordered[-1], 1)
+    }
+
+
+class ComputerMovePool:
+    """Runs computer move searches in worker processes with a capped, queued concurrency."""
+
+    def __init__(self, workers: int = COMPUTER_MOVE_WORKERS, queue_limit: int = COMPUTER_MOVE_QUEUE_LIMIT,
+                 languages: Optional[List[str]] = None):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.languages = list(COMPUTER_MOVE_PRELOAD_LANGUAGES if languages is None else languages)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.failed = 0
+        self.search_times: deque = deque(maxlen=TIMING_SAMPLES)
+        self.wait_times: deque = deque(maxlen=TIMING_SAMPLES)
+
+    @property
+    def max_concurrent(self) -> int:
+        return max(1, self.workers)
+
+    def start(self) -> None:
+        """Start the worker processes and begin preloading (no-op when already started)."""
+        if self.workers <= 0:
+            from app.game_logic.dictionary_index import warm_move_generators
+            # Searches run in this process, so it builds the move generators
+            warm_move_generators()
+            return
+        if self._executor is not None:
+            return
+        # Spawned rather than forked: the web worker runs threads (dictionary reloads,
+        # DB connector) whose locks must not be copied into the children
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.languages,)
+        )
+        # Worker processes start on demand; submitting one task per worker starts them all now
+        for _ in range(self.workers):
+            self._executor.submit(_worker_ready)
+        logger.info(f"🚀 Computer move pool started with {self.workers} workers (preloading {self.languages})")
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            logger.info("🛑 Computer move pool stopped")
+
+    def _slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._loop = loop
+        return self._semaphore
+
+    async def make_move(self, game_state_data: Dict[str, Any], rack: str, language: str,
+                        difficulty: Optional[str] = None) -> Dict[str, Any]:
+        """Search the computer's move off the event loop.
+
+        Raises ComputerMovePoolBusy when the queue of waiting searches is full.
+        """
+        from app.utils.wordlist_utils import get_dictionary_version
+
+        slots = self._slots()
+        if slots.locked() and self.waiting >= self.queue_limit:
+            self.rejected += 1
+            raise ComputerMovePoolBusy(f"{self.waiting} computer moves already waiting")
+
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        try:
+            await slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.wait_times.append((time.perf_counter() - queued_at) * 1000)
+
+        self.running += 1
+        try:
+            self.start()
+            args = (game_state_data, rack, language, difficulty, get_dictionary_version(language))
+            # Without worker processes the search still runs off the loop, in a thread
+            move, search_ms = await asyncio.get_running_loop().run_in_executor(self._executor, _search, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); start a fresh pool for later searches
+            self.failed += 1
+            logger.error("❌ Computer move worker died; restarting the pool")
+            self.shutdown()
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.running -= 1
+            slots.release()
+
+        self.completed += 1
+        self.search_times.append(search_ms)
+        return move
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "max_concurrent": self.max_concurrent,
+            "queue_limit": self.queue_limit,
+            "queue_depth": self.waiting,
+            "running": self.running,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "search_ms": _summary(self.search_times),
+            "wait_ms": _summary(self.wait_times)
+        }
+
+
+# Global pool used by the routers
+computer_move_pool = ComputerMovePool()
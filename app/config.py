@@ -114,6 +114,55 @@ ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "240"))  # 4 hours instead of 30 minutes
 PERSISTENT_TOKEN_EXPIRE_DAYS = int(os.getenv("PERSISTENT_TOKEN_EXPIRE_DAYS", "30"))  # For "remember me"
 
+# How often each worker checks the database for dictionary edits made by other workers
+DICTIONARY_VERSION_POLL_SECONDS = int(os.getenv("DICTIONARY_VERSION_POLL_SECONDS", "30"))
+
+# Database connection pools. Each web worker process has two: the sync engine
+# (DB_POOL_SIZE + DB_MAX_OVERFLOW) and the async engine used by the hot game
+# endpoints (DB_ASYNC_POOL_SIZE + DB_ASYNC_MAX_OVERFLOW). Per worker process add
+# one LISTEN connection with PUBSUB_BACKEND=postgres, and one per computer move
+# worker (COMPUTER_MOVE_WORKERS), which connect when loading a wordlist from the
+# database. Instances x web workers x that total must stay below the database's
+# max_connections.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_ASYNC_POOL_SIZE = int(os.getenv("DB_ASYNC_POOL_SIZE", str(DB_POOL_SIZE)))
+DB_ASYNC_MAX_OVERFLOW = int(os.getenv("DB_ASYNC_MAX_OVERFLOW", str(DB_MAX_OVERFLOW)))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # Seconds to wait for a free connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # Seconds; Cloud SQL drops idle connections
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1") == "1"
+
+# Live GameState objects kept per worker for active games (validated by games.state_version)
+GAME_STATE_CACHE_SIZE = int(os.getenv("GAME_STATE_CACHE_SIZE", "512"))
+
+# Turns between stored game snapshots; any turn is replayed from the nearest snapshot plus its move events
+GAME_SNAPSHOT_INTERVAL = int(os.getenv("GAME_SNAPSHOT_INTERVAL", "10"))
+
+# Computer move search runs in a process pool: one search per worker process at a time,
+# further searches wait in a bounded queue (0 workers runs searches in a thread instead)
+COMPUTER_MOVE_WORKERS = int(os.getenv("COMPUTER_MOVE_WORKERS", "2"))
+COMPUTER_MOVE_QUEUE_LIMIT = int(os.getenv("COMPUTER_MOVE_QUEUE_LIMIT", "32"))
+COMPUTER_MOVE_PRELOAD_LANGUAGES = [
+    language.strip() for language in os.getenv("COMPUTER_MOVE_PRELOAD_LANGUAGES", "de,en").split(",") if language.strip()
+]
+
+# WebSocket fan-out between instances: "memory" (single process), "postgres" (LISTEN/NOTIFY
+# on the application database) or "redis" (PUBLISH/SUBSCRIBE on REDIS_URL)
+PUBSUB_BACKEND = os.getenv("PUBSUB_BACKEND", "memory").lower()
+PUBSUB_CHANNEL = os.getenv("PUBSUB_CHANNEL", "wordbattle_events")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Recent turn events kept per game for clients that reconnect with since_seq; older gaps are
+# replayed from the moves table up to the replay limit, larger ones get a snapshot instead
+GAME_EVENT_LOG_SIZE = int(os.getenv("GAME_EVENT_LOG_SIZE", "32"))
+GAME_EVENT_LOG_GAMES = int(os.getenv("GAME_EVENT_LOG_GAMES", "1000"))
+GAME_EVENT_REPLAY_LIMIT = int(os.getenv("GAME_EVENT_REPLAY_LIMIT", "32"))
+
+# Outgoing WebSocket messages wait in a bounded queue per connection; a client whose queue
+# fills up, or that takes longer than the deadline to accept one message, is disconnected
+WS_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", "64"))
+WS_SEND_TIMEOUT_SECONDS = float(os.getenv("WS_SEND_TIMEOUT_SECONDS", "10"))
+
 # Email settings
 SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.strato.de")
 SMTP_PORT = int(os.getenv("SMTP_PORT", "465"))  # SSL port
@@ -1,8 +1,16 @@
 ﻿from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-from app.config import DATABASE_URL, get_database_url, CLOUD_PROVIDER
+from sqlalchemy.pool import QueuePool
+from app.config import (
+    DATABASE_URL, get_database_url, CLOUD_PROVIDER,
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING,
+    DB_ASYNC_POOL_SIZE, DB_ASYNC_MAX_OVERFLOW
+)
 from app.cloud.providers import CloudProvider
+from app.utils.pool_metrics import metered_pool_class
 import os
+import re
+import threading
 
 # Get database URL based on environment
 # Use DATABASE_URL directly if not testing, otherwise use get_database_url for test database
@@ -10,47 +18,132 @@ if os.getenv("TESTING") == "1":
     DATABASE_URL = get_database_url(is_test=True)
 # DATABASE_URL is already set from config.py which respects environment variables
 
+def _pool_args(pool_class=QueuePool, name: str = "sync", pool_size: int = DB_POOL_SIZE,
+               max_overflow: int = DB_MAX_OVERFLOW) -> dict:
+    """Pool settings from config, with checkout metrics (see app.utils.pool_metrics)."""
+    return {
+        "poolclass": metered_pool_class(pool_class, name),
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
 # For GCP Cloud SQL, use the Cloud SQL Python Connector
 if CLOUD_PROVIDER == CloudProvider.GCP and "unix_sock" in DATABASE_URL:
     from google.cloud.sql.connector import Connector
     import asyncpg
-    import re
     
     # Extract connection details from URL
     match = re.match(r'postgresql\+pg8000://([^:]+):([^@]+)@/([^?]+)\?unix_sock=/cloudsql/(.+)', DATABASE_URL)
     if match:
         user, password, db_name, instance_connection_name = match.groups()
         
+        # One Connector per process: it caches the instance certificate and refreshes it in
+        # the background, so new pool connections skip the TLS setup and metadata lookup
+        _connector = None
+        _connector_lock = threading.Lock()
+        
+        def get_connector() -> Connector:
+            global _connector
+            with _connector_lock:
+                if _connector is None:
+                    _connector = Connector()
+                return _connector
+        
         # Create a custom connection function using Cloud SQL Connector
         def getconn():
-            connector = Connector()
-            conn = connector.connect(
+            return get_connector().connect(
                 instance_connection_name,
                 "pg8000",
                 user=user,
                 password=password,
                 db=db_name
             )
-            return conn
         
         # Create engine with custom connection function
         engine = create_engine(
             "postgresql+pg8000://",
             creator=getconn,
+            **_pool_args()
         )
         print(f"Using Cloud SQL Connector for: {instance_connection_name}/{db_name}")
     else:
         # Fallback to original URL
-        engine = create_engine(DATABASE_URL)
+        engine = create_engine(DATABASE_URL, **_pool_args())
         print(f"Using database: {DATABASE_URL}")
+elif DATABASE_URL.startswith("sqlite"):
+    # SQLite connections are cheap and file-local; keep SQLAlchemy's default pool
+    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+    print(f"Using database: {DATABASE_URL}")
 else:
     # Create database engine with URL from config
-    engine = create_engine(
-        DATABASE_URL,
-        # Only use check_same_thread for SQLite
-        connect_args={} if not DATABASE_URL.startswith("sqlite") else {"check_same_thread": False}
-    )
+    engine = create_engine(DATABASE_URL, **_pool_args())
     print(f"Using database: {DATABASE_URL}")
 
 SessionLocal = sessionmaker(bind=engine)
 Base = declarative_base()
+
+
+# Async engine (asyncpg) for the async game endpoints. Created on first use, inside the
+# event loop, so workers and scripts that only use SessionLocal never open it.
+_async_engine = None
+_async_session_factory = None
+
+def _async_database_url(url: str) -> str:
+    """The same database through its asyncio driver."""
+    url = re.sub(r"^postgresql(\+pg8000|\+psycopg2)?://", "postgresql+asyncpg://", url)
+    url = re.sub(r"^sqlite(\+pysqlite)?://", "sqlite+aiosqlite://", url)
+    return url.replace("sslmode=", "ssl=")  # asyncpg's name for it
+
+def _async_pool_args() -> dict:
+    # Test clients run each app instance on its own event loop; pooled asyncpg connections can't cross loops
+    if os.getenv("TESTING") == "1":
+        from sqlalchemy.pool import NullPool
+        return {"poolclass": NullPool}
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+    return _pool_args(AsyncAdaptedQueuePool, "async", DB_ASYNC_POOL_SIZE, DB_ASYNC_MAX_OVERFLOW)
+
+_CLOUD_SQL_URL = re.compile(r'postgresql\+pg8000://([^:]+):([^@]+)@/([^?]+)\?unix_sock=/cloudsql/(.+)')
+_async_connector = None
+
+async def connect_asyncpg():
+    """A new asyncpg connection to the application database, outside any pool."""
+    global _async_connector
+    match = _CLOUD_SQL_URL.match(DATABASE_URL)
+    if CLOUD_PROVIDER == CloudProvider.GCP and match:
+        from google.cloud.sql.connector import create_async_connector
+        user, password, db_name, instance_connection_name = match.groups()
+        if _async_connector is None:
+            _async_connector = await create_async_connector()
+        return await _async_connector.connect_async(
+            instance_connection_name,
+            "asyncpg",
+            user=user,
+            password=password,
+            db=db_name
+        )
+    import asyncpg
+    return await asyncpg.connect(_async_database_url(DATABASE_URL).replace("postgresql+asyncpg://", "postgresql://", 1))
+
+def get_async_engine():
+    """The process' async engine (asyncpg, or aiosqlite for SQLite URLs)."""
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+        
+        if CLOUD_PROVIDER == CloudProvider.GCP and _CLOUD_SQL_URL.match(DATABASE_URL):
+            _async_engine = create_async_engine("postgresql+asyncpg://", async_creator=connect_asyncpg, **_async_pool_args())
+        else:
+            _async_engine = create_async_engine(_async_database_url(DATABASE_URL), **_async_pool_args())
+        
+        # Objects stay loaded after commit: attribute access outside the session's
+        # greenlet (i.e. in the endpoint after run_sync / await commit) must not refresh
+        _async_session_factory = async_sessionmaker(_async_engine, expire_on_commit=False)
+    return _async_engine
+
+def AsyncSessionLocal():
+    """A new AsyncSession on the async engine."""
+    get_async_engine()
+    return _async_session_factory()
@@ -244,30 +244,25 @@ def load_wordlist(language="de", wordlist_path=None, skip=0, limit=None):
     try:
         logger.info(f"Starting wordlist loading: language={language}, skip={skip}, limit={limit}")
         
-        # Get initial count
-        db = SessionLocal()
-        try:
-            initial_count = db.query(WordList).filter(WordList.language == language).count()
-        finally:
-            db.close()
-        
-        # Load words
-        result = import_wordlist_continue(language, wordlist_path, skip=skip, limit=limit)
+        # Stream the file into the database (COPY on PostgreSQL)
+        stats = import_wordlist_continue(language, wordlist_path, skip=skip, limit=limit)
+        if stats is None:
+            return {"success": False, "error": "Wordlist import failed"}
         
-        # Get final count
         db = SessionLocal()
         try:
             final_count = db.query(WordList).filter(WordList.language == language).count()
         finally:
             db.close()
         
-        words_loaded = final_count - initial_count
-        
-        logger.info(f"Wordlist loading completed: {words_loaded} words loaded")
+        logger.info(f"Wordlist loading completed: {stats['inserted']} words loaded ({stats['words_per_second']} words/s)")
         
         return {
             "success": True,
-            "words_loaded": words_loaded,
+            "words_loaded": stats["inserted"],
+            "duplicates_skipped": stats["duplicates"],
+            "seconds": stats["seconds"],
+            "words_per_second": stats["words_per_second"],
             "total_words": final_count,
             "language": language
         }
@@ -314,6 +309,84 @@ def ensure_user_columns():
         logger.error(f"Error checking user columns: {e}")
         return {"success": False, "error": str(e)}
 
+def ensure_game_columns():
+    """
+    Ensure the games and moves tables have the columns added after their initial migrations.
+    This is a fallback if migrations don't work properly.
+    """
+    try:
+        logger.info("Checking if game columns exist...")
+        from sqlalchemy import text, inspect
+        
+        inspector = inspect(engine)
+        game_columns = [col['name'] for col in inspector.get_columns('games')]
+        move_columns = [col['name'] for col in inspector.get_columns('moves')]
+        
+        db = SessionLocal()
+        try:
+            if "computer_difficulty" not in game_columns:
+                logger.info("Adding computer_difficulty column...")
+                db.execute(text("ALTER TABLE games ADD COLUMN computer_difficulty VARCHAR"))
+                db.commit()
+            
+            if "state_version" not in game_columns:
+                logger.info("Adding state_version column...")
+                db.execute(text("ALTER TABLE games ADD COLUMN state_version INTEGER NOT NULL DEFAULT 0"))
+                db.commit()
+            
+            summary_columns = {
+                "turn_number": "INTEGER",
+                "consecutive_passes": "INTEGER",
+                "letter_bag_count": "INTEGER",
+                "last_move_at": "TIMESTAMP WITH TIME ZONE",
+                "last_move_player_id": "INTEGER REFERENCES users(id)",
+                "last_move_type": "VARCHAR",
+                "last_move_points": "INTEGER",
+                "last_words": "VARCHAR"
+            }
+            for column, column_type in summary_columns.items():
+                if column not in game_columns:
+                    logger.info(f"Adding games.{column} column...")
+                    db.execute(text(f"ALTER TABLE games ADD COLUMN {column} {column_type}"))
+                    db.commit()
+            
+            if "player_count" not in game_columns:
+                logger.info("Adding player_count column...")
+                db.execute(text("ALTER TABLE games ADD COLUMN player_count INTEGER NOT NULL DEFAULT 0"))
+                db.execute(text("UPDATE games SET player_count = (SELECT COUNT(*) FROM players WHERE players.game_id = games.id)"))
+                db.commit()
+            
+            if "turn_number" not in move_columns:
+                logger.info("Adding moves.turn_number column...")
+                db.execute(text("ALTER TABLE moves ADD COLUMN turn_number INTEGER"))
+                db.execute(text("CREATE INDEX IF NOT EXISTS ix_moves_game_id_turn_number ON moves (game_id, turn_number)"))
+                db.commit()
+            
+            # Indexes for the hot game list and game view queries (alembic 0016)
+            for index_sql in (
+                "CREATE INDEX IF NOT EXISTS ix_moves_game_id_timestamp ON moves (game_id, timestamp DESC)",
+                "CREATE INDEX IF NOT EXISTS ix_players_game_id_user_id ON players (game_id, user_id)",
+                "CREATE INDEX IF NOT EXISTS ix_players_user_id ON players (user_id)",
+                "CREATE INDEX IF NOT EXISTS ix_game_invitations_invitee_id_status ON game_invitations (invitee_id, status)",
+                "CREATE INDEX IF NOT EXISTS ix_game_invitations_game_id_status ON game_invitations (game_id, status)"
+            ):
+                db.execute(text(index_sql))
+            db.commit()
+                
+            logger.info("✅ Game columns ensured")
+            return {"success": True, "message": "Game columns ensured"}
+            
+        except Exception as e:
+            logger.warning(f"Could not add game columns: {e}")
+            db.rollback()
+            return {"success": False, "error": str(e)}
+        finally:
+            db.close()
+            
+    except Exception as e:
+        logger.error(f"Error checking game columns: {e}")
+        return {"success": False, "error": str(e)}
+
 def initialize_database_if_needed():
     """
     Initialize database only if it's not already set up.
@@ -332,8 +405,9 @@ def initialize_database_if_needed():
     except Exception as e:
         logger.warning(f"Could not create tables: {e}")
     
-    # Ensure user preference columns exist (fallback)
+    # Ensure user preference and game columns exist (fallback)
     column_result = ensure_user_columns()
+    ensure_game_columns()
     
     status = check_database_status()
     
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from app.database import SessionLocal, AsyncSessionLocal
 
 def get_db():
     """Get a database session."""
@@ -7,4 +7,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    """Get an async database session (for async endpoints)."""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -2,6 +2,7 @@ from typing import List, Tuple, Optional, Dict, Set
 from app.game_logic.validate_move import validate_move
 from app.game_logic.letter_bag import LETTER_DISTRIBUTION
 from app.game_logic.full_points import calculate_full_move_points
+from app.game_logic.cross_checks import CrossCheckBoard
 
 # Standard Scrabble board multipliers
 # WW = Triple Word Score (3x word multiplier)
@@ -145,6 +146,9 @@ def find_word_placements(
     # Get letter points for the game language
     letter_points = LETTER_DISTRIBUTION.get(language, LETTER_DISTRIBUTION["en"])["points"]
     
+    # Cross-check masks let each candidate tile be tested with one bit lookup
+    cross_checks = CrossCheckBoard(board, dictionary, language)
+    
     # Helper function to check if a position is within board bounds
     def is_within_bounds(row: int, col: int) -> bool:
         return 0 <= row < board_size and 0 <= col < board_size
@@ -163,13 +167,15 @@ def find_word_placements(
         required_letters = []
         
         for i, letter in enumerate(word):
-            curr_row = row if not is_horizontal else row + i
+            curr_row = row if is_horizontal else row + i
             curr_col = col + i if is_horizontal else col
             
             if not is_within_bounds(curr_row, curr_col):
                 return False
                 
             if board[curr_row][curr_col] is None:
+                if cross_checks.allows(curr_row, curr_col, letter, is_horizontal) is False:
+                    return False
                 move_letters.append((curr_row, curr_col, letter))
                 required_letters.append(letter)
             elif board[curr_row][curr_col] == letter:
@@ -0,0 +1,142 @@
+"""
+Per-square cross-check bitmasks.
+
+For every empty square the board keeps, per play direction, a bitmask over the
+language alphabet of the letters that would form a valid perpendicular word
+there. Placement validation and move generation then test one bit per tile
+instead of rebuilding cross-words and looking them up. After a placement only
+the rows and columns the placement touched are recomputed.
+"""
+
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.game_logic.letter_bag import LETTER_DISTRIBUTION
+
+BOARD_SIZE = 15
+BLANK_LETTERS = ("?", "*")
+
+
+@lru_cache(maxsize=None)
+def letter_bits(language: str) -> Dict[str, int]:
+    """Bit assigned to each letter of the language alphabet."""
+    distribution = LETTER_DISTRIBUTION.get(language, LETTER_DISTRIBUTION["en"])
+    alphabet = sorted(l for l in distribution["frequency"] if l not in BLANK_LETTERS)
+    return {letter: 1 << i for i, letter in enumerate(alphabet)}
+
+
+def all_letters_mask(language: str) -> int:
+    return (1 << len(letter_bits(language))) - 1
+
+
+def cell_letter(cell) -> Tuple[Optional[str], bool]:
+    """Return (letter, is_blank) for a board cell in any of the board formats in use."""
+    if cell is None:
+        return None, False
+    if isinstance(cell, dict):
+        letter = cell.get("letter") or cell.get("LETTER")
+        is_blank = bool(cell.get("is_blank", False))
+    elif isinstance(cell, str):
+        letter, is_blank = cell.strip(), False
+    else:
+        letter = getattr(cell, "letter", None)
+        is_blank = bool(getattr(cell, "is_blank", False))
+    if not letter:
+        return None, False
+    letter = letter.upper()
+    return letter, is_blank or letter in BLANK_LETTERS
+
+
+class CrossCheckBoard:
+    """Cross-check masks for a board, kept in sync with placements via place().
+
+    across[row][col] constrains tiles of a horizontal play (the vertical word through
+    the square), down[row][col] constrains tiles of a vertical play. A mask is None
+    when it cannot be computed from plain letters (an unresolved blank '?' is part
+    of the perpendicular word); callers fall back to a full word check there.
+    """
+
+    def __init__(self, board: List[List], dictionary: Set[str], language: str = "en"):
+        self.dictionary = dictionary
+        self.language = language
+        self.bits = letter_bits(language)
+        self.all_letters = all_letters_mask(language)
+
+        self.letters: List[List[Optional[str]]] = [[None] * BOARD_SIZE for _ in range(BOARD_SIZE)]
+        for r, row in enumerate(board[:BOARD_SIZE]):
+            for c, cell in enumerate(row[:BOARD_SIZE]):
+                self.letters[r][c] = cell_letter(cell)[0]
+
+        self.across: List[List[Optional[int]]] = [[self.all_letters] * BOARD_SIZE for _ in range(BOARD_SIZE)]
+        self.down: List[List[Optional[int]]] = [[self.all_letters] * BOARD_SIZE for _ in range(BOARD_SIZE)]
+        for line in range(BOARD_SIZE):
+            self._recompute_row(line)
+            self._recompute_col(line)
+
+    def allows(self, row: int, col: int, letter: str, horizontal: bool) -> Optional[bool]:
+        """Whether letter at (row, col) forms a valid perpendicular word for a play in the given direction.
+
+        Returns None when the mask is unknown and the caller must check the word itself.
+        """
+        mask = (self.across if horizontal else self.down)[row][col]
+        bit = self.bits.get(letter.upper()) if letter else None
+        if mask is None or bit is None:
+            return None
+        return bool(mask & bit)
+
+    def has_cross_word(self, row: int, col: int, horizontal: bool) -> bool:
+        """Whether a tile at (row, col) would touch tiles perpendicular to the play direction."""
+        if horizontal:
+            return (row > 0 and self.letters[row - 1][col] is not None) or \
+                   (row < BOARD_SIZE - 1 and self.letters[row + 1][col] is not None)
+        return (col > 0 and self.letters[row][col - 1] is not None) or \
+               (col < BOARD_SIZE - 1 and self.letters[row][col + 1] is not None)
+
+    def place(self, tiles: Iterable[Tuple[int, int, str]]) -> None:
+        """Apply placed tiles and recompute only the affected rows and columns."""
+        rows, cols = set(), set()
+        for row, col, letter in tiles:
+            self.letters[row][col] = letter.upper()
+            rows.add(row)
+            cols.add(col)
+        for row in rows:
+            self._recompute_row(row)
+        for col in cols:
+            self._recompute_col(col)
+
+    def _recompute_row(self, row: int) -> None:
+        """Recompute down masks in a row (they depend on the horizontal words in it)."""
+        line = self.letters[row]
+        masks = self.down[row]
+        for col in range(BOARD_SIZE):
+            masks[col] = self._mask_for(line, col)
+
+    def _recompute_col(self, col: int) -> None:
+        """Recompute across masks in a column (they depend on the vertical words in it)."""
+        line = [self.letters[r][col] for r in range(BOARD_SIZE)]
+        for row in range(BOARD_SIZE):
+            self.across[row][col] = self._mask_for(line, row)
+
+    def _mask_for(self, line: List[Optional[str]], index: int) -> Optional[int]:
+        if line[index] is not None:
+            return 0
+        start = index
+        while start > 0 and line[start - 1] is not None:
+            start -= 1
+        end = index
+        while end < BOARD_SIZE - 1 and line[end + 1] is not None:
+            end += 1
+        if start == index and end == index:
+            return self.all_letters
+
+        prefix = "".join(line[start:index])
+        suffix = "".join(line[index + 1:end + 1])
+        if any(b in prefix or b in suffix for b in BLANK_LETTERS):
+            return None
+
+        mask = 0
+        dictionary = self.dictionary
+        for letter, bit in self.bits.items():
+            if prefix + letter + suffix in dictionary:
+                mask |= bit
+        return mask
@@ -0,0 +1,196 @@
+"""
+Shared, per-language structures derived from a dictionary.
+
+Building length buckets, the blank-pattern index or the move generator means a
+pass over the whole wordlist. The routers create a fresh GameState for every
+request, so these are built once per language and dictionary version here and
+GameState instances only hold a reference.
+
+A dictionary version is the dictionary object handed out by load_wordlist:
+reloading a wordlist produces a new object, which retires the old index. While
+a new version's structures are built in the background, requests keep being
+served from the previous version's, so a hot reload never blocks a request.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+import logging
+import threading
+
+from app.game_logic.move_generator import MoveGenerator
+from app.game_logic.pattern_index import WordPatternIndex
+
+logger = logging.getLogger(__name__)
+
+# Indexes kept per language: the current version plus the one it replaced, so
+# requests still holding the previous dictionary object don't start a rebuild.
+RETAINED_VERSIONS = 2
+
+_build_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dictionary-index")
+
+# Whether a newly loaded dictionary builds its move generator up front. Only
+# processes that search computer moves opt in (the move search workers, or the
+# web worker when there are none); elsewhere it is built on first use.
+_warm_move_generators = False
+
+
+def warm_move_generators(enabled: bool = True) -> None:
+    """Opt this process in to building move generators when a dictionary is loaded."""
+    global _warm_move_generators
+    _warm_move_generators = enabled
+
+
+class DictionaryIndex:
+    """Lazily built derived structures for one version of a language's dictionary."""
+
+    def __init__(self, language: str, dictionary: Iterable[str], version: int,
+                 previous: Optional["DictionaryIndex"] = None, deferred: bool = False):
+        self.language = language
+        self.dictionary = dictionary
+        self.version = version
+        # Serves structures until this version's own are built
+        self.previous = previous
+        # A short-lived version (a word-edit overlay) that serves the previous
+        # version's structures instead of building its own
+        self.deferred = deferred
+        self._lock = threading.Lock()
+        # Separate from _lock, which is held for the whole of a build
+        self._warm_lock = threading.Lock()
+        self._warming = False
+        self._pattern_index: Optional[WordPatternIndex] = None
+        self._move_generator: Optional[MoveGenerator] = None
+
+    def _fallback(self, attribute: str):
+        """The previous version's built structure, scheduling this version's build."""
+        previous = self.previous
+        built = getattr(previous, attribute) if previous is not None else None
+        if built is not None:
+            self.warm_in_background()
+        return built
+
+    def warm_in_background(self) -> None:
+        """Build the structures the previous version had built, off the request path.
+
+        A first version builds its pattern index, and its move generator only in
+        processes that opted in (warm_move_generators).
+        """
+        if self.deferred:
+            return
+        with self._warm_lock:
+            if self._warming:
+                return
+            self._warming = True
+        _build_executor.submit(self._warm)
+
+    def build_deferred(self) -> None:
+        """Stop deferring: this version is staying, so build its own structures."""
+        self.deferred = False
+        self.warm_in_background()
+
+    def _warm(self) -> None:
+        try:
+            previous = self.previous
+            if previous is None or previous._pattern_index is not None:
+                self._build_pattern_index()
+            build_generator = _warm_move_generators if previous is None else previous._move_generator is not None
+            if build_generator:
+                self._build_move_generator()
+            logger.info(f"📚 Dictionary index for '{self.language}' version {self.version} is ready")
+        except Exception as e:
+            logger.error(f"❌ Failed to build dictionary index for '{self.language}' version {self.version}: {e}")
+        finally:
+            self.previous = None
+
+    @property
+    def pattern_index(self) -> WordPatternIndex:
+        if self._pattern_index is None:
+            fallback = self._fallback("_pattern_index")
+            if fallback is not None:
+                return fallback
+            self._build_pattern_index()
+        return self._pattern_index
+
+    def _build_pattern_index(self) -> None:
+        with self._lock:
+            if self._pattern_index is None:
+                self._pattern_index = WordPatternIndex(self.dictionary)
+
+    @property
+    def words_by_length(self) -> Dict[int, List[str]]:
+        """Dictionary words bucketed by length (sorted), shared with the pattern index."""
+        return self.pattern_index.words_by_length
+
+    @property
+    def move_generator(self) -> MoveGenerator:
+        if self._move_generator is None:
+            fallback = self._fallback("_move_generator")
+            if fallback is not None:
+                return fallback
+            self._build_move_generator()
+        return self._move_generator
+
+    def _build_move_generator(self) -> None:
+        with self._lock:
+            if self._move_generator is None:
+                self._move_generator = MoveGenerator(self.dictionary, self.language)
+
+    def stats(self) -> Dict:
+        return {
+            "language": self.language,
+            "version": self.version,
+            "words": len(self.dictionary) if hasattr(self.dictionary, "__len__") else None,
+            "pattern_index_built": self._pattern_index is not None,
+            "move_generator_built": self._move_generator is not None,
+            "serving_previous_version": self.previous.version if self.previous is not None else None,
+        }
+
+
+_INDEXES: Dict[str, List[DictionaryIndex]] = {}
+_VERSIONS: Dict[str, int] = {}
+_registry_lock = threading.Lock()
+
+
+def _find_index(language: str, dictionary: Iterable[str]) -> Optional[DictionaryIndex]:
+    for index in reversed(_INDEXES.get(language, ())):
+        if index.dictionary is dictionary:
+            return index
+    return None
+
+
+def get_dictionary_index(language: str, dictionary: Iterable[str],
+                         version: Optional[int] = None, deferred: bool = False) -> DictionaryIndex:
+    """Get the shared index for a language, starting a new version if the dictionary changed.
+
+    version is the dictionary's own version number when it has one (hot-reloaded
+    dictionaries); otherwise versions are counted per process. A deferred version
+    builds nothing of its own (see DictionaryIndex.deferred).
+    """
+    index = _find_index(language, dictionary)
+    if index is not None:
+        return index
+    with _registry_lock:
+        index = _find_index(language, dictionary)
+        if index is None:
+            retained = _INDEXES.setdefault(language, [])
+            _VERSIONS[language] = version if version is not None else _VERSIONS.get(language, 0) + 1
+            previous = retained[-1] if retained else None
+            while previous is not None and previous.deferred and previous.previous is not None:
+                previous = previous.previous  # Fall back to structures that were actually built
+            index = DictionaryIndex(language, dictionary, _VERSIONS[language], previous, deferred)
+            retained.append(index)
+            del retained[:-RETAINED_VERSIONS]
+            logger.info(f"📚 New dictionary index for '{language}' (version {index.version})")
+        return index
+
+
+def clear_dictionary_indexes(language: Optional[str] = None) -> None:
+    """Drop shared indexes so the next use rebuilds them."""
+    with _registry_lock:
+        if language:
+            _INDEXES.pop(language, None)
+        else:
+            _INDEXES.clear()
+
+
+def get_dictionary_index_stats() -> Dict[str, Dict]:
+    return {language: indexes[-1].stats() for language, indexes in _INDEXES.items() if indexes}
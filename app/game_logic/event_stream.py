@@ -0,0 +1,173 @@
+"""
+Resumable game event streams.
+
+Turn events (game_update and computer_move deltas) carry a sequence number,
+"seq", which is the turn the event completed - the same number the move log
+stores on the event's moves row. A client that reconnects to a game socket
+with since_seq=<last seq it applied> gets only the events it missed:
+
+    1. from GameEventLog, the recent events this worker delivered for the game,
+    2. else rebuilt from the moves table, while the gap is within
+       GAME_EVENT_REPLAY_LIMIT turns,
+    3. else a game_snapshot.
+
+A replay ends with a replay_complete message carrying the game's current
+state_version, so the client's version check picks up from there.
+"""
+
+import json
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import GAME_EVENT_LOG_GAMES, GAME_EVENT_LOG_SIZE, GAME_EVENT_REPLAY_LIMIT
+from app.game_logic.move_log import MoveEvent
+from app.game_logic.state_codec import decode_state
+from app.models import Game, Move
+from app.utils.game_helpers import get_game_snapshot
+
+# (seq, message JSON) pairs, in the order they are to be sent
+StreamMessages = List[Tuple[Optional[int], str]]
+
+
+def _dumps(message: Dict[str, Any]) -> str:
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+def message_seq(message_json: str) -> Optional[int]:
+    """The seq of a serialized event, None for events outside the turn sequence (chat, game_started)."""
+    if '"seq":' not in message_json:
+        return None
+    try:
+        seq = json.loads(message_json).get("seq")
+    except (ValueError, AttributeError):
+        return None
+    return seq if isinstance(seq, int) else None
+
+
+class GameEventLog:
+    """Ring buffer of each game's most recent sequenced events, for the games this worker has seen."""
+
+    def __init__(self, events_per_game: int = GAME_EVENT_LOG_SIZE, max_games: int = GAME_EVENT_LOG_GAMES):
+        self.events_per_game = events_per_game
+        self.max_games = max_games
+        self._games: "OrderedDict[str, deque]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, game_id: str, message_json: str) -> None:
+        """Keep an event delivered for a game if it is part of the turn sequence."""
+        seq = message_seq(message_json)
+        if seq is None:
+            return
+        with self._lock:
+            events = self._games.pop(game_id, None)
+            if events is None:
+                events = deque(maxlen=self.events_per_game)
+            if events and seq <= events[-1][0]:
+                events.clear()  # Out of order (e.g. the game was replayed or restarted); start over
+            events.append((seq, message_json))
+            self._games[game_id] = events
+            while len(self._games) > self.max_games:
+                self._games.popitem(last=False)
+
+    def since(self, game_id: str, since_seq: int, current_seq: int) -> Optional[StreamMessages]:
+        """The events after since_seq up to current_seq, or None unless all of them are buffered."""
+        with self._lock:
+            events = list(self._games.get(game_id, ()))
+        missed = [(seq, text) for seq, text in events if since_seq < seq <= current_seq]
+        if [seq for seq, _ in missed] != list(range(since_seq + 1, current_seq + 1)):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return missed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._games.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "games": len(self._games),
+            "events_per_game": self.events_per_game,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+# Global log for this worker, fed by ConnectionManager.deliver_to_game
+game_event_log = GameEventLog()
+
+
+def event_from_move(game_id: str, event: MoveEvent) -> Dict[str, Any]:
+    """A replayed turn event rebuilt from its moves row (versions are not stored there)."""
+    message = {
+        "type": "game_update",
+        "game_id": game_id,
+        "seq": event.turn_number,
+        "replayed": True,
+        "action": event.type,
+        "player_id": event.player_id,
+        "score_changes": {event.player_id: event.score_after},
+        "current_player_id": event.next_player_id,
+        "letter_bag_count": event.letter_bag_count,
+        "turn_number": event.turn_number,
+        "consecutive_passes": event.consecutive_passes
+    }
+    if event.tiles:
+        message.update(tiles=event.tiles, points=event.points, words=event.words)
+    if event.exchanged_count:
+        message["exchange_count"] = event.exchanged_count
+    return message
+
+
+def _current_seq(game: Game) -> int:
+    if game.turn_number is not None:
+        return game.turn_number
+    return decode_state(game.state).get("turn_number", 0)
+
+
+def _replay_from_moves(db: Session, game: Game, since_seq: int, current_seq: int) -> Optional[StreamMessages]:
+    moves = (
+        db.query(Move)
+        .filter(Move.game_id == game.id, Move.turn_number > since_seq, Move.turn_number <= current_seq)
+        .order_by(Move.turn_number)
+        .all()
+    )
+    events = [event for event in (MoveEvent.from_move(move) for move in moves) if event is not None]
+    if [event.turn_number for event in events] != list(range(since_seq + 1, current_seq + 1)):
+        return None  # Turns from before the move log, or a gap
+    return [(event.turn_number, _dumps(event_from_move(game.id, event))) for event in events]
+
+
+def resume_messages(db: Session, game_id: str, since_seq: int) -> StreamMessages:
+    """What a client that last applied since_seq needs to catch up: the missed events, or a snapshot."""
+    game = db.query(Game).filter(Game.id == game_id).first()
+    if game is None:
+        return []
+    current_seq = _current_seq(game)
+
+    missed: Optional[StreamMessages] = []
+    if since_seq < current_seq:
+        missed = None
+        if 0 <= since_seq and current_seq - since_seq <= GAME_EVENT_REPLAY_LIMIT:
+            missed = game_event_log.since(game_id, since_seq, current_seq)
+            if missed is None:
+                missed = _replay_from_moves(db, game, since_seq, current_seq)
+    elif since_seq > current_seq:
+        missed = None  # The client is ahead of the server's state (another game, or a reset)
+
+    if missed is None:
+        snapshot = get_game_snapshot(game_id, db)
+        return [(current_seq, _dumps(snapshot))]
+
+    return missed + [(current_seq, _dumps({
+        "type": "replay_complete",
+        "game_id": game_id,
+        "seq": current_seq,
+        "state_version": game.state_version,
+        "replayed": len(missed)
+    }))]
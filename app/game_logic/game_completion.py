@@ -2,11 +2,11 @@ from typing import List, Dict, Tuple, Optional
 from sqlalchemy.orm import Session
 from app.models import Game, Player, Move
 from app.config import GAME_INACTIVE_DAYS
-import json
 from datetime import datetime, timezone, timedelta
 from app.models.game import GameStatus
 from app.game_logic.game_state import GameState, GamePhase
-from app.routers.games import GameStateEncoder
+from app.game_logic.state_codec import encode_state, decode_state
+from app.game_logic.state_version import commit_game_state
 
 def check_game_completion(game: Game, game_state: GameState) -> bool:
     """Check if the game should be completed and update its status if so."""
@@ -17,10 +17,10 @@ def check_game_completion(game: Game, game_state: GameState) -> bool:
         game.status = GameStatus.COMPLETED
         
         # Update game state
-        state_data = json.loads(game.state)
+        state_data = decode_state(game.state)
         state_data["phase"] = GamePhase.COMPLETED.value
         state_data["completion_data"] = completion_data
-        game.state = json.dumps(state_data, cls=GameStateEncoder)
+        game.state = encode_state(state_data)
         
         return True
     
@@ -64,15 +64,15 @@ def finalize_game(game_id: str, db: Session) -> Dict:
     game = db.query(Game).filter(Game.id == game_id).first()
     if game:
         # Store completion data in the game state
-        board = json.loads(game.state)
-        game_state = {
-            "board": board,
+        game_state = decode_state(game.state)
+        game_state.update({
+            "phase": GamePhase.COMPLETED.value,
             "completed": True,
             "completion_data": completion_data,
             "completed_at": datetime.now(timezone.utc).isoformat()
-        }
-        game.state = json.dumps(game_state)
+        })
+        game.state = encode_state(game_state)
         game.current_player_id = None  # No current player in completed game
-        db.commit()
+        commit_game_state(db, game)
     
     return completion_data
\ No newline at end of file
@@ -4,11 +4,12 @@ from enum import Enum
 from .letter_bag import create_letter_bag, draw_letters, return_letters, create_rack, LETTER_DISTRIBUTION
 from app.game_logic.board_utils import BOARD_MULTIPLIERS
 from app.game_logic.full_points import calculate_full_move_points
+from app.game_logic.cross_checks import CrossCheckBoard
+from app.game_logic.dictionary_index import DictionaryIndex, get_dictionary_index
 import logging
 import json
 import random
 import uuid
-import re
 
 logger = logging.getLogger(__name__)
 
@@ -70,9 +71,11 @@ class GameState:
         self.center_used = False
         # Add caching for pattern validation
         self._pattern_cache: Dict[str, bool] = {}
-        self._compiled_patterns: Dict[str, re.Pattern] = {}
-        # Dictionary index by word length for faster lookups
-        self._dictionary_by_length: Optional[Dict[int, Set[str]]] = None
+        # Shared per-language dictionary structures (length buckets, pattern index)
+        self._dictionary_index: Optional[DictionaryIndex] = None
+        # Per-square cross-check bitmasks, built lazily and updated after each placement
+        self._cross_checks: Optional[CrossCheckBoard] = None
+        self._cross_checks_board: Optional[List[List]] = None
 
     def add_player(self, player_id: int) -> str:
         """Add a player to the game and return their initial rack."""
@@ -123,6 +126,11 @@ class GameState:
                 col_letter = chr(65 + pos.col)
                 return False, f"Cannot place tile '{tile.letter}' at position ({pos.row + 1}, {col_letter}) - there is already a '{existing_tile.letter}' tile there.", []
 
+        # Reject invalid cross-words with one bitmask test per tile before building any words
+        invalid_cross_word = self._find_invalid_cross_word(word_positions, dictionary)
+        if invalid_cross_word:
+            return False, f"'{invalid_cross_word}' is not a valid word in the dictionary.", []
+
         # Validate all formed words with optimized blank tile handling
         all_words_patterns = self._get_all_formed_words(word_positions)
         if not all_words_patterns:
@@ -735,6 +743,38 @@ class GameState:
         """Update the board with new tiles."""
         for pos, tile in move_data:
             self.board[pos.row][pos.col] = tile
+        if self._cross_checks is not None and self._cross_checks_board is self.board:
+            self._cross_checks.place((pos.row, pos.col, tile.letter) for pos, tile in move_data)
+
+    def _get_cross_checks(self, dictionary: Set[str]) -> CrossCheckBoard:
+        """Get the cross-check masks for the current board, rebuilding if the board or dictionary was replaced."""
+        if (self._cross_checks is None or
+                self._cross_checks.dictionary is not dictionary or
+                self._cross_checks_board is not self.board):
+            self._cross_checks = CrossCheckBoard(self.board, dictionary, self.language)
+            self._cross_checks_board = self.board
+        return self._cross_checks
+
+    def _find_invalid_cross_word(self, word_positions: List[Tuple[Position, PlacedTile]], dictionary: Set[str]) -> Optional[str]:
+        """Return the first cross-word rejected by the cross-check masks, if any.
+
+        Only the perpendicular words of each tile are covered; the main word and tiles
+        the masks can't decide (unresolved blanks) are left to the full word check.
+        """
+        cross_checks = self._get_cross_checks(dictionary)
+        if len(word_positions) == 1:
+            directions = (True, False)
+        else:
+            directions = (word_positions[0][0].row == word_positions[1][0].row,)
+
+        for pos, tile in word_positions:
+            for horizontal in directions:
+                if cross_checks.allows(pos.row, pos.col, tile.letter, horizontal) is False:
+                    board_copy = [row[:] for row in self.board]
+                    board_copy[pos.row][pos.col] = tile
+                    words = self._find_words_at_position(pos.row, pos.col, board_copy, not horizontal)
+                    return words[0] if words else tile.letter.upper()
+        return None
 
     def check_game_end(self) -> Tuple[bool, Optional[Dict]]:
         """Check if the game has ended and return final scores with winner information."""
@@ -835,21 +875,20 @@ class GameState:
         
         return final_scores
 
-    def _get_dictionary_by_length(self, dictionary: Set[str]) -> Dict[int, Set[str]]:
-        """Create or get a dictionary indexed by word length for faster lookups."""
-        if self._dictionary_by_length is None:
-            self._dictionary_by_length = {}
-            for word in dictionary:
-                length = len(word)
-                if length not in self._dictionary_by_length:
-                    self._dictionary_by_length[length] = set()
-                self._dictionary_by_length[length].add(word)
-        return self._dictionary_by_length
+    def _get_dictionary_index(self, dictionary: Set[str]) -> DictionaryIndex:
+        """Get the process-wide derived structures for this game's dictionary."""
+        if self._dictionary_index is None or self._dictionary_index.dictionary is not dictionary:
+            self._dictionary_index = get_dictionary_index(self.language, dictionary)
+        return self._dictionary_index
+
+    def _get_dictionary_by_length(self, dictionary: Set[str]) -> Dict[int, List[str]]:
+        """Get the dictionary indexed by word length (shared across GameState instances)."""
+        return self._get_dictionary_index(dictionary).words_by_length
 
     def _is_valid_word_pattern(self, word_pattern: str, dictionary: Set[str]) -> bool:
         """Check if a word pattern with potential blank tiles ('?') can form any valid word.
         
-        Optimized version using regex patterns and caching for much better performance.
+        Blank patterns are answered by the shared positional pattern index for the language.
         """
         if '?' not in word_pattern:
             # No blank tiles, direct dictionary lookup
@@ -860,65 +899,20 @@ class GameState:
         if cache_key in self._pattern_cache:
             return self._pattern_cache[cache_key]
         
-        pattern_upper = word_pattern.upper()
-        
-        # Get words of the same length only (major optimization)
-        dictionary_by_length = self._get_dictionary_by_length(dictionary)
-        words_of_length = dictionary_by_length.get(len(pattern_upper), set())
-        
-        if not words_of_length:
-            self._pattern_cache[cache_key] = False
-            return False
-        
-        # Create regex pattern for fast matching
-        regex_pattern = self._get_or_create_regex_pattern(pattern_upper)
-        
-        # Find matching words using compiled regex on subset
-        found_match = False
-        for word in words_of_length:
-            if regex_pattern.match(word):
-                found_match = True
-                break  # Early termination - just need one match
+        found_match = self._get_dictionary_index(dictionary).pattern_index.has_match(cache_key)
         
         # Cache the result
         self._pattern_cache[cache_key] = found_match
         return found_match
     
-    def _get_or_create_regex_pattern(self, pattern: str) -> re.Pattern:
-        """Get or create a compiled regex pattern for the given word pattern."""
-        if pattern not in self._compiled_patterns:
-            # Convert '?' to regex pattern that matches any letter
-            regex_str = pattern.replace('?', '[A-Z]')
-            regex_str = f'^{regex_str}$'  # Exact match
-            self._compiled_patterns[pattern] = re.compile(regex_str)
-        
-        return self._compiled_patterns[pattern]
-    
     def _resolve_word_pattern(self, word_pattern: str, dictionary: Set[str]) -> str:
-        """Find the actual word that a pattern with '?' would form (for display purposes).
-        
-        Optimized version using regex patterns.
-        """
+        """Find the actual word that a pattern with '?' would form (for display purposes)."""
         if '?' not in word_pattern:
             return word_pattern.upper()
         
         pattern_upper = word_pattern.upper()
-        
-        # Get words of the same length only
-        dictionary_by_length = self._get_dictionary_by_length(dictionary)
-        words_of_length = dictionary_by_length.get(len(pattern_upper), set())
-        
-        if not words_of_length:
-            return pattern_upper
-        
-        regex_pattern = self._get_or_create_regex_pattern(pattern_upper)
-        
-        # Find first matching word
-        for word in words_of_length:
-            if regex_pattern.match(word):
-                return word
-        
-        return pattern_upper  # Fallback (shouldn't happen if validation passed)
+        match = self._get_dictionary_index(dictionary).pattern_index.first_match(pattern_upper)
+        return match or pattern_upper  # Fallback (shouldn't happen if validation passed)
 
     def _clear_validation_caches(self) -> None:
         """Clear validation caches to manage memory usage.
@@ -926,5 +920,6 @@ class GameState:
         Call this periodically if memory usage becomes a concern.
         """
         self._pattern_cache.clear()
-        self._compiled_patterns.clear()
-        self._dictionary_by_length = None 
\ No newline at end of file
+        self._dictionary_index = None
+        self._cross_checks = None
+        self._cross_checks_board = None 
\ No newline at end of file
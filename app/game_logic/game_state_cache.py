@@ -0,0 +1,168 @@
+"""
+Per-worker cache of live GameState objects.
+
+Rebuilding a GameState for every turn means decoding games.state, building
+PlacedTile objects for the board and a copy of the letter bag. Active games keep their GameState in
+this worker instead, keyed by game id and tagged with the games.state_version
+it corresponds to. A request only uses the cached object while the version still
+matches the row it just read: any write from another worker or endpoint bumps
+the version, and the next turn here rebuilds from the database.
+
+A turn checks the state out of the cache, mutates it in place and checks it back
+in with the version its commit produced. A turn that fails validation, raises
+or loses the version race never checks it back in, so a half-applied move is
+never served to the next request.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from app.config import GAME_STATE_CACHE_SIZE
+from app.game_logic.game_state import GameState, GamePhase, PlacedTile
+from app.game_logic.state_codec import decode_state, encode_state
+
+logger = logging.getLogger(__name__)
+
+
+def detect_center_used_from_board(board):
+    """Helper function to detect if center has been used by checking if there's a tile at position (7,7)."""
+    if not board or len(board) < 8 or len(board[7]) < 8:
+        return False
+    return board[7][7] is not None
+
+
+def reconstruct_board_from_json(board_data):
+    """Helper function to reconstruct board with proper PlacedTile objects from JSON data."""
+    if not board_data:
+        return [[None]*15 for _ in range(15)]
+
+    reconstructed_board = []
+    for row in board_data:
+        reconstructed_row = []
+        for cell in row:
+            if cell is None:
+                reconstructed_row.append(None)
+            else:
+                # Reconstruct PlacedTile object from JSON dict
+                tile = PlacedTile(
+                    letter=cell["letter"],
+                    is_blank=cell.get("is_blank", False),
+                    tile_id=cell.get("tile_id")  # Preserve existing tile_id or None (will auto-generate)
+                )
+                reconstructed_row.append(tile)
+        reconstructed_board.append(reconstructed_row)
+    return reconstructed_board
+
+
+def load_game_state(game) -> GameState:
+    """Rebuild a game's GameState from games.state (racks and scores are not included)."""
+    return game_state_from_text(game.state, game.language)
+
+
+def game_state_from_text(state_text: str, language: str) -> GameState:
+    """Rebuild a GameState from stored games.state text (racks and scores are not included)."""
+    # Position-based tile ids, so tiles from compact states don't each get a uuid4
+    persisted_state_data = decode_state(state_text, include_tile_ids=True)
+    game_state = GameState(language=language)
+    game_state.board = reconstruct_board_from_json(persisted_state_data.get("board"))
+    game_state.phase = GamePhase(persisted_state_data.get("phase", GamePhase.IN_PROGRESS.value))
+
+    letter_bag_data = persisted_state_data.get("letter_bag", [])
+    if isinstance(letter_bag_data, dict) and "letters" in letter_bag_data:
+        # If it was serialized as a LetterBag object with letters attribute
+        game_state.letter_bag = letter_bag_data["letters"]
+    else:
+        game_state.letter_bag = letter_bag_data
+
+    game_state.turn_number = persisted_state_data.get("turn_number", 0)
+    game_state.consecutive_passes = persisted_state_data.get("consecutive_passes", 0)
+    if "center_used" in persisted_state_data:
+        game_state.center_used = persisted_state_data["center_used"]
+    else:
+        # Fallback for existing games: detect if center is used by checking the board
+        game_state.center_used = detect_center_used_from_board(game_state.board)
+    return game_state
+
+
+def serialize_game_state(game_state: GameState, completion_data: Optional[Dict] = None) -> str:
+    """The games.state text for a GameState (racks and scores live in the players rows)."""
+    return encode_state({
+        "board": game_state.board,
+        "phase": game_state.phase.value,
+        "language": game_state.language,
+        "letter_bag": game_state.letter_bag,
+        "turn_number": game_state.turn_number,
+        "consecutive_passes": game_state.consecutive_passes,
+        "center_used": game_state.center_used,
+        "completion_data": completion_data
+    })
+
+
+class GameStateCache:
+    """LRU of live GameState objects keyed by game id and validated by games.state_version."""
+
+    def __init__(self, max_size: int = GAME_STATE_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[int, GameState]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def checkout(self, game, players: Iterable[Any]) -> GameState:
+        """Take a game's GameState for one turn: the cached object if current, else rebuilt.
+
+        Racks and scores always come from the players rows the caller loaded.
+        """
+        with self._lock:
+            entry = self._entries.pop(game.id, None)
+
+        if entry is not None and entry[0] == game.state_version:
+            self.hits += 1
+            game_state = entry[1]
+        else:
+            self.misses += 1
+            game_state = load_game_state(game)
+
+        game_state.current_player_id = game.current_player_id
+        game_state.players = {}
+        game_state.scores = {}
+        for player in players:
+            game_state.players[player.user_id] = player.rack
+            game_state.scores[player.user_id] = player.score
+        return game_state
+
+    def checkin(self, game_id: str, game_state: GameState, state_version: int) -> None:
+        """Keep a game's GameState after a committed turn that produced state_version."""
+        if game_state.phase == GamePhase.COMPLETED:
+            return
+        with self._lock:
+            self._entries[game_id] = (state_version, game_state)
+            self._entries.move_to_end(game_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, game_id: str) -> None:
+        with self._lock:
+            self._entries.pop(game_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "games": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None
+        }
+
+
+# Global cache for this worker
+game_state_cache = GameStateCache()
@@ -0,0 +1,586 @@
+"""
+Move generation for the computer player.
+
+Builds a minimized DAWG (directed acyclic word graph) over the game dictionary
+and enumerates every legal placement for a rack using the anchor / cross-check
+algorithm (Appel & Jacobson). Rows are scanned directly, columns are scanned on
+the transposed board, so a single routine handles both directions.
+"""
+
+from typing import List, Dict, Set, Tuple, Optional, Iterable
+from dataclasses import dataclass
+import logging
+import time
+
+from app.game_logic.letter_bag import LETTER_DISTRIBUTION
+from app.game_logic.board_utils import BOARD_MULTIPLIERS
+from app.game_logic.cross_checks import CrossCheckBoard, cell_letter, letter_bits
+
+logger = logging.getLogger(__name__)
+
+BOARD_SIZE = 15
+CENTER = 7
+BLANK_LETTERS = ("?", "*")
+BINGO_BONUS = 50
+RACK_SIZE = 7
+# Search steps between clock reads when a deadline is set (a power of two minus one)
+DEADLINE_CHECK_INTERVAL = 255
+
+
+class _SearchTimeout(Exception):
+    """Raised inside the search when its deadline passes."""
+
+
+class DawgNode:
+    """A DAWG node. Nodes are shared between words after minimization."""
+
+    __slots__ = ("edges", "final", "letter_mask")
+
+    def __init__(self):
+        self.edges: Dict[str, "DawgNode"] = {}
+        self.final = False
+        # Bits of the letters on edges, set by the MoveGenerator that owns the DAWG
+        self.letter_mask = 0
+
+
+class Dawg:
+    """Minimized word graph built incrementally from sorted words (Daciuk et al.)."""
+
+    def __init__(self, words: Iterable[str]):
+        self.root = DawgNode()
+        self.word_count = 0
+        self.node_count = 1
+        self._register: Dict[tuple, DawgNode] = {}
+        self._unchecked: List[Tuple[DawgNode, str, DawgNode]] = []
+        self._previous_word = ""
+
+        for word in sorted(set(words)):
+            self._insert(word)
+        self._minimize(0)
+
+        # Only needed while building
+        self._register = {}
+        self._unchecked = []
+
+    def _insert(self, word: str) -> None:
+        common_prefix = 0
+        for a, b in zip(word, self._previous_word):
+            if a != b:
+                break
+            common_prefix += 1
+
+        self._minimize(common_prefix)
+
+        node = self._unchecked[-1][2] if self._unchecked else self.root
+        for letter in word[common_prefix:]:
+            child = DawgNode()
+            node.edges[letter] = child
+            self._unchecked.append((node, letter, child))
+            node = child
+        node.final = True
+
+        self._previous_word = word
+        self.word_count += 1
+
+    def _minimize(self, down_to: int) -> None:
+        while len(self._unchecked) > down_to:
+            parent, letter, child = self._unchecked.pop()
+            signature = (child.final, tuple(sorted((l, id(n)) for l, n in child.edges.items())))
+            existing = self._register.get(signature)
+            if existing is not None:
+                parent.edges[letter] = existing
+            else:
+                self._register[signature] = child
+                self.node_count += 1
+
+    def __contains__(self, word: str) -> bool:
+        node = self.root
+        for letter in word:
+            node = node.edges.get(letter)
+            if node is None:
+                return False
+        return node.final
+
+
+@dataclass(slots=True)
+class GeneratedMove:
+    """A legal placement found by the move generator."""
+    word: str
+    tiles: List[Tuple[int, int, str, bool]]  # (row, col, letter, is_blank)
+    score: int
+    start: Tuple[int, int]
+    direction: str  # "horizontal" or "vertical"
+
+    def tile_dicts(self) -> List[Dict]:
+        return [
+            {"row": row, "col": col, "letter": letter, "is_blank": is_blank}
+            for row, col, letter, is_blank in self.tiles
+        ]
+
+    def to_dict(self) -> Dict:
+        return {
+            "type": "place",
+            "word": self.word,
+            "tiles": self.tile_dicts(),
+            "score": self.score,
+            "start_pos": self.start,
+            "direction": self.direction,
+        }
+
+
+def _build_factor_tables() -> Tuple[List[List[int]], List[List[int]]]:
+    letter_factors = [[1] * BOARD_SIZE for _ in range(BOARD_SIZE)]
+    word_factors = [[1] * BOARD_SIZE for _ in range(BOARD_SIZE)]
+    for (row, col), multiplier in BOARD_MULTIPLIERS.items():
+        if multiplier == "BL":
+            letter_factors[row][col] = 2
+        elif multiplier == "BW":
+            letter_factors[row][col] = 3
+        elif multiplier == "WL":
+            word_factors[row][col] = 2
+        elif multiplier == "WW":
+            word_factors[row][col] = 3
+    return letter_factors, word_factors
+
+
+LETTER_FACTORS, WORD_FACTORS = _build_factor_tables()
+
+
+class MoveGenerator:
+    """Enumerates legal placements for a rack against a dictionary DAWG."""
+
+    def __init__(self, words: Iterable[str], language: str = "en"):
+        start_time = time.time()
+        self.language = language
+        distribution = LETTER_DISTRIBUTION.get(language, LETTER_DISTRIBUTION["en"])
+        self.letter_points = distribution["points"]
+        self.alphabet = frozenset(l for l in distribution["frequency"] if l not in BLANK_LETTERS)
+        self.bits = letter_bits(language)
+
+        playable = (
+            w for w in (word.strip().upper() for word in words)
+            if 2 <= len(w) <= BOARD_SIZE and set(w) <= self.alphabet
+        )
+        self.dawg = Dawg(playable)
+        self._set_letter_masks()
+
+        logger.info(
+            f"🧩 Move generator for '{language}' built in {time.time() - start_time:.2f}s: "
+            f"{self.dawg.word_count} words, {self.dawg.node_count} nodes"
+        )
+
+    def _set_letter_masks(self) -> None:
+        """Give every node the bitmask of its edge letters, to prune squares none of them fit."""
+        bits = self.bits
+        seen = set()
+        stack = [self.dawg.root]
+        while stack:
+            node = stack.pop()
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            mask = 0
+            for letter, child in node.edges.items():
+                mask |= bits[letter]
+                stack.append(child)
+            node.letter_mask = mask
+
+    def generate_moves(self, board: List[List], rack: str,
+                       cross_checks: Optional[CrossCheckBoard] = None) -> List[GeneratedMove]:
+        """Return every legal placement for the rack, best score first.
+
+        cross_checks may carry precomputed masks for the same board (e.g. kept by a
+        GameState); otherwise they are derived from the DAWG for the rows in play.
+        """
+        return self.search(board, rack, cross_checks)[0]
+
+    def search(self, board: List[List], rack: str, cross_checks: Optional[CrossCheckBoard] = None,
+               deadline: Optional[float] = None, max_tiles: int = RACK_SIZE) -> Tuple[List[GeneratedMove], bool]:
+        """Generate placements until done or until deadline (a time.perf_counter() value).
+
+        Returns (moves best score first, complete). With a deadline the lines with the
+        most anchors are searched first, both directions interleaved, so an interrupted
+        search has covered the busiest parts of the board. An interrupted search may
+        have found nothing; a search with a small max_tiles (placements of at most that
+        many rack tiles) is a cheap fallback then.
+        """
+        letters = self._normalize_board(board)
+        rack_counts: Dict[str, int] = {"?": 0}
+        for letter in rack.upper():
+            key = "?" if letter in BLANK_LETTERS else letter
+            rack_counts[key] = rack_counts.get(key, 0) + 1
+
+        board_empty = all(l is None for row in letters for l in row)
+
+        across = cross_checks.across if cross_checks is not None else None
+        down = [list(col) for col in zip(*cross_checks.down)] if cross_checks is not None else None
+
+        directions = [(letters, False, across)]
+        if not board_empty:
+            transposed = [list(col) for col in zip(*letters)]
+            directions.append((transposed, True, down))
+
+        lines = []
+        for grid, is_transposed, masks in directions:
+            for row in range(BOARD_SIZE):
+                anchors = self._anchors(grid, row, board_empty)
+                if anchors:
+                    lines.append((grid, row, self._left_limits(grid[row], anchors), is_transposed,
+                                  masks[row] if masks else None))
+        if deadline is not None:
+            lines.sort(key=lambda line: len(line[2]), reverse=True)
+        raw_moves: List[tuple] = []
+        complete = True
+        try:
+            # Rack prefixes are the same left of every anchor, so they are spelled once per search
+            left_parts = self._left_parts(rack_counts, min(max_tiles - 1, max(
+                (limit for _, _, anchors, _, _ in lines for _, limit in anchors if limit is not None), default=0
+            )), deadline)
+            for grid, row, anchors, is_transposed, masks in lines:
+                if deadline is not None and time.perf_counter() > deadline:
+                    raise _SearchTimeout()
+                self._generate_line(grid, row, anchors, rack_counts, left_parts, is_transposed,
+                                    masks, raw_moves, deadline, max_tiles)
+        except _SearchTimeout:
+            complete = False
+        if board_empty:
+            # The board is symmetric along its diagonal, so opening moves mirror exactly
+            raw_moves += [(score, start, word, placed, True) for score, start, word, placed, _ in raw_moves]
+
+        # A single tile is found along both its row and its column, and board blanks can
+        # spell the same placement as different words; everything else is found once
+        board_blanks = any(l in BLANK_LETTERS for row in letters for l in row if l is not None)
+        best: Dict[tuple, tuple] = {}
+        unique = []
+        for raw in raw_moves:
+            score, (line, start_col), word, placed, is_transposed = raw
+            if len(placed) == 1:
+                col, letter, _ = placed[0]
+                key = ((col, line) if is_transposed else (line, col), letter)
+            elif board_blanks:
+                key = (is_transposed, line, tuple((col, letter) for col, letter, _ in placed))
+            else:
+                unique.append(raw)
+                continue
+            current = best.get(key)
+            if current is None or current[0] < score:
+                best[key] = raw
+        unique.extend(best.values())
+
+        moves = []
+        for score, (line, start_col), word, placed, is_transposed in unique:
+            if is_transposed:
+                tiles = [(col, line, letter, is_blank) for col, letter, is_blank in placed]
+                start = (start_col, line)
+            else:
+                tiles = [(line, col, letter, is_blank) for col, letter, is_blank in placed]
+                start = (line, start_col)
+            moves.append(GeneratedMove(word, tiles, score, start, "vertical" if is_transposed else "horizontal"))
+        moves.sort(key=lambda m: m.score, reverse=True)
+        return moves, complete
+
+    def best_move(self, board: List[List], rack: str,
+                  cross_checks: Optional[CrossCheckBoard] = None) -> Optional[GeneratedMove]:
+        moves = self.generate_moves(board, rack, cross_checks)
+        return moves[0] if moves else None
+
+    def _normalize_board(self, board: List[List]) -> List[List[Optional[str]]]:
+        letters = [[None] * BOARD_SIZE for _ in range(BOARD_SIZE)]
+        for r, row in enumerate(board[:BOARD_SIZE]):
+            for c, cell in enumerate(row[:BOARD_SIZE]):
+                letters[r][c] = cell_letter(cell)[0]
+        return letters
+
+    def _cross_checks(self, grid, row: int, masks: Optional[List[Optional[int]]] = None) -> List[int]:
+        """For each square in the row, the bitmask of letters the perpendicular word allows.
+
+        Precomputed masks are used when given for every square; otherwise they are derived from the DAWG.
+        """
+        all_letters = (1 << len(self.bits)) - 1
+        if masks is not None and None not in masks:
+            return list(masks)
+        allowed = [all_letters] * BOARD_SIZE
+        bits = self.bits
+
+        for col in range(BOARD_SIZE):
+            if grid[row][col] is not None:
+                continue
+            above_start = row
+            while above_start > 0 and grid[above_start - 1][col] is not None:
+                above_start -= 1
+            below_end = row
+            while below_end < BOARD_SIZE - 1 and grid[below_end + 1][col] is not None:
+                below_end += 1
+            if above_start == row and below_end == row:
+                continue
+
+            prefix = [grid[r][col] for r in range(above_start, row)]
+            suffix = [grid[r][col] for r in range(row + 1, below_end + 1)]
+            mask = 0
+            for node in self._walk(self.dawg.root, prefix):
+                for letter, child in node.edges.items():
+                    bit = bits[letter]
+                    if not mask & bit and any(n.final for n in self._walk(child, suffix)):
+                        mask |= bit
+            allowed[col] = mask
+
+        return allowed
+
+    @staticmethod
+    def _walk(node: DawgNode, letters: List[str]) -> List[DawgNode]:
+        """Follow letters from node; an unresolved blank ('?') on the board matches any edge."""
+        nodes = [node]
+        for letter in letters:
+            next_nodes = []
+            for n in nodes:
+                if letter in BLANK_LETTERS:
+                    next_nodes.extend(n.edges.values())
+                else:
+                    child = n.edges.get(letter)
+                    if child is not None:
+                        next_nodes.append(child)
+            if not next_nodes:
+                return []
+            nodes = next_nodes
+        return nodes
+
+    def _prefix_paths(self, prefix: List[str]) -> List[Tuple[List[str], DawgNode]]:
+        """DAWG positions reachable by the tiles left of an anchor, resolving board blanks."""
+        paths = [([], self.dawg.root)]
+        for letter in prefix:
+            next_paths = []
+            for path, node in paths:
+                if letter in BLANK_LETTERS:
+                    next_paths.extend((path + [l], child) for l, child in node.edges.items())
+                else:
+                    child = node.edges.get(letter)
+                    if child is not None:
+                        next_paths.append((path + [letter], child))
+            paths = next_paths
+        return paths
+
+    @staticmethod
+    def _anchors(grid, row: int, board_empty: bool) -> List[int]:
+        """Empty squares of the row next to a tile (only the centre on an empty board)."""
+        if board_empty:
+            return [CENTER] if row == CENTER else []
+        line = grid[row]
+        return [
+            col for col in range(BOARD_SIZE)
+            if line[col] is None and (
+                (col > 0 and line[col - 1] is not None) or
+                (col < BOARD_SIZE - 1 and line[col + 1] is not None) or
+                (row > 0 and grid[row - 1][col] is not None) or
+                (row < BOARD_SIZE - 1 and grid[row + 1][col] is not None)
+            )
+        ]
+
+    @staticmethod
+    def _left_limits(line: List[Optional[str]], anchors: List[int]) -> List[Tuple[int, Optional[int]]]:
+        """Pair each anchor with how many rack tiles may go left of it, or None when board tiles are there.
+
+        Left parts stop at the previous anchor, whose own search covers placements reaching further.
+        """
+        anchor_set = set(anchors)
+        limits = []
+        for anchor in anchors:
+            if anchor > 0 and line[anchor - 1] is not None:
+                limits.append((anchor, None))
+                continue
+            limit = 0
+            col = anchor - 1
+            while col >= 0 and line[col] is None and col not in anchor_set:
+                limit += 1
+                col -= 1
+            limits.append((anchor, min(limit, RACK_SIZE - 1)))
+        return limits
+
+    def _left_parts(self, rack_counts: Dict[str, int], limit: int,
+                    deadline: Optional[float] = None) -> List[List[tuple]]:
+        """Every DAWG prefix the rack can spell, by length up to limit, as (word, node, tiles).
+
+        tiles is a tuple of (letter, is_blank). A blank only stands in for letters the
+        rack has run out of, as in the search itself. Raises _SearchTimeout once
+        deadline passes.
+        """
+        parts: List[List[tuple]] = [[] for _ in range(limit + 1)]
+        rack_letters = [l for l in rack_counts if l != "?"]
+        visits = [0]
+
+        def walk(word: str, node: DawgNode, tiles: tuple) -> None:
+            if deadline is not None:
+                visits[0] += 1
+                if not visits[0] & DEADLINE_CHECK_INTERVAL and time.perf_counter() > deadline:
+                    raise _SearchTimeout()
+            parts[len(tiles)].append((word, node, tiles))
+            if len(tiles) == limit:
+                return
+            edges = node.edges
+            if rack_counts["?"] > 0:
+                candidates = edges.items()
+            else:
+                candidates = [(l, edges[l]) for l in rack_letters if rack_counts[l] > 0 and l in edges]
+            for letter, child in candidates:
+                if rack_counts.get(letter, 0) > 0:
+                    rack_counts[letter] -= 1
+                    walk(word + letter, child, tiles + ((letter, False),))
+                    rack_counts[letter] += 1
+                elif rack_counts["?"] > 0:
+                    rack_counts["?"] -= 1
+                    walk(word + letter, child, tiles + ((letter, True),))
+                    rack_counts["?"] += 1
+
+        try:
+            walk("", self.dawg.root, ())
+        finally:
+            walk = None  # Break the recursive closure's reference cycle (see _generate_line)
+        return parts
+
+    def _generate_line(self, grid, row: int, anchors: List[Tuple[int, Optional[int]]], rack_counts: Dict[str, int],
+                       left_parts: List[List[tuple]], transposed: bool, precomputed: Optional[List[Optional[int]]],
+                       results: List[tuple], deadline: Optional[float] = None,
+                       max_tiles: int = RACK_SIZE) -> None:
+        """Append the moves along one row of grid to results, placing at most max_tiles tiles.
+
+        anchors pairs each anchor with its left part limit (see _left_limits), and
+        left_parts holds the rack's prefixes (see _left_parts). Results are raw tuples
+        (score, (row, start_col), word, placed, transposed) where placed is a tuple of
+        (col, letter, is_blank) for the tiles taken from the rack.
+        Raises _SearchTimeout once deadline passes; moves found so far stay in results.
+        """
+        points = self.letter_points
+        bits = self.bits
+        rack_letters = [l for l in rack_counts if l != "?"]
+        line = grid[row]
+        visits = [0]
+
+        allowed = self._cross_checks(grid, row, precomputed)
+        if transposed:
+            letter_factors = [LETTER_FACTORS[c][row] for c in range(BOARD_SIZE)]
+            word_factors = [WORD_FACTORS[c][row] for c in range(BOARD_SIZE)]
+        else:
+            letter_factors = LETTER_FACTORS[row]
+            word_factors = WORD_FACTORS[row]
+        rack_blanks = rack_counts["?"]
+
+        def record(word: str, placed: List[Tuple[int, str, bool]], end_col: int) -> None:
+            # Scored like GameState._calculate_points: only the tiles from the rack count
+            if rack_counts["?"] < rack_blanks:
+                placed = _real_tiles_on_best_squares(placed, letter_factors)
+            score = 0
+            word_multiplier = 1
+            for col, letter, is_blank in placed:
+                if not is_blank:
+                    score += points.get(letter, 0) * letter_factors[col]
+                word_multiplier *= word_factors[col]
+            score *= word_multiplier
+            if len(placed) == RACK_SIZE:
+                score += BINGO_BONUS
+            results.append((score, (row, end_col - len(word)), word, tuple(placed), transposed))
+
+        def extend_right(word: str, node: DawgNode, col: int, anchor: int,
+                         placed: List[Tuple[int, str, bool]]) -> None:
+            if deadline is not None:
+                visits[0] += 1
+                if not visits[0] & DEADLINE_CHECK_INTERVAL and time.perf_counter() > deadline:
+                    raise _SearchTimeout()
+
+            # Follow the tiles already on the board without recursing
+            while col < BOARD_SIZE and line[col] is not None:
+                existing = line[col]
+                if existing in BLANK_LETTERS:
+                    for letter, child in node.edges.items():
+                        extend_right(word + letter, child, col + 1, anchor, placed)
+                    return
+                node = node.edges.get(existing)
+                if node is None:
+                    return
+                word += existing
+                col += 1
+
+            if node.final and col > anchor and placed:
+                record(word, placed, col)
+            if col >= BOARD_SIZE or len(placed) >= max_tiles:
+                return
+
+            constraint = allowed[col] & node.letter_mask
+            if not constraint:
+                return
+            edges = node.edges
+            if rack_counts["?"] > 0:
+                candidates = edges.items()
+            else:
+                candidates = [(l, edges[l]) for l in rack_letters if rack_counts[l] > 0 and l in edges]
+            for letter, child in candidates:
+                if not constraint & bits[letter]:
+                    continue
+                if rack_counts.get(letter, 0) > 0:
+                    rack_counts[letter] -= 1
+                    placed.append((col, letter, False))
+                    extend_right(word + letter, child, col + 1, anchor, placed)
+                    placed.pop()
+                    rack_counts[letter] += 1
+                elif rack_counts["?"] > 0:
+                    # A blank only stands in for letters the rack has run out of;
+                    # record() then puts the real tiles on the better squares
+                    rack_counts["?"] -= 1
+                    placed.append((col, letter, True))
+                    extend_right(word + letter, child, col + 1, anchor, placed)
+                    placed.pop()
+                    rack_counts["?"] += 1
+
+        try:
+            for anchor, limit in anchors:
+                if limit is None:
+                    start = anchor
+                    while start > 0 and line[start - 1] is not None:
+                        start -= 1
+                    for path, node in self._prefix_paths(line[start:anchor]):
+                        extend_right("".join(path), node, anchor, anchor, [])
+                    continue
+                anchor_mask = allowed[anchor]
+                for length in range(min(limit, max_tiles - 1) + 1):
+                    start_col = anchor - length
+                    for word, node, tiles in left_parts[length]:
+                        if not anchor_mask & node.letter_mask:
+                            continue
+                        for letter, is_blank in tiles:
+                            rack_counts["?" if is_blank else letter] -= 1
+                        extend_right(word, node, anchor, anchor,
+                                     [(start_col + i, letter, is_blank) for i, (letter, is_blank) in enumerate(tiles)])
+                        for letter, is_blank in tiles:
+                            rack_counts["?" if is_blank else letter] += 1
+        finally:
+            # extend_right refers to itself, a reference cycle only the garbage collector
+            # would free; clearing it frees the line's search state right away
+            extend_right = None
+
+
+def _real_tiles_on_best_squares(placed: List[Tuple[int, str, bool]],
+                                letter_factors: List[int]) -> List[Tuple[int, str, bool]]:
+    """Where a letter is played both as a blank and from real tiles, move the real tiles to its letter bonus squares."""
+    blank_letters = {letter for _, letter, is_blank in placed if is_blank}
+    if not blank_letters:
+        return placed
+    placed = list(placed)
+    for letter in blank_letters:
+        indexes = [i for i, (_, l, _) in enumerate(placed) if l == letter]
+        real = sum(1 for i in indexes if not placed[i][2])
+        if not real:
+            continue
+        indexes.sort(key=lambda i: letter_factors[placed[i][0]], reverse=True)
+        for rank, i in enumerate(indexes):
+            placed[i] = (placed[i][0], letter, rank >= real)
+    return placed
+
+
+def get_move_generator(language: str, words: Iterable[str]) -> MoveGenerator:
+    """Get or build the move generator for a language, shared through its dictionary index."""
+    # Import here to avoid circular imports
+    from app.game_logic.dictionary_index import get_dictionary_index
+    return get_dictionary_index(language, words).move_generator
+
+
+def clear_move_generator_cache(language: Optional[str] = None) -> None:
+    from app.game_logic.dictionary_index import clear_dictionary_indexes
+    clear_dictionary_indexes(language)
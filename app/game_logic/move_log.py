@@ -0,0 +1,252 @@
+"""
+Append-only move log and turn replay.
+
+Every turn appends one typed move event to the moves table: the move itself
+(tiles, points, words) plus what it left behind (the mover's rack and score,
+consecutive passes, next player), tagged with the turn it completed. The
+event's move_data keeps the keys the move history views read ("type", "data",
+"points", "words", "turn_number", "action"), so older readers are unaffected.
+
+Every GAME_SNAPSHOT_INTERVAL turns, and when a game starts, the full state is
+stored in game_snapshots (games.state encoding plus racks and scores).
+replay_game_state() rebuilds the GameState at any turn from the nearest
+snapshot at or before it plus the events after that. The letter bag is derived
+from the racks: whatever a rack lost beyond the played tiles went back into the
+bag, whatever it gained came out of it.
+
+Games started before the move log have no snapshots and can't be replayed;
+their current state is still available from games.state.
+
+Both paths also keep the game list summary on the games row current (turn,
+bag size, last move), so game lists don't parse games.state or read moves.
+"""
+
+import json
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import GAME_SNAPSHOT_INTERVAL
+from app.game_logic.game_state import GameState, GamePhase, MoveType, PlacedTile
+from app.game_logic.game_state_cache import game_state_from_text, load_game_state
+from app.game_logic.state_codec import decode_state
+from app.models import Game, Move, GameSnapshot
+
+logger = logging.getLogger(__name__)
+
+EVENT_VERSION = 1
+
+
+class TurnNotAvailable(Exception):
+    """The requested turn can't be rebuilt (not played yet, or played before the move log)."""
+
+
+@dataclass
+class MoveEvent:
+    type: str  # MoveType value
+    turn_number: int  # Game turn completed by this move
+    player_id: int
+    rack_after: str
+    score_after: int
+    consecutive_passes: int
+    next_player_id: Optional[int]
+    tiles: List[Dict[str, Any]] = field(default_factory=list)  # [{"row", "col", "letter", "is_blank"}]
+    points: int = 0
+    words: List[str] = field(default_factory=list)
+    exchanged_count: int = 0
+    letter_bag_count: Optional[int] = None  # Tiles left in the bag after the move
+
+    def to_move_data(self) -> str:
+        data = {
+            "v": EVENT_VERSION,
+            "type": self.type,
+            "turn_number": self.turn_number,
+            "data": self.tiles,
+            "points": self.points,
+            "words": self.words,
+            "rack_after": self.rack_after,
+            "score_after": self.score_after,
+            "consecutive_passes": self.consecutive_passes,
+            "next_player_id": self.next_player_id,
+            "letter_bag_count": self.letter_bag_count
+        }
+        if self.type == MoveType.PASS.value:
+            data["action"] = "pass"
+        elif self.type == MoveType.EXCHANGE.value:
+            data["action"] = "exchange"
+            data["letters_exchanged_count"] = self.exchanged_count
+        return json.dumps(data)
+
+    @classmethod
+    def from_move(cls, move: Move) -> Optional["MoveEvent"]:
+        """The event stored in a moves row, or None for moves logged before the move log."""
+        try:
+            data = json.loads(move.move_data) if move.move_data else {}
+        except ValueError:
+            return None
+        if data.get("v") != EVENT_VERSION:
+            return None
+        return cls(
+            type=data["type"],
+            turn_number=data["turn_number"],
+            player_id=move.player_id,
+            rack_after=data["rack_after"],
+            score_after=data["score_after"],
+            consecutive_passes=data["consecutive_passes"],
+            next_player_id=data.get("next_player_id"),
+            tiles=data.get("data", []),
+            points=data.get("points", 0),
+            words=data.get("words", []),
+            exchanged_count=data.get("letters_exchanged_count", 0),
+            letter_bag_count=data.get("letter_bag_count")
+        )
+
+
+def write_snapshot(db: Session, game: Game, turn_number: int, players: Iterable[Any]) -> GameSnapshot:
+    """Store games.state and the current player (as set on the game) with the players' racks and scores."""
+    snapshot = GameSnapshot(
+        game_id=game.id,
+        turn_number=turn_number,
+        current_player_id=game.current_player_id,
+        state=game.state,
+        racks=json.dumps({str(p.user_id): "".join(p.rack or "") for p in players}),
+        scores=json.dumps({str(p.user_id): p.score or 0 for p in players})
+    )
+    db.add(snapshot)
+    return snapshot
+
+
+def start_move_log(db: Session, game: Game, players: Iterable[Any], letter_bag_count: int) -> GameSnapshot:
+    """Record turn 0 of a game that is starting: its snapshot and the initial list summary."""
+    game.turn_number = 0
+    game.consecutive_passes = 0
+    game.letter_bag_count = letter_bag_count
+    return write_snapshot(db, game, 0, players)
+
+
+def append_move(db: Session, game: Game, event: MoveEvent, players: Iterable[Any]) -> Move:
+    """Append a turn's event; every GAME_SNAPSHOT_INTERVAL turns also snapshot the state.
+
+    Call after game.state, the current player and the players rows hold the state after the move.
+    Nothing is committed here: the event and the game's list summary are written with the turn's game update.
+    """
+    move = Move(
+        game_id=game.id,
+        player_id=event.player_id,
+        move_data=event.to_move_data(),
+        turn_number=event.turn_number,
+        timestamp=datetime.now(timezone.utc)
+    )
+    db.add(move)
+
+    game.turn_number = event.turn_number
+    game.consecutive_passes = event.consecutive_passes
+    if event.letter_bag_count is not None:
+        game.letter_bag_count = event.letter_bag_count
+    game.last_move_at = move.timestamp
+    game.last_move_player_id = event.player_id
+    game.last_move_type = event.type
+    game.last_move_points = event.points
+    game.last_words = ",".join(event.words)
+    if GAME_SNAPSHOT_INTERVAL > 0 and event.turn_number % GAME_SNAPSHOT_INTERVAL == 0:
+        write_snapshot(db, game, event.turn_number, players)
+    return move
+
+
+def apply_event(game_state: GameState, event: MoveEvent) -> None:
+    """Advance a replayed GameState by one move event."""
+    rack_before = Counter(game_state.players.get(event.player_id, ""))
+    used = Counter()
+    for tile in event.tiles:
+        row, col = tile["row"], tile["col"]
+        is_blank = tile.get("is_blank", False)
+        game_state.board[row][col] = PlacedTile(tile["letter"], is_blank, f"{row}-{col}")
+        used["?" if is_blank else tile["letter"]] += 1
+        if row == 7 and col == 7:
+            game_state.center_used = True
+
+    # The bag gets back what the rack lost beyond the played tiles and gives up what the rack gained
+    bag = Counter(game_state.letter_bag)
+    bag.update(rack_before)
+    bag.subtract(used)
+    bag.subtract(Counter(event.rack_after))
+    game_state.letter_bag = sorted(bag.elements())
+
+    game_state.players[event.player_id] = event.rack_after
+    game_state.scores[event.player_id] = event.score_after
+    game_state.consecutive_passes = event.consecutive_passes
+    game_state.turn_number = event.turn_number
+    game_state.current_player_id = event.next_player_id
+    game_state.phase = GamePhase.IN_PROGRESS
+
+
+def current_game_state(game: Game) -> GameState:
+    """The game's GameState as stored now, with racks and scores from the players rows (read-only use)."""
+    game_state = load_game_state(game)
+    game_state.current_player_id = game.current_player_id
+    for player in game.players:
+        game_state.players[player.user_id] = player.rack
+        game_state.scores[player.user_id] = player.score
+    return game_state
+
+
+def replay_game_state(db: Session, game: Game, turn_number: int) -> GameState:
+    """The game's GameState after the given turn (0 is the state when the game started).
+
+    Raises TurnNotAvailable when the turn can't be rebuilt.
+    """
+    current_turn = decode_state(game.state).get("turn_number", 0)
+    if turn_number < 0 or turn_number > current_turn:
+        raise TurnNotAvailable(f"Turn {turn_number} has not been played (current turn {current_turn})")
+    if turn_number == current_turn:
+        return current_game_state(game)
+
+    snapshot = (
+        db.query(GameSnapshot)
+        .filter(GameSnapshot.game_id == game.id, GameSnapshot.turn_number <= turn_number)
+        .order_by(GameSnapshot.turn_number.desc())
+        .first()
+    )
+    if snapshot is None:
+        raise TurnNotAvailable(f"Game {game.id} has no move log before turn {turn_number}")
+
+    game_state = game_state_from_text(snapshot.state, game.language)
+    game_state.players = {int(uid): rack for uid, rack in json.loads(snapshot.racks).items()}
+    game_state.scores = {int(uid): score for uid, score in json.loads(snapshot.scores).items()}
+    game_state.current_player_id = snapshot.current_player_id
+    game_state.letter_bag = sorted(game_state.letter_bag)
+
+    moves = (
+        db.query(Move)
+        .filter(Move.game_id == game.id, Move.turn_number > snapshot.turn_number, Move.turn_number <= turn_number)
+        .order_by(Move.turn_number)
+        .all()
+    )
+    events = [event for event in (MoveEvent.from_move(move) for move in moves) if event is not None]
+    if len(events) != turn_number - snapshot.turn_number:
+        raise TurnNotAvailable(f"Move log of game {game.id} is incomplete before turn {turn_number}")
+    for event in events:
+        apply_event(game_state, event)
+    return game_state
+
+
+def turn_state_data(game_state: GameState, rack_user_ids: Optional[Iterable[int]] = None) -> Dict[str, Any]:
+    """Response view of a (replayed) GameState; racks are only included for rack_user_ids (all if None)."""
+    visible = set(game_state.players) if rack_user_ids is None else set(rack_user_ids)
+    return {
+        "turn_number": game_state.turn_number,
+        "phase": game_state.phase.value,
+        "current_player_id": game_state.current_player_id,
+        "consecutive_passes": game_state.consecutive_passes,
+        "board": [
+            [{"letter": tile.letter, "is_blank": tile.is_blank} if tile else None for tile in row]
+            for row in game_state.board
+        ],
+        "letter_bag_count": len(game_state.letter_bag),
+        "scores": dict(game_state.scores),
+        "racks": {uid: list(rack) for uid, rack in game_state.players.items() if uid in visible}
+    }
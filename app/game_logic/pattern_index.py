@@ -0,0 +1,99 @@
+"""
+Positional word index for blank-tile ('?') patterns.
+
+Words are bucketed by length. For every (length, position, letter) the index
+keeps a bitset (a Python int) of the words in that bucket with that letter at
+that position. A pattern such as "H?U?" is answered by AND-ing the bitsets of
+its fixed letters; the lowest set bit is the first matching word. This replaces
+regex scans over every word of the same length.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+WILDCARDS = ("?", "*")
+
+
+class WordPatternIndex:
+    """Answers wildcard queries over a dictionary with bitset intersections."""
+
+    def __init__(self, words: Iterable[str]):
+        start_time = time.time()
+
+        by_length: Dict[int, List[str]] = {}
+        for word in words:
+            by_length.setdefault(len(word), []).append(word)
+        for bucket in by_length.values():
+            bucket.sort()
+        self.words_by_length = by_length
+
+        self._bitsets: Dict[Tuple[int, int, str], int] = {}
+        self._all: Dict[int, int] = {}
+        for length, bucket in by_length.items():
+            self._all[length] = (1 << len(bucket)) - 1
+            # Collect bits in byte arrays first; OR-ing into growing ints would be quadratic
+            byte_count = (len(bucket) + 7) // 8
+            buffers: Dict[Tuple[int, str], bytearray] = {}
+            for i, word in enumerate(bucket):
+                byte_index, bit = i >> 3, 1 << (i & 7)
+                for position, letter in enumerate(word):
+                    buffer = buffers.get((position, letter))
+                    if buffer is None:
+                        buffer = buffers[(position, letter)] = bytearray(byte_count)
+                    buffer[byte_index] |= bit
+            for (position, letter), buffer in buffers.items():
+                self._bitsets[(length, position, letter)] = int.from_bytes(buffer, "little")
+
+        logger.info(
+            f"🔎 Pattern index built in {time.time() - start_time:.2f}s: "
+            f"{sum(len(b) for b in by_length.values())} words, {len(self._bitsets)} bitsets"
+        )
+
+    def _match_bits(self, pattern: str) -> int:
+        length = len(pattern)
+        bits = self._all.get(length, 0)
+        for position, letter in enumerate(pattern):
+            if not bits:
+                break
+            if letter not in WILDCARDS:
+                bits &= self._bitsets.get((length, position, letter), 0)
+        return bits
+
+    def has_match(self, pattern: str) -> bool:
+        """Whether any word matches the pattern ('?' matches any single letter)."""
+        return self._match_bits(pattern.upper()) != 0
+
+    def first_match(self, pattern: str) -> Optional[str]:
+        """The alphabetically first word matching the pattern, or None."""
+        pattern = pattern.upper()
+        bits = self._match_bits(pattern)
+        if not bits:
+            return None
+        return self.words_by_length[len(pattern)][(bits & -bits).bit_length() - 1]
+
+    def matches(self, pattern: str) -> List[str]:
+        """All words matching the pattern, in alphabetical order."""
+        pattern = pattern.upper()
+        bits = self._match_bits(pattern)
+        bucket = self.words_by_length.get(len(pattern), [])
+        result = []
+        while bits:
+            lowest = bits & -bits
+            result.append(bucket[lowest.bit_length() - 1])
+            bits ^= lowest
+        return result
+
+
+def get_pattern_index(language: str, dictionary: Iterable[str]) -> WordPatternIndex:
+    """Get or build the pattern index for a language, shared through its dictionary index."""
+    # Import here to avoid circular imports
+    from app.game_logic.dictionary_index import get_dictionary_index
+    return get_dictionary_index(language, dictionary).pattern_index
+
+
+def clear_pattern_index_cache(language: Optional[str] = None) -> None:
+    from app.game_logic.dictionary_index import clear_dictionary_indexes
+    clear_dictionary_indexes(language)
@@ -0,0 +1,234 @@
+"""
+Compact encoding of games.state.
+
+The state used to be stored as JSON: a 15x15 array of {"letter", "is_blank",
+"tile_id"} objects, the whole shuffled letter bag, the board multipliers and
+rack/score snapshots, several KB rewritten on every turn. It is now a small
+versioned binary record, base64-encoded because games.state is a text column:
+
+    magic "WBS" | format version | flags | phase | turn number (uint16)
+    | consecutive passes | language (2 ASCII bytes)
+    | board: 225 letter codes (0 = empty) | blank bitmap (29 bytes)
+    | letter bag: one count per ALPHABET letter | extras (UTF-8 JSON, optional)
+
+Letter codes index ALPHABET. Tile UUIDs are not stored: tiles never move once
+placed, so callers that want ids get position-based ones. The multipliers are
+the fixed board layout and the snapshots duplicate the players table, so
+neither is stored. The bag is stored as letter counts and reshuffled on
+decode; draws stay uniformly random. Uncommon keys (completion data, forfeit
+details, ...) go into the extras JSON, so nothing written to the state is lost.
+
+decode_state() reads both this format and the legacy JSON and returns the
+familiar dict shape, so read paths are unchanged. Rows are migrated lazily: the
+next write of a legacy row stores it compactly (scripts/migrate_game_state_encoding.py
+converts the rest in bulk). A state the format can't represent (unknown letter,
+malformed board) is written as JSON instead.
+"""
+
+import base64
+import binascii
+import json
+import random
+import struct
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.game_logic.board_utils import BOARD_MULTIPLIERS
+from app.game_logic.game_state import GamePhase, MoveType, Position, PlacedTile
+
+FORMAT_VERSION = 1
+MAGIC = b"WBS"
+BOARD_SIZE = 15
+BOARD_CELLS = BOARD_SIZE * BOARD_SIZE
+BLANK_BITMAP_SIZE = (BOARD_CELLS + 7) // 8
+# Append-only: a letter's code is its index + 1, and stored states depend on it
+ALPHABET = "?ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÜÑ"
+LETTER_CODES = {letter: code for code, letter in enumerate(ALPHABET, start=1)}
+PHASES = ("not_started", "in_progress", "completed")
+
+HEADER = struct.Struct("<3sBBBHB2s")
+FLAG_CENTER_USED = 1
+FLAG_TEST_MODE = 2
+FLAG_BOARD = 4
+FLAG_LETTER_BAG = 8
+FLAG_EXTRAS = 16
+
+# Keys held in the fixed fields, and derived keys that are not stored at all
+ENCODED_KEYS = {"board", "phase", "language", "letter_bag", "turn_number", "consecutive_passes", "center_used", "test_mode"}
+DROPPED_KEYS = {"multipliers", "player_racks_snapshot", "player_scores_snapshot"}
+
+MULTIPLIERS = {f"{row},{col}": value for (row, col), value in BOARD_MULTIPLIERS.items()}
+
+
+class GameStateEncoder(json.JSONEncoder):
+    def default(self, obj):
+        if isinstance(obj, datetime):
+            return obj.isoformat()
+        elif isinstance(obj, (GamePhase, MoveType)):
+            return obj.value
+        elif isinstance(obj, Position):
+            return {"row": obj.row, "col": obj.col}
+        elif isinstance(obj, PlacedTile):
+            return {"letter": obj.letter, "is_blank": obj.is_blank, "tile_id": obj.tile_id}
+        elif isinstance(obj, set):
+            return list(obj)
+        return super().default(obj)
+
+
+class _NotEncodable(Exception):
+    pass
+
+
+def _cell_letter(cell) -> Optional[tuple]:
+    if cell is None:
+        return None
+    if isinstance(cell, dict):
+        return cell.get("letter"), bool(cell.get("is_blank", False))
+    return cell.letter, bool(cell.is_blank)  # PlacedTile
+
+
+def _encode_board(board) -> bytes:
+    if not isinstance(board, list) or len(board) != BOARD_SIZE:
+        raise _NotEncodable("board is not 15x15")
+    codes = bytearray(BOARD_CELLS)
+    blanks = 0
+    for row, cells in enumerate(board):
+        if not isinstance(cells, list) or len(cells) != BOARD_SIZE:
+            raise _NotEncodable("board is not 15x15")
+        for col, cell in enumerate(cells):
+            tile = _cell_letter(cell)
+            if tile is None:
+                continue
+            code = LETTER_CODES.get(tile[0])
+            if code is None:
+                raise _NotEncodable(f"letter {tile[0]!r} is not in the alphabet")
+            index = row * BOARD_SIZE + col
+            codes[index] = code
+            if tile[1]:
+                blanks |= 1 << index
+    return bytes(codes) + blanks.to_bytes(BLANK_BITMAP_SIZE, "little")
+
+
+def _encode_bag(letter_bag) -> bytes:
+    if isinstance(letter_bag, dict) and "letters" in letter_bag:
+        letter_bag = letter_bag["letters"]
+    counts = bytearray(len(ALPHABET))
+    for letter in letter_bag:
+        code = LETTER_CODES.get(letter)
+        if code is None or counts[code - 1] == 255:
+            raise _NotEncodable(f"letter bag entry {letter!r} can't be encoded")
+        counts[code - 1] += 1
+    return bytes(counts)
+
+
+def encode_state(state_data: Dict[str, Any]) -> str:
+    """The games.state text for a state dict (board cells may be dicts or PlacedTile objects)."""
+    try:
+        return _encode_compact(state_data)
+    except _NotEncodable:
+        return json.dumps(state_data, cls=GameStateEncoder)
+
+
+def _encode_compact(state_data: Dict[str, Any]) -> str:
+    language = (state_data.get("language") or "").encode("ascii", "replace")
+    turn_number = state_data.get("turn_number", 0) or 0
+    consecutive_passes = state_data.get("consecutive_passes", 0) or 0
+    phase = state_data.get("phase")
+    if isinstance(phase, GamePhase):
+        phase = phase.value
+    if len(language) not in (0, 2) or not 0 <= turn_number <= 0xFFFF or not 0 <= consecutive_passes <= 0xFF:
+        raise _NotEncodable("header field out of range")
+    if phase is not None and phase not in PHASES:
+        raise _NotEncodable(f"unknown phase {phase!r}")
+
+    flags = 0
+    board = state_data.get("board")
+    body = bytearray()
+    if board is not None:
+        flags |= FLAG_BOARD
+        body += _encode_board(board)
+        center_used = state_data.get("center_used")
+        if center_used is None:
+            center_used = board[7][7] is not None
+        if center_used:
+            flags |= FLAG_CENTER_USED
+    elif state_data.get("center_used"):
+        flags |= FLAG_CENTER_USED
+    if state_data.get("letter_bag") is not None:
+        flags |= FLAG_LETTER_BAG
+        body += _encode_bag(state_data["letter_bag"])
+    if state_data.get("test_mode"):
+        flags |= FLAG_TEST_MODE
+
+    extras = {
+        key: value for key, value in state_data.items()
+        if value is not None and key not in ENCODED_KEYS and key not in DROPPED_KEYS
+    }
+    if extras:
+        flags |= FLAG_EXTRAS
+        body += json.dumps(extras, cls=GameStateEncoder, separators=(",", ":")).encode("utf-8")
+
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, flags,
+        PHASES.index(phase) + 1 if phase is not None else 0,
+        turn_number, consecutive_passes, language.ljust(2, b"\0")
+    )
+    return base64.b64encode(header + bytes(body)).decode("ascii")
+
+
+def is_compact(state_text: Optional[str]) -> bool:
+    """Whether a stored state is already in the compact format."""
+    return bool(state_text) and not state_text.lstrip().startswith(("{", "[", "null"))
+
+
+def decode_state(state_text: Optional[str], include_tile_ids: bool = False) -> Dict[str, Any]:
+    """The state dict for stored games.state text, compact or legacy JSON.
+
+    Compact boards carry no tile ids; include_tile_ids adds stable position-based ones.
+    """
+    if not state_text:
+        return {}
+    if not is_compact(state_text):
+        return json.loads(state_text) or {}
+
+    try:
+        data = base64.b64decode(state_text, validate=True)
+    except (binascii.Error, ValueError) as e:
+        raise ValueError(f"Unreadable game state: {e}")
+    magic, version, flags, phase, turn_number, consecutive_passes, language = HEADER.unpack_from(data)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError(f"Unknown game state format {magic!r} v{version}")
+
+    state: Dict[str, Any] = {}
+    offset = HEADER.size
+    if flags & FLAG_BOARD:
+        codes = data[offset:offset + BOARD_CELLS]
+        blanks = int.from_bytes(data[offset + BOARD_CELLS:offset + BOARD_CELLS + BLANK_BITMAP_SIZE], "little")
+        offset += BOARD_CELLS + BLANK_BITMAP_SIZE
+        board: List[List[Optional[Dict[str, Any]]]] = [[None] * BOARD_SIZE for _ in range(BOARD_SIZE)]
+        for index, code in enumerate(codes):
+            if code:
+                row, col = divmod(index, BOARD_SIZE)
+                cell = {"letter": ALPHABET[code - 1], "is_blank": bool(blanks >> index & 1)}
+                if include_tile_ids:
+                    cell["tile_id"] = f"{row}-{col}"
+                board[row][col] = cell
+        state["board"] = board
+        state["multipliers"] = MULTIPLIERS
+    if phase:
+        state["phase"] = PHASES[phase - 1]
+    if language.strip(b"\0"):
+        state["language"] = language.strip(b"\0").decode("ascii")
+    if flags & FLAG_LETTER_BAG:
+        counts = data[offset:offset + len(ALPHABET)]
+        offset += len(ALPHABET)
+        letter_bag = [letter for letter, count in zip(ALPHABET, counts) for _ in range(count)]
+        random.shuffle(letter_bag)
+        state["letter_bag"] = letter_bag
+    state["turn_number"] = turn_number
+    state["consecutive_passes"] = consecutive_passes
+    state["center_used"] = bool(flags & FLAG_CENTER_USED)
+    state["test_mode"] = bool(flags & FLAG_TEST_MODE)
+    if flags & FLAG_EXTRAS:
+        state.update(json.loads(data[offset:].decode("utf-8")))
+    return state
@@ -0,0 +1,65 @@
+"""
+Optimistic concurrency for game writes.
+
+games.state_version is the Game mapper's version_id_col: every UPDATE of a game
+row is issued as UPDATE games ... WHERE id = ? AND state_version = ? and bumps
+the version, so a write based on an outdated read matches no row and is rolled
+back instead of overwriting the other request's turn. No row locks are held.
+
+Clients may also send the state_version they last saw with a state-changing
+request. A request made against an older version is rejected before it does any
+work, so a retried move that already went through can't be applied twice.
+Either way the API answers with GameStateConflict (409, GAME_STATE_CONFLICT)
+carrying the current version.
+"""
+
+import logging
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.models.game import Game
+
+logger = logging.getLogger(__name__)
+
+
+class GameStateConflict(HTTPException):
+    """A state-changing request was based on an outdated version of the game."""
+
+    error_code = "GAME_STATE_CONFLICT"
+
+    def __init__(self, game_id: str, current_version: Optional[int], expected_version: Optional[int] = None):
+        super().__init__(
+            status_code=409,
+            detail="Game was changed by another request. Reload the game and try again."
+        )
+        self.game_id = game_id
+        self.current_version = current_version
+        self.expected_version = expected_version
+
+
+def check_state_version(game: Game, expected_version: Optional[int]) -> None:
+    """Reject the request if the client acted on a version other than the current one."""
+    if expected_version is not None and expected_version != game.state_version:
+        raise GameStateConflict(game.id, game.state_version, expected_version)
+
+
+def commit_game_state(db: Session, game: Game) -> int:
+    """Commit a game write conditionally on the version it was read with.
+
+    Returns the new state_version; raises GameStateConflict if another request
+    wrote the game first (nothing of this request is committed then).
+    """
+    game_id, expected_version = game.id, game.state_version
+    try:
+        db.flush()
+        state_version = game.state_version
+        db.commit()
+    except StaleDataError:
+        db.rollback()
+        current_version = db.query(Game.state_version).filter(Game.id == game_id).scalar()
+        logger.warning(f"⚠️ Concurrent update of game {game_id} rejected (read version {expected_version}, now {current_version})")
+        raise GameStateConflict(game_id, current_version, expected_version)
+    return state_version
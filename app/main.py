@@ -2,7 +2,7 @@ from fastapi import FastAPI, Request, Depends, WebSocket, WebSocketDisconnect, Q
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from app.routers import users, games, moves, rack, profile, admin, auth, chat, game_setup, config, feedback, websocket_routes, analytics
-from app.config import CORS_ORIGINS, RATE_LIMIT, SECRET_KEY, ALGORITHM
+from app.config import CORS_ORIGINS, RATE_LIMIT, SECRET_KEY, ALGORITHM, DICTIONARY_VERSION_POLL_SECONDS
 import time
 import os
 import logging
@@ -13,10 +13,14 @@ from jose import jwt
 from contextlib import asynccontextmanager
 import asyncio
 from collections import defaultdict
+from typing import Optional
 from sqlalchemy import text, inspect
-from app.database_manager import check_database_status, ensure_user_columns
+from app.database_manager import check_database_status, ensure_user_columns, ensure_game_columns
 from app.middleware.performance import PerformanceMiddleware, monitor
 from app.utils.cache import cache
+from app.game_logic.state_version import GameStateConflict
+from sqlalchemy.orm.exc import StaleDataError
+from app.game_logic.state_codec import decode_state
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -39,6 +43,7 @@ async def lifespan(app: FastAPI):
     
     try:
         ensure_user_columns()
+        ensure_game_columns()
         await ensure_default_admin_exists()
         
         status = check_database_status()
@@ -50,10 +55,27 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Database status check failed: {e}")
     
+    dictionary_poller = asyncio.create_task(poll_dictionary_versions_background())
+    
+    # Start the move search workers now so they preload while the service warms up
+    from app.computer_move_pool import computer_move_pool
+    if os.environ.get("TESTING") != "1":
+        computer_move_pool.start()
+    
+    # Subscribe to events from the other instances (PUBSUB_BACKEND)
+    from app.pubsub import event_bus
+    try:
+        await event_bus.start()
+    except Exception as e:
+        logger.error(f"Event bus failed to start, WebSocket events stay on this instance: {e}")
+    
     yield
     
     # Shutdown
     print("🛑 WordBattle Backend shutting down...")
+    dictionary_poller.cancel()
+    computer_move_pool.shutdown()
+    await event_bus.stop()
     print(f"📊 Performance Summary:")
     if response_times:
         avg_response = sum(response_times) / len(response_times)
@@ -146,6 +168,29 @@ async def http_exception_handler(request: Request, exc: HTTPException):
         }
     )
 
+@app.exception_handler(GameStateConflict)
+async def game_state_conflict_handler(request: Request, exc: GameStateConflict):
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={
+            "success": False,
+            "error": exc.detail,
+            "error_code": exc.error_code,
+            "game_id": exc.game_id,
+            "state_version": exc.current_version,
+            "expected_state_version": exc.expected_version,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "request_id": request.headers.get("X-Request-ID", "")
+        }
+    )
+
+@app.exception_handler(StaleDataError)
+async def stale_data_handler(request: Request, exc: StaleDataError):
+    # A versioned row (games.state_version) was written concurrently by a path that
+    # commits directly instead of through commit_game_state: answer with the same 409
+    logger.warning(f"⚠️ Concurrent update rejected on {request.url.path}: {exc}")
+    return await game_state_conflict_handler(request, GameStateConflict(request.path_params.get("game_id"), None))
+
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
@@ -202,8 +247,9 @@ async def startup_event():
     # Only check if database exists, don't load words during startup
     try:
         # Ensure user preference columns exist (fallback)
-        from app.database_manager import ensure_user_columns
+        from app.database_manager import ensure_user_columns, ensure_game_columns
         ensure_user_columns()
+        ensure_game_columns()
         
         # Always ensure jan@binge.de exists as admin user
         await ensure_default_admin_exists()
@@ -260,6 +306,9 @@ async def ensure_default_admin_exists():
                 logger.info(f"✅ Created computer player user (ID: {computer_user.id})")
             else:
                 logger.info(f"✅ Computer player user already exists (ID: {computer_user.id})")
+            
+            from app.utils.system_users import refresh_system_users
+            refresh_system_users(db)
         finally:
             db.close()
             
@@ -299,8 +348,26 @@ async def initialize_words_background():
     except Exception as e:
         logger.error(f"Error in background word initialization: {e}")
 
+async def poll_dictionary_versions_background():
+    """Pick up dictionary edits made on other workers; reloads happen off the request path."""
+    from app.utils.wordlist_utils import poll_dictionary_versions
+    
+    loop = asyncio.get_event_loop()
+    while True:
+        await asyncio.sleep(DICTIONARY_VERSION_POLL_SECONDS)
+        try:
+            await loop.run_in_executor(None, poll_dictionary_versions)
+        except Exception as e:
+            logger.warning(f"⚠️ Dictionary version poll failed: {e}")
+
 async def initialize_computer_player_background():
-    """Initialize computer player in the background."""
+    """Initialize computer player in the background, when searches run in this process."""
+    from app.computer_move_pool import computer_move_pool
+    if computer_move_pool.workers > 0 and os.environ.get("TESTING") != "1":
+        # The pool's worker processes preload their own move generators
+        logger.info("🧠 Computer moves run in the move search workers - skipping in-process initialization")
+        return
+    
     try:
         logger.info("🚀 Starting computer player initialization...")
         
@@ -308,17 +375,20 @@ async def initialize_computer_player_background():
         from app.optimized_computer_player import initialize_optimized_computer_player
         
         # Load wordlist for computer player initialization
-        wordlist = load_wordlist("de")  # Start with German
+        language = "de"  # Start with German
+        wordlist = load_wordlist(language)
         if not wordlist:
             logger.warning("⚠️ No German wordlist available, trying English...")
-            wordlist = load_wordlist("en")
+            language = "en"
+            wordlist = load_wordlist(language)
         
         if wordlist:
             logger.info(f"🎯 Initializing computer player with {len(wordlist)} words...")
-            # Initialize in a thread to avoid blocking
+            # Initialize in a thread to avoid blocking. The cached wordlist object is passed
+            # as-is so the move generator built here is reused by computer moves.
             import asyncio
             loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, initialize_optimized_computer_player, list(wordlist))
+            await loop.run_in_executor(None, initialize_optimized_computer_player, wordlist, language)
             logger.info("✅ Computer player initialization completed successfully!")
         else:
             logger.error("❌ No wordlist available for computer player initialization")
@@ -574,7 +644,8 @@ def read_root():
 async def websocket_endpoint(
     websocket: WebSocket, 
     game_id: str, 
-    token: str = Query(None, description="JWT access token for authentication")
+    token: str = Query(None, description="JWT access token for authentication"),
+    since_seq: Optional[int] = Query(None, description="Last event seq the client applied; resumes the stream from there")
 ):
     """
     WebSocket endpoint for real-time game updates and chat.
@@ -586,9 +657,11 @@ async def websocket_endpoint(
     * Game events (start, end, etc.)
     
     The connection requires authentication via a JWT token and the user must be a participant in the game.
+    Reconnecting clients pass since_seq and receive only the events they missed instead of the full state.
     """
     from app.websocket import manager
-    from app.auth import get_user_from_token
+    from app.routers.websocket_routes import load_game_snapshot, load_resume_messages, load_user_for_token
+    from starlette.concurrency import run_in_threadpool
     from app.database import SessionLocal
     from app.models import Game, ChatMessage
     from datetime import datetime, timezone
@@ -597,12 +670,39 @@ async def websocket_endpoint(
         await websocket.close(code=1008)
         return
     
-    # Get database session
-    db = SessionLocal()
+    # Each database use gets its own short-lived session, run in the threadpool: an
+    # open socket holds no pooled connection while it waits for messages, and the
+    # event loop never waits on the database
+    def load_initial_state():
+        with SessionLocal() as db:
+            game = db.query(Game).filter(Game.id == game_id).first()
+            if not game:
+                return None
+            return {
+                "type": "connection_established",
+                "game_state": {
+                    "game_id": game_id,
+                    "state": decode_state(game.state),
+                    "current_player_id": game.current_player_id
+                }
+            }
+    
+    def save_chat_message(message_text: str):
+        with SessionLocal() as db:
+            chat_message = ChatMessage(
+                game_id=game_id,
+                sender_id=user.id,
+                message=message_text,
+                timestamp=datetime.now(timezone.utc)
+            )
+            db.add(chat_message)
+            db.commit()
+            db.refresh(chat_message)
+            return chat_message.id, chat_message.timestamp
     
     try:
         # Validate token and get user
-        user = get_user_from_token(token, db)
+        user = await run_in_threadpool(load_user_for_token, token)
         if not user:
             await websocket.close(code=1008)
             return
@@ -612,19 +712,15 @@ async def websocket_endpoint(
         
         try:
             # Connect to the game
-            await manager.connect(websocket, game_id, user)
+            await manager.connect(websocket, game_id, user, resuming=since_seq is not None)
             
-            # Send initial game state
-            game = db.query(Game).filter(Game.id == game_id).first()
-            if game:
-                await websocket.send_json({
-                    "type": "connection_established",
-                    "game_state": {
-                        "game_id": game_id,
-                        "state": json.loads(game.state),
-                        "current_player_id": game.current_player_id
-                    }
-                })
+            # Send the missed events, or the initial game state
+            if since_seq is not None:
+                manager.resume(websocket, await run_in_threadpool(load_resume_messages, game_id, since_seq))
+            else:
+                initial_state = await run_in_threadpool(load_initial_state)
+                if initial_state:
+                    manager.send_to_connection(websocket, initial_state)
             
             # Keep connection open and handle messages
             try:
@@ -632,30 +728,26 @@ async def websocket_endpoint(
                     data = await websocket.receive_json()
                     logger.debug(f"Received WebSocket message on game {game_id} from {user.username}: {data}")
                     
-                    if data.get("type") == "chat_message":
+                    if data.get("type") == "snapshot_request":
+                        # The client missed a game_update (version gap): send the full state
+                        manager.send_to_connection(websocket, await run_in_threadpool(load_game_snapshot, game_id))
+                    
+                    elif data.get("type") == "chat_message":
                         message_text = data.get("message", "").strip()
                         if message_text:  # Only process non-empty messages
                             # Store message in database
-                            chat_message = ChatMessage(
-                                game_id=game_id,
-                                sender_id=user.id,
-                                message=message_text,
-                                timestamp=datetime.now(timezone.utc)
-                            )
-                            db.add(chat_message)
-                            db.commit()
-                            db.refresh(chat_message)
+                            message_id, timestamp = await run_in_threadpool(save_chat_message, message_text)
                             
                             # Broadcast to all connected players
                             await manager.broadcast_to_game(
                                 game_id,
                                 {
                                     "type": "chat_message",
-                                    "message_id": chat_message.id,
+                                    "message_id": message_id,
                                     "sender_id": user.id,
                                     "sender_username": user.username,
                                     "message": message_text,
-                                    "timestamp": chat_message.timestamp.isoformat()
+                                    "timestamp": timestamp.isoformat()
                                 }
                             )
             except WebSocketDisconnect:
@@ -667,7 +759,5 @@ async def websocket_endpoint(
     except Exception as e:
         logger.error(f"WebSocket setup error: {e}")
         await websocket.close(code=1008)
-    finally:
-        db.close()
 
 # Performance endpoint moved to admin router
@@ -3,9 +3,10 @@ from app.models.user import User
 from app.models.game import Game, GameStatus
 from app.models.player import Player
 from app.models.move import Move
-from app.models.wordlist import WordList
+from app.models.game_snapshot import GameSnapshot
+from app.models.wordlist import WordList, DictionaryVersion
 from app.models.game_invitation import GameInvitation
 from app.models.chat_message import ChatMessage
 from app.models.feedback import Feedback, FeedbackCategory, FeedbackStatus
 
-__all__ = ['Base', 'User', 'Game', 'GameStatus', 'Player', 'Move', 'WordList', 'GameInvitation', 'ChatMessage', 'Feedback', 'FeedbackCategory', 'FeedbackStatus']
\ No newline at end of file
+__all__ = ['Base', 'User', 'Game', 'GameStatus', 'Player', 'Move', 'GameSnapshot', 'WordList', 'DictionaryVersion', 'GameInvitation', 'ChatMessage', 'Feedback', 'FeedbackCategory', 'FeedbackStatus']
\ No newline at end of file
@@ -26,6 +26,19 @@ class Game(Base):
     started_at = Column(DateTime(timezone=True), nullable=True)
     completed_at = Column(DateTime(timezone=True), nullable=True)
     ended_at = Column(DateTime(timezone=True), nullable=True)  # For forfeit tracking
+    computer_difficulty = Column(String, nullable=True)  # easy, medium, hard; set when a computer player joins
+    state_version = Column(Integer, nullable=False, default=0, server_default="0")  # Bumped on every write
+    
+    # Summary for game lists, maintained by the start and move write paths (NULL for games last written before them)
+    turn_number = Column(Integer, nullable=True)
+    consecutive_passes = Column(Integer, nullable=True)
+    letter_bag_count = Column(Integer, nullable=True)
+    player_count = Column(Integer, nullable=False, default=0, server_default="0")  # Kept in step by Player inserts/deletes
+    last_move_at = Column(DateTime(timezone=True), nullable=True)
+    last_move_player_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    last_move_type = Column(String, nullable=True)  # MoveType value
+    last_move_points = Column(Integer, nullable=True)
+    last_words = Column(String, nullable=True)  # Comma-separated words formed by the last move
     
     # Relationships
     creator = relationship("User", foreign_keys=[creator_id])
@@ -34,3 +47,7 @@ class Game(Base):
     invitations = relationship("GameInvitation", back_populates="game")
     moves = relationship("Move", back_populates="game")
     chat_messages = relationship("ChatMessage", back_populates="game")
+    
+    # Every UPDATE of a game is conditional on the state_version it was read with and bumps it,
+    # so concurrent writers can't overwrite each other (the loser gets a StaleDataError)
+    __mapper_args__ = {"version_id_col": state_version}
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from app.database import Base
 from datetime import datetime, timezone
@@ -25,4 +25,9 @@ class GameInvitation(Base):
     # Relationships
     game = relationship("Game", back_populates="invitations")
     inviter = relationship("User", foreign_keys=[inviter_id])
-    invitee = relationship("User", foreign_keys=[invitee_id]) 
\ No newline at end of file
+    invitee = relationship("User", foreign_keys=[invitee_id]) 
+    
+    __table_args__ = (
+        Index("ix_game_invitations_invitee_id_status", "invitee_id", "status"),  # A user's pending invitations
+        Index("ix_game_invitations_game_id_status", "game_id", "status"),  # A game's invitations
+    )
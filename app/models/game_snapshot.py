@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
+from app.database import Base
+from datetime import datetime, timezone
+
+class GameSnapshot(Base):
+    """Full game state after a turn, stored every GAME_SNAPSHOT_INTERVAL turns for replays."""
+    __tablename__ = "game_snapshots"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    game_id = Column(String, ForeignKey("games.id"), nullable=False)
+    turn_number = Column(Integer, nullable=False)
+    current_player_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    state = Column(String, nullable=False)  # games.state encoding (see state_codec)
+    racks = Column(String, nullable=False)  # JSON {user_id: rack}
+    scores = Column(String, nullable=False)  # JSON {user_id: score}
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    
+    # Relationships
+    game = relationship("Game")
+
+    __table_args__ = (
+        UniqueConstraint("game_id", "turn_number", name="uq_game_snapshots_game_id_turn_number"),
+    )
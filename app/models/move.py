@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -9,7 +9,13 @@ class Move(Base):
     player_id = Column(Integer, ForeignKey("users.id"))
     move_data = Column(String)
     timestamp = Column(DateTime(timezone=True))
+    turn_number = Column(Integer, nullable=True)  # Game turn the move completed; None for moves logged before the move log
     
     # Relationships
     game = relationship("Game", back_populates="moves")
     player = relationship("User", back_populates="moves")
+
+    __table_args__ = (
+        Index("ix_moves_game_id_turn_number", "game_id", "turn_number"),
+        Index("ix_moves_game_id_timestamp", "game_id", timestamp.desc()),  # Latest moves of a game
+    )
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, event
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.models.game import Game
 
 class Player(Base):
     __tablename__ = "players"
@@ -12,3 +13,25 @@ class Player(Base):
 
     user = relationship("User")
     game = relationship("Game")
+
+    __table_args__ = (
+        Index("ix_players_game_id_user_id", "game_id", "user_id"),  # Players of a game, membership checks
+        Index("ix_players_user_id", "user_id"),  # A user's games
+    )
+
+
+# games.player_count follows every player insert and delete, whichever endpoint adds the player.
+# Plain UPDATEs: they don't bump games.state_version, so a concurrent turn isn't rejected by a join.
+def _adjust_player_count(connection, game_id, delta):
+    games = Game.__table__
+    connection.execute(
+        games.update().where(games.c.id == game_id).values(player_count=games.c.player_count + delta)
+    )
+
+@event.listens_for(Player, "after_insert")
+def _count_player_insert(mapper, connection, target):
+    _adjust_player_count(connection, target.game_id, 1)
+
+@event.listens_for(Player, "after_delete")
+def _count_player_delete(mapper, connection, target):
+    _adjust_player_count(connection, target.game_id, -1)
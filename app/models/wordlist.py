@@ -22,4 +22,15 @@ class WordList(Base):
         Index('idx_word_language', word, language),
         Index('idx_added_user', added_user_id),
         Index('idx_added_timestamp', added_timestamp),
-    )
\ No newline at end of file
+    )
+
+class DictionaryVersion(Base):
+    """Per-language version counter, bumped on every wordlist edit.
+
+    Workers poll this table to learn that their in-memory dictionary is stale.
+    """
+    __tablename__ = "dictionary_versions"
+    
+    language = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
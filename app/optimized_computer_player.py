@@ -1,25 +1,79 @@
 """
-Optimized Computer Player with Bubble Sort Word Elimination & Direct Access Object Model
-======================================================================================
+Optimized Computer Player
+=========================
 
-This implementation uses advanced performance optimizations:
-1. BUBBLE SORT ELIMINATION: Fast rejection of impossible words before expensive operations
-2. DIRECT ACCESS OBJECT MODEL: Pre-computed data structures for instant lookups
-3. INDEXED WORD LOOKUP: Words organized by length, starting letters, and rack compatibility
-4. STRATEGIC POSITION CACHING: Board analysis cached and reused
-5. MINIMAL VALIDATION: Only validate promising candidates
+Move selection is done by the DAWG move generator (app.game_logic.move_generator):
+1. DAWG DICTIONARY: Minimized word graph built once per language at startup
+2. ANCHORS & CROSS-CHECKS: Only squares next to existing tiles are tried, with
+   the letters allowed by perpendicular words precomputed per square
+3. ANYTIME SEARCH: Placements (including blanks) are scored exactly until the
+   difficulty's wall-clock budget runs out; the best move found so far is played,
+   or the best short placement if none was found in time
+4. RACK LEAVE: Hard mode also values the tiles kept for the next turn
+5. DIRECT ACCESS OBJECT MODEL: Word index and board analysis helpers for heuristics
 
-Performance Target: <50ms per move vs current 2000ms+
+Performance Target: worst case bounded by the budget (20 / 80 / 250ms)
 """
 
-from typing import List, Dict, Any, Set, Tuple, Optional
+from typing import List, Dict, Any, Set, Tuple, Optional, Iterable
 from dataclasses import dataclass
-from collections import defaultdict
+from collections import Counter, defaultdict
+import random
 import time
 import logging
 
+from app.game_logic.letter_bag import LETTER_DISTRIBUTION
+from app.game_logic.move_generator import GeneratedMove, MoveGenerator, get_move_generator
+
 logger = logging.getLogger(__name__)
 
+# Rack leave heuristic weights (in points)
+LEAVE_BLANK_BONUS = 20
+LEAVE_DUPLICATE_PENALTY = 4
+LEAVE_VOWEL_IMBALANCE_PENALTY = 3
+LEAVE_VOWEL_RATIO = 0.4
+VOWELS = frozenset("AEIOUÄÖÜ")
+
+# Share of the budget the full search gets; the rest is kept for the fallback
+# search of short placements when the full search finds nothing in time
+FULL_SEARCH_SHARE = 0.8
+FALLBACK_MAX_TILES = 2
+
+
+def rack_leave_value(leave: str, language: str = "de", bag_empty: bool = False) -> float:
+    """Estimated worth of the tiles kept after a move.
+
+    Blanks are an asset, expensive letters and duplicates are liabilities, and
+    a leave far from a 40% vowel share is penalized. Once the bag is empty the
+    kept tiles only count against the player at the end of the game.
+    """
+    points = LETTER_DISTRIBUTION.get(language, LETTER_DISTRIBUTION["en"])["points"]
+    if bag_empty:
+        return -sum(points.get(letter, 0) for letter in leave)
+    
+    value = 0.0
+    counts = Counter(leave)
+    for letter, count in counts.items():
+        if letter == "?":
+            value += LEAVE_BLANK_BONUS * count
+            continue
+        value += (2 - points.get(letter, 0)) / 2 * count
+        value -= LEAVE_DUPLICATE_PENALTY * (count - 1)
+    
+    tiles = len(leave) - counts.get("?", 0)
+    if tiles >= 2:
+        vowels = sum(count for letter, count in counts.items() if letter in VOWELS)
+        value -= LEAVE_VOWEL_IMBALANCE_PENALTY * abs(vowels - round(tiles * LEAVE_VOWEL_RATIO))
+    return value
+
+def rack_leave_ceiling(rack: str, language: str = "de") -> float:
+    """An upper bound of rack_leave_value over every leave the rack can produce (bag not empty)."""
+    points = LETTER_DISTRIBUTION.get(language, LETTER_DISTRIBUTION["en"])["points"]
+    return sum(
+        LEAVE_BLANK_BONUS if letter == "?" else max(0.0, (2 - points.get(letter, 0)) / 2)
+        for letter in rack.upper().replace("*", "?")
+    )
+
 @dataclass
 class WordCandidate:
     """Optimized word candidate with pre-computed properties."""
@@ -256,238 +310,99 @@ class OptimizedBoardAnalyzer:
         return 5
 
 class OptimizedComputerPlayer:
-    """Minimal intelligence computer player - always passes (reactivated for testing)."""
+    """Computer player backed by the DAWG move generator."""
     
     def __init__(self, difficulty: str = "medium"):
         self.difficulty = difficulty
         self.word_index: Optional[OptimizedWordIndex] = None
+        self.move_generator: Optional[MoveGenerator] = None
         self.board_analyzer = OptimizedBoardAnalyzer()
         
-        # Performance thresholds by difficulty
+        # Search budget per difficulty: wall-clock milliseconds, how many of the best
+        # moves found easy mode picks from, and whether the rack leave is evaluated
         self.move_limits = {
-            "easy": {"candidates": 5, "positions": 3, "attempts": 10},
-            "medium": {"candidates": 10, "positions": 5, "attempts": 20},
-            "hard": {"candidates": 20, "positions": 8, "attempts": 30}
+            "easy": {"budget_ms": 20, "candidates": 5, "rack_leave": False},
+            "medium": {"budget_ms": 80, "candidates": 1, "rack_leave": False},
+            "hard": {"budget_ms": 250, "candidates": 1, "rack_leave": True}
         }
     
-    def initialize_with_wordlist(self, wordlist: List[str]) -> None:
-        """Initialize the optimized word index (called once during service startup)."""
-        if self.word_index is None:
-            self.word_index = OptimizedWordIndex(wordlist)
-            # Store wordlist as set for fast dictionary validation
-            self._wordlist_set = set(word.upper() for word in wordlist)
-            logger.info(f"🚀 OptimizedComputerPlayer initialized with {len(wordlist)} words for validation")
+    def initialize_with_wordlist(self, wordlist: Iterable[str], language: str = "de") -> None:
+        """Build the move generator for a language (called once during service startup)."""
+        self.move_generator = get_move_generator(language, wordlist)
+        logger.info(f"🚀 OptimizedComputerPlayer initialized for '{language}' with {self.move_generator.dawg.word_count} words")
     
-    def _get_performance_wordlist(self, full_wordlist: List[str]) -> List[str]:
-        """Get a performance-optimized subset of the wordlist for quick play."""
-        # Convert to list if it's a set
-        if not isinstance(full_wordlist, list):
-            full_wordlist = list(full_wordlist)
-        
-        # Smart filtering for performance:
-        # 1. Common word lengths (2-7 letters)
-        # 2. No very rare words
-        # 3. Priority to common letters
-        common_letters = set('AEIOURSTLNDMHCBPFGWYVKJXQZ')
-        
-        performance_words = []
-        for word in full_wordlist:
-            word_upper = word.upper()
-            # Filter criteria for performance
-            if (2 <= len(word_upper) <= 7 and  # Good length range
-                len(set(word_upper) & common_letters) >= len(word_upper) * 0.7):  # Mostly common letters
-                performance_words.append(word_upper)
-                
-                # Limit to 25,000 words for quick initialization
-                if len(performance_words) >= 25000:
-                    break
-        
-        logger.info(f"🎯 Performance wordlist: {len(performance_words)} words from {len(full_wordlist)} total")
-        return performance_words
+    def make_move(self, game_state_data: Dict[str, Any], rack: str, wordlist: Iterable[str],
+                  language: Optional[str] = None, difficulty: Optional[str] = None) -> Dict[str, Any]:
+        """Play the best placement found within the difficulty's time budget, or pass if there is none."""
+        language = language or game_state_data.get("language", "de")
+        difficulty = difficulty if difficulty in self.move_limits else self.difficulty
+        limits = self.move_limits.get(difficulty, self.move_limits["medium"])
+        board = game_state_data.get("board") or [[None] * 15 for _ in range(15)]
+        
+        generator = get_move_generator(language, wordlist)
+        self.move_generator = generator
+        # The budget covers the search only: a cold generator build must not use it up
+        start_time = time.perf_counter()
+        budget = limits["budget_ms"] / 1000
+        moves, complete = generator.search(board, rack, deadline=start_time + budget * FULL_SEARCH_SHARE)
+        if not moves and not complete:
+            # Nothing found in time (e.g. no hits on the busiest lines): short placements are cheap
+            moves, _ = generator.search(board, rack, deadline=start_time + budget, max_tiles=FALLBACK_MAX_TILES)
+        best = self._choose_move(moves, rack, language, limits, self._bag_is_empty(game_state_data))
+        
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        search_note = "" if complete else f", budget {limits['budget_ms']}ms reached"
+        if best is None:
+            logger.info(f"🤖 Computer finds no placement for rack '{rack}' ({elapsed_ms:.1f}ms{search_note}) - passing")
+            return {
+                "type": "pass",
+                "message": "Computer passes (no valid placement)"
+            }
+        
+        logger.info(
+            f"🤖 Computer ({difficulty}) plays '{best.word}' for {best.score} points "
+            f"({elapsed_ms:.1f}ms, {len(moves)} moves searched{search_note})"
+        )
+        return best.to_dict()
     
-    def make_move(self, game_state_data: Dict[str, Any], rack: str, wordlist: List[str]) -> Dict[str, Any]:
-        """Make a move - MINIMAL INTELLIGENCE: Always pass."""
-        rack_letters = list(rack.upper())
-        board = game_state_data.get("board", [[None]*15 for _ in range(15)])
-        
-        logger.info(f"🤖 MinimalComputerPlayer: Always passing (minimal intelligence mode)")
-        logger.info(f"   Rack: {rack_letters}")
-        logger.info(f"   Board has tiles: {any(any(cell is not None for cell in row) for row in board)}")
-        
-        return {
-            "type": "pass", 
-            "message": "Computer passes (minimal intelligence mode - always passes)"
-        }
-    
-    def _try_optimized_placement(self, board: List[List], candidate: WordCandidate, 
-                                start_row: int, start_col: int, direction: str, 
-                                rack_letters: List[str]) -> Optional[Dict[str, Any]]:
-        """Try placing a word with validation for correctness."""
-        word = candidate.word
-        tiles = []
-        rack_copy = rack_letters.copy()
-        
-        # CRITICAL: Validate word is in dictionary first!
-        if not hasattr(self, '_wordlist_set'):
-            logger.warning(f"⚠️ No wordlist available for validation, skipping word: {word}")
-            return None
-        
-        # SPECIAL DETECTION: Only block known problematic patterns
-        if word.upper() in ["ADSTAND", "ISTADSTAND", "ISTSTAND"]:
-            logger.error(f"🚨 CRITICAL: Blocked known invalid word: '{word}'")
-            return None
-        
-        if word.upper() not in self._wordlist_set:
-            logger.error(f"🚫 INVALID WORD REJECTED: '{word}' is NOT in dictionary")
-            # Log some similar words for debugging
-            similar_words = [w for w in list(self._wordlist_set)[:100] if w.startswith(word[:3])][:5]
-            logger.error(f"   Similar words in dictionary: {similar_words}")
-            return None
-        
-        logger.debug(f"✅ MAIN WORD VALIDATED: '{word}' is in dictionary")
-        
-        # Fast connectivity check
-        connected = False
-        
-        # Build tile placement
-        for i, letter in enumerate(word):
-            if direction == "horizontal":
-                row, col = start_row, start_col + i
-            else:
-                row, col = start_row + i, start_col
-            
-            if board[row][col] is None:
-                # Need to place this letter
-                if letter in rack_copy:
-                    rack_copy.remove(letter)
-                elif '?' in rack_copy:  # Use blank
-                    rack_copy.remove('?')
-                elif '*' in rack_copy:  # Alternative blank format
-                    rack_copy.remove('*')
-                else:
-                    logger.warning(f"⚠️ Cannot place '{word}': missing letter '{letter}' from rack")
-                    return None  # Can't place this letter
-                
-                tiles.append({"row": row, "col": col, "letter": letter})
-            else:
-                # Letter must match existing tile
-                cell = board[row][col]
-                if isinstance(cell, dict):
-                    existing_letter = cell.get("letter", cell.get("LETTER", str(cell))).upper()
-                else:
-                    existing_letter = str(cell).upper()
-                
-                if existing_letter != letter:
-                    logger.warning(f"⚠️ Cannot place '{word}': letter mismatch at ({row},{col}), need '{letter}' but found '{existing_letter}'")
-                    return None
-                connected = True  # Connected to existing tile
-        
-        # Check connectivity (at least one tile connects to existing)
-        if not connected and any(any(cell is not None for cell in row) for row in board):
-            # Not first move and no connection
-            logger.warning(f"⚠️ Cannot place '{word}': no connection to existing tiles")
+    def _choose_move(self, moves: List[GeneratedMove], rack: str, language: str,
+                     limits: Dict[str, Any], bag_empty: bool) -> Optional[GeneratedMove]:
+        if not moves:
             return None
-        
-        # Validate all cross-words formed (comprehensive validation)
-        if not self._validate_all_cross_words(board, tiles, direction, start_row, start_col):
-            logger.error(f"🚫 CROSS-WORD VALIDATION FAILED for main word '{word}'")
-            return None
-        
-        logger.info(f"✅ VALID WORD ACCEPTED: '{word}' passed all validation checks")
-        
-        # Calculate simple score (basic implementation)
-        score = len(word) * 2  # Simple scoring
-        
-        return {
-            "word": word,
-            "tiles": tiles,
-            "score": score,
-            "start_pos": (start_row, start_col),
-            "direction": direction
-        }
+        if limits["rack_leave"]:
+            # Moves come best score first, and no leave is worth more than keeping every
+            # asset on the rack, so the scan stops once a move can't catch up
+            ceiling = 0.0 if bag_empty else rack_leave_ceiling(rack, language)
+            best, best_value = None, float("-inf")
+            for move in moves:
+                if move.score + ceiling <= best_value:
+                    break
+                value = move.score + rack_leave_value(self._leave(rack, move), language, bag_empty)
+                if value > best_value:
+                    best, best_value = move, value
+            return best
+        if limits["candidates"] > 1:
+            return random.choice(moves[:limits["candidates"]])
+        return moves[0]
     
-    def _validate_all_cross_words(self, board: List[List], tiles: List[Dict], 
-                                 direction: str, start_row: int, start_col: int) -> bool:
-        """Validate that all cross-words formed are in the dictionary."""
-        if not hasattr(self, '_wordlist_set'):
-            logger.warning("⚠️ No wordlist available for cross-word validation - skipping")
-            return True  # Skip validation if no wordlist
-        
-        # Create temporary board with new tiles
-        temp_board = [row[:] for row in board]
-        for tile in tiles:
-            temp_board[tile["row"]][tile["col"]] = tile["letter"]
-        
-        logger.debug(f"🔍 CROSS-WORD VALIDATION: Checking {len(tiles)} tiles in {direction} direction")
-        
-        # Check each placed tile for cross-words
-        for tile in tiles:
-            row, col = tile["row"], tile["col"]
-            
-            # Check horizontal cross-word (if main word is vertical)
-            if direction == "vertical":
-                word = self._extract_word_at_position(temp_board, row, col, "horizontal")
-                if len(word) > 1:
-                    if word.upper() not in self._wordlist_set:
-                        logger.error(f"🚫 INVALID HORIZONTAL CROSS-WORD: '{word}' at ({row},{col}) NOT IN DICTIONARY")
-                        return False
-            
-            # Check vertical cross-word (if main word is horizontal)  
-            if direction == "horizontal":
-                word = self._extract_word_at_position(temp_board, row, col, "vertical")
-                if len(word) > 1:
-                    if word.upper() not in self._wordlist_set:
-                        logger.error(f"🚫 INVALID VERTICAL CROSS-WORD: '{word}' at ({row},{col}) NOT IN DICTIONARY")
-                        return False
-        
-        logger.debug("✅ All cross-words validated successfully")
-        return True
+    @staticmethod
+    def _leave(rack: str, move: GeneratedMove) -> str:
+        """The rack left after the move's tiles are played (blanks as '?')."""
+        remaining = list(rack.upper().replace("*", "?"))
+        for _, _, letter, is_blank in move.tiles:
+            tile = "?" if is_blank else letter
+            if tile in remaining:
+                remaining.remove(tile)
+        return "".join(remaining)
     
-    def _extract_word_at_position(self, board: List[List], row: int, col: int, direction: str) -> str:
-        """Extract the complete word at a position in the given direction."""
-        logger.debug(f"🔍 Extracting {direction} word at ({row},{col})")
-        
-        if direction == "horizontal":
-            # Find start of word
-            start_col = col
-            while start_col > 0 and board[row][start_col - 1] is not None:
-                start_col -= 1
-            
-            # Extract word
-            word = ""
-            current_col = start_col
-            while current_col < 15 and board[row][current_col] is not None:
-                cell = board[row][current_col]
-                if isinstance(cell, dict):
-                    letter = cell.get("letter", str(cell)).upper()
-                else:
-                    letter = str(cell).upper()
-                word += letter
-                current_col += 1
-            
-            logger.debug(f"🔍 Extracted horizontal word: '{word}' from ({row},{start_col}) to ({row},{current_col-1})")
-            return word
-        
-        else:  # vertical
-            # Find start of word
-            start_row = row
-            while start_row > 0 and board[start_row - 1][col] is not None:
-                start_row -= 1
-            
-            # Extract word
-            word = ""
-            current_row = start_row
-            while current_row < 15 and board[current_row][col] is not None:
-                cell = board[current_row][col]
-                if isinstance(cell, dict):
-                    letter = cell.get("letter", str(cell)).upper()
-                else:
-                    letter = str(cell).upper()
-                word += letter
-                current_row += 1
-            
-            logger.debug(f"🔍 Extracted vertical word: '{word}' from ({start_row},{col}) to ({current_row-1},{col})")
-            return word
+    @staticmethod
+    def _bag_is_empty(game_state_data: Dict[str, Any]) -> bool:
+        bag = game_state_data.get("letter_bag")
+        if isinstance(bag, dict):
+            bag = bag.get("letters")
+        if isinstance(bag, list):
+            return not bag
+        return game_state_data.get("letter_bag_count") == 0
 
 
 # Global instance for service-level caching
@@ -518,7 +433,7 @@ def get_computer_player_health() -> Dict[str, Any]:
     if _optimized_computer_player is not None:
         try:
             # Quick test of optimized player
-            if _optimized_computer_player.word_index is not None:
+            if _optimized_computer_player.move_generator is not None:
                 optimized_available = True
         except Exception as e:
             optimized_error = str(e)
@@ -565,7 +480,7 @@ def get_optimized_computer_player(difficulty: str = "medium") -> OptimizedComput
         logger.error(f"❌ Failed to create OptimizedComputerPlayer: {e}")
         raise
 
-def initialize_optimized_computer_player(wordlist: List[str]) -> None:
+def initialize_optimized_computer_player(wordlist: Iterable[str], language: str = "de") -> None:
     """Initialize optimized computer player during service startup."""
     global _computer_player_status
     
@@ -574,9 +489,7 @@ def initialize_optimized_computer_player(wordlist: List[str]) -> None:
     try:
         player = get_optimized_computer_player()
         
-        # Use performance wordlist for quick startup
-        performance_wordlist = player._get_performance_wordlist(wordlist)
-        player.initialize_with_wordlist(performance_wordlist)
+        player.initialize_with_wordlist(wordlist, language)
         
         initialization_time = time.time() - start_time
         _computer_player_status.update({
@@ -585,7 +498,7 @@ def initialize_optimized_computer_player(wordlist: List[str]) -> None:
             "initialization_time": initialization_time
         })
         
-        logger.info(f"🚀 OptimizedComputerPlayer initialized for service in {initialization_time:.2f}s with {len(performance_wordlist)} words")
+        logger.info(f"🚀 OptimizedComputerPlayer initialized for service in {initialization_time:.2f}s")
     except Exception as e:
         _computer_player_status.update({
             "ready": False,
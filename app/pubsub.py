@@ -0,0 +1,315 @@
+"""
+Event bus for WebSocket fan-out between instances.
+
+WebSocket connections live in one process, but the request that produces an
+event (a move, an invitation) may be handled by any instance. Game broadcasts
+and user notifications are therefore published to a bus, and every instance
+subscribes and delivers them to the sockets connected to it - including the
+instance that published.
+
+Backends:
+
+    memory    - in-process (the default; one instance only). Several
+                InMemoryBackend instances sharing an InMemoryHub stand in
+                for several nodes in tests.
+    postgres  - LISTEN/NOTIFY on the application database (no extra service)
+    redis     - PUBLISH/SUBSCRIBE on any Redis-protocol server (REDIS_URL)
+
+Events travel as "<kind>\\t<key>\\n<message JSON>": the message is serialized
+once by the publisher and handed to the local sockets as text.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import zlib
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.config import PUBSUB_BACKEND, PUBSUB_CHANNEL, REDIS_URL
+
+logger = logging.getLogger(__name__)
+
+Receiver = Callable[[str], Awaitable[None]]
+Handler = Callable[[str, str], Awaitable[None]]
+
+RECONNECT_DELAY_SECONDS = 2.0
+
+
+def encode_event(kind: str, key, message: dict) -> str:
+    # Same compact form as WebSocket.send_json
+    return f"{kind}\t{key}\n" + json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+def decode_event(data: str) -> Tuple[str, str, str]:
+    header, text = data.split("\n", 1)
+    kind, key = header.split("\t", 1)
+    return kind, key, text
+
+
+class PubSubBackend:
+    """Transport between instances. start() subscribes; every published event reaches every subscriber."""
+
+    name = "base"
+
+    async def start(self, receive: Receiver) -> None:
+        raise NotImplementedError
+
+    async def publish(self, data: str) -> None:
+        raise NotImplementedError
+
+    async def stop(self) -> None:
+        pass
+
+
+class InMemoryHub:
+    """The shared 'network' of InMemoryBackend instances."""
+
+    def __init__(self):
+        self.receivers: List[Receiver] = []
+
+
+class InMemoryBackend(PubSubBackend):
+    name = "memory"
+
+    def __init__(self, hub: Optional[InMemoryHub] = None):
+        self.hub = hub or InMemoryHub()
+        self._receive: Optional[Receiver] = None
+
+    async def start(self, receive: Receiver) -> None:
+        self._receive = receive
+        self.hub.receivers.append(receive)
+
+    async def publish(self, data: str) -> None:
+        for receive in list(self.hub.receivers):
+            await receive(data)
+
+    async def stop(self) -> None:
+        if self._receive in self.hub.receivers:
+            self.hub.receivers.remove(self._receive)
+        self._receive = None
+
+
+class _ListenerBackend(PubSubBackend):
+    """A backend with one long-lived subscription, re-established when it drops."""
+
+    def __init__(self, channel: str = PUBSUB_CHANNEL):
+        self.channel = channel
+        self._task: Optional[asyncio.Task] = None
+        self._connected = asyncio.Event()
+        # Deliveries in flight, referenced until done (the loop only keeps weak references)
+        self._deliveries: set = set()
+
+    async def start(self, receive: Receiver) -> None:
+        self._task = asyncio.create_task(self._run(receive))
+        try:
+            await asyncio.wait_for(self._connected.wait(), timeout=10)
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ {self.name} pub/sub not connected yet, retrying in the background")
+
+    async def _run(self, receive: Receiver) -> None:
+        while True:
+            try:
+                await self._listen(receive)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"{self.name} pub/sub subscription lost: {e}")
+            self._connected.clear()
+            await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+    async def _listen(self, receive: Receiver) -> None:
+        """Subscribe, set self._connected, and return (or raise) when the subscription ends."""
+        raise NotImplementedError
+
+    def _deliver(self, receive: Receiver, data: str) -> None:
+        """Hand a received event to the bus without blocking the subscription."""
+        task = asyncio.get_running_loop().create_task(receive(data))
+        self._deliveries.add(task)
+        task.add_done_callback(self._deliveries.discard)
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+
+
+class PostgresBackend(_ListenerBackend):
+    """LISTEN/NOTIFY on a dedicated asyncpg connection to the application database."""
+
+    name = "postgres"
+    MAX_PAYLOAD = 7999  # NOTIFY payloads are limited to 8000 bytes
+
+    def __init__(self, channel: str = PUBSUB_CHANNEL, connect: Optional[Callable[[], Awaitable]] = None):
+        super().__init__(channel)
+        if connect is None:
+            from app.database import connect_asyncpg
+            connect = connect_asyncpg
+        self._connect = connect
+        self._connection = None
+        # asyncpg runs one operation at a time per connection; NOTIFYs share the LISTEN connection
+        self._publish_lock = asyncio.Lock()
+
+    async def _listen(self, receive: Receiver) -> None:
+        connection = await self._connect()
+        closed = asyncio.Event()
+        connection.add_termination_listener(lambda _: closed.set())
+
+        def on_notify(_connection, _pid, _channel, payload):
+            self._deliver(receive, self.unpack(payload))
+
+        try:
+            await connection.add_listener(self.channel, on_notify)
+            self._connection = connection
+            self._connected.set()
+            logger.info(f"📡 Listening for events on Postgres channel {self.channel}")
+            await closed.wait()
+        finally:
+            self._connection = None
+            if not connection.is_closed():
+                await connection.close()
+
+    @classmethod
+    def pack(cls, data: str) -> str:
+        """Board-sized events go compressed; NOTIFY payloads are text, so base64 with a 'z' marker."""
+        if len(data.encode()) <= cls.MAX_PAYLOAD and not data.startswith("z"):
+            return data
+        packed = "z" + base64.b64encode(zlib.compress(data.encode())).decode()
+        if len(packed) > cls.MAX_PAYLOAD:
+            raise ValueError(f"Event of {len(data)} bytes is too large for NOTIFY")
+        return packed
+
+    @staticmethod
+    def unpack(payload: str) -> str:
+        if payload.startswith("z"):
+            return zlib.decompress(base64.b64decode(payload[1:])).decode()
+        return payload
+
+    async def publish(self, data: str) -> None:
+        payload = self.pack(data)
+        async with self._publish_lock:
+            connection = self._connection
+            if connection is None:
+                raise ConnectionError("Postgres pub/sub is not connected")
+            await connection.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+
+
+class RedisBackend(_ListenerBackend):
+    """PUBLISH/SUBSCRIBE on a Redis-protocol server (Redis, Valkey, Memorystore)."""
+
+    name = "redis"
+
+    def __init__(self, channel: str = PUBSUB_CHANNEL, url: str = REDIS_URL):
+        super().__init__(channel)
+        import redis.asyncio as redis  # Only needed when this backend is configured
+        self._client = redis.from_url(url, decode_responses=True)
+
+    async def _listen(self, receive: Receiver) -> None:
+        pubsub = self._client.pubsub()
+        try:
+            await pubsub.subscribe(self.channel)
+            self._connected.set()
+            logger.info(f"📡 Listening for events on Redis channel {self.channel}")
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    self._deliver(receive, message["data"])
+        finally:
+            await pubsub.close()
+
+    async def publish(self, data: str) -> None:
+        await self._client.publish(self.channel, data)
+
+    async def stop(self) -> None:
+        await super().stop()
+        await self._client.close()
+
+
+def create_backend(name: str = PUBSUB_BACKEND) -> PubSubBackend:
+    if name == "postgres":
+        return PostgresBackend()
+    if name == "redis":
+        return RedisBackend()
+    if name != "memory":
+        logger.warning(f"⚠️ Unknown PUBSUB_BACKEND '{name}', using in-process delivery")
+    return InMemoryBackend()
+
+
+class EventBus:
+    """Publishes events to every instance and dispatches received ones to the local handlers."""
+
+    def __init__(self, backend: Optional[PubSubBackend] = None):
+        self.backend = backend
+        self.handlers: Dict[str, Handler] = {}
+        self.started = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # publish_threadsafe() futures, referenced until done
+        self._pending: set = set()
+        self.published = 0
+        self.received = 0
+        self.publish_errors = 0
+
+    def register(self, kind: str, handler: Handler) -> None:
+        """handler(key, message_json) delivers one event to this instance's sockets."""
+        self.handlers[kind] = handler
+
+    async def start(self) -> None:
+        if self.backend is None:
+            self.backend = create_backend()
+        await self.backend.start(self._receive)
+        self._loop = asyncio.get_running_loop()
+        self.started = True
+        logger.info(f"📡 Event bus started ({self.backend.name})")
+
+    async def stop(self) -> None:
+        if self.started:
+            self.started = False
+            await self.backend.stop()
+
+    async def publish(self, kind: str, key, message: dict) -> None:
+        data = encode_event(kind, key, message)
+        if self.started:
+            try:
+                await self.backend.publish(data)
+                self.published += 1
+                return
+            except Exception as e:
+                self.publish_errors += 1
+                logger.error(f"Event bus publish failed, delivering locally only: {e}")
+        # Not started (scripts, tests) or the bus is down: this instance's sockets still get it
+        await self._receive(data)
+
+    def publish_threadsafe(self, kind: str, key, message: dict) -> None:
+        """Publish from synchronous code on any thread, without waiting; a no-op until the bus is started."""
+        loop = self._loop
+        if not self.started or loop is None or loop.is_closed():
+            return
+        future = asyncio.run_coroutine_threadsafe(self.publish(kind, key, message), loop)
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+
+    async def _receive(self, data: str) -> None:
+        self.received += 1
+        try:
+            kind, key, text = decode_event(data)
+            handler = self.handlers.get(kind)
+            if handler:
+                await handler(key, text)
+        except Exception as e:
+            logger.error(f"Error delivering event from bus: {e}")
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "backend": self.backend.name if self.backend else None,
+            "started": self.started,
+            "published": self.published,
+            "received": self.received,
+            "publish_errors": self.publish_errors
+        }
+
+
+# Global bus for this worker; the WebSocket managers register their delivery handlers on it
+event_bus = EventBus()
@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func, text
 from app.dependencies import get_db
 from app.auth import get_current_user, create_access_token
-from app.models import User, WordList, Game, Player, GameStatus, Move
+from app.models import User, WordList, Game, Player, GameStatus, Move, GameSnapshot
+from app.game_logic.state_codec import decode_state
+from app.game_logic.move_log import replay_game_state, turn_state_data, TurnNotAvailable
+from app.game_logic.state_version import commit_game_state
 from app.wordlist import import_wordlist, load_wordlist_from_file
 from passlib.context import CryptContext
 from datetime import timedelta
@@ -29,7 +32,7 @@ class TerminateGameRequest(BaseModel):
     reason: str = "Administrative action"
 
 @router.post("/debug/create-test-tokens")
-async def create_test_tokens(
+def create_test_tokens(
     db: Session = Depends(get_db)
 ):
     """
@@ -253,7 +256,7 @@ def get_admin_dashboard(
         raise HTTPException(status_code=500, detail=f"Error fetching dashboard data: {str(e)}")
 
 @router.post("/database/import-wordlists")
-async def bulk_import_wordlists(
+def bulk_import_wordlists(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -335,7 +338,7 @@ async def bulk_import_wordlists(
         raise HTTPException(status_code=500, detail=f"Error during bulk import: {str(e)}")
 
 @router.post("/database/reset-wordlists")
-async def reset_wordlists(
+def reset_wordlists(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -366,7 +369,7 @@ async def reset_wordlists(
         raise HTTPException(status_code=500, detail=f"Error resetting wordlists: {str(e)}")
 
 @router.post("/database/reset-users")
-async def reset_users(
+def reset_users(
     keep_admins: bool = True,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -432,7 +435,7 @@ async def reset_users(
                 pass  # Session might already be closed
 
 @router.post("/database/reset-all")
-async def reset_all_data(
+def reset_all_data(
     confirm: bool = False,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -478,6 +481,7 @@ async def reset_all_data(
         try:
             from app.models import Game, Player, GameInvitation, Move, ChatMessage
             fresh_db.query(ChatMessage).delete()
+            fresh_db.query(GameSnapshot).delete()
             fresh_db.query(Move).delete()
             fresh_db.query(Player).delete()
             fresh_db.query(GameInvitation).delete()
@@ -532,7 +536,7 @@ async def reset_all_data(
                 pass  # Session might already be closed
 
 @router.get("/database/admin-status")
-async def admin_status(
+def admin_status(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -613,7 +617,7 @@ def recover_database_session(db: Session, logger) -> Session:
                 )
 
 @router.post("/database/reset-games")
-async def reset_games(
+def reset_games(
     request: Optional[ResetGamesRequest] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -651,6 +655,7 @@ async def reset_games(
         # Get counts before deletion
         tables_to_reset = [
             ("chat_messages", "Chat Messages"),
+            ("game_snapshots", "Game Snapshots"),
             ("moves", "Moves"),
             ("players", "Players"),
             ("game_invitations", "Game Invitations"),
@@ -756,7 +761,7 @@ async def reset_games(
                 pass  # Session might already be closed
 
 @router.post("/load-all-words")
-async def load_all_words(
+def load_all_words(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -820,7 +825,7 @@ async def load_all_words(
         raise HTTPException(status_code=500, detail=f"Error loading words: {str(e)}")
 
 @router.get("/performance")
-async def get_performance_stats(
+def get_performance_stats(
     current_user: User = Depends(get_current_user)
 ):
     """Get application performance statistics."""
@@ -831,6 +836,12 @@ async def get_performance_stats(
     try:
         from app.middleware.performance import monitor
         from app.utils.cache import cache
+        from app.computer_move_pool import computer_move_pool
+        from app.game_logic.game_state_cache import game_state_cache
+        from app.game_logic.event_stream import game_event_log
+        from app.utils.pool_metrics import pool_stats
+        from app.pubsub import event_bus
+        from app.websocket import manager, notification_manager
         
         stats = monitor.get_stats()
         cache_stats = cache.stats()
@@ -838,6 +849,12 @@ async def get_performance_stats(
         return {
             "performance": stats,
             "cache": cache_stats,
+            "computer_moves": computer_move_pool.stats(),
+            "game_state_cache": game_state_cache.stats(),
+            "database_pool": pool_stats(),
+            "event_bus": event_bus.stats(),
+            "websockets": {"games": manager.stats(), "notifications": notification_manager.stats()},
+            "game_event_log": game_event_log.stats(),
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
     except Exception as e:
@@ -913,7 +930,7 @@ def ensure_default_users(db: Session):
     }
 
 @router.post("/database/create-default-admin")
-async def create_default_admin(
+def create_default_admin(
     db: Session = Depends(get_db)
 ):
     """Create a default admin user and computer player for testing purposes"""
@@ -935,7 +952,7 @@ async def create_default_admin(
         raise HTTPException(status_code=500, detail=f"Failed to create default users: {str(e)}")
 
 @router.post("/database/ensure-primary-admin")
-async def ensure_primary_admin(
+def ensure_primary_admin(
     db: Session = Depends(get_db)
 ):
     """Ensure that jan@binge.de exists as the primary admin user (production-safe)"""
@@ -1036,7 +1053,7 @@ async def ensure_primary_admin(
         raise HTTPException(status_code=500, detail=f"Failed to ensure primary admin: {str(e)}")
 
 @router.post("/database/fix-schema")
-async def fix_database_schema():
+def fix_database_schema():
     """Fix database schema by ensuring required columns exist (production-safe)"""
     try:
         from sqlalchemy import text
@@ -1111,7 +1128,7 @@ async def fix_database_schema():
         }
 
 @router.post("/database/run-migration")
-async def run_migration():
+def run_migration():
     """Run Alembic migration from within the application (production-safe)"""
     try:
         from sqlalchemy import text, create_engine
@@ -1216,7 +1233,7 @@ async def run_migration():
         }
 
 @router.get("/debug/persistent-tokens")
-async def debug_persistent_tokens(db: Session = Depends(get_db)):
+def debug_persistent_tokens(db: Session = Depends(get_db)):
     """Debug endpoint to check persistent token status (production-safe)"""
     try:
         from sqlalchemy import text
@@ -1270,7 +1287,7 @@ async def debug_persistent_tokens(db: Session = Depends(get_db)):
         }
 
 @router.get("/contract-status")
-async def get_contract_status():
+def get_contract_status():
     """Get basic contract validation status (public endpoint)."""
     
     try:
@@ -1316,7 +1333,7 @@ async def get_contract_status():
         }
 
 @router.get("/contracts/info")
-async def get_contract_info():
+def get_contract_info():
     """Get comprehensive contract validation information (public endpoint)."""
     
     try:
@@ -1369,7 +1386,7 @@ async def get_contract_info():
         }
 
 @router.get("/contracts/compliance")
-async def check_contract_compliance(
+def check_contract_compliance(
     current_user = Depends(get_current_user)
 ):
     """Check API compliance with frontend contracts (admin only)."""
@@ -1406,7 +1423,7 @@ async def check_contract_compliance(
         }
 
 @router.post("/contracts/validate-endpoint")
-async def validate_specific_endpoint(
+def validate_specific_endpoint(
     endpoint_data: dict,
     current_user = Depends(get_current_user)
 ):
@@ -1444,7 +1461,7 @@ async def validate_specific_endpoint(
         raise HTTPException(500, f"Validation error: {str(e)}")
 
 @router.get("/debug/database-url")
-async def get_database_url_debug():
+def get_database_url_debug():
     """Debug endpoint to check DATABASE_URL configuration (public for testing)."""
     import os
     from app.config import DATABASE_URL
@@ -1458,7 +1475,7 @@ async def get_database_url_debug():
     }
 
 @router.get("/debug/startup-status")
-async def get_startup_status():
+def get_startup_status():
     """Debug endpoint to show startup tasks status."""
     try:
         from app.utils.startup import startup_tasks
@@ -1480,7 +1497,7 @@ async def get_startup_status():
         }
 
 @router.get("/debug/verification-codes")
-async def get_debug_verification_codes():
+def get_debug_verification_codes():
     """Debug endpoint to show recent verification codes for testing (when SMTP not configured)."""
     from app.db import get_db
     from app.models import User
@@ -1531,7 +1548,7 @@ async def get_debug_verification_codes():
 # =============================================================================
 
 @router.post("/database/reset")
-async def database_reset(
+def database_reset(
     confirm: bool = False,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -1578,6 +1595,7 @@ async def database_reset(
         try:
             from app.models import Game, Player, GameInvitation, Move, ChatMessage
             fresh_db.query(ChatMessage).delete()
+            fresh_db.query(GameSnapshot).delete()
             fresh_db.query(Move).delete()
             fresh_db.query(Player).delete()
             fresh_db.query(GameInvitation).delete()
@@ -1632,7 +1650,7 @@ async def database_reset(
                 pass  # Session might already be closed
 
 @router.post("/database/backup")
-async def database_backup(
+def database_backup(
     backup_type: str = "full",
     include_wordlists: bool = True,
     db: Session = Depends(get_db),
@@ -1695,7 +1713,7 @@ async def database_backup(
         raise HTTPException(status_code=500, detail=f"Error creating database backup: {str(e)}")
 
 @router.post("/database/maintenance")
-async def database_maintenance(
+def database_maintenance(
     operation: str = "optimize",
     auto_vacuum: bool = True,
     rebuild_indexes: bool = False,
@@ -1970,7 +1988,7 @@ def check_legacy_games(
     }
 
 @router.post("/database/recover-transaction")
-async def recover_failed_transaction(
+def recover_failed_transaction(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -2060,7 +2078,7 @@ async def recover_failed_transaction(
             pass  # Session might already be closed
 
 @router.post("/debug/fix-admin-privileges")
-async def fix_admin_privileges(
+def fix_admin_privileges(
     db: Session = Depends(get_db)
 ):
     """
@@ -2131,7 +2149,7 @@ async def fix_admin_privileges(
         raise HTTPException(status_code=500, detail=f"Error fixing admin privileges: {str(e)}")
 
 @router.post("/debug/simple-login")
-async def debug_simple_login(
+def debug_simple_login(
     email: str,
     db: Session = Depends(get_db)
 ):
@@ -2213,7 +2231,7 @@ def get_all_games_admin(
         raise HTTPException(status_code=403, detail="Admin access required")
     
     try:
-        # Build query
+        # Build query; the list comes from the games summary columns and the creator join
         query = db.query(Game)
         
         # Apply status filter if provided
@@ -2224,39 +2242,45 @@ def get_all_games_admin(
             except ValueError:
                 raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
         
-        # Apply pagination
-        games = query.offset(offset).limit(limit).all()
-        
         # Get total count
         total_count = query.count()
         
+        # Apply pagination
+        rows = (
+            query.outerjoin(User, User.id == Game.creator_id)
+            .add_columns(User.username)
+            .order_by(Game.created_at.desc())
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
+        
         # Format response
         games_data = []
-        for game in games:
-            # Get players count
-            players_count = db.query(Player).filter(Player.game_id == game.id).count()
-            
-            # Get creator info
-            creator = db.query(User).filter(User.id == game.creator_id).first()
-            creator_username = creator.username if creator else "Unknown"
-            
-            # Parse state for additional info
-            state_data = json.loads(game.state) if game.state else {}
+        for game, creator_username in rows:
+            turn_number, consecutive_passes = game.turn_number, game.consecutive_passes
+            if turn_number is None:
+                # Last written before the summary columns existed
+                state_data = decode_state(game.state)
+                turn_number = state_data.get("turn_number", 0)
+                consecutive_passes = state_data.get("consecutive_passes", 0)
             
             games_data.append({
                 "id": game.id,
                 "status": game.status.value,
                 "language": game.language,
                 "max_players": game.max_players,
-                "current_players": players_count,
+                "current_players": game.player_count,
                 "creator_id": game.creator_id,
-                "creator_username": creator_username,
+                "creator_username": creator_username or "Unknown",
                 "created_at": game.created_at.isoformat(),
                 "started_at": game.started_at.isoformat() if game.started_at else None,
                 "completed_at": game.completed_at.isoformat() if game.completed_at else None,
                 "current_player_id": game.current_player_id,
-                "turn_number": state_data.get("turn_number", 0),
-                "consecutive_passes": state_data.get("consecutive_passes", 0)
+                "turn_number": turn_number,
+                "consecutive_passes": consecutive_passes or 0,
+                "letter_bag_count": game.letter_bag_count,
+                "last_move_at": game.last_move_at.isoformat() if game.last_move_at else None
             })
         
         return {
@@ -2274,6 +2298,7 @@ def get_all_games_admin(
 @router.get("/games/{game_id}")
 def get_game_details_admin(
     game_id: str,
+    turn: Optional[int] = Query(None, description="Also return the game state after this turn, replayed from the move log"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -2282,6 +2307,7 @@ def get_game_details_admin(
     
     Args:
         game_id: ID of the game to retrieve
+        turn: Optional turn number to rebuild the state for (0 = game start)
         
     Returns:
         Detailed game information including players, moves, and state
@@ -2333,11 +2359,18 @@ def get_game_details_admin(
             })
         
         # Parse game state
-        state_data = json.loads(game.state) if game.state else {}
+        state_data = decode_state(game.state)
         
         # Get creator info
         creator = db.query(User).filter(User.id == game.creator_id).first()
         
+        state_at_turn = None
+        if turn is not None:
+            try:
+                state_at_turn = turn_state_data(replay_game_state(db, game, turn))
+            except TurnNotAvailable as e:
+                raise HTTPException(status_code=404, detail=str(e))
+        
         return {
             "id": game.id,
             "status": game.status.value,
@@ -2360,7 +2393,8 @@ def get_game_details_admin(
                 "consecutive_passes": state_data.get("consecutive_passes", 0),
                 "letter_bag_count": len(state_data.get("letter_bag", [])),
                 "board_tiles": sum(1 for row in state_data.get("board", []) for cell in row if cell is not None) if state_data.get("board") else 0
-            }
+            },
+            "state_at_turn": state_at_turn
         }
         
     except HTTPException:
@@ -2419,7 +2453,7 @@ def terminate_game_admin(
         )
         
         db.add(termination_move)
-        db.commit()
+        commit_game_state(db, game)
         
         logger.info(f"Game {game_id} terminated by admin {current_user.username}: {request.reason}")
         
@@ -2756,7 +2790,7 @@ def fix_feedback_schema(
         raise HTTPException(status_code=500, detail=f"Schema fix failed: {str(e)}")
 
 @router.get("/database/inspect-feedback-table")
-async def inspect_feedback_table(
+def inspect_feedback_table(
     current_user=Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -508,7 +508,7 @@ def contract_refresh(db: Session = Depends(get_db), current_user: User = Depends
     }
 
 @router.post("/simple-admin-login")
-async def simple_admin_login(
+def simple_admin_login(
     email: str,
     db: Session = Depends(get_db)
 ):
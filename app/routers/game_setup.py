@@ -7,11 +7,10 @@ from app.models.game import GameStatus
 from app.models.game_invitation import InvitationStatus
 from app.auth import get_current_user
 from app.game_logic.game_state import GameState, GamePhase
-from app.routers.games import GameStateEncoder
+from app.game_logic.state_codec import encode_state
 from app.utils.wordlist_utils import ensure_wordlist_available
 from datetime import datetime, timezone, timedelta
 import uuid
-import json
 from typing import List
 from pydantic import BaseModel
 
@@ -57,7 +56,7 @@ def setup_game(
         id=game_id,
         creator_id=current_user.id,
         current_player_id=current_user.id,
-        state=json.dumps(state_data, cls=GameStateEncoder),
+        state=encode_state(state_data),
         status=GameStatus.SETUP,
         language=setup_data.language,
         max_players=setup_data.max_players,
@@ -3,34 +3,43 @@
 from fastapi import APIRouter, Depends, HTTPException, Body, WebSocket, WebSocketDisconnect, Query, status
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import desc, text, and_
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from pydantic import BaseModel
+from dataclasses import dataclass
+from starlette.concurrency import run_in_threadpool
 import json
 import uuid
 import logging
 from datetime import datetime, timezone
 
-from app.db import get_db
+from app.db import get_db, get_async_db
 from app.dependencies import get_translation_helper
 from app.models import Game, Player, Move, User, ChatMessage, GameInvitation
 from app.models.game import GameStatus
 from app.models.game_invitation import InvitationStatus
-from app.auth import get_current_user, get_token_from_header, get_user_from_token
+from app.auth import get_current_user, get_current_user_async, get_token_from_header, get_user_from_token
 from app.game_logic.game_state import GameState, GamePhase, MoveType, Position, PlacedTile
+from app.game_logic.game_state_cache import (
+    game_state_cache, serialize_game_state, reconstruct_board_from_json, detect_center_used_from_board
+)
+from app.game_logic.state_version import check_state_version, commit_game_state
+from app.game_logic.state_codec import GameStateEncoder, encode_state, decode_state
+from app.game_logic.move_log import MoveEvent, append_move, start_move_log, replay_game_state, turn_state_data, TurnNotAvailable
 from app.game_logic.letter_bag import LETTER_DISTRIBUTION, LetterBag, create_letter_bag, draw_letters, return_letters, create_rack
 from app.utils.i18n import TranslationHelper
 from app.utils.wordlist_utils import ensure_wordlist_available, load_wordlist
 from app.utils.email_service import email_service
 from app.utils.game_helpers import (
     get_player_data, get_last_move_info, get_next_player_info, 
-    format_time_since_activity, get_game_summary_data, 
-    get_detailed_game_data, sort_games_by_priority, group_games_by_status,
-    is_computer_user_id as helper_is_computer_user_id,
-    get_recent_moves_data
+    format_time_since_activity, get_game_summary_data, get_game_summaries,
+    get_detailed_game_data, sort_games_by_priority, group_games_by_status
 )
+from app.utils.system_users import TEST_USERNAMES, get_computer_user_id, is_computer_user_id
 from app.config import FRONTEND_URL
 from app.websocket import manager, notification_manager
+from anyio import from_thread  # Sync (threadpool) endpoints hand their WebSocket sends to the event loop
 from jose import JWTError, jwt
 from app.auth import SECRET_KEY, ALGORITHM
 import random
@@ -43,30 +52,9 @@ from app.utils.cache import cache_response
 
 logger = logging.getLogger(__name__)
 
-# List of test usernames to exclude from production user listings
-TEST_USERNAMES = [
-    "player01", "player02", "player1", "player2",  # Common test player names
-    "computer", "Computer", "computer_player", "Computer_player",  # Computer player variations
-    "test_user", "testuser", "test", "Test", "test_player",  # Test user variations
-    "Player01", "Player02", "Player1", "Player2"  # Capitalized variations
-]
-
 def is_computer_player(player, db):
     """Check if a player is a computer player."""
-    if hasattr(player, 'user_id'):
-        user = db.query(User).filter(User.id == player.user_id).first()
-        return user and user.username == "computer_player"
-    return False
-
-def get_computer_user_id(db):
-    """Get the computer player's user ID."""
-    computer_user = db.query(User).filter(User.username == "computer_player").first()
-    return computer_user.id if computer_user else None
-
-# Use shared helper function for consistency
-def is_computer_user_id(user_id, db):
-    """Check if a user_id belongs to the computer player."""
-    return helper_is_computer_user_id(user_id, db)
+    return is_computer_user_id(getattr(player, 'user_id', None), db)
 
 class CreateGameRequest(BaseModel):
     language: str = "en"
@@ -95,49 +83,79 @@ class CreateGameWithInvitationsRequest(BaseModel):
     add_computer_player: bool = False  # Add computer opponent during creation
     computer_difficulty: str = "medium"  # easy, medium, hard
 
-class GameStateEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        elif isinstance(obj, (GamePhase, MoveType)):
-            return obj.value
-        elif isinstance(obj, Position):
-            return {"row": obj.row, "col": obj.col}
-        elif isinstance(obj, PlacedTile):
-            return {"letter": obj.letter, "is_blank": obj.is_blank, "tile_id": obj.tile_id}
-        elif isinstance(obj, set):
-            return list(obj)
-        return super().default(obj)
-
 router = APIRouter(prefix="/games", tags=["games"])
 
-def detect_center_used_from_board(board):
-    """Helper function to detect if center has been used by checking if there's a tile at position (7,7)."""
-    if not board or len(board) < 8 or len(board[7]) < 8:
-        return False
-    return board[7][7] is not None
+def commit_game_turn(db: Session, game: Game, game_state: GameState) -> int:
+    """Commit a turn and keep its GameState cached under the state_version the commit produced."""
+    state_version = commit_game_state(db, game)
+    game_state_cache.checkin(game.id, game_state, state_version)
+    return state_version
+
+def _load_turn(db: Session, game_id: str, state_version: Optional[int], current_user: User) -> Tuple[Game, List[Player]]:
+    """Check that it's the user's turn in a game in progress; returns the game and its player rows."""
+    game = db.query(Game).filter(Game.id == game_id).first()
+    if not game:
+        raise HTTPException(404, "Game not found")
+    check_state_version(game, state_version)
+
+    if game.status != GameStatus.IN_PROGRESS:
+        raise HTTPException(400, f"Game is not in progress. Status: {game.status.value}")
+
+    if game.current_player_id != current_user.id:
+        raise HTTPException(403, "Not your turn")
+    return game, db.query(Player).filter(Player.game_id == game_id).all()
 
-def reconstruct_board_from_json(board_data):
-    """Helper function to reconstruct board with proper PlacedTile objects from JSON data."""
-    if not board_data:
-        return [[None]*15 for _ in range(15)]
+@dataclass
+class PlayedTurn:
+    """
+    A turn played on the game's GameState, for the session to commit.
     
-    reconstructed_board = []
-    for row in board_data:
-        reconstructed_row = []
-        for cell in row:
-            if cell is None:
-                reconstructed_row.append(None)
-            else:
-                # Reconstruct PlacedTile object from JSON dict
-                tile = PlacedTile(
-                    letter=cell["letter"],
-                    is_blank=cell.get("is_blank", False),
-                    tile_id=cell.get("tile_id")  # Preserve existing tile_id or None (will auto-generate)
-                )
-                reconstructed_row.append(tile)
-        reconstructed_board.append(reconstructed_row)
-    return reconstructed_board
+    Validating, scoring and serializing a turn is CPU work, so the async turn endpoints
+    do it in the threadpool between two run_sync calls, which only do the DB I/O
+    (run_sync runs on the event loop).
+    """
+    game_state: GameState
+    message: str
+    state: str  # games.state after the turn
+    game_over: bool = False
+    completion_details: Optional[dict] = None
+    points: int = 0
+    tiles: Tuple[Tuple[Position, PlacedTile], ...] = ()
+    score_breakdown: Optional[dict] = None
+    new_rack: str = ""
+    exchanged_count: int = 0
+
+def game_update_delta(game: Game, previous_version: int, state_version: int, player: User, action: str,
+                      scores_before: Dict[int, int], players: List[Player], **details) -> dict:
+    """
+    The game_update for one committed turn: only what changed, not the board.
+    
+    Clients apply it on top of previous_version; when their version differs they
+    missed an update and ask for a snapshot instead ({"type": "snapshot_request"}).
+    """
+    return {
+        "type": "game_update",
+        "game_id": game.id,
+        "seq": game.turn_number,  # Turn completed; the resume position for reconnecting clients
+        "previous_version": previous_version,
+        "state_version": state_version,
+        "action": action,
+        "player_id": player.id,
+        "username": player.username,
+        "score_changes": {p.user_id: p.score for p in players if p.score != scores_before.get(p.user_id)},
+        "current_player_id": game.current_player_id,
+        "letter_bag_count": game.letter_bag_count,  # Turn summary columns, set by append_move
+        "turn_number": game.turn_number,
+        "consecutive_passes": game.consecutive_passes,
+        **details
+    }
+
+async def broadcast_turn(game_id: str, payload: dict, action: str) -> None:
+    """Send a committed turn's game update to the game's WebSocket clients."""
+    try:
+        await manager.broadcast_to_game(game_id, payload)
+    except Exception as e: # pragma: no cover
+        logger.error(f"WebSocket broadcast error after {action} in game {game_id}: {e}")
 
 def format_game_state_response(game_data: dict, game_name: str) -> dict:
     """Format game data to match contract GameStateResponse schema."""
@@ -242,7 +260,7 @@ def create_game_contract(
             game.name = game_data.name
             db.commit()
         
-        game_state_response = get_game(game_id, db, current_user)
+        game_state_response = get_game(game_id, db, current_user, include_tile_ids=False)
         
         # Format response to match contract
         if game_state_response.get("success"):
@@ -276,7 +294,7 @@ def create_game_contract(
             game.name = game_data.name
             db.commit()
         
-        game_state_response = get_game(game_id, db, current_user)
+        game_state_response = get_game(game_id, db, current_user, include_tile_ids=False)
         
         # The get_game function already returns formatted data with success field
         # Just update the name field to match the contract request
@@ -337,7 +355,7 @@ def create_game_impl(
         "consecutive_passes": 0,
         "test_mode": game_data.short_game  # Store short_game flag as test_mode for backward compatibility
     }
-    game.state = json.dumps(initial_state, cls=GameStateEncoder)
+    game.state = encode_state(initial_state)
     
     # Add creator as first player
     player = Player(
@@ -359,17 +377,18 @@ def create_game_impl(
         validate_computer_player_availability()
         
         # Get computer user (created during startup)
-        computer_user = db.query(User).filter(User.username == "computer_player").first()
-        if not computer_user:
+        computer_user_id = get_computer_user_id(db)
+        if not computer_user_id:
             raise HTTPException(500, "Computer player user not found. Please restart the service.")
         
         computer_player = Player(
             game_id=game.id,
-            user_id=computer_user.id,
+            user_id=computer_user_id,
             score=0,
             rack=""  # Will be dealt when game starts
         )
         db.add(computer_player)
+        game.computer_difficulty = game_data.computer_difficulty
     
     db.commit()
     db.refresh(game)
@@ -390,7 +409,7 @@ def create_game_impl(
         game.current_player_id = current_user.id
         
         # Load current game state from DB JSON
-        persisted_state_data = json.loads(game.state)
+        persisted_state_data = decode_state(game.state)
         game_state = GameState(language=game.language)
         game_state.board = reconstruct_board_from_json(persisted_state_data.get("board"))
         game_state.phase = GamePhase(persisted_state_data.get("phase", GamePhase.NOT_STARTED.value))
@@ -426,7 +445,8 @@ def create_game_impl(
             "consecutive_passes": game_state.consecutive_passes,
             "center_used": game_state.center_used
         }
-        game.state = json.dumps(updated_state_json, cls=GameStateEncoder)
+        game.state = encode_state(updated_state_json)
+        start_move_log(db, game, all_players, len(game_state.letter_bag))  # Turn 0 of the move log
         
         db.commit()
         db.refresh(game)
@@ -601,7 +621,7 @@ async def create_game_with_invitations_impl(
         "consecutive_passes": 0,
         "test_mode": game_data.short_game  # Store short_game flag as test_mode for backward compatibility
     }
-    game.state = json.dumps(initial_state, cls=GameStateEncoder)
+    game.state = encode_state(initial_state)
     
     # Add creator as first player
     creator_player = Player(
@@ -765,7 +785,7 @@ async def create_game_with_invitations(
     return await create_game_with_invitations_impl(game_data, db, current_user)
 
 @router.post("/{game_id}/join")
-async def join_game(
+def join_game(
     game_id: str,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user),
@@ -815,14 +835,12 @@ async def join_game(
         
         # Send WebSocket notification for invitation status change
         try:
-            import asyncio
-            asyncio.create_task(
-                notification_manager.send_invitation_status_changed(
-                    pending_invitation.inviter_id,  # Notify the inviter
-                    pending_invitation.id,
-                    "accepted",
-                    game_id
-                )
+            from_thread.run(
+                notification_manager.send_invitation_status_changed,
+                pending_invitation.inviter_id,  # Notify the inviter
+                pending_invitation.id,
+                "accepted",
+                game_id
             )
             logger.info(f"🔔 WebSocket invitation status notification sent to user {pending_invitation.inviter_id}")
         except Exception as e:
@@ -847,7 +865,7 @@ async def join_game(
         all_players = db.query(Player).filter(Player.game_id == game_id).all()
         
         # Get test mode from game state
-        state_data = json.loads(game.state) if game.state else {}
+        state_data = decode_state(game.state)
         short_game = state_data.get("test_mode", False)
         
         # Create letter bag (use short game mode if enabled)
@@ -879,11 +897,12 @@ async def join_game(
             "turn_number": 0,
             "consecutive_passes": 0
         })
-        game.state = json.dumps(state_data, cls=GameStateEncoder)
+        game.state = encode_state(state_data)
+        start_move_log(db, game, all_players, len(letter_bag))  # Turn 0 of the move log
         
         # Notify via WebSocket that game has started
         try:
-            await manager.broadcast_to_game(game_id, {
+            from_thread.run(manager.broadcast_to_game, game_id, {
                 "type": "game_started",
                 "game_id": game_id,
                 "current_player_id": game.current_player_id,
@@ -900,13 +919,12 @@ async def join_game(
                 ).first()
                 
                 if invitation:  # Only notify if they joined via invitation
-                    asyncio.create_task(
-                        notification_manager.send_game_started(
-                            player.user_id,
-                            game_id,
-                            invitation.id,
-                            invitation.inviter.username
-                        )
+                    from_thread.run(
+                        notification_manager.send_game_started,
+                        player.user_id,
+                        game_id,
+                        invitation.id,
+                        invitation.inviter.username
                     )
                     
         except Exception as e:
@@ -926,7 +944,7 @@ async def join_game(
     }
 
 @router.post("/{game_id}/join-with-token")
-async def join_game_with_token(
+def join_game_with_token(
     game_id: str,
     token: str = Query(..., description="Join token from invitation email"),
     db: Session = Depends(get_db),
@@ -990,14 +1008,12 @@ async def join_game_with_token(
     
     # Send WebSocket notification for invitation status change
     try:
-        import asyncio
-        asyncio.create_task(
-            notification_manager.send_invitation_status_changed(
-                invitation.inviter_id,  # Notify the inviter
-                invitation.id,
-                "accepted",
-                game_id
-            )
+        from_thread.run(
+            notification_manager.send_invitation_status_changed,
+            invitation.inviter_id,  # Notify the inviter
+            invitation.id,
+            "accepted",
+            game_id
         )
         logger.info(f"🔔 WebSocket invitation status notification sent to user {invitation.inviter_id}")
     except Exception as e:
@@ -1022,7 +1038,7 @@ async def join_game_with_token(
         all_players = db.query(Player).filter(Player.game_id == game_id).all()
         
         # Get test mode from game state
-        state_data = json.loads(game.state) if game.state else {}
+        state_data = decode_state(game.state)
         short_game = state_data.get("test_mode", False)
         
         # Create letter bag (use short game mode if enabled)
@@ -1054,11 +1070,12 @@ async def join_game_with_token(
             "turn_number": 0,
             "consecutive_passes": 0
         })
-        game.state = json.dumps(state_data, cls=GameStateEncoder)
+        game.state = encode_state(state_data)
+        start_move_log(db, game, all_players, len(letter_bag))  # Turn 0 of the move log
         
         # Notify via WebSocket that game has started
         try:
-            await manager.broadcast_to_game(game_id, {
+            from_thread.run(manager.broadcast_to_game, game_id, {
                 "type": "game_started",
                 "game_id": game_id,
                 "current_player_id": game.current_player_id,
@@ -1075,13 +1092,12 @@ async def join_game_with_token(
                 ).first()
                 
                 if invitation_check:  # Only notify if they joined via invitation
-                    asyncio.create_task(
-                        notification_manager.send_game_started(
-                            player.user_id,
-                            game_id,
-                            invitation_check.id,
-                            invitation_check.inviter.username
-                        )
+                    from_thread.run(
+                        notification_manager.send_game_started,
+                        player.user_id,
+                        game_id,
+                        invitation_check.id,
+                        invitation_check.inviter.username
                     )
                     
         except Exception as e:
@@ -1117,11 +1133,9 @@ def list_user_games(
                       If not provided, shows all games.
     """
     
-    # Optimized query with eager loading to prevent N+1 queries
+    # Players, users and moves are batch-loaded by get_game_summaries
     query = db.query(Game).join(Player).filter(
         Player.user_id == current_user.id
-    ).options(
-        selectinload(Game.players).joinedload(Player.user)
     )
     
     # Add filter for specific statuses if requested
@@ -1151,11 +1165,8 @@ def list_user_games(
     
     user_games = query.all()
 
-    # Use shared helper function to get game summary data
-    games_info = []
-    for game in user_games:
-        game_summary = get_game_summary_data(game, current_user.id, db)
-        games_info.append(game_summary)
+    # Summaries for all games in a constant number of queries
+    games_info = get_game_summaries(user_games, current_user.id, db)
     
     # Sort games using shared helper function
     games_info = sort_games_by_priority(games_info)
@@ -1245,7 +1256,8 @@ def get_my_invitations(
 def get_game(
     game_id: str,
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user) # Assuming this verifies user is part of game or admin
+    current_user = Depends(get_current_user), # Assuming this verifies user is part of game or admin
+    include_tile_ids: bool = Query(False, description="Add position-based tile_id to each board cell")
 ):
     """Get detailed game information using shared helper functions."""
     game = db.query(Game).filter(Game.id == game_id).first()
@@ -1259,7 +1271,7 @@ def get_game(
         raise HTTPException(403, "You are not part of this game.")
 
     # Use shared helper function to get detailed game data
-    game_data = get_detailed_game_data(game, current_user.id, db)
+    game_data = get_detailed_game_data(game, current_user.id, db, include_tile_ids=include_tile_ids)
 
     # Format according to contract and wrap in success field
     formatted_response = format_game_state_response(game_data, "WordBattle Game")
@@ -1269,27 +1281,68 @@ def get_game(
 def get_game_state(
     game_id: str,
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_user),
+    include_tile_ids: bool = Query(False, description="Add position-based tile_id to each board cell")
 ):
     """Get detailed game state including player racks and board state."""
     # Use the existing get_game function but return the raw data without success wrapper
-    game_response = get_game(game_id, db, current_user)
+    game_response = get_game(game_id, db, current_user, include_tile_ids=include_tile_ids)
     
     # Remove the success wrapper if it exists
     if isinstance(game_response, dict) and "success" in game_response:
         # Extract the actual game data
         game_data = {k: v for k, v in game_response.items() if k != "success"}
         return game_data
-    
+
     return game_response
 
-@router.post("/{game_id}/start")
-async def start_game(
+@router.get("/{game_id}/turns/{turn_number}")
+def get_game_state_at_turn(
     game_id: str,
+    turn_number: int,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
+):
+    """Get the board, scores and your rack as they were after a given turn (0 = game start)."""
+    game = db.query(Game).filter(Game.id == game_id).first()
+    if not game:
+        raise HTTPException(404, "Game not found")
+
+    is_player = db.query(Player).filter(Player.game_id == game_id, Player.user_id == current_user.id).first()
+    if not is_player and game.creator_id != current_user.id:
+        raise HTTPException(403, "You are not part of this game.")
+
+    try:
+        game_state = replay_game_state(db, game, turn_number)
+    except TurnNotAvailable as e:
+        raise HTTPException(404, str(e))
+
+    return {"success": True, "game_id": game_id, **turn_state_data(game_state, [current_user.id])}
+
+@router.post("/{game_id}/start")
+async def start_game(
+    game_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
 ):
     """Start a game."""
+    current_player_id = await db.run_sync(_start_game, game_id, current_user)
+    
+    # Notify websocket clients about game start
+    try:
+        await manager.broadcast_to_game(game_id, {
+            "type": "game_started",
+            "game_id": game_id,
+            "current_player_id": current_player_id,
+            "message": "Game has started!"
+        })
+    except Exception as e:
+        logger.error(f"WebSocket broadcast error after game start {game_id}: {e}")
+    
+    return {"success": True}
+
+def _start_game(db: Session, game_id: str, current_user: User) -> int:
+    """Deal the racks and commit the start; returns the first player's id."""
     # Get game from database
     game = db.query(Game).filter(Game.id == game_id).first()
     if not game:
@@ -1332,7 +1385,7 @@ async def start_game(
         )
     
     # Get test mode from game state
-    state_data = json.loads(game.state) if game.state else {}
+    state_data = decode_state(game.state)
     short_game = state_data.get("test_mode", False)  # Keep "test_mode" key for backward compatibility
     
     # Create letter bag (use short game mode if enabled)
@@ -1355,85 +1408,50 @@ async def start_game(
     logger.info(f"Game {game_id} started with {len(players)} players. First player randomly selected: {first_player.user.username} (ID: {first_player.user_id})")
     
     # Update the game state JSON to reflect the started game
-    state_data = json.loads(game.state) if game.state else {}
+    state_data = decode_state(game.state)
     state_data.update({
         "phase": GamePhase.IN_PROGRESS.value,
         "letter_bag": letter_bag,
         "turn_number": 0,
         "consecutive_passes": 0
     })
-    game.state = json.dumps(state_data, cls=GameStateEncoder)
-    
-    # Save changes
-    db.commit()
-    
-    # Notify websocket clients about game start
-    try:
-        await manager.broadcast_to_game(game_id, {
-            "type": "game_started",
-            "game_id": game_id,
-            "current_player_id": game.current_player_id,
-            "message": "Game has started!"
-        })
-    except Exception as e:
-        logger.error(f"WebSocket broadcast error after game start {game_id}: {e}")
+    game.state = encode_state(state_data)
+    start_move_log(db, game, players, len(letter_bag))  # Turn 0 of the move log
     
-    return {"success": True}
+    # Save changes; if the game was started concurrently, this start is rejected (409)
+    commit_game_state(db, game)
+    return game.current_player_id
 
 @router.post("/{game_id}/move")
 async def make_move(
     game_id: str,
     move_data: List[dict], # [{"row": int, "col": int, "letter": str, "is_blank": bool (optional), "tile_id": str (optional)}]
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    state_version: Optional[int] = Query(None, description="Game state_version the client acted on; a stale version is rejected with 409"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
 ):
-    game = db.query(Game).filter(Game.id == game_id).first()
-    if not game:
-        raise HTTPException(404, "Game not found")
-    
-    if game.status != GameStatus.IN_PROGRESS:
-        raise HTTPException(400, f"Game is not in progress. Status: {game.status.value}")
-        
-    if game.current_player_id != current_user.id:
-        raise HTTPException(403, "Not your turn")
-
-    # Load game state from DB JSON (game.state)
-    persisted_state_data = json.loads(game.state)
-    game_state = GameState(language=game.language)
-    game_state.board = reconstruct_board_from_json(persisted_state_data.get("board"))
-    game_state.phase = GamePhase(persisted_state_data.get("phase", GamePhase.IN_PROGRESS.value)) # Default to IN_PROGRESS
-    game_state.current_player_id = game.current_player_id # From Game table
-    
-    # Reconstruct LetterBag object from persisted data
-    letter_bag_data = persisted_state_data.get("letter_bag", [])
-    if isinstance(letter_bag_data, dict) and "letters" in letter_bag_data:
-        # If it was serialized as a LetterBag object with letters attribute
-        game_state.letter_bag = letter_bag_data["letters"]
-    else:
-        # If it was serialized as a simple list
-        game_state.letter_bag = letter_bag_data
-    
-    game_state.turn_number = persisted_state_data.get("turn_number", 0)
-    game_state.consecutive_passes = persisted_state_data.get("consecutive_passes", 0)
-    # Restore center_used flag from persisted state, or detect from board if not available
-    if "center_used" in persisted_state_data:
-        game_state.center_used = persisted_state_data["center_used"]
-    else:
-        # Fallback for existing games: detect if center is used by checking the board
-        game_state.center_used = detect_center_used_from_board(game_state.board)
+    game, db_players = await db.run_sync(_load_turn, game_id, state_version, current_user)
+    # End the read transaction: no connection is held while the move is validated and
+    # scored in the threadpool. The turn is committed against the state_version read
+    # here, so a concurrent write in between still ends in a 409.
+    await db.commit()
+    turn = await run_in_threadpool(_play_placement, game, db_players, move_data, current_user)
+    response_data, broadcast_payload = await db.run_sync(_commit_placement, game, db_players, turn, current_user)
+    await broadcast_turn(game_id, broadcast_payload, "move")
+    return response_data
 
-    # Load player racks and scores from Player table into GameState
-    db_players = db.query(Player).filter(Player.game_id == game_id).all()
-    for p_rec in db_players:
-        game_state.players[p_rec.user_id] = p_rec.rack 
-        game_state.scores[p_rec.user_id] = p_rec.score      
+def _play_placement(game: Game, db_players: List[Player], move_data: List[dict], current_user: User) -> PlayedTurn:
+    """Validate and score a placement on the game's GameState (threadpool: no session use)."""
+    # Active games reuse this worker's live GameState while games.state_version matches;
+    # otherwise it is rebuilt from game.state. Racks and scores come from the Player table.
+    game_state = game_state_cache.checkout(game, db_players)
 
     # Defensive: Ensure current user is in game_state.players and has a rack
     if current_user.id not in game_state.players:
-        logger.error(f"Player {current_user.id} not found in game {game_id} players: {list(game_state.players.keys())}")
+        logger.error(f"Player {current_user.id} not found in game {game.id} players: {list(game_state.players.keys())}")
         raise HTTPException(403, "You are not a player in this game.")
     if not isinstance(game_state.players[current_user.id], str) or not game_state.players[current_user.id]:
-        logger.error(f"Player {current_user.id} has no rack in game {game_id}. Players: {game_state.players}")
+        logger.error(f"Player {current_user.id} has no rack in game {game.id}. Players: {game_state.players}")
         raise HTTPException(500, "Player rack is missing or invalid.")
 
     # Convert move_data from API (list of dicts) to GameState format (list of tuples)
@@ -1451,7 +1469,7 @@ async def make_move(
             logger.error(f"Invalid move data: {m_item}")
             raise HTTPException(400, "Invalid move data format. Each item must have 'row', 'col', 'letter'.")
 
-    logger.info(f"Player {current_user.id} making move in game {game_id}: {parsed_move_positions}, rack: {game_state.players[current_user.id]}")
+    logger.info(f"Player {current_user.id} making move in game {game.id}: {parsed_move_positions}, rack: {game_state.players[current_user.id]}")
 
     # Load dictionary for word validation
     try:
@@ -1472,6 +1490,8 @@ async def make_move(
         raise HTTPException(500, f"Internal error during move: {e}")
     
     if not success:
+        # Rejected placements leave the state untouched, so it stays cached
+        game_state_cache.checkin(game.id, game_state, game.state_version)
         raise HTTPException(400, message) # Move was invalid
     
     # Get detailed score breakdown for this move
@@ -1483,6 +1503,27 @@ async def make_move(
         logger.error(f"🔍 Error calculating score breakdown: {e}")
         score_breakdown = None
     
+    # Check for game completion
+    is_game_over, completion_details = game_state.check_game_end() # This updates game_state.phase too
+    
+    return PlayedTurn(
+        game_state=game_state,
+        message=message,
+        state=serialize_game_state(game_state, completion_details if is_game_over else None),
+        game_over=is_game_over,
+        completion_details=completion_details,
+        points=points_gained,
+        tiles=tuple(parsed_move_positions),
+        score_breakdown=score_breakdown
+    )
+
+def _commit_placement(db: Session, game: Game, db_players: List[Player], turn: PlayedTurn,
+                      current_user: User) -> Tuple[dict, dict]:
+    """Commit a played placement; returns the response and the game_update to broadcast."""
+    game_state = turn.game_state
+    previous_version = game.state_version
+    scores_before = {p.user_id: p.score for p in db_players}
+    
     # Update Game table
     game.current_player_id = game_state.current_player_id # game_state updates this
     
@@ -1491,95 +1532,59 @@ async def make_move(
         p_rec.rack = "".join(game_state.players[p_rec.user_id])
         p_rec.score = game_state.scores[p_rec.user_id]
     
-    # Record the move in Moves table
-    move_entry = Move(
-        game_id=game_id,
-        player_id=current_user.id,
-        move_data=json.dumps({
-            "type": MoveType.PLACE.value, 
-            "data": move_data, 
-            "points": points_gained,
-            "turn_number": game_state.turn_number,
-            "words": []  # TODO: Extract words formed from the move validation
-        }), # Store move type, data, points, turn number, and words in JSON
-        timestamp=datetime.now(timezone.utc)
-    )
-    db.add(move_entry)
-    
-    # Check for game completion
-    is_game_over, completion_details = game_state.check_game_end() # This updates game_state.phase too
-    
-    if is_game_over:
+    if turn.game_over:
         game.status = GameStatus.COMPLETED
         game.completed_at = datetime.now(timezone.utc)
-        # Final scores are in game_state.scores, update Player table one last time
-        for p_rec in db_players:
-            p_rec.score = game_state.scores[p_rec.user_id]
-
 
-    # Persist updated GameState to game.state JSON
-    updated_state_json = {
-        "board": game_state.board,
-        "phase": game_state.phase.value,
-        "language": game.language, # Unchanged
-        "multipliers": persisted_state_data.get("multipliers"), # Unchanged by move
-        "letter_bag": game_state.letter_bag,
-        "turn_number": game_state.turn_number,
-        "consecutive_passes": game_state.consecutive_passes,
-        "center_used": game_state.center_used,  # Include center_used flag
-        "player_racks_snapshot": {uid: list(rack) for uid, rack in game_state.players.items()}, # Snapshot current racks
-        "player_scores_snapshot": game_state.scores.copy(), # Snapshot current scores
-        "completion_data": completion_details if is_game_over else None
-    }
-    game.state = json.dumps(updated_state_json, cls=GameStateEncoder)
+    # Persist updated GameState to game.state JSON (conditional on the state_version read above)
+    game.state = turn.state
     
-    db.commit()
+    tiles = [{"row": pos.row, "col": pos.col, "letter": tile.letter, "is_blank": tile.is_blank}
+             for pos, tile in turn.tiles]
+    words = [word["word"] for word in turn.score_breakdown["words_formed"]] if turn.score_breakdown else []
+    
+    # Append the move event to the move log
+    append_move(db, game, MoveEvent(
+        type=MoveType.PLACE.value,
+        turn_number=game_state.turn_number,
+        player_id=current_user.id,
+        rack_after="".join(game_state.players[current_user.id]),
+        score_after=game_state.scores[current_user.id],
+        consecutive_passes=game_state.consecutive_passes,
+        next_player_id=game.current_player_id,
+        tiles=tiles,
+        points=turn.points,
+        words=words,
+        letter_bag_count=len(game_state.letter_bag)
+    ), db_players)
+    new_state_version = commit_game_turn(db, game, game_state)
     
     # Prepare HTTP response
     response_data = {
-        "message": message,
-        "points_gained": points_gained,
+        "message": turn.message,
+        "state_version": new_state_version,
+        "points_gained": turn.points,
         "your_new_rack": list(game_state.players[current_user.id]),
         "next_player_id": game.current_player_id,
-        "game_over": is_game_over,
-        "score_breakdown": score_breakdown if score_breakdown else {"error": "Score breakdown calculation failed"}
+        "game_over": turn.game_over,
+        "score_breakdown": turn.score_breakdown if turn.score_breakdown else {"error": "Score breakdown calculation failed"}
     }
-    if is_game_over:
-        response_data["completion_details"] = completion_details
-    
-    # Broadcast game update via WebSocket
-    try:
-        # Get recent moves for all players except the one who just moved (for highlighting)
-        recent_moves = get_recent_moves_data(game_id, current_user.id, db)
-        
-        broadcast_payload = {
-            "type": "game_update",
-            "game_id": game_id,
-            "board": game_state.board,
-            "scores": {p.user_id: p.score for p in db_players}, # Fresh scores from DB
-            "current_player_id": game.current_player_id,
-            "last_move": {
-                "player_id": current_user.id,
-                "username": current_user.username,
-                "move_data": move_data, # The move that was just made
-                "points": points_gained,
-                "score_breakdown": score_breakdown
-            },
-            "game_over": is_game_over,
-            "completion_details": completion_details if is_game_over else None,
-            "letter_bag_count": len(game_state.letter_bag),
-            "turn_number": game_state.turn_number,
-            "consecutive_passes": game_state.consecutive_passes,
-            "recent_moves": recent_moves
-        }
-        await manager.broadcast_to_game(game.id, broadcast_payload)
-    except Exception as e: # pragma: no cover
-        logger.error(f"WebSocket broadcast error after move in game {game_id}: {e}")
-    
-    return response_data
+    if turn.game_over:
+        response_data["completion_details"] = turn.completion_details
+    
+    # Delta for WebSocket clients
+    broadcast_payload = game_update_delta(
+        game, previous_version, new_state_version, current_user, MoveType.PLACE.value, scores_before, db_players,
+        tiles=tiles,
+        points=turn.points,
+        words=words,
+        game_over=turn.game_over,
+        completion_details=turn.completion_details if turn.game_over else None
+    )
+    return response_data, broadcast_payload
 
 @router.post("/{game_id}/test-move")
-async def test_move(
+def test_move(
     game_id: str,
     move_data: List[dict], # [{"row": int, "col": int, "letter": str, "is_blank": bool (optional), "tile_id": str (optional)}]
     skip_turn_validation: bool = Body(False, description="Skip turn validation for testing purposes"),
@@ -1613,7 +1618,7 @@ async def test_move(
         raise HTTPException(403, "Not your turn (use skip_turn_validation=true to bypass for testing)")
 
     # Load game state from DB JSON (game.state)
-    persisted_state_data = json.loads(game.state)
+    persisted_state_data = decode_state(game.state)
     game_state = GameState(language=game.language)
     game_state.board = reconstruct_board_from_json(persisted_state_data.get("board"))
     game_state.phase = GamePhase(persisted_state_data.get("phase", GamePhase.IN_PROGRESS.value))
@@ -1745,48 +1750,21 @@ async def test_move(
 @router.post("/{game_id}/pass")
 async def pass_turn(
     game_id: str,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    state_version: Optional[int] = Query(None, description="Game state_version the client acted on; a stale version is rejected with 409"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
 ):
-    game = db.query(Game).filter(Game.id == game_id).first()
-    if not game:
-        raise HTTPException(404, "Game not found")
-
-    if game.status != GameStatus.IN_PROGRESS:
-        raise HTTPException(400, f"Game is not in progress. Status: {game.status.value}")
-
-    if game.current_player_id != current_user.id:
-        raise HTTPException(403, "Not your turn")
-
-    # Load game state
-    persisted_state_data = json.loads(game.state)
-    game_state = GameState(language=game.language)
-    game_state.board = reconstruct_board_from_json(persisted_state_data.get("board"))
-    game_state.phase = GamePhase(persisted_state_data.get("phase", GamePhase.IN_PROGRESS.value))
-    game_state.current_player_id = game.current_player_id
-    
-    # Reconstruct LetterBag object from persisted data
-    letter_bag_data = persisted_state_data.get("letter_bag", [])
-    if isinstance(letter_bag_data, dict) and "letters" in letter_bag_data:
-        # If it was serialized as a LetterBag object with letters attribute
-        game_state.letter_bag = letter_bag_data["letters"]
-    else:
-        # If it was serialized as a simple list
-        game_state.letter_bag = letter_bag_data
-    
-    game_state.turn_number = persisted_state_data.get("turn_number", 0)
-    game_state.consecutive_passes = persisted_state_data.get("consecutive_passes", 0)
-    # Restore center_used flag from persisted state, or detect from board if not available
-    if "center_used" in persisted_state_data:
-        game_state.center_used = persisted_state_data["center_used"]
-    else:
-        # Fallback for existing games: detect if center is used by checking the board
-        game_state.center_used = detect_center_used_from_board(game_state.board)
+    game, db_players = await db.run_sync(_load_turn, game_id, state_version, current_user)
+    await db.commit()  # As in make_move: no connection is held while the turn is played
+    turn = await run_in_threadpool(_play_pass, game, db_players, current_user)
+    response_data, broadcast_payload = await db.run_sync(_commit_pass, game, db_players, turn, current_user)
+    await broadcast_turn(game_id, broadcast_payload, "pass")
+    return response_data
 
-    db_players = db.query(Player).filter(Player.game_id == game_id).all()
-    for p_rec in db_players:
-        game_state.players[p_rec.user_id] = p_rec.rack
-        game_state.scores[p_rec.user_id] = p_rec.score
+def _play_pass(game: Game, db_players: List[Player], current_user: User) -> PlayedTurn:
+    """Pass on the game's GameState (threadpool: no session use)."""
+    # Load game state (cached GameState while games.state_version matches)
+    game_state = game_state_cache.checkout(game, db_players)
     
     # Make pass move
     success, message, _ = game_state.make_move( # No points for pass
@@ -1799,135 +1777,91 @@ async def pass_turn(
     if not success: # pragma: no cover # Should always succeed for PASS if state is consistent
         raise HTTPException(400, message)
     
+    # Check for game completion (e.g., too many consecutive passes)
+    is_game_over, completion_details = game_state.check_game_end()
+    
+    return PlayedTurn(
+        game_state=game_state,
+        message=message,
+        # consecutive_passes updated by make_move(PASS)
+        state=serialize_game_state(game_state, completion_details if is_game_over else None),
+        game_over=is_game_over,
+        completion_details=completion_details
+    )
+
+def _commit_pass(db: Session, game: Game, db_players: List[Player], turn: PlayedTurn,
+                 current_user: User) -> Tuple[dict, dict]:
+    """Commit a pass; returns the response and the game_update to broadcast."""
+    game_state = turn.game_state
+    previous_version = game.state_version
+    scores_before = {p.user_id: p.score for p in db_players}
+    
     # Update Game table
     game.current_player_id = game_state.current_player_id 
     
     # No change to Player records (rack, score) for a pass
-    
-    # Record pass action in Moves table
-    move_entry = Move(
-        game_id=game_id,
-        player_id=current_user.id,
-        move_data=json.dumps({"type": MoveType.PASS.value, "action": "pass", "points": 0}),
-        timestamp=datetime.now(timezone.utc)
-    )
-    db.add(move_entry)
-    
-    # Check for game completion (e.g., too many consecutive passes)
-    is_game_over, completion_details = game_state.check_game_end()
-    if is_game_over:
+    if turn.game_over:
         game.status = GameStatus.COMPLETED
         game.completed_at = datetime.now(timezone.utc)
         # Update final scores in Player table if check_game_end modified them (e.g. unplayed letters)
         for p_rec in db_players:
             p_rec.score = game_state.scores[p_rec.user_id]
 
-
     # Persist updated GameState to game.state JSON
-    updated_state_json = {
-        "board": game_state.board, # Unchanged by pass
-        "phase": game_state.phase.value,
-        "language": game.language,
-        "multipliers": persisted_state_data.get("multipliers"),
-        "letter_bag": game_state.letter_bag, # Unchanged by pass
-        "turn_number": game_state.turn_number,
-        "consecutive_passes": game_state.consecutive_passes, # Updated by make_move(PASS)
-        "center_used": game_state.center_used,  # Include center_used flag
-        "player_racks_snapshot": {uid: list(rack) for uid, rack in game_state.players.items()},
-        "player_scores_snapshot": game_state.scores.copy(),
-        "completion_data": completion_details if is_game_over else None
-    }
-    game.state = json.dumps(updated_state_json, cls=GameStateEncoder)
-
-    db.commit()
+    game.state = turn.state
+    
+    # Append the pass to the move log
+    append_move(db, game, MoveEvent(
+        type=MoveType.PASS.value,
+        turn_number=game_state.turn_number,
+        player_id=current_user.id,
+        rack_after="".join(game_state.players[current_user.id]),
+        score_after=game_state.scores[current_user.id],
+        consecutive_passes=game_state.consecutive_passes,
+        next_player_id=game.current_player_id,
+        letter_bag_count=len(game_state.letter_bag)
+    ), db_players)
+    new_state_version = commit_game_turn(db, game, game_state)
     
     response_data = {
         "message": "Turn passed successfully.",
+        "state_version": new_state_version,
         "next_player_id": game.current_player_id,
-        "game_over": is_game_over
+        "game_over": turn.game_over
     }
-    if is_game_over:
-        response_data["completion_details"] = completion_details
-    
-    # Broadcast game update
-    try:
-        broadcast_payload = {
-            "type": "game_update",
-            "game_id": game_id,
-            "current_player_id": game.current_player_id,
-            "last_action": {
-                "type": MoveType.PASS.value,
-                "player_id": current_user.id,
-                "username": current_user.username,
-            },
-            "game_over": is_game_over,
-            "completion_details": completion_details if is_game_over else None,
-            "letter_bag_count": len(game_state.letter_bag),
-            "turn_number": game_state.turn_number,
-            "consecutive_passes": game_state.consecutive_passes,
-            "scores": {p.user_id: p.score for p in db_players}, # Scores don't change on pass, but good to send
-            "recent_moves": get_recent_moves_data(game_id, current_user.id, db)
-        }
-        await manager.broadcast_to_game(game.id, broadcast_payload)
-    except Exception as e: # pragma: no cover
-        logger.error(f"WebSocket broadcast error after pass in game {game_id}: {e}")
-    
-    return response_data
+    if turn.game_over:
+        response_data["completion_details"] = turn.completion_details
+    
+    # Delta for WebSocket clients (scores only change when the passes end the game)
+    broadcast_payload = game_update_delta(
+        game, previous_version, new_state_version, current_user, MoveType.PASS.value, scores_before, db_players,
+        game_over=turn.game_over,
+        completion_details=turn.completion_details if turn.game_over else None
+    )
+    return response_data, broadcast_payload
 
 @router.post("/{game_id}/exchange")
 async def exchange_letters(
     game_id: str,
     letters_to_exchange: List[str] = Body(..., embed=True),  # Explicitly expect {"letters_to_exchange": ["A", "B"]}
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    state_version: Optional[int] = Query(None, description="Game state_version the client acted on; a stale version is rejected with 409"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
 ):
-    game = db.query(Game).filter(Game.id == game_id).first()
-    if not game:
-        raise HTTPException(404, "Game not found")
-
-    if game.status != GameStatus.IN_PROGRESS:
-        raise HTTPException(400, f"Game is not in progress. Status: {game.status.value}")
-
-    if game.current_player_id != current_user.id:
-        raise HTTPException(403, "Not your turn")
-
+    game, db_players = await db.run_sync(_load_turn, game_id, state_version, current_user)
     if not letters_to_exchange:
         raise HTTPException(400, "No letters provided for exchange.")
+    await db.commit()  # As in make_move: no connection is held while the turn is played
+    turn = await run_in_threadpool(_play_exchange, game, db_players, letters_to_exchange, current_user)
+    response_data, broadcast_payload = await db.run_sync(_commit_exchange, game, db_players, turn, current_user)
+    await broadcast_turn(game_id, broadcast_payload, "exchange")
+    return response_data
 
-    # Load game state
-    persisted_state_data = json.loads(game.state)
-    game_state = GameState(language=game.language)
-    game_state.board = reconstruct_board_from_json(persisted_state_data.get("board"))
-    game_state.phase = GamePhase(persisted_state_data.get("phase", GamePhase.IN_PROGRESS.value))
-    game_state.current_player_id = game.current_player_id
-    
-    # Reconstruct LetterBag object from persisted data
-    letter_bag_data = persisted_state_data.get("letter_bag", [])
-    if isinstance(letter_bag_data, dict) and "letters" in letter_bag_data:
-        # If it was serialized as a LetterBag object with letters attribute
-        game_state.letter_bag = letter_bag_data["letters"]
-    else:
-        # If it was serialized as a simple list
-        game_state.letter_bag = letter_bag_data
-    
-    game_state.turn_number = persisted_state_data.get("turn_number", 0)
-    game_state.consecutive_passes = persisted_state_data.get("consecutive_passes", 0)
-    # Restore center_used flag from persisted state, or detect from board if not available
-    if "center_used" in persisted_state_data:
-        game_state.center_used = persisted_state_data["center_used"]
-    else:
-        # Fallback for existing games: detect if center is used by checking the board
-        game_state.center_used = detect_center_used_from_board(game_state.board)
-
-    db_players = db.query(Player).filter(Player.game_id == game_id).all()
-    current_player_record = None
-    for p_rec in db_players:
-        game_state.players[p_rec.user_id] = p_rec.rack
-        game_state.scores[p_rec.user_id] = p_rec.score # Scores don't change on exchange
-        if p_rec.user_id == current_user.id:
-            current_player_record = p_rec
-            
-    if not current_player_record: # Should not happen
+def _play_exchange(game: Game, db_players: List[Player], letters_to_exchange: List[str], current_user: User) -> PlayedTurn:
+    """Exchange letters on the game's GameState (threadpool: no session use)."""
+    # Load game state (cached GameState while games.state_version matches)
+    game_state = game_state_cache.checkout(game, db_players)
+    if not any(p_rec.user_id == current_user.id for p_rec in db_players): # Should not happen
         raise HTTPException(404, "Player not found in game")
     
     # Make exchange move
@@ -1941,71 +1875,61 @@ async def exchange_letters(
     if not success:
         raise HTTPException(400, message) # e.g., not enough letters in bag, letter not in rack
     
+    # No game end check needed specifically for exchange, but turn advances.
+    # consecutive_passes is reset by game_state.make_move
+    return PlayedTurn(
+        game_state=game_state,
+        message=message,
+        # Letter bag and turn updated, no completion data
+        state=serialize_game_state(game_state),
+        new_rack="".join(new_rack_after_exchange),
+        exchanged_count=len(letters_to_exchange)
+    )
+
+def _commit_exchange(db: Session, game: Game, db_players: List[Player], turn: PlayedTurn,
+                     current_user: User) -> Tuple[dict, dict]:
+    """Commit an exchange; returns the response and the game_update to broadcast."""
+    game_state = turn.game_state
+    previous_version = game.state_version
+    scores_before = {p.user_id: p.score for p in db_players}
+    current_player_record = next(p_rec for p_rec in db_players if p_rec.user_id == current_user.id)
+    
     # Update Game table
     game.current_player_id = game_state.current_player_id
     
     # Update player's rack in Player table
-    current_player_record.rack = "".join(new_rack_after_exchange)
-    
-    # Record exchange action in Moves table
-    move_entry = Move(
-        game_id=game_id,
-        player_id=current_user.id,
-        move_data=json.dumps({"action": "exchange", "letters_exchanged_count": len(letters_to_exchange)}), # Don't log specific letters
-        timestamp=datetime.now(timezone.utc)
-    )
-    db.add(move_entry)
-
-    # No game end check needed specifically for exchange, but turn advances.
-    # consecutive_passes is reset by game_state.make_move
+    current_player_record.rack = turn.new_rack
     
     # Persist updated GameState to game.state JSON
-    updated_state_json = {
-        "board": game_state.board, # Unchanged
-        "phase": game_state.phase.value, # Should remain IN_PROGRESS
-        "language": game.language,
-        "multipliers": persisted_state_data.get("multipliers"),
-        "letter_bag": game_state.letter_bag, # Updated
-        "turn_number": game_state.turn_number, # Updated
-        "consecutive_passes": game_state.consecutive_passes, # Reset
-        "center_used": game_state.center_used,  # Include center_used flag
-        "player_racks_snapshot": {uid: list(rack) for uid, rack in game_state.players.items()},
-        "player_scores_snapshot": game_state.scores.copy(),
-        # No completion data from exchange
-    }
-    game.state = json.dumps(updated_state_json, cls=GameStateEncoder)
+    game.state = turn.state
     
-    db.commit()
+    # Append the exchange to the move log (the letters themselves are only in the rack)
+    append_move(db, game, MoveEvent(
+        type=MoveType.EXCHANGE.value,
+        turn_number=game_state.turn_number,
+        player_id=current_user.id,
+        rack_after=current_player_record.rack,
+        score_after=current_player_record.score,
+        consecutive_passes=game_state.consecutive_passes,
+        next_player_id=game.current_player_id,
+        exchanged_count=turn.exchanged_count,
+        letter_bag_count=len(game_state.letter_bag)
+    ), db_players)
+    new_state_version = commit_game_turn(db, game, game_state)
     
     response_data = {
         "message": "Letters exchanged successfully.",
-        "your_new_rack": list(new_rack_after_exchange),
+        "state_version": new_state_version,
+        "your_new_rack": list(turn.new_rack),
         "next_player_id": game.current_player_id
     }
     
-    # Broadcast game update
-    try:
-        broadcast_payload = {
-            "type": "game_update",
-            "game_id": game_id,
-            "current_player_id": game.current_player_id,
-            "last_action": {
-                "type": MoveType.EXCHANGE.value,
-                "player_id": current_user.id,
-                "username": current_user.username,
-                "exchange_count": len(letters_to_exchange) # Inform how many letters were exchanged
-            },
-            "letter_bag_count": len(game_state.letter_bag),
-            "turn_number": game_state.turn_number,
-            "consecutive_passes": game_state.consecutive_passes, # Will be 0
-            "scores": {p.user_id: p.score for p in db_players}, # Scores don't change
-            "recent_moves": get_recent_moves_data(game_id, current_user.id, db)
-        }
-        await manager.broadcast_to_game(game_id, broadcast_payload)
-    except Exception as e: # pragma: no cover
-        logger.error(f"WebSocket broadcast error after exchange in game {game_id}: {e}")
-            
-    return response_data
+    # Delta for WebSocket clients
+    broadcast_payload = game_update_delta(
+        game, previous_version, new_state_version, current_user, MoveType.EXCHANGE.value, scores_before, db_players,
+        exchange_count=turn.exchanged_count # Inform how many letters were exchanged
+    )
+    return response_data, broadcast_payload
 
 # This endpoint is likely DEPRECATED as dealing is part of move/exchange.
 @router.post("/{game_id}/deal")
@@ -2027,7 +1951,7 @@ def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
     return db.query(User).filter(User.id == user_id).first()
 
 @router.post("/{game_id}/validate_words")
-async def validate_words(
+def validate_words(
     game_id: str,
     words: List[str] = Body(..., description="List of words to validate", example=["HELLO", "WORLD"]),
     include_placements: bool = Body(False, description="Whether to include possible placements for valid words"),
@@ -2064,7 +1988,7 @@ async def validate_words(
         dictionary = load_wordlist(game.language)
         
         # Get current game state if we need to find placements
-        state_data = json.loads(game.state) if include_placements else None
+        state_data = decode_state(game.state) if include_placements else None
         board = state_data.get("board", [[None]*15 for _ in range(15)]) if include_placements else None
         
         # Get player's rack if we need to find placements
@@ -2164,7 +2088,7 @@ def get_game_invitations(
     }
 
 @router.post("/{game_id}/auto-start")
-async def auto_start_game(
+def auto_start_game(
     game_id: str,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -2196,7 +2120,7 @@ async def auto_start_game(
         )
     
     # Get test mode from game state
-    state_data = json.loads(game.state) if game.state else {}
+    state_data = decode_state(game.state)
     short_game = state_data.get("test_mode", False)  # Keep "test_mode" key for backward compatibility
     
     # Create letter bag (use short game mode if enabled)
@@ -2219,21 +2143,22 @@ async def auto_start_game(
     logger.info(f"Game {game_id} auto-started with {len(players)} players. First player randomly selected: {first_player.user.username} (ID: {first_player.user_id})")
     
     # Update the game state JSON to reflect the started game
-    state_data = json.loads(game.state) if game.state else {}
+    state_data = decode_state(game.state)
     state_data.update({
         "phase": GamePhase.IN_PROGRESS.value,
         "letter_bag": letter_bag,
         "turn_number": 0,
         "consecutive_passes": 0
     })
-    game.state = json.dumps(state_data, cls=GameStateEncoder)
+    game.state = encode_state(state_data)
+    start_move_log(db, game, players, len(letter_bag))  # Turn 0 of the move log
     
-    # Save changes
-    db.commit()
+    # Save changes; if the game was started concurrently, this start is rejected (409)
+    commit_game_state(db, game)
     
     # Notify websocket clients about game start
     try:
-        await manager.broadcast_to_game(game_id, {
+        from_thread.run(manager.broadcast_to_game, game_id, {
             "type": "game_auto_started",
             "game_id": game_id,
             "current_player_id": game.current_player_id,
@@ -2548,6 +2473,7 @@ def add_computer_player_endpoint(
             score=0
         )
         db.add(computer_player)
+        game.computer_difficulty = request.difficulty
         db.commit()
         
         computer_info = {
@@ -2575,18 +2501,70 @@ def add_computer_player_endpoint(
 @router.post("/{game_id}/computer-move")
 async def trigger_computer_move(
     game_id: str,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    state_version: Optional[int] = Query(None, description="Game state_version the client acted on; a stale version is rejected with 409"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
 ):
     """Trigger a computer player move (for testing or manual triggering)."""
     
     # Validate computer player is ready
     validate_computer_player_availability()
     
+    game, computer_player, all_players = await db.run_sync(_load_computer_turn, game_id, state_version, current_user)
+    # End the read transaction: no connection is held while the pool searches. The
+    # move is committed against the state_version read here, so a concurrent write
+    # in between still ends in a 409.
+    await db.commit()
+    
+    try:
+        # Parse game state
+        game_state_data = await run_in_threadpool(decode_state, game.state)
+        
+        difficulty = game.computer_difficulty or "medium"  # Games created before difficulties were stored
+        
+        # Log rack information for debugging
+        logger.info(f"🤖 Computer player starting move for game {game_id} ({difficulty})")
+        logger.info(f"   Computer rack: '{computer_player.rack}' (length: {len(computer_player.rack)})")
+        
+        # 🚀 Search in the computer move process pool, off the event loop; the workers
+        # hold the dictionary and move generator preloaded
+        from app.computer_move_pool import computer_move_pool, ComputerMovePoolBusy
+        try:
+            move_result = await computer_move_pool.make_move(
+                game_state_data=game_state_data,
+                rack=computer_player.rack,
+                language=game.language,
+                difficulty=difficulty
+            )
+        except ComputerMovePoolBusy as e:
+            logger.warning(f"⚠️ Computer move for game {game_id} rejected: {e}")
+            raise HTTPException(503, "Computer player is busy, please retry shortly")
+        
+        # Scoring and encoding the new state run in the threadpool too (see PlayedTurn)
+        turn = await run_in_threadpool(_play_computer_move, game, computer_player, all_players, game_state_data, move_result)
+        response_data, broadcast_payload = await db.run_sync(_apply_computer_move, game, computer_player, all_players, turn)
+        
+        # Notify via WebSocket
+        await manager.broadcast_to_game(game_id, broadcast_payload)
+        
+        return response_data
+        
+    except HTTPException:
+        await db.rollback()
+        raise
+    except Exception as e:
+        logger.error(f"Computer move failed in game {game_id}: {e}")
+        await db.rollback()
+        raise HTTPException(500, f"Computer move failed: {str(e)}")
+
+def _load_computer_turn(db: Session, game_id: str, state_version: Optional[int],
+                        current_user: User) -> Tuple[Game, Player, List[Player]]:
+    """Check that the computer player is up in this game; returns the game, the computer's and all player rows."""
     # Get game
     game = db.query(Game).filter(Game.id == game_id).first()
     if not game:
         raise HTTPException(404, "Game not found")
+    check_state_version(game, state_version)
     
     # Check if user is part of the game
     user_player = db.query(Player).filter(
@@ -2611,144 +2589,139 @@ async def trigger_computer_move(
     ).first() if computer_user_id else None
     if not computer_player:
         raise HTTPException(400, "No computer player in this game")
-    
-    try:
-        # Parse game state
-        game_state_data = json.loads(game.state)
-        
-        # Load wordlist for validation
-        wordlist = load_wordlist(game.language)
-        if not wordlist:
-            raise HTTPException(500, f"Wordlist not available for language {game.language}")
-        
-        # Convert Set to List for computer player
-        wordlist_list = list(wordlist)
-        
-        # 🚀 USE OPTIMIZED COMPUTER PLAYER ONLY - No fallbacks, clean implementation
-        from app.optimized_computer_player import get_optimized_computer_player
-        
-        # Get optimized computer player instance (with service-level caching)
-        computer = get_optimized_computer_player("medium")  # Default to medium difficulty
-        logger.info(f"🚀 Using OptimizedComputerPlayer for game {game_id}")
-        
-        # Log rack information for debugging
-        logger.info(f"🤖 Computer player starting move for game {game_id}")
-        logger.info(f"   Computer rack: '{computer_player.rack}' (length: {len(computer_player.rack)})")
-        
-        # Make computer move using optimized algorithm
-        move_result = computer.make_move(
-            game_state_data=game_state_data,
-            rack=computer_player.rack,
-            wordlist=wordlist_list  # Full wordlist - no artificial limits!
-        )
-        
-        if move_result is None:
-            # Computer is passing
-            # Update game state for pass
-            game_state_data["consecutive_passes"] = game_state_data.get("consecutive_passes", 0) + 1
-            game_state_data["turn_number"] = game_state_data.get("turn_number", 0) + 1
-            
-            # Move to next player
-            all_players = db.query(Player).filter(Player.game_id == game_id).all()
-            player_ids = [p.user_id for p in all_players]
-            next_player_id = get_next_player(player_ids, game.current_player_id)
-            game.current_player_id = next_player_id
-            
-            # Create pass move record
-            move = Move(
-                game_id=game_id,
-                player_id=computer_player.user_id,
-                move_data=json.dumps({"type": "PASS", "action": "pass", "points": 0}),
-                timestamp=datetime.now(timezone.utc)
-            )
-            db.add(move)
-            
-            move_type = "pass"
-            
-        else:
-            # Computer placed tiles
-            tiles_data = move_result.get("tiles", [])
-            
-            # Update board in game state
-            for tile in tiles_data:
-                game_state_data["board"][tile["row"]][tile["col"]] = {
-                    "letter": tile["letter"],
-                    "is_blank": tile.get("is_blank", False),
-                    "tile_id": tile.get("tile_id", f"comp_{uuid.uuid4().hex[:8]}")
-                }
-            
-            # Update computer player's rack (remove used letters)
-            rack_letters = list(computer_player.rack)
-            for tile in tiles_data:
-                if tile["letter"] in rack_letters:
-                    rack_letters.remove(tile["letter"])
-            
-            # Draw new letters to fill rack
-            letter_bag = game_state_data.get("letter_bag", [])
-            if len(letter_bag) > 0:
-                new_letters = draw_letters(letter_bag, 7 - len(rack_letters))
-                rack_letters.extend(new_letters)
-                # Update the letter bag in game state
-                game_state_data["letter_bag"] = letter_bag
-            computer_player.rack = "".join(rack_letters)
-            
-            # Update score
-            computer_player.score += move_result.get("score", 0)
-            
-            # Reset consecutive passes
-            game_state_data["consecutive_passes"] = 0
-            game_state_data["turn_number"] = game_state_data.get("turn_number", 0) + 1
-            
-            # Move to next player
-            all_players = db.query(Player).filter(Player.game_id == game_id).all()
-            player_ids = [p.user_id for p in all_players]
-            next_player_id = get_next_player(player_ids, game.current_player_id)
-            game.current_player_id = next_player_id
-            
-            # Create move record
-            move = Move(
-                game_id=game_id,
-                player_id=computer_player.user_id,
-                move_data=json.dumps({
-                    "type": "PLACE", 
-                    "data": tiles_data, 
-                    "points": move_result.get("score", 0),
-                    "word": move_result.get("word", ""),
-                    "rack_after": computer_player.rack
-                }),
-                timestamp=datetime.now(timezone.utc)
-            )
-            db.add(move)
-            
-            move_type = "place"
-        
-        # Update game state
-        game.state = json.dumps(game_state_data, cls=GameStateEncoder)
-        
-        db.commit()
-        
-        # Notify via WebSocket
-        await manager.broadcast_to_game(game_id, {
-            "type": "computer_move",
-            "move": move_result or {"type": "pass"},
-            "next_player_id": game.current_player_id,
-            "game_state": game_state_data,
-            "recent_moves": get_recent_moves_data(game_id, computer_player.user_id, db)
-        })
-        
-        logger.info(f"Computer player made move in game {game_id}: {move_type}")
-        
+    return game, computer_player, db.query(Player).filter(Player.game_id == game_id).all()
+
+def score_placement(language: str, game_state_data: dict, tiles: List[dict]) -> int:
+    """Points for placing tiles on the board in game_state_data, as GameState scores a move."""
+    game_state = GameState(language=language)
+    game_state.board = reconstruct_board_from_json(game_state_data.get("board"))
+    return game_state._calculate_points([
+        (Position(tile["row"], tile["col"]), PlacedTile(tile["letter"], tile.get("is_blank", False)))
+        for tile in tiles
+    ])
+
+def _play_computer_move(game: Game, computer_player: Player, all_players: List[Player], game_state_data: dict,
+                        move_result: Optional[dict]) -> dict:
+    """Apply the computer's move to the decoded game state (threadpool: no session use).
+
+    Returns what _apply_computer_move commits: the move type, points, tiles, the
+    computer's new rack, the next player and the updated (and encoded) state.
+    """
+    # Move to next player
+    player_ids = [p.user_id for p in all_players]
+    next_player_id = get_next_player(player_ids, game.current_player_id)
+    
+    if move_result is None or move_result.get("type") == "pass":
+        # Computer is passing
+        # Update game state for pass
+        game_state_data["consecutive_passes"] = game_state_data.get("consecutive_passes", 0) + 1
+        game_state_data["turn_number"] = game_state_data.get("turn_number", 0) + 1
         return {
-            "message": f"Computer player {move_type}",
+            "type": "pass",
             "move": move_result or {"type": "pass"},
-            "next_player_id": game.current_player_id,
-            "computer_score": computer_player.score
+            "points": 0,
+            "tiles": [],
+            "rack": computer_player.rack,
+            "next_player_id": next_player_id,
+            "game_state_data": game_state_data,
+            "state": encode_state(game_state_data)
         }
-        
-    except Exception as e:
-        logger.error(f"Computer move failed in game {game_id}: {e}")
-        db.rollback()
-        raise HTTPException(500, f"Computer move failed: {str(e)}")
+    
+    # Computer placed tiles
+    tiles_data = [{"row": tile["row"], "col": tile["col"], "letter": tile["letter"], "is_blank": tile.get("is_blank", False)}
+                  for tile in move_result.get("tiles", [])]
+    # Credited by the same scorer as a human's move on this board
+    points = score_placement(game.language, game_state_data, tiles_data)
+    
+    # Update board in game state
+    for tile in tiles_data:
+        game_state_data["board"][tile["row"]][tile["col"]] = {
+            "letter": tile["letter"],
+            "is_blank": tile["is_blank"]
+        }
+    
+    # Update computer player's rack (remove used letters, blanks come off as '?')
+    rack_letters = list(computer_player.rack)
+    for tile in tiles_data:
+        used = "?" if tile["is_blank"] else tile["letter"]
+        if used in rack_letters:
+            rack_letters.remove(used)
+    game_state_data["center_used"] = True
+    
+    # Draw new letters to fill rack
+    letter_bag = game_state_data.get("letter_bag", [])
+    if len(letter_bag) > 0:
+        new_letters = draw_letters(letter_bag, 7 - len(rack_letters))
+        rack_letters.extend(new_letters)
+        # Update the letter bag in game state
+        game_state_data["letter_bag"] = letter_bag
+    
+    # Reset consecutive passes
+    game_state_data["consecutive_passes"] = 0
+    game_state_data["turn_number"] = game_state_data.get("turn_number", 0) + 1
+    
+    return {
+        "type": "place",
+        "move": dict(move_result, score=points),
+        "points": points,
+        "tiles": tiles_data,
+        "rack": "".join(rack_letters),
+        "next_player_id": next_player_id,
+        "game_state_data": game_state_data,
+        "state": encode_state(game_state_data)
+    }
+
+def _apply_computer_move(db: Session, game: Game, computer_player: Player, all_players: List[Player],
+                         turn: dict) -> Tuple[dict, dict]:
+    """Commit the computer's move; returns the response and the computer_move delta to broadcast."""
+    game_id = game.id
+    previous_version = game.state_version
+    scores_before = {p.user_id: p.score for p in all_players}
+    move_type = turn["type"]
+    game_state_data = turn["game_state_data"]
+    
+    computer_player.rack = turn["rack"]
+    computer_player.score += turn["points"]
+    game.current_player_id = turn["next_player_id"]
+    
+    # Update game state; a concurrent trigger for the same turn loses here (409)
+    game.state = turn["state"]
+    
+    # Append the move event to the move log
+    append_move(db, game, MoveEvent(
+        type=MoveType.PLACE.value if move_type == "place" else MoveType.PASS.value,
+        turn_number=game_state_data["turn_number"],
+        player_id=computer_player.user_id,
+        rack_after=computer_player.rack,
+        score_after=computer_player.score,
+        consecutive_passes=game_state_data["consecutive_passes"],
+        next_player_id=game.current_player_id,
+        tiles=turn["tiles"],
+        points=turn["points"],
+        words=[turn["move"]["word"]] if move_type == "place" and turn["move"].get("word") else [],
+        letter_bag_count=len(game_state_data.get("letter_bag", []))
+    ), all_players)
+    
+    new_state_version = commit_game_state(db, game)
+    logger.info(f"Computer player made move in game {game_id}: {move_type}")
+    
+    return {
+        "message": f"Computer player {move_type}",
+        "move": turn["move"],
+        "next_player_id": game.current_player_id,
+        "computer_score": computer_player.score,
+        "state_version": new_state_version
+    }, dict(
+        game_update_delta(
+            game, previous_version, new_state_version, computer_player.user,
+            MoveType.PLACE.value if move_type == "place" else MoveType.PASS.value, scores_before, all_players,
+            tiles=turn["tiles"],
+            points=turn["points"],
+            move=turn["move"],
+            next_player_id=game.current_player_id
+        ),
+        type="computer_move"
+    )
 
 
 @router.get("/{game_id}/computer-player-info")
@@ -2793,7 +2766,7 @@ def get_computer_player_info(
     }
 
 @router.post("/{game_id}/computer-move-debug")
-async def debug_computer_move(
+def debug_computer_move(
     game_id: str,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -2825,7 +2798,7 @@ async def debug_computer_move(
     
     try:
         # Parse game state
-        game_state_data = json.loads(game.state)
+        game_state_data = decode_state(game.state)
         
         # Load wordlist for the game language
         wordlist = load_wordlist(game.language)
@@ -2877,15 +2850,18 @@ async def debug_computer_move(
         
         # Try the actual move generation with OptimizedComputerPlayer
         try:
+            # The generator is cached per dictionary, so pass the full wordlist, not the debug sample
             move_result = computer.make_move(
                 game_state_data=game_state_data,
                 rack=computer_player.rack,
-                wordlist=wordlist_list
+                wordlist=wordlist,
+                language=game.language,
+                difficulty=game.computer_difficulty
             )
             debug_info["move_generation_test"] = {
                 "success": True,
                 "move_result": move_result,
-                "move_type": "pass" if move_result is None else "place"
+                "move_type": move_result.get("type", "place")
             }
         except Exception as e:
             debug_info["move_generation_test"] = {
@@ -2974,7 +2950,7 @@ def validate_computer_player_availability():
         )
 
 @router.post("/{game_id}/shuffle-rack")
-async def shuffle_rack(
+def shuffle_rack(
     game_id: str,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -3020,7 +2996,7 @@ async def shuffle_rack(
         raise HTTPException(400, "No tiles in rack to shuffle")
 
 @router.post("/{game_id}/forfeit")
-async def forfeit_game(
+def forfeit_game(
     game_id: str,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -3067,13 +3043,13 @@ async def forfeit_game(
     
     # Update game state to mark as forfeited
     try:
-        game_state_data = json.loads(game.state) if game.state else {}
+        game_state_data = decode_state(game.state)
         game_state_data["forfeited"] = True
         game_state_data["forfeited_by"] = current_user.id
         game_state_data["forfeit_time"] = datetime.now(timezone.utc).isoformat()
         game_state_data["final_scores"] = final_scores
-        game.state = json.dumps(game_state_data, cls=GameStateEncoder)
-    except (json.JSONDecodeError, TypeError):
+        game.state = encode_state(game_state_data)
+    except (ValueError, TypeError):
         # If state parsing fails, create minimal forfeit state
         forfeit_state = {
             "forfeited": True,
@@ -3081,9 +3057,9 @@ async def forfeit_game(
             "forfeit_time": datetime.now(timezone.utc).isoformat(),
             "final_scores": final_scores
         }
-        game.state = json.dumps(forfeit_state, cls=GameStateEncoder)
+        game.state = encode_state(forfeit_state)
     
-    db.commit()
+    commit_game_state(db, game)
     
     # Send WebSocket notification to all players
     try:
@@ -3101,7 +3077,7 @@ async def forfeit_game(
         
         # Notify all players in the game
         for player in all_players:
-            await manager.send_personal_message(forfeit_message, player.user_id)
+            from_thread.run(notification_manager.send_to_user, player.user_id, forfeit_message)
             
     except Exception as e:
         logger.warning(f"Failed to send forfeit WebSocket notification: {e}")
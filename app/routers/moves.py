@@ -14,7 +14,7 @@ from app.game_logic.rules import get_next_player
 from app.utils.wordlist_utils import load_wordlist
 from app.websocket import manager
 from app.game_logic.game_state import GameState
-from app.routers.games import GameStateEncoder
+from app.game_logic.state_codec import encode_state, decode_state
 from app.utils.logger import logger
 
 router = APIRouter(prefix="/games/{game_id}")
@@ -251,7 +251,7 @@ async def make_move(
     }
 
 @router.post("/")
-async def record_move(
+def record_move(
     game_id: str,
     move_data: dict,
     db: Session = Depends(get_db),
@@ -263,13 +263,13 @@ async def record_move(
         raise HTTPException(404, "Game not found")
     
     # Load game state
-    state_data = json.loads(game.state)
+    state_data = decode_state(game.state)
     game_state = GameState()
     game_state.board = state_data.get("board", [[None]*15 for _ in range(15)])
     
     # Update game state
     state_data["board"] = game_state.board
-    game.state = json.dumps(state_data, cls=GameStateEncoder)
+    game.state = encode_state(state_data)
     
     # Record move
     move = Move(
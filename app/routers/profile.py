@@ -6,6 +6,7 @@ from app.models import User, Game, Player
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, distinct, text
 from app.db import get_db
+from app.game_logic.state_codec import decode_state
 import json
 import logging
 from datetime import datetime, timezone, timedelta
@@ -210,7 +211,7 @@ def games_for_user(current_user: User = Depends(get_current_user), db: Session =
         if game:
             games.append({
                 "id": str(game.id), 
-                "state": game.state, 
+                "state": decode_state(game.state), 
                 "current_player_id": game.current_player_id
             })
     
@@ -121,7 +121,7 @@ def get_random_candidates(
     
     try:
         # Get test usernames to filter out
-        from app.routers.games import TEST_USERNAMES
+        from app.utils.system_users import TEST_USERNAMES
         
         # Simplified approach - just get all users who accept invites, excluding test users
         # Language filtering can be added later when we have more users and proper JSON handling
@@ -185,7 +185,7 @@ def search_users(
     
     try:
         # Get test usernames to filter out
-        from app.routers.games import TEST_USERNAMES
+        from app.utils.system_users import TEST_USERNAMES
         
         # Search for users with usernames containing the search term
         search_results = db.query(User).filter(
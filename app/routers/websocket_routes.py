@@ -1,52 +1,98 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query, Depends, HTTPException
+from starlette.concurrency import run_in_threadpool
 from starlette.websockets import WebSocketState
 from app.websocket import manager, notification_manager
 from app.auth import get_user_from_token
 from app.models import Game, Player, User
-from app.db import get_db
+from app.db import SessionLocal
+from app.utils.game_helpers import get_game_snapshot
+from app.game_logic.event_stream import resume_messages
 from sqlalchemy.orm import Session
 from jose import JWTError
+from typing import Optional, Tuple
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+
+def is_snapshot_request(data: str) -> bool:
+    try:
+        return json.loads(data).get("type") == "snapshot_request"
+    except (ValueError, AttributeError):
+        return False
+
+
+def load_resume_messages(game_id: str, since_seq: int):
+    """resume_messages() in a short-lived session; blocking, so run it in the threadpool."""
+    with SessionLocal() as db:
+        return resume_messages(db, game_id, since_seq)
+
+
+def load_game_snapshot(game_id: str) -> dict:
+    """get_game_snapshot() in a short-lived session; blocking, so run it in the threadpool."""
+    with SessionLocal() as db:
+        return get_game_snapshot(game_id, db)
+
+
+def load_user_for_token(token: str) -> Optional[User]:
+    """The token's user, looked up in a short-lived session (detached, columns loaded); blocking."""
+    with SessionLocal() as db:
+        return get_user_from_token(token, db)
+
+
+def authorize_game_connection(token: str, game_id: str) -> Tuple[Optional[User], Optional[int]]:
+    """
+    Look up the token's user and check they play in the game: (user, None), or (None, close code).
+    
+    Uses its own short-lived session, so an open socket holds no pooled connection while idle;
+    the returned user is detached with its columns loaded. Blocking: run it in the threadpool.
+    """
+    with SessionLocal() as db:
+        user = get_user_from_token(token, db)
+        if not user:
+            return None, 4001
+        player = db.query(Player.id).filter(
+            Player.game_id == game_id,
+            Player.user_id == user.id
+        ).first()
+        if not player:
+            return None, 4003
+        return user, None
+
+
 @router.websocket("/games/{game_id}/ws")
 async def websocket_game_endpoint(
     websocket: WebSocket,
     game_id: str,
     token: str = Query(...),
-    db: Session = Depends(get_db)
+    since_seq: Optional[int] = Query(None, description="Last event seq the client applied; resumes the stream from there")
 ):
     """WebSocket endpoint for game-specific connections."""
     try:
-        # Validate token and get user
-        user = get_user_from_token(token, db)
+        # Validate token and check the user is part of the game
+        user, close_code = await run_in_threadpool(authorize_game_connection, token, game_id)
         if not user:
-            await websocket.close(code=4001)
-            return
-
-        # Check if user is part of the game
-        player = db.query(Player).filter(
-            Player.game_id == game_id,
-            Player.user_id == user.id
-        ).first()
-        
-        if not player:
-            await websocket.close(code=4003)
+            await websocket.close(code=close_code)
             return
 
         # Accept connection and connect to manager
         await websocket.accept()
-        await manager.connect(websocket, game_id, user)
+        await manager.connect(websocket, game_id, user, resuming=since_seq is not None)
+        if since_seq is not None:
+            # Reconnect: replay what the client missed (or a snapshot) before live events
+            manager.resume(websocket, await run_in_threadpool(load_resume_messages, game_id, since_seq))
         
         try:
             while True:
                 # Keep connection alive and handle incoming messages
                 data = await websocket.receive_text()
-                # Handle any client messages if needed
                 logger.debug(f"Received message from {user.username} in game {game_id}: {data}")
+                if is_snapshot_request(data):
+                    # The client missed a game_update (version gap): send the full state
+                    manager.send_to_connection(websocket, await run_in_threadpool(load_game_snapshot, game_id))
         except WebSocketDisconnect:
             manager.disconnect(websocket, game_id)
     except JWTError:
@@ -72,13 +118,10 @@ async def websocket_user_notifications(
     Production URL: wss://your-server/ws/user/notifications?token=your_jwt_token
     """
     try:
-        # Get database session manually since we can't use Depends in WebSocket
-        from app.db import SessionLocal
-        db = SessionLocal()
+        # Look the user up in a short-lived session; nothing is held while the socket is open
+        user = await run_in_threadpool(load_user_for_token, token)
         
         try:
-            # Validate token and get user
-            user = get_user_from_token(token, db)
             if not user:
                 logger.warning("WebSocket notification connection rejected: Invalid token")
                 await websocket.close(code=4001)
@@ -101,7 +144,7 @@ async def websocket_user_notifications(
                         
                         # Handle ping/pong for connection health
                         if data == "ping":
-                            await websocket.send_text("pong")
+                            notification_manager.send_to_connection(websocket, "pong")
                             logger.debug(f"Ping/pong with user {user.username}")
                         else:
                             logger.debug(f"Received notification message from {user.username}: {data}")
@@ -116,7 +159,6 @@ async def websocket_user_notifications(
         finally:
             # Clean up connection
             notification_manager.disconnect(websocket)
-            db.close()
             
     except JWTError:
         logger.warning("WebSocket notification connection rejected: JWT error")
@@ -11,7 +11,7 @@ import io
 import csv
 import logging
 from sqlalchemy import text, or_
-from app.utils.wordlist_utils import clear_wordlist_cache, add_word_to_database, add_words_to_database, get_cache_stats
+from app.utils.wordlist_utils import add_word_to_database, add_words_to_database, get_cache_stats, get_dictionary_version, schedule_dictionary_reload
 
 logger = logging.getLogger(__name__)
 
@@ -91,7 +91,8 @@ def add_single_word(
             "word": word.upper(),
             "language": language,
             "added_by": current_user.username,
-            "cache_cleared": True
+            "cache_cleared": True,
+            "dictionary_version": get_dictionary_version(language)
         }
     }
 
@@ -201,17 +202,25 @@ def clear_dictionary_cache(
     language: str = None,
     current_user = Depends(require_word_admin)
 ):
-    """Manually clear the dictionary cache for a language or all languages."""
-    clear_wordlist_cache(language)
+    """Reload the dictionary for a language or all languages from the database.
+    
+    The reload runs in the background; the current version is served until the
+    new one is swapped in.
+    """
+    languages = [language.lower()] if language else get_cache_stats()["cached_languages"]
+    scheduled = [lang for lang in languages if schedule_dictionary_reload(lang)]
     
     if language:
         return {
-            "message": f"Dictionary cache cleared for language: {language}",
-            "language": language
+            "message": f"Dictionary reload scheduled for language: {language}",
+            "language": language,
+            "reload_scheduled": bool(scheduled),
+            "current_version": get_dictionary_version(language)
         }
     else:
         return {
-            "message": "All dictionary caches cleared"
+            "message": "Dictionary reload scheduled for all cached languages",
+            "languages": scheduled
         }
 
 @router.get("/download-wordlist/{language}")
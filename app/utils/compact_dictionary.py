@@ -0,0 +1,189 @@
+"""
+Compact on-disk dictionary format.
+
+A wordlist is compiled into a sorted packed array of UTF-8 words:
+
+    magic (8 bytes) | word count (uint32) | data size (uint32) | version (uint32)
+    | offsets (uint32 x count+1) | word bytes
+
+The loader memory-maps the file read-only, so every worker process on a node
+shares the same page-cache copy instead of holding its own Python set, and a
+cold start only has to map the file. Lookups are a binary search over the
+offsets table. Offsets are stored little-endian and mapped without copying.
+"""
+
+import mmap
+import os
+import struct
+import sys
+import logging
+from array import array
+from collections.abc import Set as AbstractSet
+from typing import Dict, Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"WBDICT02"
+# Recent lookups are memoized per process: cross-checks re-test the same candidate
+# words on every request for a game, and a dict hit is far cheaper than a search.
+LOOKUP_MEMO_SIZE = 65536
+HEADER = struct.Struct("<III")
+HEADER_SIZE = len(MAGIC) + HEADER.size
+
+
+def get_compact_dictionary_path(language: str) -> str:
+    """Path of the compiled dictionary for a language."""
+    base_dir = os.getenv(
+        "COMPACT_DICTIONARY_DIR",
+        os.path.join(os.path.dirname(__file__), "..", "..", "data", "compiled")
+    )
+    return os.path.join(base_dir, f"{language.lower()}.wbdict")
+
+
+def build_compact_dictionary(words: Iterable[str], path: str, version: int = 0) -> int:
+    """Compile words into the packed format at path. Returns the number of words written.
+
+    version is the dictionary version the words correspond to (the dictionary_versions table).
+
+    The file is written next to the target and renamed into place, so processes that
+    already mapped the previous version keep a consistent view.
+    """
+    encoded = sorted({w.strip().upper().encode("utf-8") for w in words if w and w.strip()})
+
+    offsets = array("I", [0])
+    total = 0
+    for word in encoded:
+        total += len(word)
+        offsets.append(total)
+    if offsets.itemsize != 4 or sys.byteorder != "little":
+        raise RuntimeError("Compiled dictionaries require 32-bit little-endian offsets")
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(HEADER.pack(len(encoded), total, version))
+        f.write(offsets.tobytes())
+        for word in encoded:
+            f.write(word)
+    os.replace(tmp_path, path)
+
+    logger.info(f"📦 Compiled {len(encoded)} words (version {version}) into {path} ({HEADER_SIZE + 4 * len(offsets) + total} bytes)")
+    return len(encoded)
+
+
+class CompactDictionary(AbstractSet):
+    """Read-only set of words backed by a memory-mapped compiled dictionary."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"Not a compiled dictionary: {path}")
+        self._count, data_size, self.version = HEADER.unpack_from(self._mmap, len(MAGIC))
+
+        offsets_end = HEADER_SIZE + 4 * (self._count + 1)
+        if len(self._mmap) != offsets_end + data_size:
+            self._mmap.close()
+            raise ValueError(f"Truncated compiled dictionary: {path}")
+        self._offsets = memoryview(self._mmap)[HEADER_SIZE:offsets_end].cast("I")
+        self._data_start = offsets_end
+        self._memo: Dict[str, bool] = {}
+
+    def _word_bytes(self, index: int) -> bytes:
+        start = self._data_start + self._offsets[index]
+        end = self._data_start + self._offsets[index + 1]
+        return self._mmap[start:end]
+
+    def __contains__(self, word) -> bool:
+        if not isinstance(word, str):
+            return False
+        found = self._memo.get(word)
+        if found is not None:
+            return found
+
+        key = word.encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._word_bytes(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        found = lo < self._count and self._word_bytes(lo) == key
+
+        if len(self._memo) >= LOOKUP_MEMO_SIZE:
+            self._memo.clear()
+        self._memo[word] = found
+        return found
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self._count):
+            yield self._word_bytes(index).decode("utf-8")
+
+    @classmethod
+    def _from_iterable(cls, it):
+        # Set operations (|, &, -) produce ordinary sets
+        return set(it)
+
+    def __repr__(self) -> str:
+        return f"CompactDictionary({self.path!r}, {self._count} words, version {self.version})"
+
+
+class OverlayDictionary(AbstractSet):
+    """A dictionary version formed by adding words to a base version without copying it.
+
+    Word admin edits are applied to the live dictionary this way; the merged version
+    is compiled in the background and replaces the overlay once it is mapped.
+    """
+
+    def __init__(self, base: AbstractSet, added: Iterable[str], version: int):
+        self.base = base
+        self.added = frozenset(word for word in added if word not in base)
+        self.version = version
+
+    def __contains__(self, word) -> bool:
+        return word in self.added or word in self.base
+
+    def __len__(self) -> int:
+        return len(self.base) + len(self.added)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.base
+        yield from self.added
+
+    @classmethod
+    def _from_iterable(cls, it):
+        return set(it)
+
+    def __repr__(self) -> str:
+        return f"OverlayDictionary({len(self.added)} words over {self.base!r}, version {self.version})"
+
+
+def load_compact_dictionary(language: str) -> Optional[CompactDictionary]:
+    """Map the compiled dictionary for a language, or None if there is no usable file."""
+    path = get_compact_dictionary_path(language)
+    if not os.path.exists(path):
+        return None
+    try:
+        return CompactDictionary(path)
+    except (OSError, ValueError) as e:
+        logger.warning(f"⚠️ Ignoring compiled dictionary {path}: {e}")
+        return None
+
+
+def remove_compact_dictionary(language: str) -> None:
+    """Remove the compiled dictionary so the next load recompiles it from the source."""
+    path = get_compact_dictionary_path(language)
+    try:
+        os.remove(path)
+        logger.info(f"Removed stale compiled dictionary {path}")
+    except FileNotFoundError:
+        pass
@@ -4,22 +4,17 @@ Shared utilities for game endpoints to eliminate code duplication.
 """
 
 from typing import List, Dict, Any, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.orm import Session, aliased
 from app.models import Game, Player, User, Move
 from app.models.game import GameStatus
+from app.game_logic.state_codec import decode_state
 import json
 from datetime import datetime, timezone
 import logging
 
 logger = logging.getLogger(__name__)
 
-def is_computer_user_id(user_id: int, db: Session) -> bool:
-    """Check if a user_id belongs to the computer player."""
-    if user_id is None:
-        return False
-    user = db.query(User).filter(User.id == user_id).first()
-    return user and user.username == "computer_player"
-
 def get_player_data(player: Player, current_user_id: int, game_status: GameStatus, db: Session) -> Dict[str, Any]:
     """
     Single source of truth for player data formatting.
@@ -37,9 +32,12 @@ def get_player_data(player: Player, current_user_id: int, game_status: GameStatu
     player_user = db.query(User).filter(User.id == player.user_id).first()
     if not player_user:
         return None
-    
+    return _format_player_data(player, player_user, current_user_id, game_status)
+
+def _format_player_data(player: Player, player_user: User, current_user_id: int, game_status: GameStatus) -> Dict[str, Any]:
+    """Player data for an already loaded player user (see get_player_data)."""
     # Check if this is a computer player
-    is_computer = is_computer_user_id(player.user_id, db)
+    is_computer = player_user.username == "computer_player"
     
     player_data = {
         "id": str(player_user.id),
@@ -84,7 +82,11 @@ def get_last_move_info(game_id: str, current_user_id: int, db: Session) -> Optio
     last_move_player = db.query(User).filter(User.id == last_move.player_id).first()
     if not last_move_player:
         return None
-    
+    return _format_last_move_info(last_move, last_move_player, current_user_id)
+
+def _format_last_move_info(last_move: Move, last_move_player: User, current_user_id: int) -> Dict[str, Any]:
+    """Last move information for an already loaded move and player (see get_last_move_info)."""
+    move_data = {}
     try:
         move_data = json.loads(last_move.move_data)
         move_type = move_data.get("type", "unknown")
@@ -93,21 +95,31 @@ def get_last_move_info(game_id: str, current_user_id: int, db: Session) -> Optio
         if move_type == "word_placement":
             words = move_data.get("words_formed", [])
             move_description = f"Played word(s): {', '.join(words)}" if words else "Placed tiles"
-        elif move_type == "pass":
-            move_description = "Passed turn"
         elif move_type == "exchange":
             letters_count = len(move_data.get("letters_exchanged", []))
             move_description = f"Exchanged {letters_count} letter(s)"
         else:
-            move_description = f"Made a {move_type} move"
+            move_description = _describe_move_type(move_type)
     except (json.JSONDecodeError, KeyError):
         move_description = "Made a move"
     
+    return _last_move_info(
+        last_move.timestamp, move_description, move_data.get("points", 0),
+        move_data.get("words", move_data.get("words_formed", [])), last_move_player, current_user_id
+    )
+
+def _describe_move_type(move_type: str) -> str:
+    return "Passed turn" if move_type == "pass" else f"Made a {move_type} move"
+
+def _last_move_info(timestamp: datetime, description: str, points: int, words: List[str],
+                    last_move_player: User, current_user_id: int) -> Dict[str, Any]:
     return {
         "player_id": str(last_move_player.id),
         "player_username": last_move_player.username,
-        "timestamp": last_move.timestamp.isoformat(),
-        "description": move_description,
+        "timestamp": timestamp.isoformat(),
+        "description": description,
+        "points": points or 0,
+        "words": words or [],
         "was_current_user": last_move_player.id == current_user_id
     }
 
@@ -251,52 +263,131 @@ def get_game_summary_data(game: Game, current_user_id: int, db: Session) -> Dict
     Returns:
         Formatted game summary data
     """
-    # Get all players
-    players = db.query(Player).filter(Player.game_id == game.id).all()
-    
-    # Parse game state
-    state_data = json.loads(game.state) if game.state else {}
-    
-    # Format players using shared function
-    players_info = []
-    for player in players:
-        player_data = get_player_data(player, current_user_id, game.status, db)
-        if player_data:
-            # Add game-specific fields for list view
-            player_data["is_creator"] = player.user_id == game.creator_id
-            players_info.append(player_data)
-    
-    # Get additional info using shared functions
-    next_player_info = get_next_player_info(game, current_user_id, db)
-    last_move_info = get_last_move_info(game.id, current_user_id, db)
-    
-    # Get recent moves for highlighting (contract requirement)
-    recent_moves = get_recent_moves_data(game.id, current_user_id, db)
+    return get_game_summaries([game], current_user_id, db)[0]
+
+def get_game_summaries(games: List[Game], current_user_id: int, db: Session) -> List[Dict[str, Any]]:
+    """
+    Game summary data for many games at once, in a constant number of queries.
     
-    # Calculate time since last activity
-    last_move = db.query(Move).filter(Move.game_id == game.id).order_by(Move.timestamp.desc()).first()
-    last_activity = last_move.timestamp if last_move else game.created_at
-    time_since_str = format_time_since_activity(last_activity)
+    Turn, last move and last activity come from the summary columns on the
+    games row. Players and their users are loaded in one query and each
+    player's latest move in another (ROW_NUMBER window per game and player)
+    for the recent moves. Games last written before the summary columns
+    existed fall back to games.state and their latest move.
+    Users that aren't players of their game (rare) take one more query.
     
-    return {
-        "id": game.id,
-        "status": game.status.value,
-        "language": game.language,
-        "max_players": game.max_players,
-        "current_players": len(players),
-        "created_at": game.created_at.isoformat(),
-        "started_at": game.started_at.isoformat() if game.started_at else None,
-        "completed_at": game.completed_at.isoformat() if game.completed_at else None,
-        "current_player_id": str(game.current_player_id) if game.current_player_id else None,
-        "turn_number": state_data.get("turn_number", 0),
-        "is_user_turn": (game.status == GameStatus.IN_PROGRESS and game.current_player_id == current_user_id),
-        "time_since_last_activity": time_since_str,
-        "next_player": next_player_info,
-        "last_move": last_move_info,
-        "players": players_info,
-        "user_score": next((p["score"] for p in players_info if p["is_current_user"]), 0),
-        "recent_moves": recent_moves
-    }
+    Args:
+        games: Game objects to summarize
+        current_user_id: Current user ID
+        db: Database session
+        
+    Returns:
+        Formatted game summary data per game, in the order of games
+    """
+    if not games:
+        return []
+    game_ids = [game.id for game in games]
+    
+    # Players with their users
+    players_by_game: Dict[str, List[Player]] = {game_id: [] for game_id in game_ids}
+    users: Dict[int, User] = {}
+    for player, user in (
+        db.query(Player, User)
+        .outerjoin(User, User.id == Player.user_id)
+        .filter(Player.game_id.in_(game_ids))
+        .order_by(Player.id)
+    ):
+        players_by_game[player.game_id].append(player)
+        if user:
+            users[user.id] = user
+    
+    # Latest move of every player in every game
+    move_rank = func.row_number().over(
+        partition_by=(Move.game_id, Move.player_id),
+        order_by=(Move.timestamp.desc(), Move.id.desc())
+    ).label("move_rank")
+    ranked_moves = db.query(Move, move_rank).filter(Move.game_id.in_(game_ids)).subquery()
+    latest_move = aliased(Move, ranked_moves)
+    latest_moves_by_game: Dict[str, List[Move]] = {game_id: [] for game_id in game_ids}
+    for move in db.query(latest_move).filter(ranked_moves.c.move_rank == 1):
+        latest_moves_by_game[move.game_id].append(move)
+    
+    # Users referenced by a game without being one of its players
+    missing_user_ids = {game.current_player_id for game in games if game.current_player_id}
+    missing_user_ids.update(game.last_move_player_id for game in games if game.last_move_player_id)
+    missing_user_ids.update(move.player_id for moves in latest_moves_by_game.values() for move in moves)
+    missing_user_ids.difference_update(users)
+    missing_user_ids.discard(None)
+    if missing_user_ids:
+        users.update((user.id, user) for user in db.query(User).filter(User.id.in_(missing_user_ids)))
+    
+    summaries = []
+    for game in games:
+        players = players_by_game[game.id]
+        
+        players_info = []
+        for player in players:
+            player_user = users.get(player.user_id)
+            if player_user:
+                player_data = _format_player_data(player, player_user, current_user_id, game.status)
+                # Add game-specific fields for list view
+                player_data["is_creator"] = player.user_id == game.creator_id
+                players_info.append(player_data)
+        
+        next_player_info = None
+        next_player = users.get(game.current_player_id)
+        if game.status == GameStatus.IN_PROGRESS and next_player:
+            next_player_info = {
+                "id": str(next_player.id),
+                "username": next_player.username,
+                "is_current_user": next_player.id == current_user_id
+            }
+        
+        latest_moves = sorted(latest_moves_by_game[game.id], key=lambda move: (move.timestamp, move.id), reverse=True)
+        last_move_info = None
+        if game.last_move_at:
+            last_activity = game.last_move_at
+            if users.get(game.last_move_player_id):
+                last_move_info = _last_move_info(
+                    game.last_move_at, _describe_move_type(game.last_move_type), game.last_move_points,
+                    game.last_words.split(",") if game.last_words else [], users[game.last_move_player_id], current_user_id
+                )
+        else:
+            last_move = latest_moves[0] if latest_moves else None
+            last_activity = last_move.timestamp if last_move else game.created_at
+            if last_move and users.get(last_move.player_id):
+                last_move_info = _format_last_move_info(last_move, users[last_move.player_id], current_user_id)
+        
+        # Other players' latest moves for highlighting (contract requirement, see get_recent_moves_data)
+        recent_moves = [
+            move_info for move_info in (
+                _format_recent_move(move, users.get(move.player_id))
+                for move in latest_moves if move.player_id != current_user_id
+            ) if move_info
+        ][:3]
+        
+        summaries.append({
+            "id": game.id,
+            "status": game.status.value,
+            "language": game.language,
+            "max_players": game.max_players,
+            "current_players": len(players),
+            "created_at": game.created_at.isoformat(),
+            "started_at": game.started_at.isoformat() if game.started_at else None,
+            "completed_at": game.completed_at.isoformat() if game.completed_at else None,
+            "current_player_id": str(game.current_player_id) if game.current_player_id else None,
+            "turn_number": game.turn_number if game.turn_number is not None else decode_state(game.state).get("turn_number", 0),
+            "letter_bag_count": game.letter_bag_count,
+            "is_user_turn": (game.status == GameStatus.IN_PROGRESS and game.current_player_id == current_user_id),
+            "time_since_last_activity": format_time_since_activity(last_activity),
+            "next_player": next_player_info,
+            "last_move": last_move_info,
+            "players": players_info,
+            "user_score": next((p["score"] for p in players_info if p["is_current_user"]), 0),
+            "recent_moves": recent_moves
+        })
+    
+    return summaries
 
 def get_recent_moves_data(game_id: str, current_user_id: int, db: Session) -> List[Dict[str, Any]]:
     """
@@ -333,130 +424,164 @@ def get_recent_moves_data(game_id: str, current_user_id: int, db: Session) -> Li
         # Skip if we already have this player's most recent move
         if move.player_id in seen_players:
             continue
-            
-        try:
-            move_data = json.loads(move.move_data) if move.move_data else {}
-            move_type = move_data.get("type", "unknown")
-            
-            # Only include PLACE moves for highlighting (contract requirement)
-            if move_type != "PLACE":
-                seen_players.add(move.player_id)  # Mark as seen but don't include
-                continue
-            
-            # Get player info
-            player = db.query(User).filter(User.id == move.player_id).first()
-            if not player:
-                continue
-                
-            # Extract move positions from move data with enhanced tile information
-            positions = []
-            move_positions = move_data.get("data", [])
-            
-            for pos_data in move_positions:
-                if isinstance(pos_data, dict):
-                    # Calculate tile points based on letter and blank status
-                    letter = pos_data.get("letter", "")
-                    is_blank = pos_data.get("is_blank", False)
-                    
-                    # Basic point values for tiles (enhanced from simple default)
-                    tile_points = 1  # Default for blanks
-                    if not is_blank and letter:
-                        # Standard Scrabble point values
-                        point_values = {
-                            'A': 1, 'E': 1, 'I': 1, 'O': 1, 'U': 1, 'L': 1, 'N': 1, 'S': 1, 'T': 1, 'R': 1,
-                            'D': 2, 'G': 2,
-                            'B': 3, 'C': 3, 'M': 3, 'P': 3,
-                            'F': 4, 'H': 4, 'V': 4, 'W': 4, 'Y': 4,
-                            'K': 5,
-                            'J': 8, 'X': 8,
-                            'Q': 10, 'Z': 10
-                        }
-                        tile_points = point_values.get(letter.upper(), 1)
-                    
-                    position = {
-                        "row": pos_data.get("row", 0),
-                        "col": pos_data.get("col", 0),
-                        "letter": letter.upper(),
-                        "points": tile_points,
-                        "is_blank": is_blank
-                    }
-                    positions.append(position)
-            
-            # Only include moves that actually placed tiles
-            if positions:
-                # Extract additional move information for full contract compliance
-                turn_number = move_data.get("turn_number", 0)
-                points_earned = move_data.get("points", 0)
-                
-                # Handle different point field names (some moves use "score")
-                if points_earned == 0:
-                    points_earned = move_data.get("score", 0)
-                
-                # Handle both "words" (human moves) and "word" (computer moves) fields
-                words_formed = move_data.get("words", [])
-                if not words_formed:
-                    # Check for singular "word" field (computer moves)
-                    single_word = move_data.get("word", "")
-                    if single_word:
-                        words_formed = [single_word]
-                
-                # Ensure words_formed is a list of strings
-                if isinstance(words_formed, str):
-                    words_formed = [words_formed]
-                elif not isinstance(words_formed, list):
-                    words_formed = []
-                
-                # Calculate time ago for user-friendly display
-                time_ago = datetime.now(timezone.utc) - move.timestamp
-                
-                # Format time ago in a human-readable way
-                if time_ago.days > 0:
-                    time_ago_str = f"{time_ago.days} day{'s' if time_ago.days != 1 else ''} ago"
-                elif time_ago.seconds > 3600:
-                    hours = time_ago.seconds // 3600
-                    time_ago_str = f"{hours} hour{'s' if hours != 1 else ''} ago"
-                elif time_ago.seconds > 60:
-                    minutes = time_ago.seconds // 60
-                    time_ago_str = f"{minutes} minute{'s' if minutes != 1 else ''} ago"
-                else:
-                    time_ago_str = "Just now"
-                
-                # Enhanced move info with comprehensive details for frontend
-                move_info = {
-                    # Player information (WHO)
-                    "player_id": str(move.player_id),
-                    "player_username": player.username,
-                    "is_computer": is_computer_user_id(move.player_id, db),
-                    
-                    # Timing information (WHEN)
-                    "timestamp": move.timestamp.isoformat(),
-                    "timestamp_unix": int(move.timestamp.timestamp()),
-                    "time_ago": time_ago_str,
-                    "turn_number": turn_number,
-                    
-                    # Move details (WHAT)
-                    "move_type": move_type,
-                    "words_formed": words_formed,
-                    "points_earned": points_earned,
-                    "positions": positions,
-                    
-                    # Additional context for frontend
-                    "move_summary": _generate_move_summary(words_formed, points_earned, move_type),
-                    "tile_count": len(positions)
-                }
-                moves_data.append(move_info)
-                seen_players.add(move.player_id)
-                
-        except Exception as e:
-            logger.error(f"Error processing move {move.id} for recent moves: {e}")
-            continue
+        seen_players.add(move.player_id)
+        
+        player = db.query(User).filter(User.id == move.player_id).first()
+        move_info = _format_recent_move(move, player)
+        if move_info:
+            moves_data.append(move_info)
     
     # Sort by timestamp (most recent first) and limit based on game size
     # Contract specifies: max_players - 1 moves (up to 3 moves for 4-player games)
     moves_data.sort(key=lambda x: x["timestamp"], reverse=True)
     return moves_data[:3]  # Maximum 3 recent moves for 4-player games
 
-def get_detailed_game_data(game: Game, current_user_id: int, db: Session) -> Dict[str, Any]:
+def _format_recent_move(move: Move, player: Optional[User]) -> Optional[Dict[str, Any]]:
+    """Recent move entry for a player's latest move; None unless it placed tiles (see get_recent_moves_data)."""
+    if not player:
+        return None
+    try:
+        move_data = json.loads(move.move_data) if move.move_data else {}
+        move_type = move_data.get("type", "unknown")
+        
+        # Only include PLACE moves for highlighting (contract requirement)
+        if move_type != "PLACE":
+            return None
+        
+        # Extract move positions from move data with enhanced tile information
+        positions = []
+        move_positions = move_data.get("data", [])
+        
+        for pos_data in move_positions:
+            if isinstance(pos_data, dict):
+                # Calculate tile points based on letter and blank status
+                letter = pos_data.get("letter", "")
+                is_blank = pos_data.get("is_blank", False)
+                
+                # Basic point values for tiles (enhanced from simple default)
+                tile_points = 1  # Default for blanks
+                if not is_blank and letter:
+                    # Standard Scrabble point values
+                    point_values = {
+                        'A': 1, 'E': 1, 'I': 1, 'O': 1, 'U': 1, 'L': 1, 'N': 1, 'S': 1, 'T': 1, 'R': 1,
+                        'D': 2, 'G': 2,
+                        'B': 3, 'C': 3, 'M': 3, 'P': 3,
+                        'F': 4, 'H': 4, 'V': 4, 'W': 4, 'Y': 4,
+                        'K': 5,
+                        'J': 8, 'X': 8,
+                        'Q': 10, 'Z': 10
+                    }
+                    tile_points = point_values.get(letter.upper(), 1)
+                
+                position = {
+                    "row": pos_data.get("row", 0),
+                    "col": pos_data.get("col", 0),
+                    "letter": letter.upper(),
+                    "points": tile_points,
+                    "is_blank": is_blank
+                }
+                positions.append(position)
+        
+        # Only include moves that actually placed tiles
+        if not positions:
+            return None
+        
+        # Extract additional move information for full contract compliance
+        turn_number = move_data.get("turn_number", 0)
+        points_earned = move_data.get("points", 0)
+        
+        # Handle different point field names (some moves use "score")
+        if points_earned == 0:
+            points_earned = move_data.get("score", 0)
+        
+        # Handle both "words" (human moves) and "word" (computer moves) fields
+        words_formed = move_data.get("words", [])
+        if not words_formed:
+            # Check for singular "word" field (computer moves)
+            single_word = move_data.get("word", "")
+            if single_word:
+                words_formed = [single_word]
+        
+        # Ensure words_formed is a list of strings
+        if isinstance(words_formed, str):
+            words_formed = [words_formed]
+        elif not isinstance(words_formed, list):
+            words_formed = []
+        
+        # Calculate time ago for user-friendly display
+        timestamp = move.timestamp if move.timestamp.tzinfo else move.timestamp.replace(tzinfo=timezone.utc)
+        time_ago = datetime.now(timezone.utc) - timestamp
+        
+        # Format time ago in a human-readable way
+        if time_ago.days > 0:
+            time_ago_str = f"{time_ago.days} day{'s' if time_ago.days != 1 else ''} ago"
+        elif time_ago.seconds > 3600:
+            hours = time_ago.seconds // 3600
+            time_ago_str = f"{hours} hour{'s' if hours != 1 else ''} ago"
+        elif time_ago.seconds > 60:
+            minutes = time_ago.seconds // 60
+            time_ago_str = f"{minutes} minute{'s' if minutes != 1 else ''} ago"
+        else:
+            time_ago_str = "Just now"
+        
+        # Enhanced move info with comprehensive details for frontend
+        move_info = {
+            # Player information (WHO)
+            "player_id": str(move.player_id),
+            "player_username": player.username,
+            "is_computer": player.username == "computer_player",
+            
+            # Timing information (WHEN)
+            "timestamp": move.timestamp.isoformat(),
+            "timestamp_unix": int(timestamp.timestamp()),
+            "time_ago": time_ago_str,
+            "turn_number": turn_number,
+            
+            # Move details (WHAT)
+            "move_type": move_type,
+            "words_formed": words_formed,
+            "points_earned": points_earned,
+            "positions": positions,
+            
+            # Additional context for frontend
+            "move_summary": _generate_move_summary(words_formed, points_earned, move_type),
+            "tile_count": len(positions)
+        }
+        return move_info
+    except Exception as e:
+        logger.error(f"Error processing move {move.id} for recent moves: {e}")
+        return None
+
+def get_game_snapshot(game_id: str, db: Session) -> Optional[Dict[str, Any]]:
+    """
+    Full public state of a game for WebSocket clients.
+    
+    Sent on a snapshot_request, when a client sees a game_update whose
+    previous_version is not the version it holds (it missed an update).
+    Racks are not included; players fetch their own over HTTP.
+    """
+    game = db.query(Game).filter(Game.id == game_id).first()
+    if not game:
+        return None
+    state_data = decode_state(game.state)
+    players = db.query(Player).filter(Player.game_id == game_id).all()
+    letter_bag = state_data.get("letter_bag", [])
+    return {
+        "type": "game_snapshot",
+        "game_id": game_id,
+        "seq": game.turn_number if game.turn_number is not None else state_data.get("turn_number", 0),
+        "state_version": game.state_version,
+        "status": game.status.value,
+        "board": state_data.get("board"),
+        "scores": {p.user_id: p.score for p in players},
+        "current_player_id": game.current_player_id,
+        "letter_bag_count": game.letter_bag_count if game.letter_bag_count is not None else len(letter_bag),
+        "turn_number": state_data.get("turn_number", 0),
+        "consecutive_passes": state_data.get("consecutive_passes", 0),
+        "completion_data": state_data.get("completion_data")
+    }
+
+def get_detailed_game_data(game: Game, current_user_id: int, db: Session, include_tile_ids: bool = False) -> Dict[str, Any]:
     """
     Shared function to get detailed game data for single game view.
     Used by get_game endpoint.
@@ -465,11 +590,12 @@ def get_detailed_game_data(game: Game, current_user_id: int, db: Session) -> Dic
         game: Game object
         current_user_id: Current user ID
         db: Database session
+        include_tile_ids: Add position-based tile ids to the board cells
         
     Returns:
         Formatted detailed game data
     """
-    state_data = json.loads(game.state) if game.state else {}
+    state_data = decode_state(game.state, include_tile_ids=include_tile_ids)
     
     # Get all players with detailed info
     players = db.query(Player).filter(Player.game_id == game.id).all()
@@ -511,6 +637,7 @@ def get_detailed_game_data(game: Game, current_user_id: int, db: Session) -> Dic
         "created_at": game.created_at.isoformat(),
         "started_at": game.started_at.isoformat() if game.started_at else None,
         "current_player_id": game.current_player_id,
+        "state_version": game.state_version,  # Send back with state-changing requests
         "phase": state_data.get("phase"),
         "board": state_data.get("board"),
         "multipliers": state_data.get("multipliers"),
@@ -0,0 +1,114 @@
+"""
+Connection pool metrics.
+
+The engines in app.database use metered subclasses of their QueuePool: every
+checkout records how long it waited for a connection, connections opened
+beyond pool_size count as overflow, and checkouts that give up after
+pool_timeout count as timeouts. Together with the live in-use count this is
+what sizing Cloud Run concurrency against the database's connection limit
+needs; it is exported through GET /admin/performance.
+"""
+
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+TIMING_SAMPLES = 1000  # Most recent checkouts kept for the wait percentiles
+
+
+def _summary(samples: Iterable[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+    return {
+        "p50": round(statistics.median(ordered), 2),
+        "p95": round(ordered[int(0.95 * (len(ordered) - 1))], 2),
+        "max": round(ordered[-1], 2)
+    }
+
+
+class PoolMetrics:
+    """Checkout counters for one engine's pool."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool: Optional[QueuePool] = None  # The engine's current pool (replaced on dispose)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.overflow_connections = 0
+            self.timeouts = 0
+            self.wait_times: deque = deque(maxlen=TIMING_SAMPLES)
+
+    def record_checkout(self, wait_ms: float, overflowed: bool) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_times.append(wait_ms)
+            if overflowed:
+                self.overflow_connections += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def stats(self) -> Dict[str, Any]:
+        pool = self.pool
+        with self._lock:
+            stats = {
+                "checkouts": self.checkouts,
+                "checkout_wait_ms": _summary(self.wait_times),
+                "overflow_connections": self.overflow_connections,
+                "timeouts": self.timeouts
+            }
+        if pool is not None:
+            stats.update({
+                "pool_size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "in_use": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0)
+            })
+        return stats
+
+
+# Metrics of every metered pool in this worker, by engine name
+pool_metrics: Dict[str, PoolMetrics] = {}
+
+
+def metered_pool_class(base: type, name: str) -> type:
+    """A subclass of the QueuePool class `base` that records checkouts in pool_metrics[name]."""
+    metrics = pool_metrics.setdefault(name, PoolMetrics(name))
+
+    class MeteredPool(base):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            metrics.pool = self
+
+        def _do_get(self):
+            overflow_before = self.overflow()
+            started = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except exc.TimeoutError:
+                metrics.record_timeout()
+                raise
+            overflowed = self.overflow() > max(overflow_before, 0)
+            metrics.record_checkout((time.perf_counter() - started) * 1000, overflowed)
+            return connection
+
+    MeteredPool.__name__ = f"Metered{base.__name__}"
+    MeteredPool.__qualname__ = MeteredPool.__name__
+    return MeteredPool
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Metrics for every metered pool, for the performance endpoint."""
+    return {name: metrics.stats() for name, metrics in pool_metrics.items()}
@@ -0,0 +1,130 @@
+"""
+System user registry.
+
+The computer player and the test accounts are ordinary rows in the users
+table. Their ids are resolved once per process (at startup, or on first use)
+so that "is this the computer player?" is an integer comparison instead of a
+users query per player or move.
+
+Commits that create, rename or delete one of these users mark the registry
+stale; the next lookup reloads it. The change is also published on the event
+bus, so the other instances reload theirs too.
+"""
+
+import logging
+import threading
+from typing import FrozenSet, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models import User
+from app.pubsub import event_bus
+
+logger = logging.getLogger(__name__)
+
+COMPUTER_USERNAME = "computer_player"
+
+# List of test usernames to exclude from production user listings
+TEST_USERNAMES = [
+    "player01", "player02", "player1", "player2",  # Common test player names
+    "computer", "Computer", "computer_player", "Computer_player",  # Computer player variations
+    "test_user", "testuser", "test", "Test", "test_player",  # Test user variations
+    "Player01", "Player02", "Player1", "Player2"  # Capitalized variations
+]
+
+_SYSTEM_USERNAMES = frozenset(TEST_USERNAMES) | {COMPUTER_USERNAME}
+
+_lock = threading.Lock()
+_loaded = False
+_computer_user_id: Optional[int] = None
+_test_user_ids: FrozenSet[int] = frozenset()
+
+
+def refresh_system_users(db: Optional[Session] = None) -> None:
+    """Resolve the system user ids from the database."""
+    global _loaded, _computer_user_id, _test_user_ids
+
+    if db is None:
+        from app.database import SessionLocal
+        session = SessionLocal()
+        try:
+            return refresh_system_users(session)
+        finally:
+            session.close()
+
+    rows = db.query(User.id, User.username).filter(User.username.in_(_SYSTEM_USERNAMES)).all()
+    with _lock:
+        _computer_user_id = next((user_id for user_id, username in rows if username == COMPUTER_USERNAME), None)
+        _test_user_ids = frozenset(user_id for user_id, username in rows if username in TEST_USERNAMES)
+        _loaded = True
+    logger.info(f"👥 System users resolved: computer player {_computer_user_id}, {len(_test_user_ids)} test users")
+
+
+def invalidate_system_users() -> None:
+    """Reload the registry on its next lookup."""
+    global _loaded
+    with _lock:
+        _loaded = False
+
+
+def _ensure_loaded(db: Optional[Session]) -> None:
+    if not _loaded:
+        refresh_system_users(db)
+
+
+def get_computer_user_id(db: Optional[Session] = None) -> Optional[int]:
+    """Get the computer player's user ID."""
+    _ensure_loaded(db)
+    return _computer_user_id
+
+
+def is_computer_user_id(user_id: Optional[int], db: Optional[Session] = None) -> bool:
+    """Check if a user_id belongs to the computer player."""
+    if user_id is None:
+        return False
+    return user_id == get_computer_user_id(db)
+
+
+def is_test_user_id(user_id: Optional[int], db: Optional[Session] = None) -> bool:
+    """Check if a user_id belongs to one of the TEST_USERNAMES accounts."""
+    _ensure_loaded(db)
+    return user_id in _test_user_ids
+
+
+def _touches_system_user(user: User) -> bool:
+    return user.username in _SYSTEM_USERNAMES or user.id == _computer_user_id or user.id in _test_user_ids
+
+
+@event.listens_for(Session, "after_flush")
+def _note_system_user_changes(session, flush_context):
+    changed = (session.new | session.dirty | session.deleted)
+    if any(isinstance(obj, User) and _touches_system_user(obj) for obj in changed):
+        session.info["system_users_changed"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _note_bulk_user_changes(orm_execute_state):
+    if (orm_execute_state.is_delete or orm_execute_state.is_update) and any(
+        mapper.class_ is User for mapper in orm_execute_state.all_mappers
+    ):
+        orm_execute_state.session.info["system_users_changed"] = True
+
+
+async def _on_system_users_changed(key: str, message_json: str) -> None:
+    invalidate_system_users()
+
+
+event_bus.register("system_users", _on_system_users_changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _refresh_after_commit(session):
+    if session.info.pop("system_users_changed", False):
+        invalidate_system_users()
+        event_bus.publish_threadsafe("system_users", "all", {})
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop("system_users_changed", None)
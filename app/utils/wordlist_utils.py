@@ -1,15 +1,38 @@
 ﻿import os
 import codecs
-from typing import Set, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Set, Optional, Tuple
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 import logging
 
+from app.game_logic.dictionary_index import clear_dictionary_indexes, get_dictionary_index
+from app.utils.compact_dictionary import (
+    CompactDictionary,
+    OverlayDictionary,
+    build_compact_dictionary,
+    get_compact_dictionary_path,
+    load_compact_dictionary,
+    remove_compact_dictionary,
+)
+
 logger = logging.getLogger(__name__)
 
 # Global dictionary cache - loaded once and reused across all requests
 _DICTIONARY_CACHE = {}
 _CACHE_INITIALIZED = {}
 
+# Version of each cached dictionary, matched against the dictionary_versions table.
+# Reloads run on a single background thread and swap the new version in whole, so
+# requests always see either the old or the new dictionary and never wait for one.
+_DICTIONARY_VERSIONS: Dict[str, int] = {}
+_RELOADS_IN_FLIGHT: Set[str] = set()
+_reload_lock = threading.Lock()
+# Held while checking the served version and swapping in a new one
+_swap_lock = threading.Lock()
+_reload_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dictionary-reload")
+
 def get_wordlist_path(language: str) -> str:
     """Get the file path for a wordlist based on language code."""
     # Try both formats: de-words.txt and de_words.txt
@@ -168,7 +191,9 @@ def get_cache_status() -> dict:
     return {
         "cached_languages": list(_DICTIONARY_CACHE.keys()),
         "cache_sizes": {lang: len(words) for lang, words in _DICTIONARY_CACHE.items()},
-        "total_cached_words": sum(len(words) for words in _DICTIONARY_CACHE.values())
+        "total_cached_words": sum(len(words) for words in _DICTIONARY_CACHE.values()),
+        "versions": dict(_DICTIONARY_VERSIONS),
+        "reloads_in_flight": sorted(_RELOADS_IN_FLIGHT)
     }
 
 def ensure_wordlist_available(language: str, db: Session) -> bool:
@@ -236,21 +261,29 @@ def clear_wordlist_cache(language: Optional[str] = None) -> None:
     
     if language:
         language = language.lower()
+        # The compiled file no longer matches the database; it is rebuilt on the next load
+        remove_compact_dictionary(language)
+        clear_dictionary_indexes(language)
         if language in _DICTIONARY_CACHE:
             logger.info(f"Clearing wordlist cache for language: {language}")
             del _DICTIONARY_CACHE[language]
             _CACHE_INITIALIZED[language] = False
+        _DICTIONARY_VERSIONS.pop(language, None)
     else:
         logger.info("Clearing all wordlist caches")
         _DICTIONARY_CACHE.clear()
         _CACHE_INITIALIZED.clear()
+        _DICTIONARY_VERSIONS.clear()
+        clear_dictionary_indexes()
 
 def get_cache_stats() -> dict:
     """Get statistics about the current cache state."""
     return {
         "cached_languages": list(_DICTIONARY_CACHE.keys()),
         "cache_sizes": {lang: len(words) for lang, words in _DICTIONARY_CACHE.items()},
-        "total_cached_words": sum(len(words) for words in _DICTIONARY_CACHE.values())
+        "total_cached_words": sum(len(words) for words in _DICTIONARY_CACHE.values()),
+        "versions": dict(_DICTIONARY_VERSIONS),
+        "reloads_in_flight": sorted(_RELOADS_IN_FLIGHT)
     }
 
 def load_wordlist(language: str) -> Set[str]:
@@ -268,28 +301,29 @@ def load_wordlist(language: str) -> Set[str]:
     
     # Try to load from database first (if not in test mode)
     if not os.getenv("TESTING"):
+        # A compiled dictionary is memory-mapped and shared by all workers on the node
+        compact = load_compact_dictionary(language)
+        if compact is not None:
+            logger.info(f"Mapped compiled dictionary for {language} ({len(compact)} words, version {compact.version})")
+            _install_dictionary(language, compact, compact.version)
+            return compact
+        
         try:
-            from app.database import get_db
-            from app.models.wordlist import WordList
+            word_set, version = _load_words_from_database(language)
             
-            # Use database session
-            db = next(get_db())
-            try:
-                words_query = db.query(WordList.word).filter(WordList.language == language)
-                db_words = [word[0] for word in words_query.all()]
+            if word_set:
+                logger.info(f"Loaded {len(word_set)} words for {language} from database (version {version})")
                 
-                if db_words:
-                    word_set = set(db_words)
-                    logger.info(f"Loaded {len(word_set)} words for {language} from database")
-                    
-                    # Cache the result
-                    _DICTIONARY_CACHE[language] = word_set
-                    _CACHE_INITIALIZED[language] = True
-                    return word_set
-                else:
-                    logger.warning(f"No words found in database for language: {language}, falling back to file")
-            finally:
-                db.close()
+                # Compile for the next worker / cold start, then serve the mapped copy
+                compiled = _compile_dictionary(language, word_set, version)
+                if compiled is not None:
+                    word_set = compiled
+                
+                # Cache the result
+                _install_dictionary(language, word_set, version)
+                return word_set
+            else:
+                logger.warning(f"No words found in database for language: {language}, falling back to file")
                 
         except Exception as e:
             logger.warning(f"Error loading from database for {language}: {e}, falling back to file")
@@ -304,8 +338,7 @@ def load_wordlist(language: str) -> Set[str]:
         logger.info(f"Loaded {len(word_set)} words for {language} from file: {wordlist_path}")
         
         # Cache the result
-        _DICTIONARY_CACHE[language] = word_set
-        _CACHE_INITIALIZED[language] = True
+        _install_dictionary(language, word_set, _DICTIONARY_VERSIONS.get(language, 0))
         return word_set
         
     except FileNotFoundError as e:
@@ -315,6 +348,209 @@ def load_wordlist(language: str) -> Set[str]:
         logger.error(f"Error loading wordlist for {language}: {e}")
         raise
 
+def _compile_dictionary(language: str, words: Iterable[str], version: int = 0) -> Optional[CompactDictionary]:
+    """Write the compiled dictionary for a language and map it; None if the file can't be written."""
+    try:
+        build_compact_dictionary(words, get_compact_dictionary_path(language), version)
+        return load_compact_dictionary(language)
+    except (OSError, RuntimeError) as e:
+        logger.warning(f"Could not compile dictionary for {language}: {e}")
+        return None
+
+def _load_words_from_database(language: str) -> Tuple[Set[str], int]:
+    """Select a language's words together with the dictionary version they belong to."""
+    from app.database import SessionLocal
+    from app.models.wordlist import WordList
+    
+    db = SessionLocal()
+    try:
+        # Read the version first: an edit committed in between only makes the words newer
+        version = get_database_dictionary_versions(db).get(language, 0)
+        words = {row[0].upper() for row in db.query(WordList.word).filter(WordList.language == language).yield_per(50000)}
+        return words, version
+    finally:
+        db.close()
+
+def _install_dictionary(language: str, dictionary, version: int, deferred: bool = False) -> None:
+    """Swap a dictionary version into the cache and start building its shared index.
+    
+    deferred: don't build an index for this version (an overlay that is about to be
+    merged); it serves the previous version's structures until the merge is swapped in.
+    """
+    _DICTIONARY_CACHE[language] = dictionary
+    _CACHE_INITIALIZED[language] = True
+    _DICTIONARY_VERSIONS[language] = version
+    index = get_dictionary_index(language, dictionary, version, deferred=deferred)
+    if not deferred:
+        index.warm_in_background()
+
+def get_dictionary_version(language: str) -> int:
+    """Version of the dictionary this process is serving for a language (0 if unversioned)."""
+    return _DICTIONARY_VERSIONS.get(language.lower(), 0)
+
+def get_database_dictionary_versions(db: Session) -> Dict[str, int]:
+    """Current dictionary version per language, as recorded in the database."""
+    try:
+        rows = db.execute(text("SELECT language, version FROM dictionary_versions")).fetchall()
+    except Exception as e:
+        logger.warning(f"Could not read dictionary versions: {e}")
+        db.rollback()
+        return {}
+    return {row[0]: row[1] for row in rows}
+
+def bump_dictionary_version(language: str, db: Session) -> Optional[int]:
+    """Increment a language's dictionary version in the caller's transaction.
+    
+    Returns the new version, or None if the versions table is unavailable.
+    """
+    from datetime import datetime, timezone
+    
+    try:
+        # Savepoint, so a missing table doesn't abort the caller's transaction
+        with db.begin_nested():
+            return db.execute(
+                text(
+                    "INSERT INTO dictionary_versions (language, version, updated_at) "
+                    "VALUES (:language, 1, :now) "
+                    "ON CONFLICT (language) DO UPDATE "
+                    "SET version = dictionary_versions.version + 1, updated_at = :now "
+                    "RETURNING version"
+                ),
+                {"language": language, "now": datetime.now(timezone.utc)}
+            ).scalar()
+    except Exception as e:
+        logger.warning(f"Could not bump dictionary version for {language}: {e}")
+        return None
+
+def apply_dictionary_delta(language: str, added_words: Iterable[str], version: Optional[int] = None) -> None:
+    """Apply added words to the live dictionary without reloading it.
+    
+    The new version is served immediately as an overlay on the current one; the
+    merged dictionary is compiled in the background and swapped in when ready.
+    If this process has missed an earlier version, it reloads in the background.
+    
+    Word validation sees the added words at once. The blank-pattern index and the
+    move generator are rebuilt only for the merged version, so until that build
+    finishes (the compile plus one index build) blank validation and the computer
+    player still work from the previous version's words.
+    """
+    language = language.lower()
+    with _swap_lock:
+        current = _DICTIONARY_CACHE.get(language)
+        if current is None or not _CACHE_INITIALIZED.get(language, False):
+            # Not loaded here; the next load reads the new version
+            return
+        
+        current_version = _DICTIONARY_VERSIONS.get(language, 0)
+        if version is None:
+            version = current_version + 1
+        if version <= current_version:
+            return
+        if version == current_version + 1:
+            _install_dictionary(language, OverlayDictionary(current, added_words, version), version, deferred=True)
+            logger.info(f"Applied word delta to {language} dictionary (version {version})")
+    
+    if version == current_version + 1:
+        _schedule(language, _merge_dictionary, language)
+    else:
+        schedule_dictionary_reload(language, version)
+
+def schedule_dictionary_reload(language: str, target_version: Optional[int] = None) -> bool:
+    """Reload a language's dictionary in the background; the current version is served meanwhile.
+    
+    Returns False if a reload for the language is already running.
+    """
+    language = language.lower()
+    if target_version is None:
+        target_version = _DICTIONARY_VERSIONS.get(language, 0) + 1
+    return _schedule(language, _reload_dictionary, language, target_version)
+
+def _schedule(language: str, job, *args) -> bool:
+    with _reload_lock:
+        if language in _RELOADS_IN_FLIGHT:
+            return False
+        _RELOADS_IN_FLIGHT.add(language)
+    
+    def run():
+        try:
+            job(*args)
+        except Exception as e:
+            logger.error(f"❌ Background dictionary update for {language} failed: {e}")
+        finally:
+            with _reload_lock:
+                _RELOADS_IN_FLIGHT.discard(language)
+    
+    _reload_executor.submit(run)
+    return True
+
+def _merge_dictionary(language: str) -> None:
+    """Compile the served overlay version into a mapped dictionary and swap it in."""
+    while True:
+        overlay = _DICTIONARY_CACHE.get(language)
+        version = _DICTIONARY_VERSIONS.get(language, 0)
+        if not isinstance(overlay, OverlayDictionary):
+            return
+        compiled = _compile_dictionary(language, overlay, version)
+        if compiled is None:
+            # Keep serving the overlay, with its own index
+            get_dictionary_index(language, overlay, version).build_deferred()
+            return
+        with _swap_lock:
+            if _DICTIONARY_VERSIONS.get(language) == version:
+                _install_dictionary(language, compiled, version)
+                logger.info(f"Swapped in compiled {language} dictionary (version {version})")
+                return
+        # Another delta arrived while compiling; merge again from the latest overlay
+
+def _reload_dictionary(language: str, target_version: int) -> None:
+    """Load the newest dictionary version and swap it in."""
+    # Another worker on the node may already have compiled it
+    compact = load_compact_dictionary(language)
+    if compact is not None and compact.version >= target_version:
+        dictionary, version = compact, compact.version
+    elif os.getenv("TESTING"):
+        dictionary, version = read_wordlist_file(get_wordlist_path(language)), target_version
+    else:
+        words, version = _load_words_from_database(language)
+        if not words:
+            logger.warning(f"No words found in database for {language}; keeping the current dictionary")
+            return
+        dictionary = _compile_dictionary(language, words, version) or words
+    
+    with _swap_lock:
+        if version < _DICTIONARY_VERSIONS.get(language, 0):
+            return
+        _install_dictionary(language, dictionary, version)
+    logger.info(f"Reloaded {language} dictionary (version {version}, {len(dictionary)} words)")
+
+def poll_dictionary_versions(db: Optional[Session] = None) -> Dict[str, int]:
+    """Schedule background reloads for cached languages that another worker has edited.
+    
+    Returns the languages that were behind, with the version they are reloading to.
+    """
+    if not _DICTIONARY_CACHE:
+        return {}
+    
+    if db is None:
+        from app.database import SessionLocal
+        session = SessionLocal()
+        try:
+            versions = get_database_dictionary_versions(session)
+        finally:
+            session.close()
+    else:
+        versions = get_database_dictionary_versions(db)
+    
+    stale = {}
+    for language in list(_DICTIONARY_CACHE):
+        version = versions.get(language, 0)
+        if version > _DICTIONARY_VERSIONS.get(language, 0):
+            stale[language] = version
+            schedule_dictionary_reload(language, version)
+    if stale:
+        logger.info(f"Dictionary versions changed, reloading in background: {stale}")
+    return stale
+
 def add_word_to_database(word: str, language: str, user_id: int, db: Session) -> bool:
     """Add a single word to the database and invalidate cache.
     
@@ -327,7 +563,8 @@ def add_word_to_database(word: str, language: str, user_id: int, db: Session) ->
     Returns:
         True if word was added, False if it already existed
         
-    This function automatically invalidates the cache for the affected language.
+    The dictionary version is bumped with the insert and the word is applied to
+    the cached dictionary as a delta; other workers pick it up by polling.
     """
     from app.models.wordlist import WordList
     from datetime import datetime, timezone
@@ -353,12 +590,12 @@ def add_word_to_database(word: str, language: str, user_id: int, db: Session) ->
     )
     
     db.add(new_word)
+    version = bump_dictionary_version(language, db)
     db.commit()
     
-    # Invalidate cache for this language
-    clear_wordlist_cache(language)
+    apply_dictionary_delta(language, [word], version)
     
-    logger.info(f"Added word '{word}' to {language} wordlist and cleared cache")
+    logger.info(f"Added word '{word}' to {language} wordlist (dictionary version {version})")
     return True
 
 def add_words_to_database(words: list, language: str, user_id: int, db: Session) -> dict:
@@ -373,7 +610,8 @@ def add_words_to_database(words: list, language: str, user_id: int, db: Session)
     Returns:
         Dictionary with statistics about the operation
         
-    This function automatically invalidates the cache for the affected language.
+    The dictionary version is bumped with the insert and the words are applied to
+    the cached dictionary as a delta; other workers pick them up by polling.
     """
     from app.models.wordlist import WordList
     from datetime import datetime, timezone
@@ -407,12 +645,12 @@ def add_words_to_database(words: list, language: str, user_id: int, db: Session)
         ]
         
         db.add_all(word_objects)
+        version = bump_dictionary_version(language, db)
         db.commit()
         
-        # Invalidate cache for this language
-        clear_wordlist_cache(language)
+        apply_dictionary_delta(language, new_words, version)
         
-        logger.info(f"Added {len(new_words)} words to {language} wordlist and cleared cache")
+        logger.info(f"Added {len(new_words)} words to {language} wordlist (dictionary version {version})")
     
     return {
         "total_requested": len(words),
@@ -1,25 +1,119 @@
 from fastapi import WebSocket
-from typing import Dict, Set, List, Any, Optional, Tuple
+from typing import Callable, Dict, Set, List, Any, Optional, Tuple
+import asyncio
 import json
 import logging
 from datetime import datetime, timezone
 from app.auth import get_token_from_header, get_user_from_token
+from app.config import WS_SEND_QUEUE_SIZE, WS_SEND_TIMEOUT_SECONDS
+from app.game_logic.event_stream import game_event_log, message_seq
 from app.models import User
+from app.pubsub import EventBus, event_bus
 from starlette.websockets import WebSocketDisconnect
 
 logger = logging.getLogger(__name__)
 
+# Close code for clients that could not keep up with their messages
+SLOW_CLIENT_CLOSE_CODE = 4008
+
+
+class ConnectionWriter:
+    """
+    Sends one WebSocket's messages from a bounded queue in its own task.
+    
+    Broadcasting only enqueues already serialized text, so it never waits for a
+    client. A client whose queue overflows or that misses the send deadline is
+    dropped: on_drop removes it from its manager and the socket is closed.
+    """
+    
+    def __init__(self, websocket: WebSocket, on_drop: Callable[[], None], name: str, paused: bool = False):
+        self.websocket = websocket
+        self.on_drop = on_drop
+        self.name = name
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=WS_SEND_QUEUE_SIZE)
+        self.closed = False
+        # A paused writer queues messages but holds them until resume()
+        self.ready = asyncio.Event()
+        if not paused:
+            self.ready.set()
+        self.task = asyncio.create_task(self._run())
+    
+    def send(self, message_json: str) -> bool:
+        """Queue a message; returns False if the connection is (now) dropped."""
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(message_json)
+            return True
+        except asyncio.QueueFull:
+            logger.warning(f"⚠️ Send queue full for {self.name}, dropping slow client")
+            self.drop()
+            return False
+    
+    def resume(self, first: List[str], skip_through: Optional[int] = None):
+        """Send `first` ahead of everything queued while paused, minus queued events with seq <= skip_through."""
+        held = []
+        while not self.queue.empty():
+            held.append(self.queue.get_nowait())
+        if skip_through is not None:
+            held = [text for text in held if (seq := message_seq(text)) is None or seq > skip_through]
+        for message_json in first + held:
+            if not self.send(message_json):
+                return
+        self.ready.set()
+    
+    async def _run(self):
+        try:
+            await self.ready.wait()
+            while True:
+                message_json = await self.queue.get()
+                await asyncio.wait_for(self.websocket.send_text(message_json), WS_SEND_TIMEOUT_SECONDS)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ Send to {self.name} exceeded {WS_SEND_TIMEOUT_SECONDS}s, dropping slow client")
+            self.drop()
+        except Exception as e:
+            logger.error(f"Error sending to {self.name}: {e}")
+            self.drop()
+    
+    def drop(self):
+        """Remove a client that can't keep up (or has gone away) and close its socket."""
+        if self.closed:
+            return
+        self.on_drop()
+        self.close()
+        asyncio.create_task(self._close_socket())
+    
+    async def _close_socket(self):
+        try:
+            await self.websocket.close(code=SLOW_CLIENT_CLOSE_CODE)
+        except Exception:
+            pass
+    
+    def close(self):
+        """Stop sending; queued messages are discarded."""
+        self.closed = True
+        if self.task is not asyncio.current_task():
+            self.task.cancel()
+
 class ConnectionManager:
-    def __init__(self):
+    def __init__(self, bus: EventBus = event_bus):
+        # Game broadcasts go through the bus so that every instance delivers to its own clients
+        self.bus = bus
+        bus.register("game", self.deliver_to_game)
         # Dictionary to store active connections per game
         self.active_connections: Dict[str, Set[WebSocket]] = {}
         # Dictionary to store user info per connection
         self.connection_users: Dict[WebSocket, User] = {}
+        # Outgoing message queue per connection
+        self.writers: Dict[WebSocket, ConnectionWriter] = {}
+        self.dropped_connections = 0
         # Maximum connections per game
         self.MAX_CONNECTIONS_PER_GAME = 4
     
-    async def connect(self, websocket: WebSocket, game_id: str, user: User):
-        """Connect a new WebSocket client."""
+    async def connect(self, websocket: WebSocket, game_id: str, user: User, resuming: bool = False):
+        """Connect a new WebSocket client (resuming: hold its broadcasts until resume())."""
         if game_id not in self.active_connections:
             self.active_connections[game_id] = set()
         
@@ -39,8 +133,26 @@ class ConnectionManager:
         
         self.active_connections[game_id].add(websocket)
         self.connection_users[websocket] = user
+        self.writers[websocket] = ConnectionWriter(
+            websocket, lambda: self._drop(websocket, game_id), f"{user.username} in game {game_id}", paused=resuming
+        )
         logger.info(f"Client connected to game {game_id}: {user.username}")
     
+    def resume(self, websocket: WebSocket, messages: List[Tuple[Optional[int], str]]):
+        """
+        Start a resuming client's stream with the events it missed (see app.game_logic.event_stream).
+        
+        Broadcasts that arrived since connect() follow them, except those the replay already covered.
+        """
+        writer = self.writers.get(websocket)
+        if writer:
+            last_seq = max((seq for seq, _ in messages if seq is not None), default=None)
+            writer.resume([text for _, text in messages], skip_through=last_seq)
+    
+    def _drop(self, websocket: WebSocket, game_id: str):
+        self.dropped_connections += 1
+        self.disconnect(websocket, game_id)
+    
     def disconnect(self, websocket: WebSocket, game_id: str):
         """Disconnect a WebSocket client."""
         try:
@@ -49,6 +161,10 @@ class ConnectionManager:
                 if not self.active_connections[game_id]:
                     del self.active_connections[game_id]
             
+            writer = self.writers.pop(websocket, None)
+            if writer:
+                writer.close()
+            
             if websocket in self.connection_users:
                 user = self.connection_users[websocket]
                 del self.connection_users[websocket]
@@ -57,19 +173,29 @@ class ConnectionManager:
             logger.error(f"Error during disconnect: {e}")
     
     async def broadcast_to_game(self, game_id: str, message: dict):
-        """Broadcast a message to all connected clients in a game."""
-        if game_id in self.active_connections:
-            disconnected = set()
-            for connection in self.active_connections[game_id]:
-                try:
-                    await connection.send_json(message)
-                except Exception as e:
-                    logger.error(f"Error broadcasting to client: {e}")
-                    disconnected.add(connection)
-            
-            # Clean up disconnected clients
-            for connection in disconnected:
-                self.disconnect(connection, game_id)
+        """Broadcast a message to all connected clients in a game, on every instance."""
+        await self.bus.publish("game", game_id, message)
+    
+    async def deliver_to_game(self, game_id: str, message_json: str):
+        """Queue a broadcast from the event bus for the game's clients connected to this instance."""
+        game_event_log.record(game_id, message_json)
+        for connection in list(self.active_connections.get(game_id, ())):
+            writer = self.writers.get(connection)
+            if writer:
+                writer.send(message_json)
+    
+    def send_to_connection(self, websocket: WebSocket, message: dict) -> bool:
+        """Queue a message for one connected client (behind anything already queued for it)."""
+        writer = self.writers.get(websocket)
+        return writer.send(json.dumps(message, separators=(",", ":"), ensure_ascii=False)) if writer else False
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "games": len(self.active_connections),
+            "connections": len(self.writers),
+            "queued_messages": sum(writer.queue.qsize() for writer in self.writers.values()),
+            "dropped_connections": self.dropped_connections
+        }
     
     def get_connected_users(self, game_id: str) -> List[User]:
         """Get list of connected users for a game."""
@@ -81,11 +207,16 @@ class ConnectionManager:
 class UserNotificationManager:
     """WebSocket manager for user notification connections (invitations, etc.)"""
     
-    def __init__(self):
+    def __init__(self, bus: EventBus = event_bus):
+        self.bus = bus
+        bus.register("user", self.deliver_to_user)
         # Dictionary to store active notification connections per user
         self.user_connections: Dict[int, WebSocket] = {}  # user_id -> websocket
         # Dictionary to store user info per connection
         self.connection_users: Dict[WebSocket, User] = {}  # websocket -> user
+        # Outgoing message queue per connection
+        self.writers: Dict[WebSocket, ConnectionWriter] = {}
+        self.dropped_connections = 0
     
     async def connect(self, websocket: WebSocket, user: User):
         """Connect a user's notification WebSocket."""
@@ -102,9 +233,12 @@ class UserNotificationManager:
         # Store new connection
         self.user_connections[user.id] = websocket
         self.connection_users[websocket] = user
+        self.writers[websocket] = ConnectionWriter(
+            websocket, lambda: self._drop(websocket), f"{user.username}'s notifications"
+        )
         
         # Send connection established message
-        await self.send_to_user(user.id, {
+        self.send_to_connection(websocket, {
             "type": "connection_established",
             "user_id": user.id,
             "username": user.username,
@@ -113,9 +247,17 @@ class UserNotificationManager:
         
         logger.info(f"User notification connection established: {user.username} (ID: {user.id})")
     
+    def _drop(self, websocket: WebSocket):
+        self.dropped_connections += 1
+        self.disconnect(websocket)
+    
     def disconnect(self, websocket: WebSocket):
         """Disconnect a user's notification WebSocket."""
         try:
+            writer = self.writers.pop(websocket, None)
+            if writer:
+                writer.close()
+            
             if websocket in self.connection_users:
                 user = self.connection_users[websocket]
                 del self.connection_users[websocket]
@@ -129,21 +271,26 @@ class UserNotificationManager:
             logger.error(f"Error during notification disconnect: {e}")
     
     async def send_to_user(self, user_id: int, message: dict):
-        """Send a notification message to a specific user."""
-        if user_id in self.user_connections:
-            websocket = self.user_connections[user_id]
-            try:
-                await websocket.send_json(message)
-                logger.debug(f"Notification sent to user {user_id}: {message['type']}")
-            except Exception as e:
-                logger.error(f"Error sending notification to user {user_id}: {e}")
-                # Clean up broken connection
-                self.disconnect(websocket)
-                return False
-        else:
+        """Send a notification message to a specific user, on whichever instance they are connected to."""
+        await self.bus.publish("user", user_id, message)
+    
+    async def deliver_to_user(self, user_id: str, message_json: str):
+        """Queue a notification from the event bus if the user is connected to this instance."""
+        websocket = self.user_connections.get(int(user_id))
+        if websocket is None:
             logger.debug(f"User {user_id} not connected for notifications")
             return False
-        return True
+        writer = self.writers.get(websocket)
+        return writer.send(message_json) if writer else False
+    
+    def send_to_connection(self, websocket: WebSocket, message) -> bool:
+        """Queue a message (a dict, or text such as "pong") for one notification connection."""
+        writer = self.writers.get(websocket)
+        if writer is None:
+            return False
+        if not isinstance(message, str):
+            message = json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+        return writer.send(message)
     
     async def send_invitation_received(self, user_id: int, invitation_data: dict):
         """Send invitation_received notification to user."""
@@ -198,8 +345,16 @@ class UserNotificationManager:
     def get_connected_user_count(self) -> int:
         """Get the number of users connected for notifications."""
         return len(self.user_connections)
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "connections": len(self.writers),
+            "queued_messages": sum(writer.queue.qsize() for writer in self.writers.values()),
+            "dropped_connections": self.dropped_connections
+        }
 
 
 # Global instances
 manager = ConnectionManager()
 notification_manager = UserNotificationManager()
+
@@ -1,9 +1,19 @@
-from typing import Set
+from typing import Iterable, Iterator, Optional, Set
+from datetime import datetime, timezone
 from app.config import DEFAULT_WORDLIST_PATH
 from app.database import SessionLocal
 from app.models import WordList
 import os
+import io
 import codecs
+import itertools
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Rows per executemany call when COPY isn't available (SQLite)
+IMPORT_BATCH_SIZE = 10000
 
 def load_wordlist_from_file(path: str = None) -> Set[str]:
     """
@@ -54,158 +64,222 @@ def load_wordlist(language="de") -> set[str]:
     from app.utils.wordlist_utils import load_wordlist as unified_load_wordlist
     return unified_load_wordlist(language)
 
-def import_wordlist(language: str = "de", path: str = None) -> None:
+class _WordCopyStream(io.RawIOBase):
+    """File-like view of rows in PostgreSQL COPY text format, produced on demand."""
+    
+    def __init__(self, rows: Iterator[str]):
+        self._rows = rows
+        self._buffer = b""
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, target) -> int:
+        while len(self._buffer) < len(target):
+            chunk = "".join(itertools.islice(self._rows, 1000))
+            if not chunk:
+                break
+            self._buffer += chunk.encode("utf-8")
+        size = min(len(target), len(self._buffer))
+        target[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+def iter_wordlist_file(path: str, skip: int = 0, limit: Optional[int] = None) -> Iterator[str]:
+    """
+    Lazily read uppercase words from a wordlist file.
+    
+    Lines are decoded one at a time (UTF-8, falling back to cp1252 for lines that
+    aren't valid UTF-8), so the file is never held in memory.
+    
+    Args:
+        path: Path to the wordlist file
+        skip: Number of lines to skip (from a previous limited import)
+        limit: Maximum number of lines to read after skipping (None for all)
+    """
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Wordlist file not found: {path}")
+    return _iter_lines(f, skip, limit)
+
+def _iter_lines(f, skip: int, limit: Optional[int]) -> Iterator[str]:
+    with f:
+        stop = None if limit is None else skip + limit
+        for line in itertools.islice(f, skip, stop):
+            try:
+                text = line.decode("utf-8")
+            except UnicodeDecodeError:
+                text = line.decode("cp1252", errors="replace")
+            word = text.lstrip("\ufeff").strip().upper()
+            if word:
+                yield word
+
+def stream_import_words(db, language: str, words: Iterable[str], replace: bool = False) -> dict:
+    """
+    Bulk insert words for a language without building ORM objects.
+    
+    Words are deduplicated as they stream past (and against the existing words
+    when appending). PostgreSQL receives them through COPY FROM STDIN; other
+    databases get batched executemany inserts. The caller's session is
+    committed once at the end.
+    
+    Returns:
+        Statistics: words inserted, duplicates skipped, elapsed seconds and throughput.
+    """
+    from app.utils.wordlist_utils import bump_dictionary_version
+    
+    start_time = time.time()
+    connection = db.connection()
+    
+    seen = set()
+    if replace:
+        db.query(WordList).filter(WordList.language == language).delete(synchronize_session=False)
+    else:
+        seen.update(row[0] for row in db.query(WordList.word).filter(WordList.language == language).yield_per(50000))
+    
+    stats = {"inserted": 0, "duplicates": 0}
+    
+    def unique_words():
+        for word in words:
+            if word in seen:
+                stats["duplicates"] += 1
+                continue
+            seen.add(word)
+            stats["inserted"] += 1
+            yield word
+    
+    timestamp = datetime.now(timezone.utc)
+    if connection.dialect.name == "postgresql":
+        # COPY text format: tab-separated columns, backslash is the escape character
+        suffix = f"\t{language}\t{timestamp.isoformat()}\n"
+        rows = (word.replace("\\", "\\\\") + suffix for word in unique_words())
+        copy_sql = f"COPY {WordList.__tablename__} (word, language, added_timestamp) FROM STDIN"
+        cursor = connection.connection.cursor()
+        try:
+            if connection.dialect.driver == "psycopg2":
+                cursor.copy_expert(copy_sql, _WordCopyStream(rows))
+            else:
+                cursor.execute(copy_sql, stream=_WordCopyStream(rows))
+        finally:
+            cursor.close()
+    else:
+        # executemany straight on the driver: the statement is compiled once and
+        # rows skip SQLAlchemy's per-row parameter processing
+        table = WordList.__table__
+        insert_sql = str(
+            table.insert().values(word=None, language=None, added_timestamp=None).compile(dialect=connection.dialect)
+        )
+        stamp_type = table.c.added_timestamp.type.dialect_impl(connection.dialect)
+        process = stamp_type.bind_processor(connection.dialect)
+        stamp = process(timestamp) if process else timestamp
+        words_iter = unique_words()
+        while True:
+            batch = [(word, language, stamp) for word in itertools.islice(words_iter, IMPORT_BATCH_SIZE)]
+            if not batch:
+                break
+            connection.exec_driver_sql(insert_sql, batch)
+    
+    if stats["inserted"] or replace:
+        bump_dictionary_version(language, db)
+    db.commit()
+    
+    elapsed = time.time() - start_time
+    stats["seconds"] = round(elapsed, 3)
+    stats["words_per_second"] = round(stats["inserted"] / elapsed) if elapsed > 0 else stats["inserted"]
+    logger.info(
+        f"📥 Imported {stats['inserted']} words for '{language}' in {elapsed:.2f}s "
+        f"({stats['words_per_second']} words/s, {stats['duplicates']} duplicates skipped)"
+    )
+    return stats
+
+def import_wordlist(language: str = "de", path: str = None) -> dict:
     """
-    Import a wordlist from a file into the database.
+    Import a wordlist from a file into the database, replacing existing words.
     
     Args:
         language: Language code (e.g., "de", "en")
         path: Path to the wordlist file. If None, uses the default path from config.
+    
+    Returns:
+        Import statistics (see stream_import_words).
     """
     if path is None:
         path = DEFAULT_WORDLIST_PATH
     
-    # Load words from file
-    words = load_wordlist_from_file(path)
-    
-    # Import to database
     db = SessionLocal()
     try:
-        # Clear existing words for this language
-        db.query(WordList).filter(WordList.language == language).delete()
-        
-        # Batch insert for better performance
-        batch_size = 1000
-        word_list = list(words)
-        total_words = len(word_list)
-        
-        for i in range(0, total_words, batch_size):
-            batch = [WordList(word=word, language=language) 
-                    for word in word_list[i:i+batch_size]]
-            db.add_all(batch)
-            db.commit()
-            print(f"Imported {min(i+batch_size, total_words)}/{total_words} words")
-        
-        print(f"Successfully imported {total_words} words for language '{language}'")
+        stats = stream_import_words(db, language, iter_wordlist_file(path), replace=True)
+        print(f"Successfully imported {stats['inserted']} words for language '{language}' "
+              f"({stats['words_per_second']} words/s)")
+        return stats
+    except FileNotFoundError:
+        db.rollback()
+        raise
     except Exception as e:
         db.rollback()
         raise RuntimeError(f"Failed to import wordlist: {str(e)}")
     finally:
         db.close()
 
-def import_wordlist_with_limit(language: str, path: str, limit: int = 50000) -> None:
+def import_wordlist_with_limit(language: str, path: str, limit: int = 50000) -> dict:
     """
     Import a limited number of words from a wordlist file for fast startup.
     
     Args:
         language: Language code (e.g., "de", "en")
         path: Path to the wordlist file
-        limit: Maximum number of words to import
-    """
-    # Load words from file (limited)
-    encodings = ['utf-8-sig', 'utf-8', 'latin1', 'cp1252']
-    words = []
+        limit: Maximum number of lines to import
     
-    for encoding in encodings:
-        try:
-            with codecs.open(path, 'r', encoding=encoding) as f:
-                for i, line in enumerate(f):
-                    if i >= limit:
-                        break
-                    word = line.strip().upper()
-                    if word:
-                        words.append(word)
-            break
-        except UnicodeDecodeError:
-            continue
-        except FileNotFoundError:
-            raise FileNotFoundError(f"Wordlist file not found: {path}")
-    
-    # Import to database
+    Returns:
+        Import statistics (see stream_import_words).
+    """
     db = SessionLocal()
     try:
-        # Clear existing words for this language
-        db.query(WordList).filter(WordList.language == language).delete()
-        
-        # Batch insert for better performance
-        batch_size = 1000
-        total_words = len(words)
-        
-        for i in range(0, total_words, batch_size):
-            batch = [WordList(word=word, language=language) 
-                    for word in words[i:i+batch_size]]
-            db.add_all(batch)
-            db.commit()
-            print(f"Imported {min(i+batch_size, total_words)}/{total_words} words")
-        
-        print(f"Successfully imported {total_words} words for language '{language}' (limited import)")
+        stats = stream_import_words(db, language, iter_wordlist_file(path, limit=limit), replace=True)
+        print(f"Successfully imported {stats['inserted']} words for language '{language}' (limited import)")
+        return stats
+    except FileNotFoundError:
+        db.rollback()
+        raise
     except Exception as e:
         db.rollback()
         raise RuntimeError(f"Failed to import limited wordlist: {str(e)}")
     finally:
         db.close()
 
-def import_wordlist_continue(language: str, path: str, skip: int = 0, limit: int = None) -> None:
+def import_wordlist_continue(language: str, path: str, skip: int = 0, limit: int = None) -> Optional[dict]:
     """
     Continue importing words from where a previous limited import left off.
     
     Args:
         language: Language code (e.g., "de", "en")
         path: Path to the wordlist file
-        skip: Number of words to skip (from previous import)
-        limit: Maximum number of words to import (None for all remaining)
-    """
-    import logging
-    logger = logging.getLogger(__name__)
+        skip: Number of lines to skip (from previous import)
+        limit: Maximum number of lines to import (None for all remaining)
     
+    Returns:
+        Import statistics (see stream_import_words), or None if the import failed.
+    """
     logger.info(f"Starting background import for {language}, skipping first {skip} words, limit={limit}")
     
-    # Load remaining words from file
-    encodings = ['utf-8-sig', 'utf-8', 'latin1', 'cp1252']
-    words = []
-    
-    for encoding in encodings:
-        try:
-            with codecs.open(path, 'r', encoding=encoding) as f:
-                for i, line in enumerate(f):
-                    if i < skip:
-                        continue
-                    if limit is not None and len(words) >= limit:
-                        break
-                    word = line.strip().upper()
-                    if word:
-                        words.append(word)
-            break
-        except UnicodeDecodeError:
-            continue
-        except FileNotFoundError:
-            logger.error(f"Wordlist file not found: {path}")
-            return
-    
-    if not words:
-        logger.info("No additional words to import")
-        return
+    if not os.path.exists(path):
+        logger.error(f"Wordlist file not found: {path}")
+        return None
     
     # Import to database (append mode)
     db = SessionLocal()
     try:
-        # Batch insert for better performance
-        batch_size = 1000
-        total_words = len(words)
-        
-        for i in range(0, total_words, batch_size):
-            batch = [WordList(word=word, language=language) 
-                    for word in words[i:i+batch_size]]
-            db.add_all(batch)
-            db.commit()
-            
-            if i % 10000 == 0:  # Log every 10k words
-                logger.info(f"Background import: {skip + i + batch_size}/{skip + total_words} total words")
-        
-        logger.info(f"Background import completed: {total_words} additional words imported for language '{language}'")
+        stats = stream_import_words(db, language, iter_wordlist_file(path, skip=skip, limit=limit))
+        if not stats["inserted"]:
+            logger.info("No additional words to import")
+        else:
+            logger.info(f"Background import completed: {stats['inserted']} additional words imported for language '{language}'")
+        return stats
     except Exception as e:
         db.rollback()
         logger.error(f"Failed to continue wordlist import: {str(e)}")
+        return None
     finally:
         db.close()
 
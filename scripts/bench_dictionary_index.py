@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+Benchmark per-request allocations for blank-tile validation.
+
+Simulates the routers' pattern of building a fresh GameState per request and
+validating a move that contains a blank. Compares the former per-GameState
+length-bucket rebuild + regex scan with the shared per-language dictionary
+index, reporting peak allocated memory and latency per request.
+
+Usage: python scripts/bench_dictionary_index.py [--language en] [--requests 20]
+"""
+
+import os
+import sys
+import argparse
+import re
+import statistics
+import time
+import tracemalloc
+
+# Add parent directory to path so we can import app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.game_logic.game_state import GameState
+from app.game_logic.dictionary_index import clear_dictionary_indexes
+from app.utils.wordlist_utils import get_wordlist_path, read_wordlist_file
+
+PATTERNS = ["?ELLO", "RE?AIN", "S?ORE?", "??"]
+
+
+def legacy_request(language, dictionary):
+    """The pre-index behaviour: bucket the whole dictionary per GameState, then regex-scan."""
+    GameState(language=language)
+    by_length = {}
+    for word in dictionary:
+        by_length.setdefault(len(word), set()).add(word)
+    for pattern in PATTERNS:
+        regex = re.compile(f"^{pattern.replace('?', '[A-Z]')}$")
+        any(regex.match(word) for word in by_length.get(len(pattern), ()))
+
+
+def indexed_request(language, dictionary):
+    game = GameState(language=language)
+    for pattern in PATTERNS:
+        game._is_valid_word_pattern(pattern, dictionary)
+
+
+def measure(request, language, dictionary, count):
+    peaks, times = [], []
+    for _ in range(count):
+        tracemalloc.start()
+        start = time.perf_counter()
+        request(language, dictionary)
+        times.append((time.perf_counter() - start) * 1000)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return statistics.median(peaks), statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dictionary index allocations per request")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    dictionary = read_wordlist_file(get_wordlist_path(args.language))
+    print(f"Dictionary: {len(dictionary)} words ({args.language})")
+
+    clear_dictionary_indexes()
+    build_start = time.perf_counter()
+    indexed_request(args.language, dictionary)  # one-time shared index build
+    print(f"Shared index build (once per language/version): {(time.perf_counter() - build_start) * 1000:.0f}ms")
+
+    legacy_peak, legacy_ms = measure(legacy_request, args.language, dictionary, args.requests)
+    indexed_peak, indexed_ms = measure(indexed_request, args.language, dictionary, args.requests)
+
+    print(f"{'':24}{'peak alloc/request':>20}{'latency/request':>18}")
+    print(f"{'per-GameState rebuild':24}{legacy_peak / 1024:>17.0f} KB{legacy_ms:>15.2f} ms")
+    print(f"{'shared index':24}{indexed_peak / 1024:>17.0f} KB{indexed_ms:>15.2f} ms")
+    if indexed_peak:
+        print(f"Allocation drop: {legacy_peak / indexed_peak:.0f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,321 @@
+#!/usr/bin/env python
+"""
+Benchmark the hot game paths over a reproducible corpus of board positions.
+
+Positions come from seeded self-play (the move generator playing both sides)
+and are bucketed into early, mid and late game by the number of tiles on the
+board. Every position is replayed through:
+
+    validate  - GameState.validate_word_placement (fresh GameState per call, like the routers)
+    score     - GameState.calculate_detailed_score_breakdown
+    placements - board_utils.find_word_placements for the played word
+    search    - MoveGenerator.generate_moves, every placement for the rack
+    computer  - OptimizedComputerPlayer.make_move
+
+and p50/p99 latency plus peak allocation per call are reported. Results are
+compared with a stored baseline; the script exits non-zero when latency or
+allocations regress by more than the tolerance. Latency is compared as the
+median over passes of each pass's median latency divided by the time of a fixed
+calibration workload measured in the same pass, which keeps the check stable
+under machine load and lets one stored baseline serve different machines.
+Latency gets at least LATENCY_TOLERANCE_FLOOR, since calibrated timings of
+sub-millisecond calls still move by about a third between runs.
+Refresh the baseline with --update-baseline after an intended change.
+
+The baseline also records where each language's corpus came from. Without a
+compiled dictionary or data/ wordlist, a language falls back to the small test
+wordlist, whose games end before reaching the mid and late stages.
+
+Usage: python scripts/bench_move_generation.py [--languages de en] [--games 3]
+       [--repeat 5] [--tolerance 0.25] [--update-baseline]
+"""
+
+import os
+import sys
+import argparse
+import contextlib
+import gc
+import json
+import logging
+import random
+import statistics
+import time
+import tracemalloc
+
+# Add parent directory to path so we can import app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.game_logic.board_utils import find_word_placements
+from app.game_logic.game_state import GameState, PlacedTile, Position
+from app.game_logic.letter_bag import create_letter_bag
+from app.game_logic.move_generator import get_move_generator, RACK_SIZE
+from app.optimized_computer_player import OptimizedComputerPlayer
+from app.utils.compact_dictionary import load_compact_dictionary
+from app.utils.wordlist_utils import get_wordlist_path, read_wordlist_file
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "bench_move_generation_baseline.json")
+TESTS_DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "tests", "data")
+STAGES = (("early", 0), ("mid", 20), ("late", 60))  # stage starts at this many tiles on the board
+POSITIONS_PER_STAGE = 12
+OPERATIONS = ("validate", "score", "placements", "search", "computer")
+# Minimum allowed regression per metric, whatever --tolerance says
+LATENCY_TOLERANCE_FLOOR = 0.5
+CALIBRATION_RUNS = 3
+
+
+def load_dictionary(language):
+    """The language's dictionary: compiled file, then data/ wordlist, then the test wordlist."""
+    compact = load_compact_dictionary(language)
+    if compact is not None:
+        return compact, compact.path
+    for path in (get_wordlist_path(language), os.path.join(TESTS_DATA_DIR, f"{language}_words.txt")):
+        if os.path.exists(path):
+            return read_wordlist_file(path), path
+    raise FileNotFoundError(f"No wordlist available for '{language}'")
+
+
+def stage_for(tile_count):
+    name = STAGES[0][0]
+    for stage, start in STAGES:
+        if tile_count >= start:
+            name = stage
+    return name
+
+
+def build_corpus(language, dictionary, games, seed):
+    """Self-play seeded games and collect (board, rack, move) positions per stage."""
+    generator = get_move_generator(language, dictionary)
+    corpus = {stage: [] for stage, _ in STAGES}
+
+    for game_number in range(games):
+        random.seed(seed + game_number)
+        bag = create_letter_bag(language)
+        racks = [[bag.pop() for _ in range(RACK_SIZE)] for _ in range(2)]
+        board = [[None] * 15 for _ in range(15)]
+        tiles_on_board = 0
+        passes = 0
+        player = 0
+
+        while passes < 2 and racks[player]:
+            rack = "".join(racks[player])
+            move = generator.best_move(board, rack)
+            if move is None:
+                passes += 1
+                player = 1 - player
+                continue
+            passes = 0
+
+            bucket = corpus[stage_for(tiles_on_board)]
+            if len(bucket) < POSITIONS_PER_STAGE * games:
+                bucket.append({
+                    "board": [[dict(cell) if cell else None for cell in row] for row in board],
+                    "rack": rack,
+                    "word": move.word,
+                    "tiles": [list(tile) for tile in move.tiles],
+                })
+
+            for row, col, letter, is_blank in move.tiles:
+                board[row][col] = {"letter": letter, "is_blank": is_blank}
+                racks[player].remove("?" if is_blank else letter)
+            tiles_on_board += len(move.tiles)
+            while bag and len(racks[player]) < RACK_SIZE:
+                racks[player].append(bag.pop())
+            player = 1 - player
+
+    return corpus
+
+
+def make_game_state(language, position):
+    game = GameState(language=language)
+    for r, row in enumerate(position["board"]):
+        for c, cell in enumerate(row):
+            if cell:
+                game.board[r][c] = PlacedTile(cell["letter"], cell["is_blank"])
+                game.center_used = True
+    return game
+
+
+def move_data(position):
+    return [(Position(row, col), PlacedTile(letter, is_blank)) for row, col, letter, is_blank in position["tiles"]]
+
+
+def operations(language, dictionary):
+    player = OptimizedComputerPlayer()
+    generator = get_move_generator(language, dictionary)
+
+    def validate(position):
+        valid, message, _ = make_game_state(language, position).validate_word_placement(move_data(position), dictionary)
+        if not valid:
+            raise AssertionError(f"Corpus move rejected: {message}")
+
+    def score(position):
+        make_game_state(language, position).calculate_detailed_score_breakdown(move_data(position))
+
+    def placements(position):
+        letters = [[cell["letter"] if cell else None for cell in row] for row in position["board"]]
+        is_first_move = not any(any(row) for row in letters)
+        find_word_placements(letters, position["word"], list(position["rack"]), dictionary, is_first_move, language)
+
+    def search(position):
+        generator.generate_moves(position["board"], position["rack"])
+
+    def computer(position):
+        player.make_move({"board": position["board"]}, position["rack"], dictionary, language)
+
+    return {"validate": validate, "score": score, "placements": placements, "search": search, "computer": computer}
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def calibrate():
+    """Time (ms) of a fixed pure-Python workload, used to normalize latencies across machines."""
+    start = time.perf_counter()
+    table = {f"W{i}": i for i in range(20000)}
+    sum(table[f"W{i}"] for i in range(0, 20000, 3))
+    sorted(table, key=len)
+    return (time.perf_counter() - start) * 1000
+
+
+def measure(operation, positions, repeat):
+    """Latency samples (ms) over all positions x repeat, and median peak allocation (KB) per call."""
+    operation(positions[0])  # warm shared indexes outside the measurement
+    times = []
+    best = [float("inf")] * len(positions)
+    relative = []
+    for _ in range(repeat):
+        # Calibrate in every pass so the reference sees the same machine load
+        calibration = min(calibrate() for _ in range(CALIBRATION_RUNS))
+        pass_times = []
+        for i, position in enumerate(positions):
+            start = time.perf_counter()
+            operation(position)
+            elapsed = (time.perf_counter() - start) * 1000
+            pass_times.append(elapsed)
+            best[i] = min(best[i], elapsed)
+        times.extend(pass_times)
+        relative.append(statistics.median(pass_times) / calibration)
+
+    peaks = []
+    for position in positions:
+        tracemalloc.start()
+        operation(position)
+        peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+        tracemalloc.stop()
+
+    return {
+        "calls": len(times),
+        "p50_ms": round(statistics.median(times), 3),
+        "p99_ms": round(percentile(times, 0.99), 3),
+        # Median over positions of the fastest repeat: far less sensitive to machine load
+        "best_ms": round(statistics.median(best), 3),
+        # Median pass latency in units of the calibration workload, comparable across machines
+        "relative": round(statistics.median(relative), 4),
+        "alloc_kb": round(statistics.median(peaks), 1),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Regressions of normalized latency or allocations beyond the tolerance."""
+    regressions = []
+    for key, result in results.items():
+        reference = baseline.get(key)
+        if not reference:
+            continue
+        for metric, floor, metric_tolerance in (("relative", 0.02, max(tolerance, LATENCY_TOLERANCE_FLOOR)),
+                                                ("alloc_kb", 1.0, tolerance)):
+            if metric not in reference:
+                continue
+            # The floor ignores noise on trivially cheap calls
+            limit = max(reference[metric] * (1 + metric_tolerance), reference[metric] + floor)
+            if result[metric] > limit:
+                regressions.append(f"{key} {metric}: {result[metric]} > {reference[metric]} (+{metric_tolerance:.0%})")
+    return regressions
+
+
+def describe_corpus(dictionary, source, corpus):
+    """Where a language's positions came from, recorded with the baseline."""
+    missing = [stage for stage, _ in STAGES if not corpus[stage]]
+    description = {"source": os.path.relpath(source, os.path.join(os.path.dirname(__file__), "..")),
+                   "words": len(dictionary)}
+    if missing:
+        description["missing_stages"] = missing
+        description["note"] = "Wordlist too small for self-play to reach these stages; they are not benchmarked"
+    return description
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark move validation, scoring and generation")
+    parser.add_argument("--languages", nargs="+", default=["de", "en"])
+    parser.add_argument("--games", type=int, default=3, help="Self-play games per language")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--repeat", type=int, default=5, help="Timed passes over the corpus")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed latency/allocation regression")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    results = {}
+    corpora = {}
+    devnull = open(os.devnull, "w")
+    for language in args.languages:
+        try:
+            dictionary, source = load_dictionary(language)
+        except FileNotFoundError as e:
+            print(f"Skipping {language}: {e}")
+            continue
+        print(f"{language}: {len(dictionary)} words from {source}")
+
+        # Scoring still prints debug output; keep it out of the report (it is still timed)
+        with contextlib.redirect_stdout(devnull):
+            corpus = build_corpus(language, dictionary, args.games, args.seed)
+        corpora[language] = describe_corpus(dictionary, source, corpus)
+        # Like the computer move workers after preloading: long-lived structures leave the GC's passes
+        gc.collect()
+        gc.freeze()
+        ops = operations(language, dictionary)
+        for stage, _ in STAGES:
+            positions = corpus[stage]
+            if not positions:
+                print(f"  {stage}: no positions (dictionary too small for this stage)")
+                continue
+            for name in OPERATIONS:
+                key = f"{language}/{stage}/{name}"
+                with contextlib.redirect_stdout(devnull):
+                    results[key] = measure(ops[name], positions, args.repeat)
+    devnull.close()
+
+    print(f"\n{'benchmark':28}{'calls':>7}{'p50 ms':>10}{'p99 ms':>10}{'best ms':>10}{'alloc KB':>11}")
+    for key, result in results.items():
+        print(f"{key:28}{result['calls']:>7}{result['p50_ms']:>10.3f}{result['p99_ms']:>10.3f}"
+              f"{result['best_ms']:>10.3f}{result['alloc_kb']:>11.1f}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(dict(results, _corpus=corpora), f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\n❌ Regressions against baseline:")
+        for regression in regressions:
+            print(f"   {regression}")
+        return 1
+    print("\n✅ No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""
+Script to compile wordlists into the memory-mapped dictionary format.
+
+Run after importing a wordlist (or at deploy time) so workers map the compiled
+file instead of selecting the whole wordlists table on a cold start.
+"""
+
+import os
+import sys
+import argparse
+import time
+
+# Add parent directory to path so we can import app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.utils.compact_dictionary import build_compact_dictionary, get_compact_dictionary_path
+from app.utils.wordlist_utils import get_database_dictionary_versions, read_wordlist_file
+
+
+def load_words_from_database(language):
+    """The language's words and the dictionary version they correspond to."""
+    from app.database import SessionLocal
+    from app.models.wordlist import WordList
+
+    db = SessionLocal()
+    try:
+        version = get_database_dictionary_versions(db).get(language, 0)
+        words = {row[0] for row in db.query(WordList.word).filter(WordList.language == language).yield_per(50000)}
+        return words, version
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile wordlists into the compact dictionary format")
+    parser.add_argument("languages", nargs="+", help="Language codes (e.g., 'de', 'en')")
+    parser.add_argument("--path", help="Compile from this wordlist file instead of the database (single language)")
+    parser.add_argument("--output", help="Output file (single language, defaults to the configured location)")
+
+    args = parser.parse_args()
+
+    if (args.path or args.output) and len(args.languages) != 1:
+        print("Error: --path and --output can only be used with a single language")
+        return 1
+
+    for language in args.languages:
+        start_time = time.time()
+        try:
+            if args.path:
+                words, version = read_wordlist_file(args.path), 0
+            else:
+                words, version = load_words_from_database(language)
+        except Exception as e:
+            print(f"Error reading words for '{language}': {e}")
+            return 1
+
+        if not words:
+            print(f"No words found for language '{language}', skipping")
+            continue
+
+        output = args.output or get_compact_dictionary_path(language)
+        count = build_compact_dictionary(words, output, version)
+        size_kb = os.path.getsize(output) / 1024
+        print(f"✅ {language}: {count} words (version {version}) -> {output} ({size_kb:.0f} KB, {time.time() - start_time:.2f}s)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
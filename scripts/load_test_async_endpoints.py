@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""
+Load test for the async turn endpoints against a running server.
+
+Each worker plays its own two-player game between the debug test users
+player01 and player02 (tokens from /admin/debug/create-test-tokens), passing
+turns back and forth via POST /games/{id}/pass and starting a new game when
+the passes end one. Throughput (passes/sec) and p50/p99 latency are reported
+for each concurrency level, so a run before and after a change shows whether
+the endpoints keep scaling while requests wait on the database.
+
+Usage: python scripts/load_test_async_endpoints.py [--url http://localhost:8000]
+       [--concurrency 1 4 16 32] [--duration 20]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def get_tokens(client):
+    """Bearer headers for player01 and player02, keyed by user id."""
+    response = await client.post("/admin/debug/create-test-tokens")
+    response.raise_for_status()
+    return {u["user_id"]: {"Authorization": f"Bearer {u['access_token']}"} for u in response.json()["users"]}
+
+
+async def new_game(client, headers):
+    """Create a game as the first user and join it as the second; joining starts it."""
+    creator, joiner = list(headers.values())
+    response = await client.post("/games/", json={"language": "en", "max_players": 2}, headers=creator)
+    response.raise_for_status()
+    game_id = response.json()["id"]
+    response = await client.post(f"/games/{game_id}/join", headers=joiner)
+    response.raise_for_status()
+    return game_id
+
+
+async def worker(client, headers, deadline, latencies, errors):
+    game_id = await new_game(client, headers)
+    player_id = next(iter(headers))
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await client.post(f"/games/{game_id}/pass", headers=headers[player_id])
+        elapsed = time.perf_counter() - started
+        if response.status_code == 403:  # The other player opened the game
+            player_id = next(uid for uid in headers if uid != player_id)
+            continue
+        if response.status_code != 200:
+            errors.append(response.status_code)
+            continue
+        latencies.append(elapsed)
+        data = response.json()
+        if data.get("game_over"):
+            game_id = await new_game(client, headers)
+        else:
+            player_id = data["next_player_id"]
+
+
+async def run_level(url, concurrency, duration):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, timeout=60, limits=limits) as client:
+        headers = await get_tokens(client)
+        latencies, errors = [], []
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(worker(client, headers, deadline, latencies, errors) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000 if latencies else 0.0
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0.0
+    print(f"{concurrency:>11} {len(latencies) / elapsed:>12.1f} {p50:>9.1f} {p99:>9.1f} {len(errors):>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 32])
+    parser.add_argument("--duration", type=float, default=20, help="seconds per concurrency level")
+    args = parser.parse_args()
+
+    print(f"{'concurrency':>11} {'passes/sec':>12} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for concurrency in args.concurrency:
+        asyncio.run(run_level(args.url, concurrency, args.duration))
+
+
+if __name__ == "__main__":
+    main()
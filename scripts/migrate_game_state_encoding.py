@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""
+Script to rewrite games.state rows still stored as JSON in the compact encoding.
+
+Not required: legacy rows are read as before and are converted on their next
+write. Run it to shrink the remaining rows (e.g. finished games) in one pass.
+Each game is updated conditionally on its state_version, so a game that takes
+a turn meanwhile is simply skipped.
+"""
+
+import os
+import sys
+import argparse
+import time
+
+# Add parent directory to path so we can import app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.game_logic.state_codec import decode_state, encode_state, is_compact
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert legacy JSON game states to the compact encoding")
+    parser.add_argument("--batch-size", type=int, default=200, help="Games loaded per query")
+    parser.add_argument("--dry-run", action="store_true", help="Only report the size reduction")
+
+    args = parser.parse_args()
+
+    from app.database import SessionLocal
+    from app.models import Game
+
+    db = SessionLocal()
+    start_time = time.time()
+    converted = skipped = failed = 0
+    bytes_before = bytes_after = 0
+    last_id = ""
+    try:
+        while True:
+            games = (
+                db.query(Game)
+                .filter(Game.id > last_id, Game.state.like("{%"))
+                .order_by(Game.id)
+                .limit(args.batch_size)
+                .all()
+            )
+            if not games:
+                break
+            last_id = games[-1].id
+
+            for game in games:
+                if is_compact(game.state):
+                    continue
+                try:
+                    encoded = encode_state(decode_state(game.state))
+                except Exception as e:
+                    print(f"❌ {game.id}: {e}")
+                    failed += 1
+                    continue
+                if not is_compact(encoded):
+                    skipped += 1  # Holds something the compact format can't represent
+                    continue
+
+                bytes_before += len(game.state)
+                bytes_after += len(encoded)
+                converted += 1
+                if args.dry_run:
+                    continue
+                game.state = encoded
+                try:
+                    db.commit()
+                except StaleDataError:
+                    db.rollback()
+                    converted -= 1
+                    skipped += 1
+
+            db.expunge_all()
+    finally:
+        db.close()
+
+    action = "Would convert" if args.dry_run else "Converted"
+    print(f"✅ {action} {converted} games ({bytes_before / 1024:.0f} KB -> {bytes_after / 1024:.0f} KB), "
+          f"{skipped} skipped, {failed} failed, {time.time() - start_time:.2f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+"""
+In-memory SQLite databases for tests that need the models but no database server.
+
+Unlike the fixtures in conftest.py these need no Postgres or cloud credentials.
+"""
+
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+
+
+def sqlite_engine(*models):
+    """A fresh in-memory database with the given models' tables (all tables if none given).
+
+    Every session and thread shares its one connection, so a TestClient's threadpool
+    sees what the test wrote.
+    """
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[model.__table__ for model in models] or None)
+    return engine
+
+
+@contextmanager
+def sqlite_session(*models):
+    """A session on a fresh sqlite_engine(*models), closed on exit."""
+    engine = sqlite_engine(*models)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
@@ -0,0 +1,55 @@
+import os
+
+from app.utils.compact_dictionary import (
+    CompactDictionary,
+    build_compact_dictionary,
+    load_compact_dictionary,
+    remove_compact_dictionary,
+)
+
+WORDS = {"HAUS", "MAUS", "ÄPFEL", "BÄR", "AB", "ZZZ"}
+
+
+def test_roundtrip_membership(tmp_path):
+    """A compiled dictionary contains exactly the input words, normalized to uppercase."""
+    path = str(tmp_path / "de.wbdict")
+    count = build_compact_dictionary(list(WORDS) + ["haus", " maus "], path)
+    assert count == len(WORDS)
+
+    dictionary = CompactDictionary(path)
+    assert len(dictionary) == len(WORDS)
+    for word in WORDS:
+        assert word in dictionary
+    assert "HAU" not in dictionary
+    assert "HAUSE" not in dictionary
+    assert "A" not in dictionary
+    assert 42 not in dictionary
+    assert set(dictionary) == WORDS
+
+
+def test_behaves_like_a_set(tmp_path):
+    """Set operations used by callers keep working on the mapped dictionary."""
+    path = str(tmp_path / "de.wbdict")
+    build_compact_dictionary(WORDS, path)
+    dictionary = CompactDictionary(path)
+
+    assert dictionary == WORDS
+    assert {"HAUS", "AB"} <= dictionary
+    assert (dictionary & {"HAUS", "NEIN"}) == {"HAUS"}
+    assert sorted(dictionary)[0] == "AB"
+
+
+def test_load_by_language(tmp_path, monkeypatch):
+    """The loader maps the file for a language and ignores missing or corrupt files."""
+    monkeypatch.setenv("COMPACT_DICTIONARY_DIR", str(tmp_path))
+    assert load_compact_dictionary("de") is None
+
+    build_compact_dictionary(WORDS, str(tmp_path / "de.wbdict"))
+    assert "BÄR" in load_compact_dictionary("de")
+
+    (tmp_path / "en.wbdict").write_bytes(b"not a dictionary")
+    assert load_compact_dictionary("en") is None
+
+    remove_compact_dictionary("de")
+    assert not os.path.exists(tmp_path / "de.wbdict")
+    assert load_compact_dictionary("de") is None
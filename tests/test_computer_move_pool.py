@@ -0,0 +1,77 @@
+import asyncio
+import threading
+
+import pytest
+
+from app import computer_move_pool as pool_module
+from app.computer_move_pool import ComputerMovePool, ComputerMovePoolBusy
+from app.game_logic import dictionary_index
+from app.game_logic.move_generator import clear_move_generator_cache
+from app.utils import wordlist_utils
+
+WORDS = {"CAT", "CATS", "AT", "TA", "ACT", "SCAT", "CAST", "TAS", "AS", "SAT"}
+
+
+def empty_board():
+    return [[None for _ in range(15)] for _ in range(15)]
+
+
+@pytest.fixture
+def small_dictionary():
+    wordlist_utils._install_dictionary("en", WORDS, 0)
+    yield
+    wordlist_utils.clear_wordlist_cache()
+    clear_move_generator_cache()
+
+
+def test_search_runs_off_the_loop_and_records_metrics(small_dictionary, monkeypatch):
+    """Without worker processes the search runs in a thread; timings are still reported."""
+    monkeypatch.setattr(dictionary_index, "_warm_move_generators", False)
+    pool = ComputerMovePool(workers=0, queue_limit=4, languages=[])
+    move = asyncio.run(pool.make_move({"board": empty_board()}, "CATSXYZ", "en", "hard"))
+    assert move["type"] == "place" and move["word"] in WORDS
+    # Searching in this process, it builds move generators for reloaded dictionaries
+    assert dictionary_index._warm_move_generators
+
+    stats = pool.stats()
+    assert stats["completed"] == 1 and stats["queue_depth"] == 0 and stats["running"] == 0
+    assert stats["search_ms"]["p50"] >= 0 and "p95" in stats["wait_ms"]
+
+
+def test_concurrency_cap_and_queue_limit(monkeypatch):
+    """One search runs per slot, the next ones queue, and a full queue turns requests away."""
+    release = threading.Event()
+
+    def blocking_search(*args):
+        release.wait(5)
+        return {"type": "pass"}, 1.0
+
+    monkeypatch.setattr(pool_module, "_search", blocking_search)
+    pool = ComputerMovePool(workers=0, queue_limit=1, languages=[])
+
+    async def scenario():
+        running = asyncio.ensure_future(pool.make_move({}, "A", "en"))
+        queued = asyncio.ensure_future(pool.make_move({}, "B", "en"))
+        await asyncio.sleep(0.05)
+        assert pool.running == 1 and pool.waiting == 1
+        with pytest.raises(ComputerMovePoolBusy):
+            await pool.make_move({}, "C", "en")
+        release.set()
+        return await asyncio.gather(running, queued)
+
+    assert asyncio.run(scenario()) == [{"type": "pass"}, {"type": "pass"}]
+    stats = pool.stats()
+    assert stats["completed"] == 2 and stats["rejected"] == 1 and stats["queue_depth"] == 0
+
+
+def test_worker_process_preloads_and_searches():
+    """A spawned worker loads the dictionary itself and returns the move across the process boundary."""
+    pool = ComputerMovePool(workers=1, queue_limit=4, languages=["en"])
+    pool.start()
+    try:
+        move = asyncio.run(pool.make_move({"board": empty_board()}, "CATSXYZ", "en"))
+    finally:
+        pool.shutdown()
+    assert move["type"] == "place"
+    assert any(tile["row"] == 7 and tile["col"] == 7 for tile in move["tiles"])
+    assert pool.stats()["completed"] == 1
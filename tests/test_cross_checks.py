@@ -0,0 +1,94 @@
+from app.game_logic.cross_checks import CrossCheckBoard, letter_bits
+from app.game_logic.board_utils import find_word_placements
+from app.game_logic.game_state import GameState, Position, PlacedTile, MoveType
+
+DICTIONARY = {"CAT", "AT", "TA", "CATS", "TAT", "AS", "SAT", "ACT"}
+
+
+def board_with(word, row, col, horizontal=True):
+    board = [[None for _ in range(15)] for _ in range(15)]
+    for i, letter in enumerate(word):
+        if horizontal:
+            board[row][col + i] = letter
+        else:
+            board[row + i][col] = letter
+    return board
+
+
+def test_masks_allow_only_valid_cross_words():
+    """A square below 'A' only allows letters that extend it to a word."""
+    checks = CrossCheckBoard(board_with("CAT", 7, 6), DICTIONARY, "en")
+    # Square under the A at (7, 7): vertical word "A?" -> AT, AS
+    assert checks.allows(8, 7, "T", horizontal=True)
+    assert checks.allows(8, 7, "S", horizontal=True)
+    assert checks.allows(8, 7, "X", horizontal=True) is False
+    # Square after CAT in the row: horizontal word "CAT?" -> CATS
+    assert checks.allows(7, 9, "S", horizontal=False)
+    assert checks.allows(7, 9, "E", horizontal=False) is False
+    # Squares away from tiles are unconstrained
+    assert checks.allows(0, 0, "Q", horizontal=True)
+    assert checks.across[0][0] == (1 << len(letter_bits("en"))) - 1
+
+
+def test_incremental_update_matches_rebuild():
+    """Updating only touched rows and columns gives the same masks as a full rebuild."""
+    board = board_with("CAT", 7, 6)
+    checks = CrossCheckBoard(board, DICTIONARY, "en")
+    checks.place([(8, 7, "T"), (8, 8, "A")])
+
+    board[8][7] = "T"
+    board[8][8] = "A"
+    rebuilt = CrossCheckBoard(board, DICTIONARY, "en")
+    assert checks.across == rebuilt.across
+    assert checks.down == rebuilt.down
+
+
+def test_unresolved_blank_defers_to_word_check():
+    """Masks next to an unresolved blank are unknown rather than guessed."""
+    checks = CrossCheckBoard(board_with("C?T", 7, 6), DICTIONARY, "en")
+    assert checks.allows(8, 7, "T", horizontal=True) is None
+
+
+def test_game_state_rejects_invalid_cross_word():
+    """Placement validation reports the cross-word rejected by the masks."""
+    game = GameState(language="en")
+    game.players = {1: "SXAAAAA", 2: "AAAAAAA"}
+    game.scores = {1: 0, 2: 0}
+    game.start_game(1)
+    for i, letter in enumerate("CAT"):
+        game.board[7][6 + i] = PlacedTile(letter)
+    game.center_used = True
+
+    success, message, _ = game.validate_word_placement(
+        [(Position(8, 7), PlacedTile("X"))], DICTIONARY
+    )
+    assert not success
+    assert "'AX'" in message
+
+    success, _, points = game.make_move(1, MoveType.PLACE, [(Position(7, 9), PlacedTile("S"))], DICTIONARY)
+    assert success and points > 0
+    # The masks followed the placement without a rebuild
+    assert game._cross_checks.allows(7, 10, "A", horizontal=False) is False
+
+
+def test_find_word_placements_directions():
+    """Placements run along rows and columns and respect cross-words."""
+    board = board_with("CAT", 7, 6)
+    placements = find_word_placements(board, "TAT", list("TAT"), DICTIONARY, language="en")
+    assert placements
+    directions = {p["direction"] for p in placements}
+    assert directions <= {"horizontal", "vertical"}
+    for placement in placements:
+        assert set(placement["score_preview"]["words_formed"]) <= DICTIONARY
+
+
+def test_move_generator_accepts_precomputed_masks():
+    """The move generator gives the same moves with a caller-supplied cross-check board."""
+    from app.game_logic.move_generator import MoveGenerator
+
+    board = board_with("CAT", 7, 6)
+    generator = MoveGenerator(DICTIONARY, "en")
+    checks = CrossCheckBoard(board, DICTIONARY, "en")
+    expected = [(m.word, m.tiles, m.score) for m in generator.generate_moves(board, "TASXQZV")]
+    actual = [(m.word, m.tiles, m.score) for m in generator.generate_moves(board, "TASXQZV", checks)]
+    assert expected and sorted(actual) == sorted(expected)
@@ -0,0 +1,28 @@
+from app.game_logic.dictionary_index import get_dictionary_index, clear_dictionary_indexes, get_dictionary_index_stats
+from app.game_logic.game_state import GameState
+
+WORDS = {"HAUS", "MAUS", "AB", "TOR"}
+
+
+def test_game_states_share_one_index():
+    """Every GameState for a language/dictionary version references the same derived structures."""
+    clear_dictionary_indexes()
+    first, second = GameState(language="de"), GameState(language="de")
+    first._is_valid_word_pattern("?AUS", WORDS)
+    second._is_valid_word_pattern("T?R", WORDS)
+    assert first._dictionary_index is second._dictionary_index
+    assert first._get_dictionary_by_length(WORDS) is second._get_dictionary_by_length(WORDS)
+    assert first._get_dictionary_by_length(WORDS)[4] == ["HAUS", "MAUS"]
+
+
+def test_new_dictionary_starts_new_version():
+    """A reloaded dictionary (new object) gets a fresh index with a higher version."""
+    clear_dictionary_indexes()
+    old_index = get_dictionary_index("de", WORDS)
+    reloaded = set(WORDS) | {"LAUS"}
+    new_index = get_dictionary_index("de", reloaded)
+    assert new_index is not old_index
+    assert new_index.version > old_index.version
+    assert new_index.pattern_index.matches("?AUS") == ["HAUS", "LAUS", "MAUS"]
+    assert get_dictionary_index_stats()["de"]["pattern_index_built"]
+    clear_dictionary_indexes()
@@ -0,0 +1,136 @@
+import pytest
+
+from app.game_logic import dictionary_index
+from app.game_logic.dictionary_index import get_dictionary_index, clear_dictionary_indexes
+from app.models.wordlist import DictionaryVersion
+from app.utils import wordlist_utils
+from app.utils.compact_dictionary import CompactDictionary, OverlayDictionary, build_compact_dictionary, get_compact_dictionary_path
+from tests.sqlite_db import sqlite_session
+
+WORDS = {"HAUS", "MAUS", "TOR"}
+
+
+def wait_for_background_work():
+    wordlist_utils._reload_executor.submit(lambda: None).result()
+    dictionary_index._build_executor.submit(lambda: None).result()
+
+
+@pytest.fixture
+def dictionaries(tmp_path, monkeypatch):
+    monkeypatch.setenv("COMPACT_DICTIONARY_DIR", str(tmp_path))
+    wordlist_utils.clear_wordlist_cache()
+    yield tmp_path
+    wait_for_background_work()
+    wordlist_utils.clear_wordlist_cache()
+
+
+@pytest.fixture
+def db():
+    with sqlite_session(DictionaryVersion) as session:
+        yield session
+
+
+def test_delta_is_served_immediately_then_merged(dictionaries):
+    """Added words are visible at once as an overlay; the compiled merge replaces it in the background."""
+    wordlist_utils._install_dictionary("de", set(WORDS), 1)
+
+    wordlist_utils.apply_dictionary_delta("de", ["LAUS"], 2)
+    served = wordlist_utils.load_wordlist("de")
+    assert "LAUS" in served and "HAUS" in served
+    assert wordlist_utils.get_dictionary_version("de") == 2
+
+    wait_for_background_work()
+    merged = wordlist_utils.load_wordlist("de")
+    assert isinstance(merged, CompactDictionary)
+    assert merged.version == 2
+    assert set(merged) == WORDS | {"LAUS"}
+
+
+def test_missed_version_reloads_instead_of_applying(dictionaries):
+    """A delta that skips a version isn't applied on top of a stale dictionary."""
+    wordlist_utils._install_dictionary("de", set(WORDS), 1)
+    build_compact_dictionary(WORDS | {"LAUS", "RAUS"}, get_compact_dictionary_path("de"), version=3)
+
+    wordlist_utils.apply_dictionary_delta("de", ["RAUS"], 3)
+    wait_for_background_work()
+
+    reloaded = wordlist_utils.load_wordlist("de")
+    assert wordlist_utils.get_dictionary_version("de") == 3
+    assert "LAUS" in reloaded and "RAUS" in reloaded
+
+
+def test_version_bump_and_poll(dictionaries, db):
+    """Edits bump the shared counter; a worker polling it reloads what another worker compiled."""
+    assert wordlist_utils.bump_dictionary_version("de", db) == 1
+    assert wordlist_utils.bump_dictionary_version("de", db) == 2
+    db.commit()
+    assert wordlist_utils.get_database_dictionary_versions(db) == {"de": 2}
+
+    wordlist_utils._install_dictionary("de", set(WORDS), 1)
+    build_compact_dictionary(WORDS | {"LAUS"}, get_compact_dictionary_path("de"), version=2)
+
+    assert wordlist_utils.poll_dictionary_versions(db) == {"de": 2}
+    wait_for_background_work()
+    assert wordlist_utils.get_dictionary_version("de") == 2
+    assert "LAUS" in wordlist_utils.load_wordlist("de")
+    assert wordlist_utils.poll_dictionary_versions(db) == {}
+
+
+def test_new_version_serves_previous_index_until_built():
+    """Requests never wait for a new version's structures: the previous ones serve meanwhile."""
+    clear_dictionary_indexes()
+    old_index = get_dictionary_index("de", WORDS)
+    old_patterns = old_index.pattern_index
+
+    updated = OverlayDictionary(WORDS, ["LAUS"], 2)
+    new_index = get_dictionary_index("de", updated, 2)
+    assert new_index.version == 2
+    assert new_index.pattern_index is old_patterns
+
+    wait_for_background_work()
+    assert new_index.previous is None
+    assert new_index.pattern_index.matches("?AUS") == ["HAUS", "LAUS", "MAUS"]
+    # Requests still holding the old dictionary keep their index
+    assert get_dictionary_index("de", WORDS) is old_index
+    clear_dictionary_indexes()
+
+
+def test_delta_builds_the_index_once_after_the_merge(dictionaries, monkeypatch):
+    """The overlay serves the previous index; only the merged version gets a rebuild."""
+    clear_dictionary_indexes()
+    wordlist_utils._install_dictionary("de", set(WORDS), 1)
+    wait_for_background_work()
+    builds = []
+    original = dictionary_index.WordPatternIndex
+    monkeypatch.setattr(dictionary_index, "WordPatternIndex", lambda words: builds.append(1) or original(words))
+
+    wordlist_utils.apply_dictionary_delta("de", ["LAUS"], 2)
+    overlay_index = get_dictionary_index("de", wordlist_utils.load_wordlist("de"))
+    assert overlay_index.deferred and overlay_index.pattern_index.matches("?AUS") == ["HAUS", "MAUS"]
+
+    wait_for_background_work()
+    merged_index = get_dictionary_index("de", wordlist_utils.load_wordlist("de"))
+    assert merged_index.version == 2 and not merged_index.deferred
+    assert merged_index.pattern_index.matches("?AUS") == ["HAUS", "LAUS", "MAUS"]
+    assert len(builds) == 1
+    clear_dictionary_indexes()
+
+
+def test_web_worker_leaves_the_move_generator_to_the_search_workers(dictionaries, monkeypatch):
+    """Loading a wordlist only builds a move generator in processes that search computer moves."""
+    wordlist_path = dictionaries / "de.txt"
+    wordlist_path.write_text("\n".join(WORDS), encoding="utf-8")
+    monkeypatch.setattr(wordlist_utils, "get_wordlist_path", lambda language: str(wordlist_path))
+    monkeypatch.setattr(dictionary_index, "_warm_move_generators", False)
+    clear_dictionary_indexes()
+
+    index = get_dictionary_index("de", wordlist_utils.load_wordlist("de"))
+    wait_for_background_work()
+    assert index._pattern_index is not None and index._move_generator is None
+
+    dictionary_index.warm_move_generators()
+    wordlist_utils.clear_wordlist_cache()
+    index = get_dictionary_index("de", wordlist_utils.load_wordlist("de"))
+    wait_for_background_work()
+    assert index._move_generator is not None
+    clear_dictionary_indexes()
@@ -0,0 +1,97 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.game_logic import event_stream
+from app.game_logic.event_stream import game_event_log, resume_messages
+from app.models import Game, Player, User
+from app.models.game import GameStatus
+from app.pubsub import EventBus, InMemoryBackend
+from app.routers.games import _commit_pass, _load_turn, _play_pass, _start_game
+from app.websocket import ConnectionManager
+from tests.sqlite_db import sqlite_session
+
+
+@pytest.fixture
+def db():
+    with sqlite_session() as session:
+        session.add_all([User(id=1, username="alice", email="alice@example.com"),
+                         User(id=2, username="bob", email="bob@example.com"),
+                         Game(id="g1", creator_id=1, language="en", max_players=2,
+                              status=GameStatus.READY, state=json.dumps({}))])
+        session.flush()
+        session.add_all([Player(game_id="g1", user_id=1, rack=""), Player(game_id="g1", user_id=2, rack="")])
+        session.commit()
+        _start_game(session, "g1", session.get(User, 1))
+        game_event_log.clear()
+        yield session
+    game_event_log.clear()
+
+
+def pass_turns(db, count):
+    """Play `count` passes, recording each delta in the event log as a broadcast would."""
+    for _ in range(count):
+        user = db.get(User, db.get(Game, "g1").current_player_id)
+        game, players = _load_turn(db, "g1", None, user)
+        _, delta = _commit_pass(db, game, players, _play_pass(game, players, user), user)
+        game_event_log.record("g1", json.dumps(delta))
+
+
+def types_and_seqs(messages):
+    return [(json.loads(text)["type"], seq) for seq, text in messages]
+
+
+def test_resume_replays_only_missed_events(db):
+    pass_turns(db, 3)
+
+    buffered = resume_messages(db, "g1", 1)
+    assert types_and_seqs(buffered) == [("game_update", 2), ("game_update", 3), ("replay_complete", 3)]
+    assert json.loads(buffered[-1][1])["state_version"] == db.get(Game, "g1").state_version
+
+    game_event_log.clear()  # Another worker, or a restart: rebuild from the moves table
+    rebuilt = resume_messages(db, "g1", 1)
+    assert types_and_seqs(rebuilt) == types_and_seqs(buffered)
+    assert json.loads(rebuilt[0][1])["replayed"] is True
+    assert json.loads(rebuilt[1][1])["current_player_id"] == json.loads(buffered[1][1])["current_player_id"]
+
+    assert types_and_seqs(resume_messages(db, "g1", 3)) == [("replay_complete", 3)]
+
+
+def test_resume_falls_back_to_a_snapshot(db, monkeypatch):
+    monkeypatch.setattr(event_stream, "GAME_EVENT_REPLAY_LIMIT", 2)
+    pass_turns(db, 3)
+
+    assert types_and_seqs(resume_messages(db, "g1", 0)) == [("game_snapshot", 3)]  # Gap too large
+    assert types_and_seqs(resume_messages(db, "g1", 7)) == [("game_snapshot", 3)]  # Client ahead
+
+
+def test_live_events_held_during_resume_are_not_sent_twice():
+    class FakeWebSocket:
+        def __init__(self):
+            self.sent = []
+
+        async def send_text(self, text):
+            self.sent.append(json.loads(text))
+
+    async def scenario():
+        manager = ConnectionManager(EventBus(InMemoryBackend()))
+        socket = FakeWebSocket()
+        await manager.connect(socket, "g1", SimpleNamespace(id=1, username="alice"), resuming=True)
+        await manager.broadcast_to_game("g1", {"type": "game_update", "seq": 5})
+        await manager.broadcast_to_game("g1", {"type": "game_update", "seq": 6})
+        await manager.broadcast_to_game("g1", {"type": "chat_message"})
+        await asyncio.sleep(0.01)
+        assert socket.sent == []
+
+        manager.resume(socket, [(5, json.dumps({"type": "game_update", "seq": 5})),
+                                (5, json.dumps({"type": "replay_complete", "seq": 5}))])
+        await asyncio.sleep(0.01)
+        assert [(m["type"], m.get("seq")) for m in socket.sent] == [
+            ("game_update", 5), ("replay_complete", 5), ("game_update", 6), ("chat_message", None)
+        ]
+
+    game_event_log.clear()
+    asyncio.run(scenario())
+    game_event_log.clear()
@@ -0,0 +1,97 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.game_logic.game_state import GamePhase, PlacedTile
+from app.game_logic.game_state_cache import GameStateCache, load_game_state, serialize_game_state
+from app.models.game import Game, GameStatus
+from tests.sqlite_db import sqlite_engine
+
+
+def make_game(**state):
+    state.setdefault("phase", GamePhase.IN_PROGRESS.value)
+    state.setdefault("letter_bag", list("AEIOU"))
+    return Game(id="g1", creator_id=1, current_player_id=1, language="en",
+                status=GameStatus.IN_PROGRESS, state=json.dumps(state))
+
+
+def players():
+    return [SimpleNamespace(user_id=1, rack="CAT", score=5), SimpleNamespace(user_id=2, rack="DOG", score=3)]
+
+
+def test_state_is_reused_while_version_matches():
+    """A checked-in state is handed out again for the same version; racks always come from the rows."""
+    cache = GameStateCache(max_size=4)
+    game = make_game(turn_number=3)
+    game.state_version = 7
+
+    state = cache.checkout(game, players())
+    assert state.turn_number == 3 and state.players == {1: "CAT", 2: "DOG"}
+    state.turn_number = 4
+    cache.checkin(game.id, state, 7)
+
+    rows = players()
+    rows[0].rack = "CATS"
+    again = cache.checkout(game, rows)
+    assert again is state and again.players[1] == "CATS"
+    # Checked out means not cached: a concurrent request rebuilds instead of sharing the object
+    assert cache.checkout(game, players()) is not state
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_stale_version_and_completed_games_are_not_served():
+    cache = GameStateCache(max_size=1)
+    game = make_game()
+    game.state_version = 1
+    state = cache.checkout(game, players())
+    cache.checkin(game.id, state, 1)
+
+    game.state_version = 2  # written by another worker
+    assert cache.checkout(game, players()) is not state
+
+    state.phase = GamePhase.COMPLETED
+    cache.checkin(game.id, state, 2)
+    assert cache.stats()["games"] == 0
+
+
+def test_serialized_state_round_trips():
+    """The written state rebuilds the same board and bag; tile ids become position-based."""
+    state = load_game_state(make_game())
+    state.board[7][7] = PlacedTile("Q", tile_id="t-1")
+    state.board[7][8] = PlacedTile("I", is_blank=True, tile_id="t-2")
+    state.center_used = True
+
+    game = make_game()
+    game.state = serialize_game_state(state)
+    loaded = load_game_state(game)
+    assert loaded.board[7][7] == PlacedTile("Q", False, "7-7")
+    assert loaded.board[7][8] == PlacedTile("I", True, "7-8")
+    assert sorted(loaded.letter_bag) == list("AEIOU") and loaded.center_used
+
+
+def test_concurrent_writers_conflict():
+    """Every game UPDATE is conditional on the version it read; the second writer loses."""
+    Session = sessionmaker(bind=sqlite_engine(Game))
+
+    setup = Session()
+    setup.add(make_game())
+    setup.commit()
+    setup.close()
+
+    first, second = Session(), Session()
+    game_a = first.get(Game, "g1")
+    game_b = second.get(Game, "g1")
+    version = game_a.state_version
+
+    game_a.current_player_id = 2
+    first.commit()
+    assert first.get(Game, "g1").state_version == version + 1
+
+    game_b.status = GameStatus.COMPLETED
+    with pytest.raises(StaleDataError):
+        second.commit()
+    first.close()
+    second.close()
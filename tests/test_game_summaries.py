@@ -0,0 +1,107 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+
+from app.game_logic.move_log import MoveEvent, append_move
+from app.models import Game, Move, Player, User
+from app.models.game import GameStatus
+from app.utils.game_helpers import (
+    get_game_summaries, get_last_move_info, get_player_data, get_recent_moves_data
+)
+from tests.sqlite_db import sqlite_session
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def db():
+    with sqlite_session(User, Game, Player, Move) as session:
+        session.add_all([
+            User(id=1, username="alice", email="alice@example.com"),
+            User(id=2, username="bob", email="bob@example.com"),
+            User(id=3, username="computer_player", email="computer@example.com"),
+        ])
+        session.commit()
+        yield session
+
+
+def add_games(db, count, first=0):
+    games = []
+    for i in range(first, first + count):
+        opponent = 2 if i % 2 else 3
+        game = Game(id=f"g{i}", creator_id=1, current_player_id=1, language="en", status=GameStatus.IN_PROGRESS,
+                    state=json.dumps({"turn_number": 2}), created_at=START)
+        db.add(game)
+        db.add_all([Player(game_id=game.id, user_id=1, rack="ABC", score=5),
+                    Player(game_id=game.id, user_id=opponent, rack="XYZ", score=7)])
+        db.add_all([
+            Move(game_id=game.id, player_id=1, timestamp=START + timedelta(minutes=1),
+                 move_data=json.dumps({"type": "PLACE", "data": [{"row": 7, "col": 7, "letter": "A"}], "points": 5})),
+            Move(game_id=game.id, player_id=opponent, timestamp=START + timedelta(minutes=2),
+                 move_data=json.dumps({"type": "PASS", "action": "pass", "points": 0})),
+            Move(game_id=game.id, player_id=opponent, timestamp=START + timedelta(minutes=3),
+                 move_data=json.dumps({"type": "PLACE", "data": [{"row": 8, "col": 7, "letter": "T"}],
+                                       "points": 7, "words": ["AT"]})),
+        ])
+        games.append(game)
+    db.commit()
+    return games
+
+
+def count_queries(db, fn):
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.bind, "before_cursor_execute", listener)
+    try:
+        result = fn()
+    finally:
+        event.remove(db.bind, "before_cursor_execute", listener)
+    return result, len(statements)
+
+
+def test_query_count_does_not_grow_with_games(db):
+    add_games(db, 2)
+    few = db.query(Game).all()
+    _, few_queries = count_queries(db, lambda: get_game_summaries(few, 1, db))
+    add_games(db, 10, first=2)
+    many = db.query(Game).all()
+    summaries, many_queries = count_queries(db, lambda: get_game_summaries(many, 1, db))
+    assert len(summaries) == len(many)
+    assert many_queries == few_queries <= 3
+
+
+def test_batched_summary_matches_per_game_helpers(db):
+    game = add_games(db, 2)[1]
+    summary = get_game_summaries([game], 1, db)[0]
+
+    players = db.query(Player).filter(Player.game_id == game.id).order_by(Player.id).all()
+    assert summary["players"] == [
+        dict(get_player_data(p, 1, game.status, db), is_creator=p.user_id == 1) for p in players
+    ]
+    assert summary["last_move"] == get_last_move_info(game.id, 1, db)
+    assert summary["recent_moves"] == get_recent_moves_data(game.id, 1, db)
+    assert summary["recent_moves"][0]["words_formed"] == ["AT"]
+    assert summary["next_player"] == {"id": "1", "username": "alice", "is_current_user": True}
+    assert summary["turn_number"] == 2 and summary["current_players"] == 2
+
+
+def test_summary_columns_follow_writes(db):
+    game = add_games(db, 2)[1]
+    assert game.player_count == 2
+
+    append_move(db, game, MoveEvent(type="PLACE", turn_number=3, player_id=1, rack_after="BC", score_after=14,
+                                    consecutive_passes=0, next_player_id=2, points=9, words=["CAT", "AT"],
+                                    letter_bag_count=80), [])
+    db.commit()
+    summary = get_game_summaries([game], 1, db)[0]
+    assert summary["turn_number"] == 3 and summary["letter_bag_count"] == 80  # Not games.state's turn 2
+    assert summary["last_move"] == {
+        "player_id": "1", "player_username": "alice", "timestamp": game.last_move_at.isoformat(),
+        "description": "Made a PLACE move", "points": 9, "words": ["CAT", "AT"], "was_current_user": True
+    }
+
+    db.delete(db.query(Player).filter(Player.game_id == game.id, Player.user_id == 2).one())
+    db.commit()
+    assert game.player_count == 1
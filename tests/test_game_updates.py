@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from app.models import Game, Player, User
+from app.models.game import GameStatus
+from app.routers.games import (
+    _commit_exchange, _commit_pass, _load_turn, _play_exchange, _play_pass, _start_game
+)
+from app.utils.game_helpers import get_game_snapshot
+from tests.sqlite_db import sqlite_session
+
+
+@pytest.fixture
+def db():
+    with sqlite_session() as session:
+        alice = User(id=1, username="alice", email="alice@example.com")
+        bob = User(id=2, username="bob", email="bob@example.com")
+        session.add_all([alice, bob, Game(id="g1", creator_id=1, language="en", max_players=2,
+                                          status=GameStatus.READY, state=json.dumps({}))])
+        session.flush()
+        session.add_all([Player(game_id="g1", user_id=1, rack=""), Player(game_id="g1", user_id=2, rack="")])
+        session.commit()
+        _start_game(session, "g1", alice)
+        yield session
+
+
+def player_to_move(db):
+    game = db.get(Game, "g1")
+    return db.get(User, game.current_player_id)
+
+
+def pass_turn(db, user):
+    """Load, play and commit a pass as the async endpoint does, in one sync session."""
+    game, players = _load_turn(db, "g1", None, user)
+    return _commit_pass(db, game, players, _play_pass(game, players, user), user)
+
+
+def exchange_letters(db, letters, user):
+    game, players = _load_turn(db, "g1", None, user)
+    return _commit_exchange(db, game, players, _play_exchange(game, players, letters, user), user)
+
+
+def test_turn_updates_are_deltas_chained_by_version(db):
+    version = db.get(Game, "g1").state_version
+    _, first = pass_turn(db, player_to_move(db))
+    rack = db.query(Player).filter(Player.game_id == "g1", Player.user_id == first["current_player_id"]).one().rack
+    _, second = exchange_letters(db, list(rack), player_to_move(db))
+
+    assert (first["previous_version"], first["state_version"]) == (version, version + 1)
+    assert (second["previous_version"], second["state_version"]) == (version + 1, version + 2)
+    assert first["action"] == "PASS" and second["action"] == "EXCHANGE" and second["exchange_count"] == 7
+    assert first["score_changes"] == {} and "board" not in first and "recent_moves" not in first
+    assert second["turn_number"] == 2 and second["consecutive_passes"] == 0
+    assert second["letter_bag_count"] == first["letter_bag_count"]
+
+    snapshot = get_game_snapshot("g1", db)
+    assert snapshot["state_version"] == second["state_version"]
+    assert snapshot["current_player_id"] == second["current_player_id"]
+    assert len(snapshot["board"]) == 15
+    assert len(json.dumps(second)) < len(json.dumps(snapshot)) / 5
+
+
+def test_sync_join_endpoint_auto_starts_and_broadcasts(monkeypatch):
+    """join_game runs in the threadpool and hands its WebSocket broadcast to the event loop."""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.auth import get_current_user
+    from app.db import get_db
+    from app.routers import games
+
+    with sqlite_session() as session:
+        session.add_all([User(id=1, username="alice", email="alice@example.com"),
+                         User(id=2, username="bob", email="bob@example.com"),
+                         Game(id="g2", creator_id=1, language="en", max_players=2,
+                              status=GameStatus.SETUP, state=json.dumps({}))])
+        session.flush()
+        session.add(Player(game_id="g2", user_id=1, rack=""))
+        session.commit()
+
+        broadcasts = []
+
+        async def broadcast_to_game(game_id, message):
+            broadcasts.append((game_id, message["type"]))
+
+        monkeypatch.setattr(games.manager, "broadcast_to_game", broadcast_to_game)
+        app = FastAPI()
+        app.include_router(games.router)
+        app.dependency_overrides[get_db] = lambda: session
+        app.dependency_overrides[get_current_user] = lambda: session.get(User, 2)
+
+        response = TestClient(app).post("/games/g2/join")
+        assert response.status_code == 200 and response.json()["game_status"] == "in_progress"
+        assert broadcasts == [("g2", "game_started")]
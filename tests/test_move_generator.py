@@ -0,0 +1,228 @@
+import itertools
+import os
+import random
+import time
+
+from app.game_logic.dictionary_index import _build_executor
+from app.game_logic.game_state import GameState, PlacedTile, Position
+from app.game_logic.letter_bag import create_letter_bag
+from app import optimized_computer_player
+from app.game_logic.move_generator import (
+    RACK_SIZE, Dawg, MoveGenerator, get_move_generator, clear_move_generator_cache
+)
+from app.game_logic.validate_move import validate_move
+from app.optimized_computer_player import OptimizedComputerPlayer, rack_leave_value
+from app.utils.wordlist_utils import read_wordlist_file
+
+WORDS = {"CAT", "CATS", "AT", "TA", "ACT", "SCAT", "CAST", "TAS", "AS", "SAT"}
+
+
+def empty_board():
+    return [[None for _ in range(15)] for _ in range(15)]
+
+
+def test_dawg_membership_and_minimization():
+    """The DAWG contains exactly the input words and shares common suffixes."""
+    dawg = Dawg(WORDS)
+    for word in WORDS:
+        assert word in dawg
+    assert "CA" not in dawg
+    assert "CATSS" not in dawg
+    assert dawg.word_count == len(WORDS)
+    assert dawg.node_count < sum(len(w) for w in WORDS)
+
+
+def test_first_move_covers_center():
+    """Opening moves must cross the center square, in both directions."""
+    generator = MoveGenerator(WORDS, "en")
+    moves = generator.generate_moves(empty_board(), "CATSXYZ")
+    assert moves
+    assert all(any((r, c) == (7, 7) for r, c, _, _ in m.tiles) for m in moves)
+    assert {m.direction for m in moves} == {"horizontal", "vertical"}
+    assert moves[0].word in WORDS
+    assert [m.score for m in moves] == sorted((m.score for m in moves), reverse=True)
+
+
+def test_generated_moves_are_valid():
+    """Every generated placement passes the rule validator."""
+    board = empty_board()
+    for i, letter in enumerate("CAT"):
+        board[7][6 + i] = letter
+    generator = MoveGenerator(WORDS, "en")
+    rack = ["S", "A", "T", "X", "Q", "Z", "V"]
+    moves = generator.generate_moves(board, "".join(rack))
+    assert any(m.word == "CATS" for m in moves)
+    for move in moves:
+        move_letters = [(r, c, letter) for r, c, letter, _ in move.tiles]
+        is_valid, reason = validate_move(board, move_letters, rack, WORDS)
+        assert is_valid, f"{move.word}: {reason}"
+
+
+def test_blank_tiles_score_zero():
+    """Blanks can stand in for any letter and add no letter points."""
+    generator = MoveGenerator({"AT"}, "en")
+    moves = generator.generate_moves(empty_board(), "?T")
+    assert moves
+    blank_tiles = [t for m in moves for t in m.tiles if t[3]]
+    assert blank_tiles and all(t[2] == "A" for t in blank_tiles)
+    # A blank "A" and a "T" (1 point) on the doubled center square: (0 + 1) * 2
+    assert moves[0].score == 2
+
+
+def test_scores_match_the_game_scorer():
+    """Every generated move scores what GameState credits a human for the same placement."""
+    words = read_wordlist_file(os.path.join(os.path.dirname(__file__), "data", "en_words.txt"))
+    generator = MoveGenerator(words, "en")
+    random.seed(3)
+    bag = create_letter_bag("en")
+    game = GameState(language="en")
+    checked = 0
+    for turn in range(12):
+        # Blanks and doubled letters exercise which tile counts as the blank
+        rack = "?" + "".join(bag.pop() for _ in range(6)) if turn % 3 == 0 else "".join(bag.pop() for _ in range(7))
+        board = [[{"letter": t.letter, "is_blank": t.is_blank} if t else None for t in row] for row in game.board]
+        moves = generator.generate_moves(board, rack)
+        for move in moves:
+            placement = [(Position(r, c), PlacedTile(letter, is_blank)) for r, c, letter, is_blank in move.tiles]
+            assert move.score == game._calculate_points(placement), move
+            checked += 1
+        if moves:
+            for r, c, letter, is_blank in moves[0].tiles:
+                game.board[r][c] = PlacedTile(letter, is_blank)
+    assert checked > 100
+
+
+def test_blank_goes_on_the_weaker_square():
+    """With a real tile and a blank for the same letter, the real tile takes the letter bonus."""
+    generator = MoveGenerator({"TOOT"}, "en")
+    board = empty_board()
+    # Row 11 has a double letter square at column 7; the search reaches row 10 first
+    for row in (9, 12):
+        board[row][7] = {"letter": "T", "is_blank": False}
+    moves = [m for m in generator.generate_moves(board, "O?") if m.direction == "vertical"]
+    assert [tile for tile in moves[0].tiles if not tile[3]] == [(11, 7, "O", False)]
+    game = GameState(language="en")
+    game.board[9][7] = PlacedTile("T")
+    game.board[12][7] = PlacedTile("T")
+    placement = [(Position(r, c), PlacedTile(letter, is_blank)) for r, c, letter, is_blank in moves[0].tiles]
+    assert moves[0].score == game._calculate_points(placement) == 2
+
+
+def test_no_move_returns_pass():
+    """The computer passes when no placement exists."""
+    clear_move_generator_cache("en")
+    player = OptimizedComputerPlayer()
+    result = player.make_move({"board": empty_board()}, "XYZQVWK", WORDS, language="en")
+    assert result["type"] == "pass"
+
+    result = player.make_move({"board": empty_board()}, "CATXYZQ", WORDS, language="en")
+    assert result["type"] == "place"
+    assert result["tiles"] and result["score"] > 0
+
+
+def test_generator_cache_reuses_dictionary():
+    """The generator is built once per language while the dictionary object is unchanged."""
+    clear_move_generator_cache("en")
+    first = get_move_generator("en", WORDS)
+    assert get_move_generator("en", WORDS) is first
+    # A new dictionary object is served by the previous generator until its own is built
+    reloaded = set(WORDS)
+    assert get_move_generator("en", reloaded) is first
+    _build_executor.submit(lambda: None).result()
+    assert get_move_generator("en", reloaded) is not first
+    clear_move_generator_cache()
+
+
+def test_search_stops_at_deadline():
+    """An expired budget stops the search early without failing; a generous one finds every move."""
+    generator = MoveGenerator(WORDS, "en")
+    board = empty_board()
+    for col, letter in enumerate("CAT", start=6):
+        board[7][col] = {"letter": letter, "is_blank": False}
+    moves, complete = generator.search(board, "CATSXYZ", deadline=time.perf_counter() - 1)
+    assert not complete and moves == []
+
+    moves, complete = generator.search(board, "CATSXYZ", deadline=time.perf_counter() + 10)
+    assert complete
+    # Lines are searched in a different order with a deadline, so equal scores may swap
+    assert sorted(moves, key=repr) == sorted(generator.generate_moves(board, "CATSXYZ"), key=repr)
+
+    short = generator.generate_moves(board, "CATSXYZ")
+    assert {len(m.tiles) for m in generator.search(board, "CATSXYZ", max_tiles=1)[0]} == {1}
+    assert [m for m in short if len(m.tiles) <= 2] == generator.search(board, "CATSXYZ", max_tiles=2)[0]
+
+
+def test_budget_caps_a_search_without_early_hits():
+    """The budget holds even when nothing turns up: words need an eighth letter the rack can't give."""
+    words = {"".join(letters) + "Z" for letters in itertools.permutations("ABCDEFG")}
+    clear_move_generator_cache("en")
+    generator = get_move_generator("en", words)
+    start = time.perf_counter()
+    moves, complete = generator.search(empty_board(), "ABCDEF?")
+    assert complete and not moves
+    unbounded_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    move = OptimizedComputerPlayer().make_move({"board": empty_board()}, "ABCDEF?", words, "en", "easy")
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    assert move["type"] == "pass"
+    # 20ms budget; the margin covers a slow test machine, not a search left running
+    assert elapsed_ms < min(40, unbounded_ms / 2), (elapsed_ms, unbounded_ms)
+    clear_move_generator_cache()
+
+
+def test_falls_back_to_short_placements(monkeypatch):
+    """When the full search runs out of time empty-handed, the best short placement is played."""
+    generator = MoveGenerator(WORDS, "en")
+    searches = []
+
+    def search(board, rack, deadline=None, max_tiles=RACK_SIZE):
+        searches.append(max_tiles)
+        if max_tiles == RACK_SIZE:
+            return [], False
+        return MoveGenerator.search(generator, board, rack, deadline=deadline, max_tiles=max_tiles)
+
+    monkeypatch.setattr(generator, "search", search)
+    monkeypatch.setattr(optimized_computer_player, "get_move_generator", lambda language, words: generator)
+    board = empty_board()
+    for col, letter in enumerate("CAT", start=6):
+        board[7][col] = {"letter": letter, "is_blank": False}
+    move = OptimizedComputerPlayer().make_move({"board": board}, "SXYZQVW", WORDS, "en")
+    assert searches == [RACK_SIZE, optimized_computer_player.FALLBACK_MAX_TILES]
+    assert move["type"] == "place" and len(move["tiles"]) <= optimized_computer_player.FALLBACK_MAX_TILES
+
+
+def test_budget_starts_after_the_generator_is_built(monkeypatch):
+    """A cold generator build doesn't count against the search budget."""
+    generator = MoveGenerator(WORDS, "en")
+    searched = []
+
+    def slow_build(language, words):
+        time.sleep(0.05)  # Longer than the easy budget
+        return generator
+
+    def search(board, rack, deadline=None, max_tiles=RACK_SIZE):
+        searched.append(deadline - time.perf_counter())
+        return MoveGenerator.search(generator, board, rack, deadline=deadline, max_tiles=max_tiles)
+
+    monkeypatch.setattr(optimized_computer_player, "get_move_generator", slow_build)
+    monkeypatch.setattr(generator, "search", search)
+    move = OptimizedComputerPlayer("easy").make_move({"board": empty_board()}, "CATSXYZ", WORDS, "en")
+    assert move["type"] != "pass"
+    assert searched[0] > 0.01
+
+
+def test_hard_mode_weighs_rack_leave():
+    """Hard mode keeps a blank over a few extra points; other tiers play the top score."""
+    assert rack_leave_value("?") > rack_leave_value("Q")
+    assert rack_leave_value("EE") < rack_leave_value("ER")
+
+    clear_move_generator_cache("en")
+    words = {"TAX", "UT"}
+    player = OptimizedComputerPlayer()
+    # TAX needs the blank as its A (18 points); UT scores 4 but keeps the blank
+    medium = player.make_move({"board": empty_board()}, "?TXU", words, language="en", difficulty="medium")
+    hard = player.make_move({"board": empty_board()}, "?TXU", words, language="en", difficulty="hard")
+    assert medium["word"] == "TAX" and medium["score"] == 18
+    assert hard["word"] == "UT"
+    clear_move_generator_cache()
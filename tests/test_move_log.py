@@ -0,0 +1,97 @@
+from collections import Counter
+
+import pytest
+
+from app.game_logic import move_log
+from app.game_logic.game_state import GameState, GamePhase, MoveType, Position, PlacedTile
+from app.game_logic.game_state_cache import serialize_game_state
+from app.game_logic.move_log import MoveEvent, TurnNotAvailable, append_move, replay_game_state, write_snapshot
+from app.models import Game, GameSnapshot, Move, Player
+from app.models.game import GameStatus
+from tests.sqlite_db import sqlite_session
+
+
+def take(bag, letters):
+    for letter in letters:
+        bag.remove(letter)
+    return letters
+
+
+def snapshot_of(game_state):
+    return {
+        "board": [[tile.letter if tile else None for tile in row] for row in game_state.board],
+        "bag": Counter(game_state.letter_bag),
+        "racks": {uid: "".join(rack) for uid, rack in game_state.players.items()},
+        "scores": dict(game_state.scores),
+        "current_player_id": game_state.current_player_id,
+        "consecutive_passes": game_state.consecutive_passes
+    }
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(move_log, "GAME_SNAPSHOT_INTERVAL", 2)
+    with sqlite_session(Game, Player, Move, GameSnapshot) as session:
+        yield session
+
+
+def test_replay_rebuilds_every_turn(db):
+    """Turns replayed from the nearest snapshot plus events match the live state at that turn."""
+    game_state = GameState(language="en")
+    game_state.phase = GamePhase.IN_PROGRESS
+    game_state.players = {1: take(game_state.letter_bag, "CATEEEI"), 2: take(game_state.letter_bag, "AEIOUNR")}
+    game_state.scores = {1: 0, 2: 0}
+    game_state.current_player_id = 1
+
+    game = Game(id="g1", creator_id=1, current_player_id=1, language="en", status=GameStatus.IN_PROGRESS,
+                state=serialize_game_state(game_state))
+    rows = [Player(user_id=uid, game_id="g1", rack="".join(rack), score=0) for uid, rack in game_state.players.items()]
+    db.add(game)
+    db.add_all(rows)
+    write_snapshot(db, game, 0, rows)
+    db.commit()
+    expected = [snapshot_of(game_state)]
+
+    turns = [
+        (1, MoveType.PLACE, [(Position(7, 7 + i), PlacedTile(letter)) for i, letter in enumerate("CAT")]),
+        (2, MoveType.EXCHANGE, list("AEIOUNR")),
+        (1, MoveType.PASS, []),
+        (2, MoveType.PASS, []),
+    ]
+    for player_id, move_type, move_data in turns:
+        success, message, points = game_state.make_move(player_id, move_type, move_data, {"CAT"})
+        assert success, message
+        game.current_player_id = game_state.current_player_id
+        for row in rows:
+            row.rack = "".join(game_state.players[row.user_id])
+            row.score = game_state.scores[row.user_id]
+        game.state = serialize_game_state(game_state)
+        append_move(db, game, MoveEvent(
+            type=move_type.value,
+            turn_number=game_state.turn_number,
+            player_id=player_id,
+            rack_after="".join(game_state.players[player_id]),
+            score_after=game_state.scores[player_id],
+            consecutive_passes=game_state.consecutive_passes,
+            next_player_id=game.current_player_id,
+            tiles=[{"row": pos.row, "col": pos.col, "letter": tile.letter, "is_blank": tile.is_blank}
+                   for pos, tile in move_data] if move_type == MoveType.PLACE else [],
+            points=points if move_type == MoveType.PLACE else 0
+        ), rows)
+        db.commit()
+        expected.append(snapshot_of(game_state))
+
+    assert [s.turn_number for s in db.query(GameSnapshot).order_by(GameSnapshot.turn_number)] == [0, 2, 4]
+    for turn, state in enumerate(expected):
+        assert snapshot_of(replay_game_state(db, game, turn)) == state, f"turn {turn}"
+    with pytest.raises(TurnNotAvailable):
+        replay_game_state(db, game, 5)
+
+
+def test_move_data_keeps_history_keys():
+    event = MoveEvent(type="EXCHANGE", turn_number=3, player_id=1, rack_after="ABCDEFG", score_after=10,
+                      consecutive_passes=0, next_player_id=2, exchanged_count=7)
+    move = Move(player_id=1, move_data=event.to_move_data())
+    assert '"action": "exchange"' in move.move_data and '"letters_exchanged_count": 7' in move.move_data
+    assert MoveEvent.from_move(move) == event
+    assert MoveEvent.from_move(Move(player_id=1, move_data='{"type": "PASS", "action": "pass"}')) is None
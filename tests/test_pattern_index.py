@@ -0,0 +1,44 @@
+from app.game_logic.pattern_index import WordPatternIndex, get_pattern_index, clear_pattern_index_cache
+from app.game_logic.dictionary_index import _build_executor
+from app.game_logic.game_state import GameState
+
+WORDS = {"HAUS", "MAUS", "LAUS", "HAUT", "BÄR", "AB", "TOR"}
+
+
+def test_pattern_queries():
+    """Wildcards match any letter at their position, including umlauts."""
+    index = WordPatternIndex(WORDS)
+    assert index.has_match("?AUS")
+    assert index.matches("?AUS") == ["HAUS", "LAUS", "MAUS"]
+    assert index.first_match("HAU?") == "HAUS"
+    assert index.first_match("B?R") == "BÄR"
+    assert index.first_match("??") == "AB"
+    assert not index.has_match("?AUX")
+    assert not index.has_match("?????")
+    assert index.matches("????") == ["HAUS", "HAUT", "LAUS", "MAUS"]
+
+
+def test_index_is_shared_per_language():
+    """The index is built once per language and rebuilt for a new dictionary object."""
+    clear_pattern_index_cache()
+    first = get_pattern_index("de", WORDS)
+    assert get_pattern_index("de", WORDS) is first
+    # A new dictionary object is served by the previous index until its own is built
+    reloaded = set(WORDS)
+    assert get_pattern_index("de", reloaded) is first
+    _build_executor.submit(lambda: None).result()
+    assert get_pattern_index("de", reloaded) is not first
+    clear_pattern_index_cache("de")
+
+
+def test_game_state_blank_patterns():
+    """GameState resolves blank patterns through the shared index."""
+    clear_pattern_index_cache()
+    first_game = GameState(language="de")
+    second_game = GameState(language="de")
+    assert first_game._is_valid_word_pattern("?AUS", WORDS)
+    assert not first_game._is_valid_word_pattern("?AUX", WORDS)
+    assert first_game._resolve_word_pattern("T?R", WORDS) == "TOR"
+    assert second_game._resolve_word_pattern("?AUT", WORDS) == "HAUT"
+    assert second_game._resolve_word_pattern("TOR", WORDS) == "TOR"
+    clear_pattern_index_cache()
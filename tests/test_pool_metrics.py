@@ -0,0 +1,42 @@
+import pytest
+from sqlalchemy import create_engine, exc
+from sqlalchemy.pool import QueuePool
+
+from app.utils.pool_metrics import metered_pool_class, pool_metrics
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=metered_pool_class(QueuePool, "test"),
+                           pool_size=1, max_overflow=1, pool_timeout=0.05)
+    pool_metrics["test"].reset()
+    yield engine
+    engine.dispose()
+    del pool_metrics["test"]
+
+
+def test_checkouts_overflow_and_timeouts_are_recorded(engine):
+    first = engine.connect()
+    second = engine.connect()  # Beyond pool_size: an overflow connection
+    stats = pool_metrics["test"].stats()
+    assert stats["in_use"] == 2 and stats["overflow"] == 1
+    assert stats["checkouts"] == 2 and stats["overflow_connections"] == 1
+
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    assert pool_metrics["test"].stats()["timeouts"] == 1
+
+    first.close()
+    second.close()
+    with engine.connect():
+        stats = pool_metrics["test"].stats()
+    assert stats["checkouts"] == 3 and stats["overflow_connections"] == 1
+    assert set(stats["checkout_wait_ms"]) == {"p50", "p95", "max"}
+
+
+def test_metrics_follow_the_pool_across_dispose(engine):
+    engine.connect().close()
+    engine.dispose()  # Replaces the pool with a new instance of the same class
+    with engine.connect():
+        stats = pool_metrics["test"].stats()
+    assert stats["checkouts"] == 2 and stats["in_use"] == 1
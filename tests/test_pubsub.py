@@ -0,0 +1,141 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from app.pubsub import EventBus, InMemoryBackend, InMemoryHub, PostgresBackend, PubSubBackend
+from app.websocket import ConnectionManager, UserNotificationManager
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, text):
+        self.sent.append(json.loads(text))
+
+    async def send_json(self, message):
+        self.sent.append(message)
+
+
+async def drain():
+    """Let the connections' writer tasks send what was queued."""
+    await asyncio.sleep(0.01)
+
+
+def node(hub):
+    """One instance: its own bus and managers on the shared in-memory hub."""
+    bus = EventBus(InMemoryBackend(hub))
+    return bus, ConnectionManager(bus), UserNotificationManager(bus)
+
+
+def test_events_reach_sockets_on_every_node():
+    async def scenario():
+        hub = InMemoryHub()
+        (bus_a, games_a, users_a), (bus_b, games_b, users_b) = node(hub), node(hub)
+        await bus_a.start()
+        await bus_b.start()
+
+        alice, bob = FakeWebSocket(), FakeWebSocket()
+        await games_a.connect(alice, "g1", SimpleNamespace(id=1, username="alice"))
+        await games_b.connect(bob, "g1", SimpleNamespace(id=2, username="bob"))
+        await games_a.broadcast_to_game("g1", {"type": "game_update", "game_id": "g1"})
+        await games_b.broadcast_to_game("g2", {"type": "game_update", "game_id": "g2"})
+        await drain()
+        assert alice.sent == bob.sent == [{"type": "game_update", "game_id": "g1"}]
+
+        carol = FakeWebSocket()
+        await users_b.connect(carol, SimpleNamespace(id=3, username="carol"))
+        await users_a.send_to_user(3, {"type": "invitation_received"})
+        await drain()
+        assert [m["type"] for m in carol.sent] == ["connection_established", "invitation_received"]
+
+        await bus_b.stop()
+        await games_a.broadcast_to_game("g1", {"type": "chat_message"})
+        await drain()
+        assert len(alice.sent) == 2 and len(bob.sent) == 1
+
+    asyncio.run(scenario())
+
+
+def test_publish_failure_falls_back_to_local_delivery():
+    class DownBackend(PubSubBackend):
+        name = "down"
+
+        async def start(self, receive):
+            pass
+
+        async def publish(self, data):
+            raise ConnectionError("bus unreachable")
+
+    async def scenario():
+        bus = EventBus(DownBackend())
+        games = ConnectionManager(bus)
+        await bus.start()
+        socket = FakeWebSocket()
+        await games.connect(socket, "g1", SimpleNamespace(id=1, username="alice"))
+        await games.broadcast_to_game("g1", {"type": "game_update"})
+        await drain()
+        assert socket.sent == [{"type": "game_update"}]
+        assert bus.stats()["publish_errors"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_large_events_fit_a_notify_payload():
+    board = [[{"letter": "E", "is_blank": False}] * 15 for _ in range(15)]
+    data = "game\tg1\n" + json.dumps({"type": "game_update", "board": board})
+    assert len(data) > PostgresBackend.MAX_PAYLOAD
+    packed = PostgresBackend.pack(data)
+    assert len(packed) <= PostgresBackend.MAX_PAYLOAD
+    assert PostgresBackend.unpack(packed) == data
+    assert PostgresBackend.pack("game\tg1\n{}") == "game\tg1\n{}"
+
+
+def test_concurrent_notifies_share_the_listen_connection():
+    class FakeConnection:
+        """Rejects overlapping operations, like an asyncpg connection."""
+
+        def __init__(self):
+            self.busy = False
+            self.listeners = []
+
+        def add_termination_listener(self, callback):
+            pass
+
+        async def add_listener(self, channel, callback):
+            self.listeners.append(callback)
+
+        async def execute(self, query, channel, payload):
+            if self.busy:
+                raise RuntimeError("cannot perform operation: another operation is in progress")
+            self.busy = True
+            await asyncio.sleep(0.001)
+            self.busy = False
+            for callback in self.listeners:
+                callback(self, 1, channel, payload)
+
+        def is_closed(self):
+            return False
+
+        async def close(self):
+            pass
+
+    async def connect():
+        return FakeConnection()
+
+    async def scenario():
+        bus = EventBus(PostgresBackend(connect=connect))
+        received = []
+
+        async def handler(key, text):
+            received.append(key)
+
+        bus.register("game", handler)
+        await bus.start()
+        await asyncio.gather(*(bus.publish("game", f"g{i}", {"type": "game_update"}) for i in range(10)))
+        await drain()
+        assert sorted(received) == sorted(f"g{i}" for i in range(10))
+        assert bus.stats()["publish_errors"] == 0
+        await bus.stop()
+
+    asyncio.run(scenario())
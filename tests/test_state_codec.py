@@ -0,0 +1,92 @@
+import json
+from collections import Counter
+
+from app.game_logic.game_state import GameState, PlacedTile
+from app.game_logic.state_codec import MULTIPLIERS, decode_state, encode_state, is_compact
+
+
+def full_state():
+    game_state = GameState(language="de")
+    board = [[None] * 15 for _ in range(15)]
+    for row in range(15):
+        for col in range(15):
+            board[row][col] = {"letter": "ÄBCDEFGHIJKLMNOPQRSTUVWXYZÖÜ"[(row + col) % 28],
+                               "is_blank": (row * col) % 7 == 0, "tile_id": f"uuid-{row}-{col}"}
+    return {
+        "board": board,
+        "phase": "in_progress",
+        "language": "de",
+        "multipliers": MULTIPLIERS,
+        "letter_bag": game_state.letter_bag,
+        "turn_number": 42,
+        "consecutive_passes": 2,
+        "center_used": True,
+        "player_racks_snapshot": {"1": list("ABCDEFG")},
+        "player_scores_snapshot": {"1": 120},
+        "completion_data": {"reason": "all_passed", "scores": {"1": 120}}
+    }
+
+
+def test_round_trip_of_a_full_board_stays_under_1kb():
+    state = full_state()
+    text = encode_state(state)
+    assert is_compact(text)
+    assert len(text) < 1024 < len(json.dumps(state))
+
+    decoded = decode_state(text)
+    assert decoded["board"][7][7] == {"letter": state["board"][7][7]["letter"], "is_blank": state["board"][7][7]["is_blank"]}
+    assert [[cell["letter"] for cell in row] for row in decoded["board"]] == \
+        [[cell["letter"] for cell in row] for row in state["board"]]
+    assert Counter(decoded["letter_bag"]) == Counter(state["letter_bag"])
+    assert decoded["multipliers"] == MULTIPLIERS
+    for key in ("phase", "language", "turn_number", "consecutive_passes", "center_used", "completion_data"):
+        assert decoded[key] == state[key]
+    # Duplicates of the players rows are not stored
+    assert "player_racks_snapshot" not in decoded
+
+
+def test_tile_ids_only_when_asked():
+    state = {"board": [[None] * 15 for _ in range(15)], "letter_bag": []}
+    state["board"][3][4] = PlacedTile("Q", tile_id="abc")
+    text = encode_state(state)
+    assert "tile_id" not in decode_state(text)["board"][3][4]
+    assert decode_state(text, include_tile_ids=True)["board"][3][4]["tile_id"] == "3-4"
+
+
+def test_legacy_json_rows_are_still_read():
+    legacy = {"board": [[None] * 15 for _ in range(15)], "phase": "not_started", "letter_bag": list("AB"),
+              "forfeited": True}
+    assert decode_state(json.dumps(legacy)) == legacy
+    assert decode_state(None) == {} and decode_state("") == {}
+
+    # Rewritten in the compact format, uncommon keys are kept
+    migrated = decode_state(encode_state(legacy))
+    assert migrated["forfeited"] is True and migrated["phase"] == "not_started"
+    assert sorted(migrated["letter_bag"]) == ["A", "B"]
+
+
+def test_states_the_format_cannot_hold_fall_back_to_json():
+    state = {"board": [[None] * 15 for _ in range(15)], "letter_bag": ["A"]}
+    state["board"][0][0] = {"letter": "Ω", "is_blank": False}
+    text = encode_state(state)
+    assert not is_compact(text)
+    assert decode_state(text)["board"][0][0]["letter"] == "Ω"
+
+
+def test_my_games_lists_decoded_states():
+    """/games/mine returns the state dict, not the stored record."""
+    from app.models import Game, Player, User
+    from app.models.game import GameStatus
+    from app.routers.profile import games_for_user
+    from tests.sqlite_db import sqlite_session
+
+    with sqlite_session() as db:
+        user = User(id=1, username="alice", email="alice@example.com")
+        db.add_all([user, Game(id="g1", creator_id=1, status=GameStatus.IN_PROGRESS, state=encode_state(full_state()))])
+        db.flush()
+        db.add(Player(game_id="g1", user_id=1, rack=""))
+        db.commit()
+
+        [game] = games_for_user(current_user=user, db=db)
+        assert game["state"]["turn_number"] == 42 and game["state"]["board"][0][0]["letter"] == "Ä"
+        json.dumps(game)
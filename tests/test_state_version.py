@@ -0,0 +1,80 @@
+import json
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.game_logic.state_version import GameStateConflict, check_state_version, commit_game_state
+from app.models.game import Game, GameStatus
+from tests.sqlite_db import sqlite_engine
+
+
+@pytest.fixture
+def sessions():
+    Session = sessionmaker(bind=sqlite_engine(Game))
+    setup = Session()
+    setup.add(Game(id="g1", creator_id=1, current_player_id=1, status=GameStatus.IN_PROGRESS, state=json.dumps({})))
+    setup.commit()
+    setup.close()
+    yield Session
+
+
+def test_stale_client_version_is_rejected(sessions):
+    """A retried request carrying the version it was made against is refused once the game moved on."""
+    db = sessions()
+    game = db.get(Game, "g1")
+    check_state_version(game, None)
+    check_state_version(game, game.state_version)
+
+    with pytest.raises(GameStateConflict) as conflict:
+        check_state_version(game, game.state_version - 1)
+    assert conflict.value.status_code == 409
+    assert conflict.value.current_version == game.state_version
+    db.close()
+
+
+def test_conditional_commit_returns_new_version_or_conflicts(sessions):
+    """The first writer gets the bumped version; the one that read the same version gets a typed conflict."""
+    first, second = sessions(), sessions()
+    game_a = first.get(Game, "g1")
+    game_b = second.get(Game, "g1")
+    version = game_a.state_version
+
+    game_a.current_player_id = 2
+    assert commit_game_state(first, game_a) == version + 1
+
+    game_b.current_player_id = 3
+    with pytest.raises(GameStateConflict) as conflict:
+        commit_game_state(second, game_b)
+    assert conflict.value.expected_version == version
+    assert conflict.value.current_version == version + 1
+    assert second.get(Game, "g1").current_player_id == 2
+    first.close()
+    second.close()
+
+
+def test_direct_commits_of_a_stale_game_answer_409(sessions):
+    """Writers that commit without commit_game_state get the same conflict response as turns."""
+    import asyncio
+
+    from sqlalchemy.orm.exc import StaleDataError
+    from starlette.requests import Request
+
+    from app.main import app
+
+    first, second = sessions(), sessions()
+    game_a, game_b = first.get(Game, "g1"), second.get(Game, "g1")
+    game_a.status = GameStatus.COMPLETED
+    first.commit()
+    game_b.current_player_id = 2
+    with pytest.raises(StaleDataError) as stale:
+        second.commit()
+
+    handler = app.exception_handlers[StaleDataError]
+    request = Request({"type": "http", "method": "POST", "path": "/games/g1/forfeit", "headers": [],
+                       "query_string": b"", "path_params": {"game_id": "g1"}})
+    response = asyncio.run(handler(request, stale.value))
+    body = json.loads(response.body)
+    assert response.status_code == 409
+    assert body["error_code"] == "GAME_STATE_CONFLICT" and body["game_id"] == "g1"
+    first.close()
+    second.close()
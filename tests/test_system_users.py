@@ -0,0 +1,88 @@
+import pytest
+from sqlalchemy import event
+
+from app.models import User
+from app.utils import system_users
+from app.utils.system_users import get_computer_user_id, is_computer_user_id, is_test_user_id
+from tests.sqlite_db import sqlite_session
+
+
+@pytest.fixture
+def db():
+    with sqlite_session() as session:
+        session.add_all([
+            User(id=1, username="alice", email="alice@example.com"),
+            User(id=2, username="player01", email="player01@example.com"),
+            User(id=3, username="computer_player", email="computer@example.com"),
+        ])
+        session.commit()
+        system_users.invalidate_system_users()
+        statements = []
+        event.listen(session.bind, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        session.info["statements"] = statements
+        yield session
+    system_users.invalidate_system_users()
+
+
+def test_lookups_are_resolved_once(db):
+    assert is_computer_user_id(3, db) and not is_computer_user_id(1, db) and not is_computer_user_id(None, db)
+    assert is_test_user_id(2, db) and is_test_user_id(3, db) and not is_test_user_id(1, db)
+    assert get_computer_user_id(db) == 3
+    assert len(db.info["statements"]) == 1
+
+
+def test_registry_reloads_after_system_user_changes(db):
+    assert get_computer_user_id(db) == 3
+
+    db.add(User(id=4, username="bob", email="bob@example.com"))
+    db.commit()
+    assert get_computer_user_id(db) == 3
+    assert len(db.info["statements"]) == 2  # The insert only
+
+    db.delete(db.get(User, 3))
+    db.commit()
+    assert get_computer_user_id(db) is None
+
+    db.add(User(id=5, username="computer_player", email="computer@example.com"))
+    db.commit()
+    assert is_computer_user_id(5, db)
+
+    db.query(User).filter(User.id == 5).delete()
+    db.commit()
+    assert get_computer_user_id(db) is None
+
+
+def test_changes_reach_other_instances_through_the_event_bus(db, monkeypatch):
+    import asyncio
+
+    from sqlalchemy import text
+
+    from app.pubsub import EventBus, InMemoryBackend, InMemoryHub
+
+    hub = InMemoryHub()
+    local, remote = EventBus(InMemoryBackend(hub)), EventBus(InMemoryBackend(hub))
+    received = []
+
+    async def on_remote(key, message_json):
+        received.append(key)
+
+    remote.register("system_users", on_remote)
+    monkeypatch.setattr(system_users, "event_bus", local)
+
+    async def scenario():
+        await local.start()
+        await remote.start()
+        db.add(User(id=6, username="player02", email="player02@example.com"))
+        db.commit()
+        await asyncio.sleep(0.01)
+
+    asyncio.run(scenario())
+    assert received == ["all"]
+
+    # Another instance re-created the computer player: the bus event drops this instance's stale id
+    assert get_computer_user_id(db) == 3
+    db.execute(text("UPDATE users SET id = 7 WHERE id = 3"))
+    db.commit()
+    assert get_computer_user_id(db) == 3
+    asyncio.run(system_users._on_system_users_changed("all", "{}"))
+    assert get_computer_user_id(db) == 7
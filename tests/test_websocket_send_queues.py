@@ -0,0 +1,68 @@
+import asyncio
+from types import SimpleNamespace
+
+from app import websocket as ws
+from app.pubsub import EventBus, InMemoryBackend
+from app.websocket import SLOW_CLIENT_CLOSE_CODE, ConnectionManager
+
+
+class FakeWebSocket:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.sent = []
+        self.close_code = None
+
+    async def send_text(self, text):
+        await asyncio.sleep(self.delay)
+        self.sent.append(text)
+
+    async def close(self, code=1000):
+        self.close_code = code
+
+
+async def connect(manager, socket, user_id, game_id="g1"):
+    await manager.connect(socket, game_id, SimpleNamespace(id=user_id, username=f"user{user_id}"))
+
+
+def test_broadcast_does_not_wait_for_slow_clients_and_serializes_once():
+    async def scenario():
+        manager = ConnectionManager(EventBus(InMemoryBackend()))
+        fast, slow = FakeWebSocket(), FakeWebSocket(delay=0.5)
+        await connect(manager, fast, 1)
+        await connect(manager, slow, 2)
+
+        started = asyncio.get_running_loop().time()
+        await manager.broadcast_to_game("g1", {"type": "game_update", "board": [[None] * 15] * 15})
+        assert asyncio.get_running_loop().time() - started < 0.1
+        await asyncio.sleep(0.01)
+        assert len(fast.sent) == 1 and slow.sent == []
+
+        await asyncio.sleep(0.6)
+        assert slow.sent[0] is fast.sent[0]  # The same serialized text went to both
+
+    asyncio.run(scenario())
+
+
+def test_clients_that_fall_behind_are_dropped(monkeypatch):
+    monkeypatch.setattr(ws, "WS_SEND_QUEUE_SIZE", 2)
+    monkeypatch.setattr(ws, "WS_SEND_TIMEOUT_SECONDS", 0.05)
+
+    async def scenario():
+        manager = ConnectionManager(EventBus(InMemoryBackend()))
+        healthy, stalled, flooded = FakeWebSocket(), FakeWebSocket(delay=1), FakeWebSocket(delay=1)
+        await connect(manager, healthy, 1)
+        await connect(manager, stalled, 2)
+        await connect(manager, flooded, 3, game_id="g2")
+
+        await manager.broadcast_to_game("g1", {"type": "game_update"})
+        for i in range(4):  # One being sent, two queued, one too many
+            await manager.broadcast_to_game("g2", {"type": "chat_message", "n": i})
+        await asyncio.sleep(0.1)
+
+        assert flooded.close_code == SLOW_CLIENT_CLOSE_CODE  # Queue overflow
+        assert stalled.close_code == SLOW_CLIENT_CLOSE_CODE  # Missed the send deadline
+        assert healthy.close_code is None and len(healthy.sent) == 1
+        assert manager.get_connected_users("g1") == [manager.connection_users[healthy]]
+        assert manager.stats()["dropped_connections"] == 2 and manager.stats()["connections"] == 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,95 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.auth import create_access_token
+from app.database import Base
+from app.models import Game, Player, User
+from app.models.game import GameStatus
+from app.routers import websocket_routes
+from app.routers.games import _start_game
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'ws.db'}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as session:
+        session.add_all([User(id=1, username="alice", email="alice@example.com"),
+                         User(id=2, username="bob", email="bob@example.com"),
+                         User(id=3, username="carol", email="carol@example.com"),
+                         Game(id="g1", creator_id=1, language="en", max_players=2,
+                              status=GameStatus.READY, state=json.dumps({}))])
+        session.flush()
+        session.add_all([Player(game_id="g1", user_id=1, rack=""), Player(game_id="g1", user_id=2, rack="")])
+        session.commit()
+        _start_game(session, "g1", session.get(User, 1))
+    monkeypatch.setattr(websocket_routes, "SessionLocal", Session)
+    yield engine
+    engine.dispose()
+
+
+def test_handshake_authorizes_without_keeping_a_session(engine):
+    user, close_code = websocket_routes.authorize_game_connection(create_access_token({"sub": "alice"}), "g1")
+    assert (user.username, close_code) == ("alice", None)
+    assert websocket_routes.authorize_game_connection(create_access_token({"sub": "carol"}), "g1") == (None, 4003)
+    assert websocket_routes.authorize_game_connection("not-a-token", "g1") == (None, 4001)
+    assert engine.pool.checkedout() == 0
+
+
+def test_open_game_socket_holds_no_connection(engine):
+    app = FastAPI()
+    app.include_router(websocket_routes.router)
+    token = create_access_token({"sub": "bob"})
+
+    with TestClient(app).websocket_connect(f"/games/g1/ws?token={token}") as websocket:
+        assert engine.pool.checkedout() == 0
+        websocket.send_text(json.dumps({"type": "snapshot_request"}))
+        snapshot = websocket.receive_json()
+        assert snapshot["type"] == "game_snapshot" and snapshot["turn_number"] == 0
+        assert engine.pool.checkedout() == 0
+
+
+def test_resume_is_loaded_off_the_event_loop(engine, monkeypatch):
+    from app.routers import websocket_routes as routes
+
+    loaded_on = []
+    load_resume_messages = routes.load_resume_messages
+
+    def record_thread(game_id, since_seq):
+        try:
+            asyncio.get_running_loop()
+            loaded_on.append("event loop")
+        except RuntimeError:
+            loaded_on.append("worker thread")
+        return load_resume_messages(game_id, since_seq)
+
+    monkeypatch.setattr(routes, "load_resume_messages", record_thread)
+    app = FastAPI()
+    app.include_router(routes.router)
+    token = create_access_token({"sub": "alice"})
+
+    with TestClient(app).websocket_connect(f"/games/g1/ws?token={token}&since_seq=0") as websocket:
+        assert websocket.receive_json()["type"] == "replay_complete"
+    assert loaded_on == ["worker thread"]
+
+
+def test_main_game_socket_uses_the_database_off_the_loop(engine, monkeypatch):
+    from app import database
+    from app.main import app
+
+    monkeypatch.setattr(database, "SessionLocal", websocket_routes.SessionLocal)
+    token = create_access_token({"sub": "alice"})
+
+    with TestClient(app).websocket_connect(f"/ws/games/g1?token={token}") as websocket:
+        assert websocket.receive_json()["type"] == "connection_established"
+        websocket.send_json({"type": "chat_message", "message": "hi"})
+        chat = websocket.receive_json()
+        assert (chat["type"], chat["message"], chat["sender_username"]) == ("chat_message", "hi", "alice")
+        assert engine.pool.checkedout() == 0
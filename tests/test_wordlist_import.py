@@ -0,0 +1,35 @@
+from app.models.wordlist import DictionaryVersion, WordList
+from app.wordlist import _WordCopyStream, iter_wordlist_file, stream_import_words
+from tests.sqlite_db import sqlite_session
+
+
+def test_file_is_read_lazily_with_skip_and_limit(tmp_path):
+    """Lines are normalized one at a time; skip/limit count lines like the limited startup import."""
+    path = tmp_path / "words.txt"
+    path.write_bytes("﻿haus\n\nMaus\n".encode("utf-8") + "b\xe4r\n".encode("cp1252") + b"tor\n")
+    assert list(iter_wordlist_file(str(path))) == ["HAUS", "MAUS", "BÄR", "TOR"]
+    assert list(iter_wordlist_file(str(path), skip=2, limit=2)) == ["MAUS", "BÄR"]
+
+
+def test_stream_import_dedupes_and_appends(tmp_path):
+    """Duplicates in the stream and words already stored are skipped; replace starts over."""
+    with sqlite_session(WordList, DictionaryVersion) as db:
+        stats = stream_import_words(db, "de", iter(["HAUS", "MAUS", "HAUS", "TOR"]), replace=True)
+        assert stats["inserted"] == 3 and stats["duplicates"] == 1
+        assert "words_per_second" in stats
+
+        stats = stream_import_words(db, "de", iter(["TOR", "BÄR"]))
+        assert stats["inserted"] == 1 and stats["duplicates"] == 1
+        assert sorted(w for (w,) in db.query(WordList.word)) == ["BÄR", "HAUS", "MAUS", "TOR"]
+        assert db.query(DictionaryVersion.version).filter(DictionaryVersion.language == "de").scalar() == 2
+
+        stream_import_words(db, "de", iter(["ZUG"]), replace=True)
+        assert [w for (w,) in db.query(WordList.word)] == ["ZUG"]
+
+
+def test_copy_stream_chunks_rows():
+    """The COPY source hands out encoded rows in whatever chunk size the driver asks for."""
+    rows = (f"WORT{i}\tde\n" for i in range(3000))
+    stream = _WordCopyStream(rows)
+    data = b"".join(iter(lambda: stream.read(8192), b""))
+    assert data == "".join(f"WORT{i}\tde\n" for i in range(3000)).encode("utf-8")